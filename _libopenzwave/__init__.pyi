@@ -559,10 +559,19 @@ class PyManager(object):
                 OpenZWave. An application needs only add a single watcher - all
                 notifications will be reported to it.
 
+                When `queued` is `True` the thread OpenZWave uses to send the
+                notification only copies it into a queue, it does not wait for the
+                GIL or for the watcher to return. The watcher is called from a
+                thread that handles all of the notifications in the queue each time
+                it gets the GIL.
+
                 :param python_func: Watcher pointer to a function that will be
                     called by the notification system.
                 :type python_func: callable
 
+                :param queued: queue the notifications
+                :type queued: bool, optional
+
                 :rtype: None
         """
         pass
@@ -1605,6 +1614,23 @@ class PyManager(object):
         """
         pass
 
+    def getNodeValueSnapshot(self, *args, **kwargs):  # real signature unknown
+        """
+        Gets the metadata and the data of all of the values of a node.
+
+                :param home_id: The Home ID of the Z-Wave controller that
+                    manages the node.
+                :type home_id: int
+
+                :param node_id: The ID of the node.
+                :type node_id: int
+
+                :return: The value ID and a dict for each value, see
+                    :py:meth:`getValues`
+                :rtype: Dict[int, dict]
+        """
+        pass
+
     def getNodeVersion(self, *args, **kwargs):  # real signature unknown
         """
         Get the version number of a node
@@ -1795,6 +1821,10 @@ class PyManager(object):
         """
         Gets a value.
 
+                The last data the ValueChanged and ValueRefreshed notifications
+                had for the value is returned when there is one, use one of the
+                `getValueAs*` methods to always get the data from OpenZWave.
+
                 :param value_id: The ID of a value.
                 :type value_id: int
 
@@ -2102,6 +2132,28 @@ class PyManager(object):
         """
         pass
 
+    def getValues(self, *args, **kwargs):  # real signature unknown
+        """
+        Gets the metadata and the data of many values.
+
+                This does the same as calling :py:meth:`getValue`,
+                :py:meth:`getValueLabel`, :py:meth:`getValueUnits` and so on for
+                each value using a single call.
+
+                The ids that are not known are left out, this includes numbers
+                that can not be a value id.
+
+                :param value_ids: The IDs of the values.
+                :type value_ids: Iterable[int]
+
+                :return: The value ID and a dict for each value. The dict holds
+                    `id`, `command_class`, `instance`, `index`, `genre`, `type`,
+                    `data`, `label`, `units`, `min`, `max`, `is_read_only` and
+                    `is_write_only`
+                :rtype: Dict[int, dict]
+        """
+        pass
+
     def hasNodeFailed(self, *args, **kwargs):  # real signature unknown
         """
         Ask a Node to update its Neighbor Tables
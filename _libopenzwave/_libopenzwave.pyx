@@ -32,12 +32,20 @@ import traceback
 
 # noinspection PyUnresolvedReferences
 from cython.operator cimport dereference as deref
+from cython.operator cimport preincrement as inc
 
 from libcpp.map cimport map, pair
 from libcpp cimport bool as bool_t
 from libcpp.vector cimport vector
 from libc.stdint cimport uint32_t, uint64_t, int32_t, int16_t, uint8_t, int8_t
-from libc.stdlib cimport malloc, free
+from libc.stdlib cimport malloc, free, realloc
+from cpython.pythread cimport (
+    PyThread_type_lock,
+    PyThread_allocate_lock,
+    PyThread_acquire_lock,
+    PyThread_release_lock,
+    WAIT_LOCK
+)
 from mylibc cimport string
 from mylibc cimport PyEval_InitThreads, Py_Initialize
 from group cimport InstanceAssociation
@@ -47,11 +55,23 @@ from group cimport InstanceAssociation_t, InstanceAssociation
 from driver cimport ControllerState, ControllerError
 from notification cimport const_notification
 from values cimport ValueID
+from values cimport (
+    ValueType_Bool,
+    ValueType_Byte,
+    ValueType_Decimal,
+    ValueType_Int,
+    ValueType_List,
+    ValueType_Short,
+    ValueType_String,
+    ValueType_Button,
+    ValueType_Raw,
+    ValueType_BitSet
+)
 from options cimport Options, Create as CreateOptions
 from manager cimport Manager, Create as CreateManager, Get as GetManager
 from manager cimport struct_associations, int_associations
 
-from notification cimport Notification
+from notification cimport Notification, NotificationNoGIL
 from notification cimport (
     Type_ValueAdded,
     Type_ValueRemoved,
@@ -75,6 +95,7 @@ from notification cimport (
 import logging
 import os
 import sys
+import threading
 from shutil import copyfile
 from pkg_resources import get_distribution, DistributionNotFound
 
@@ -1054,12 +1075,37 @@ PyLogLevels = Enum(
 # noinspection PyUnresolvedReferences
 cdef map[uint64_t, ValueID] _values_map
 
+# largest number a value id can be
+_MAX_VALUE_ID = 0xFFFFFFFFFFFFFFFF
+
+# ids of the values in _values_map for each (home id, node id), so the
+# values of a node can be found without going through all of the values.
+cdef dict _node_values = {}
+
+
+# last known data of the values, it gets updated by the ValueChanged and
+# ValueRefreshed notifications so PyManager.getValue does not have to go
+# into OpenZWave for it.
+cdef dict _values_cache = {}
+
 
 # noinspection PyMissingOrEmptyDocstring,PyPep8Naming,PyUnresolvedReferences
 cdef _getValueFromType(Manager *manager, valueId, pos=None):
     """
     Translate a value in the right type
     """
+    cdef map[uint64_t, ValueID].iterator item
+
+    item = _values_map.find(valueId)
+
+    if item == _values_map.end():
+        return None
+
+    return _readValue(manager, &deref(item).second, valueId, pos)
+
+
+# noinspection PyMissingOrEmptyDocstring,PyPep8Naming,PyUnresolvedReferences
+cdef _readValue(Manager *manager, ValueID* value, valueId, pos=None):
     cdef float type_float
     cdef bool_t type_bool
     cdef uint8_t type_byte
@@ -1069,114 +1115,116 @@ cdef _getValueFromType(Manager *manager, valueId, pos=None):
     cdef uint8_t* vectraw = NULL
     cdef uint8_t size
     cdef string s
+    cdef int datatype
+    cdef bint cret
+
+    # the type is dispatched using the enum of the ValueID, Cython turns
+    # this into a switch.
+    datatype = value.GetType()
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            'value id: %s, value type %s',
+            valueId,
+            PyValueTypes[datatype]
+        )
 
-    c = ""
-    ret = None
-    if _values_map.find(valueId) != _values_map.end():
-        datatype = PyValueTypes[_values_map.at(valueId).GetType()]
-        logger.debug('value id: {0}, value type {1}'.format(valueId, datatype))
-        if datatype == "Bool":
-            cret = manager.GetValueAsBool(
-                _values_map.at(valueId),
+    if datatype == ValueType_Bool or datatype == ValueType_Button:
+        cret = manager.GetValueAsBool(deref(value), &type_bool)
+        ret = type_bool if cret else None
+    elif datatype == ValueType_Byte:
+        cret = manager.GetValueAsByte(deref(value), &type_byte)
+        ret = type_byte if cret else None
+    elif datatype == ValueType_Raw:
+        cret = manager.GetValueAsRaw(deref(value), &vectraw, &size)
+        if cret:
+            ret = ''.join(chr(vectraw[x]) for x in range(size))
+        else:
+            ret = None
+        free(vectraw)
+    elif datatype == ValueType_Decimal:
+        cret = manager.GetValueAsFloat(deref(value), &type_float)
+        ret = type_float if cret else None
+    elif datatype == ValueType_Int:
+        cret = manager.GetValueAsInt(deref(value), &type_int)
+        ret = type_int if cret else None
+    elif datatype == ValueType_Short:
+        cret = manager.GetValueAsShort(deref(value), &type_short)
+        ret = type_short if cret else None
+    elif datatype == ValueType_String:
+        cret = manager.GetValueAsString(deref(value), &type_string)
+        ret = _str(type_string.c_str()) if cret else None
+    elif datatype == ValueType_List:
+        cret = manager.GetValueListSelection(deref(value), &type_string)
+        ret = _str(type_string.c_str()) if cret else None
+    elif datatype == ValueType_BitSet:
+        if pos is not None:
+            type_byte = pos
+            cret = manager.GetValueAsBitSet(
+                deref(value),
+                type_byte,
                 &type_bool
             )
             ret = type_bool if cret else None
-            return ret
-        elif datatype == "Byte":
-            cret = manager.GetValueAsByte(
-                _values_map.at(valueId),
-                &type_byte
-            )
+        else:
+            cret = manager.GetValueAsByte(deref(value), &type_byte)
             ret = type_byte if cret else None
-            return ret
-        elif datatype == "Raw":
-            cret = manager.GetValueAsRaw(
-                _values_map.at(valueId),
-                &vectraw,
-                &size
-            )
-            if cret:
-                for x in range (0, size):
-                    c += chr(vectraw[x])
-            ret = c if cret else None
-            free(vectraw)
-            return ret
-        elif datatype == "Decimal":
-            cret = manager.GetValueAsFloat(
-                _values_map.at(valueId),
-                &type_float
-            )
-            ret = type_float if cret else None
-            return ret
-        elif datatype == "Int":
-            cret = manager.GetValueAsInt(
-                _values_map.at(valueId),
-                &type_int
-            )
-            ret = type_int if cret else None
-            return ret
-        elif datatype == "Short":
-            cret = manager.GetValueAsShort(
-                _values_map.at(valueId),
-                &type_short
-            )
-            ret = type_short if cret else None
-            return ret
-        elif datatype == "String":
-            cret = manager.GetValueAsString(
-                _values_map.at(valueId),
-                &type_string
-            )
-            ret = _str(type_string.c_str()) if cret else None
-            return ret
-        elif datatype == "Button":
-            cret = manager.GetValueAsBool(
-                _values_map.at(valueId),
-                &type_bool
-            )
-            ret = type_bool if cret else None
-            return ret
-        elif datatype == "List":
-            cret = manager.GetValueListSelection(
-                _values_map.at(valueId),
-                &type_string
-            )
-            ret = _str(type_string.c_str()) if cret else None
-            return ret
-        elif datatype == "BitSet":
-            if pos is not None:
-                type_byte = pos
-                cret = manager.GetValueAsBitSet(
-                    _values_map.at(valueId),
-                    type_byte, &type_bool
-                )
-                ret = type_bool if cret else None
-                return ret
-            else:
-                cret = manager.GetValueAsByte(
-                    _values_map.at(valueId),
-                    &type_byte
-                )
-                ret = type_byte if cret else None
-                value_str = "{0:b}".format(ret)
-                bit_set = list(__builtin__.bool(int(item)) for item in list(value_str))
-                bit_set = list(bit_set[i] for i in range(len(value_str) - 1, -1, -1))
-                return bit_set
-        else :
-            cret = manager.GetValueAsString(
-                _values_map.at(valueId),
-                &type_string
-            )
-            ret = type_string.c_str() if cret else None
+            value_str = "{0:b}".format(ret)
+            bit_set = list(__builtin__.bool(int(bit)) for bit in list(value_str))
+            ret = list(bit_set[i] for i in range(len(value_str) - 1, -1, -1))
+    else:
+        cret = manager.GetValueAsString(deref(value), &type_string)
+        ret = type_string.c_str() if cret else None
+
     logger.debug("getValueFromType return %s", ret)
     return ret
 
+# noinspection PyMissingOrEmptyDocstring,PyPep8Naming,PyUnresolvedReferences
+cdef dict _getValueInfo(Manager *manager, ValueID* value, uint64_t valueId):
+    """
+    Collects the metadata and the data of a value
+    """
+    if valueId in _values_cache:
+        data = _values_cache[valueId]
+
+        if type(data) is list:
+            data = list(data)
+    else:
+        data = _readValue(manager, value, valueId)
+
+    return dict(
+        id=valueId,
+        command_class=value.GetCommandClassId(),
+        instance=value.GetInstance(),
+        index=value.GetIndex(),
+        genre=PyGenres[value.GetGenre()],
+        type=PyValueTypes[value.GetType()],
+        data=data,
+        label=_str(manager.GetValueLabel(deref(value)).c_str()),
+        units=_str(manager.GetValueUnits(deref(value)).c_str()),
+        min=manager.GetValueMin(deref(value)),
+        max=manager.GetValueMax(deref(value)),
+        is_read_only=manager.IsValueReadOnly(deref(value)),
+        is_write_only=manager.IsValueWriteOnly(deref(value))
+    )
+
+
 # noinspection PyMissingOrEmptyDocstring,PyPep8Naming,PyUnresolvedReferences
 cdef _delValueId(ValueID v, n):
     logger.debug("delValueId : ValueID : %s", v.GetId())
+    _values_cache.pop(v.GetId(), None)
     if _values_map.find(v.GetId()) != _values_map.end():
         _values_map.erase(_values_map.find(v.GetId()))
 
+    key = (v.GetHomeId(), v.GetNodeId())
+    value_ids = _node_values.get(key, None)
+
+    if value_ids is not None:
+        value_ids.discard(v.GetId())
+
+        if not value_ids:
+            del _node_values[key]
+
 
 # noinspection PyMissingOrEmptyDocstring,PyPep8Naming,PyUnresolvedReferences
 cdef _addValueId(ValueID v, n, add_data=True):
@@ -1191,6 +1239,11 @@ cdef _addValueId(ValueID v, n, add_data=True):
         _values_map.insert(deref(item))
         del item
 
+        _node_values.setdefault(
+            (v.GetHomeId(), v.GetNodeId()),
+            set()
+        ).add(v.GetId())
+
     n.command_class = v.GetCommandClassId()
     n.instance = v.GetInstance()
     n.index = v.GetIndex()
@@ -1326,20 +1379,80 @@ class ZWaveNotification(object):
         return object.__repr__(self) + str(self)
 
 
+# A copy of an OpenZWave notification that does not need the GIL to be made.
+# OpenZWave only keeps the notification alive for the length of the
+# callback so the fields that are needed get copied.
+cdef struct NotificationData:
+    uint32_t home_id
+    uint64_t value_id
+    int32_t type
+    int32_t user_alert
+    uint8_t node_id
+    uint8_t group_id
+    uint8_t event
+    uint8_t notification_code
+    uint8_t command
+    uint8_t button_id
+    uint8_t scene_id
+
+
 # noinspection PyPep8Naming,PyUnresolvedReferences
-cdef void _notif_callback(
-    const_notification _notification,
-    void* _context
-) with gil:
+cdef void _copy_notification(
+    NotificationNoGIL* notification,
+    NotificationData* data
+) noexcept nogil:
+    cdef int32_t notif_type = notification.GetType()
+
+    data.type = notif_type
+    data.home_id = notification.GetHomeId()
+    data.node_id = notification.GetNodeId()
+    data.value_id = 0
+    data.user_alert = 0
+    data.group_id = 0
+    data.event = 0
+    data.notification_code = 0
+    data.command = 0
+    data.button_id = 0
+    data.scene_id = 0
+
+    if notif_type == Type_Group:
+        data.group_id = notification.GetGroupIdx()
+    elif notif_type == Type_NodeEvent:
+        data.event = notification.GetEvent()
+    elif notif_type == Type_Notification:
+        data.notification_code = notification.GetNotification()
+    elif notif_type == Type_ControllerCommand:
+        data.event = notification.GetEvent()
+        data.notification_code = notification.GetNotification()
+        data.command = notification.GetCommand()
+    elif (
+        notif_type == Type_CreateButton or
+        notif_type == Type_DeleteButton or
+        notif_type == Type_ButtonOn or
+        notif_type == Type_ButtonOff
+    ):
+        data.button_id = notification.GetButtonId()
+    elif notif_type == Type_SceneEvent:
+        data.scene_id = notification.GetSceneId()
+    elif (
+        notif_type == Type_ValueAdded or
+        notif_type == Type_ValueRemoved or
+        notif_type == Type_ValueChanged or
+        notif_type == Type_ValueRefreshed
+    ):
+        data.value_id = notification.GetValueID().GetId()
+    elif notif_type == Type_UserAlerts:
+        data.user_alert = notification.GetUserAlertType()
+
+
+# noinspection PyPep8Naming,PyUnresolvedReferences
+cdef _dispatch_notification(NotificationData* data, callback):
     """
-    Notification callback to the C++ library
+    Builds the python notification from the copy and calls the callback.
     """
-    logger.debug("notif_callback : new notification")
-    cdef Notification* notification = <Notification*>_notification
-
-    notif_type = PyNotifications[notification.GetType()]
-    node_id = notification.GetNodeId()
-    home_id = notification.GetHomeId()
+    notif_type = PyNotifications[data.type]
+    node_id = data.node_id
+    home_id = data.home_id
 
     logger.debug(
         "notif_callback : notification_type: %s, home_id: %s, node_id: %s",
@@ -1351,59 +1464,72 @@ cdef void _notif_callback(
     n = ZWaveNotification(notif_type, home_id, node_id)
 
     try:
-        if notif_type.idx == Type_Group:
-            n.group_id = notification.GetGroupIdx()
-        elif notif_type.idx == Type_NodeEvent:
-            n.event = notification.GetEvent()
-        elif notif_type.idx == Type_Notification:
-            n.notification_code = notification.GetNotification()
-        elif notif_type.idx == Type_ControllerCommand:
+        if data.type == Type_Group:
+            n.group_id = data.group_id
+        elif data.type == Type_NodeEvent:
+            n.event = data.event
+        elif data.type == Type_Notification:
+            n.notification_code = data.notification_code
+        elif data.type == Type_ControllerCommand:
             n.controller_state=(
-                PyControllerState[notification.GetEvent()]
+                PyControllerState[data.event]
             )
             n.controller_error=(
-                PyControllerError[notification.GetNotification()]
+                PyControllerError[data.notification_code]
             )
             n.controller_command=(
-                PyControllerCommand[notification.GetCommand()]
+                PyControllerCommand[data.command]
             )
-        elif notif_type.idx in (
+        elif data.type in (
             Type_CreateButton,
             Type_DeleteButton,
             Type_ButtonOn,
             Type_ButtonOff
         ):
-            n.button_id = notification.GetButtonId()
-        elif notif_type.idx == Type_DriverRemoved:
+            n.button_id = data.button_id
+        elif data.type == Type_DriverRemoved:
             logger.debug(
                 "Notification : Type_DriverRemoved received : "
                 "clean all value ids"
             )
-            _values_map.empty()
-        elif notif_type.idx == Type_DriverReset:
+            _values_map.clear()
+            _values_cache.clear()
+            _node_values.clear()
+        elif data.type == Type_DriverReset:
             logger.debug(
                 "Notification : Type_DriverReset received : "
                 "clean all value ids"
             )
-            _values_map.empty()
-        elif notif_type.idx == Type_SceneEvent:
-            n.scene_id = notification.GetSceneId()
-        elif notif_type.idx in (
+            _values_map.clear()
+            _values_cache.clear()
+            _node_values.clear()
+        elif data.type == Type_SceneEvent:
+            n.scene_id = data.scene_id
+        elif data.type in (
             Type_ValueAdded,
             Type_ValueChanged,
             Type_ValueRefreshed
         ):
-            n.value = n.Value(notification.GetValueID().GetId())
+            n.value = n.Value(data.value_id)
 
-            if notif_type.idx == Type_ValueAdded:
-                _addValueId(notification.GetValueID(), n.value, False)
+            if data.type == Type_ValueAdded:
+                _addValueId(
+                    ValueID(data.home_id, data.value_id),
+                    n.value,
+                    False
+                )
             else:
-                _addValueId(notification.GetValueID(), n.value)
+                _addValueId(ValueID(data.home_id, data.value_id), n.value)
+
+                if n.value.data is None:
+                    _values_cache.pop(data.value_id, None)
+                else:
+                    _values_cache[data.value_id] = n.value.data
 
-        elif notif_type.idx == Type_ValueRemoved:
-            n.value = n.Value(notification.GetValueID().GetId())
-        elif notif_type.idx == Type_UserAlerts:
-            n.user_alert = PyUserAlerts[notification.GetUserAlertType()]
+        elif data.type == Type_ValueRemoved:
+            n.value = n.Value(data.value_id)
+        elif data.type == Type_UserAlerts:
+            n.user_alert = PyUserAlerts[data.user_alert]
     except:
         err = traceback.format_exc()
         logger.error(
@@ -1422,7 +1548,7 @@ cdef void _notif_callback(
     #     _addValueId(notification.GetValueID(), n)
     logger.debug("notif_callback : call callback context")
     try:
-        (<object>_context)(n)
+        callback(n)
     except:
         err = traceback.format_exc()
         logger.error(
@@ -1430,9 +1556,9 @@ cdef void _notif_callback(
             "Type_{0}, Node: {1}\n{2}".format(notif_type, node_id, err)
         )
 
-    if notification.GetType() == Type_ValueRemoved:
+    if data.type == Type_ValueRemoved:
         try:
-            _delValueId(notification.GetValueID(), n)
+            _delValueId(ValueID(data.home_id, data.value_id), n)
         except:
             err = traceback.format_exc()
             logger.error(
@@ -1441,9 +1567,195 @@ cdef void _notif_callback(
 
             )
 
+
+# noinspection PyPep8Naming,PyUnresolvedReferences
+cdef void _notif_callback(
+    const_notification _notification,
+    void* _context
+) with gil:
+    """
+    Notification callback to the C++ library
+    """
+    logger.debug("notif_callback : new notification")
+    cdef NotificationData data
+
+    _copy_notification(<NotificationNoGIL*>_notification, &data)
+    _dispatch_notification(&data, <object>_context)
+
     logger.debug("notif_callback : end")
 
 
+# Queued notifications.
+#
+# _notif_callback holds the thread of the OpenZWave driver until the python
+# callback returns. When the watcher is added with queued=True the
+# notifications are copied into _queue_items by _queued_notif_callback
+# without the GIL and the driver goes right back to work. A python thread
+# running _drain_notifications takes all of the copies that have been made
+# and calls the python callback for each of them.
+#
+# _queue_lock protects the queue. _queue_ready is used as a semaphore, it is
+# released when a copy is added to an empty queue and acquired by the
+# thread that drains the queue. _queue_signaled is set while _queue_ready is
+# released so it does not get released twice.
+
+# starting number of notifications the queue is able to hold, the queue
+# grows when it is full
+cdef size_t _queue_start_size = 256
+
+cdef PyThread_type_lock _queue_lock = PyThread_allocate_lock()
+cdef PyThread_type_lock _queue_ready = PyThread_allocate_lock()
+cdef NotificationData* _queue_items = NULL
+cdef size_t _queue_count = 0
+cdef size_t _queue_size = 0
+cdef size_t _queue_dropped = 0
+cdef bint _queue_signaled = False
+cdef bint _queue_stop = False
+
+# the semaphore starts out acquired
+PyThread_acquire_lock(_queue_ready, WAIT_LOCK)
+
+
+# noinspection PyPep8Naming
+cdef void _signal_queue() noexcept nogil:
+    # _queue_lock has to be held
+    global _queue_signaled
+
+    if not _queue_signaled:
+        _queue_signaled = True
+        PyThread_release_lock(_queue_ready)
+
+
+# noinspection PyPep8Naming,PyUnresolvedReferences
+cdef void _queued_notif_callback(
+    const_notification _notification,
+    void* _context
+) noexcept nogil:
+    """
+    Notification callback to the C++ library that does not call into python
+    """
+    global _queue_items, _queue_count, _queue_size, _queue_dropped
+
+    cdef NotificationData data
+    cdef NotificationData* items
+    cdef size_t size
+
+    _copy_notification(<NotificationNoGIL*>_notification, &data)
+
+    PyThread_acquire_lock(_queue_lock, WAIT_LOCK)
+
+    if _queue_count == _queue_size:
+        if _queue_size:
+            size = _queue_size * 2
+        else:
+            size = _queue_start_size
+
+        items = <NotificationData*>realloc(
+            _queue_items,
+            size * sizeof(NotificationData)
+        )
+
+        if items == NULL:
+            _queue_dropped += 1
+            PyThread_release_lock(_queue_lock)
+            return
+
+        _queue_items = items
+        _queue_size = size
+
+    _queue_items[_queue_count] = data
+    _queue_count += 1
+    _signal_queue()
+
+    PyThread_release_lock(_queue_lock)
+
+
+# noinspection PyPep8Naming
+cdef _start_queue():
+    global _queue_count, _queue_dropped, _queue_stop
+
+    with nogil:
+        PyThread_acquire_lock(_queue_lock, WAIT_LOCK)
+
+    _queue_count = 0
+    _queue_dropped = 0
+    _queue_stop = False
+
+    PyThread_release_lock(_queue_lock)
+
+
+# noinspection PyPep8Naming
+cdef _stop_queue():
+    global _queue_stop
+
+    with nogil:
+        PyThread_acquire_lock(_queue_lock, WAIT_LOCK)
+        _queue_stop = True
+        _signal_queue()
+        PyThread_release_lock(_queue_lock)
+
+
+# noinspection PyPep8Naming
+def _drain_notifications(callback):
+    """
+    Calls the callback for the queued notifications until the queue gets
+    stopped.
+
+    The GIL is only let go of while waiting for notifications, all of the
+    notifications that have been queued are handled in one go.
+    """
+    global _queue_items, _queue_count, _queue_size, _queue_dropped
+    global _queue_signaled
+
+    cdef NotificationData* batch = NULL
+    cdef NotificationData* items
+    cdef size_t batch_size = 0
+    cdef size_t count = 0
+    cdef size_t dropped = 0
+    cdef size_t size
+    cdef size_t i
+    cdef bint stop = False
+
+    try:
+        while not stop:
+            with nogil:
+                PyThread_acquire_lock(_queue_ready, WAIT_LOCK)
+                PyThread_acquire_lock(_queue_lock, WAIT_LOCK)
+                _queue_signaled = False
+
+                # the buffers get swapped so the driver can keep adding to
+                # the queue while the batch is being handled
+                items = _queue_items
+                size = _queue_size
+                count = _queue_count
+
+                _queue_items = batch
+                _queue_size = batch_size
+                _queue_count = 0
+
+                batch = items
+                batch_size = size
+
+                dropped = _queue_dropped
+                _queue_dropped = 0
+                stop = _queue_stop
+
+                PyThread_release_lock(_queue_lock)
+
+            if dropped:
+                logger.error(
+                    "notification queue : unable to allocate memory, "
+                    "%d notifications have been lost",
+                    dropped
+                )
+
+            for i in range(count):
+                _dispatch_notification(&batch[i], callback)
+    finally:
+        free(batch)
+
+
+
 # noinspection PyMissingOrEmptyDocstring,PyPep8Naming
 # cpdef object driverData():
 #     cdef DriverData data
@@ -2189,6 +2501,7 @@ cdef class PyManager:
 
     cdef Manager *manager
     cdef object _watcherCallback
+    cdef object _watcherThread
     cdef object _controllerCallback
 
     def create(self):
@@ -4039,6 +4352,9 @@ cdef class PyManager:
         ret = 2
 
         if _values_map.find(value_id) != _values_map.end():
+            # the value held by the node gets updated by OpenZWave
+            _values_cache.pop(value_id, None)
+
             datatype = PyValueTypes[_values_map.at(value_id).GetType()]
             if datatype == "Bool":
                 type_bool = value
@@ -4453,11 +4769,95 @@ cdef class PyManager:
         :param value_id: The ID of a value.
         :type value_id: int
 
+        The last data the ValueChanged and ValueRefreshed notifications
+        had for the value is returned when there is one, use one of the
+        `getValueAs*` methods to always get the data from OpenZWave.
+
         :return: Depending of the type of the valueId, None otherwise
         :rtype: int, str, float, bool, None
         """
+        if value_id in _values_cache:
+            ret = _values_cache[value_id]
+
+            if type(ret) is list:
+                return list(ret)
+
+            return ret
+
         return _getValueFromType(self.manager, value_id)
 
+    def getValues(self, value_ids):
+        """
+        Gets the metadata and the data of many values.
+
+        This does the same as calling :py:meth:`getValue`,
+        :py:meth:`getValueLabel`, :py:meth:`getValueUnits` and so on for
+        each value using a single call.
+
+        The ids that are not known are left out, this includes numbers
+        that can not be a value id.
+
+        :param value_ids: The IDs of the values.
+        :type value_ids: Iterable[int]
+
+        :return: The value ID and a dict for each value. The dict holds
+            `id`, `command_class`, `instance`, `index`, `genre`, `type`,
+            `data`, `label`, `units`, `min`, `max`, `is_read_only` and
+            `is_write_only`
+        :rtype: Dict[int, dict]
+        """
+        cdef map[uint64_t, ValueID].iterator item
+        cdef uint64_t c_value_id
+        cdef dict ret = {}
+
+        for value_id in value_ids:
+            if not 0 <= value_id <= _MAX_VALUE_ID:
+                continue
+
+            c_value_id = value_id
+            item = _values_map.find(c_value_id)
+
+            if item != _values_map.end():
+                ret[value_id] = _getValueInfo(
+                    self.manager,
+                    &deref(item).second,
+                    c_value_id
+                )
+
+        return ret
+
+    def getNodeValueSnapshot(self, home_id, node_id):
+        """
+        Gets the metadata and the data of all of the values of a node.
+
+        :param home_id: The Home ID of the Z-Wave controller that
+            manages the node.
+        :type home_id: int
+
+        :param node_id: The ID of the node.
+        :type node_id: int
+
+        :return: The value ID and a dict for each value, see
+            :py:meth:`getValues`
+        :rtype: Dict[int, dict]
+        """
+        cdef map[uint64_t, ValueID].iterator item
+        cdef uint64_t c_value_id
+        cdef dict ret = {}
+
+        for value_id in sorted(_node_values.get((home_id, node_id), ())):
+            c_value_id = value_id
+            item = _values_map.find(c_value_id)
+
+            if item != _values_map.end():
+                ret[value_id] = _getValueInfo(
+                    self.manager,
+                    &deref(item).second,
+                    c_value_id
+                )
+
+        return ret
+
     def getValueAsBool(self, value_id):
         """
         Gets a value as a bool.
@@ -5323,7 +5723,7 @@ cdef class PyManager:
     # For notification of changes to the Z-Wave network or
     # device values and associations.
     #
-    def addWatcher(self, python_func):
+    def addWatcher(self, python_func, queued=False):
         """
         Add a notification watcher.
 
@@ -5333,14 +5733,42 @@ cdef class PyManager:
         OpenZWave. An application needs only add a single watcher - all
         notifications will be reported to it.
 
+        When `queued` is `True` the thread OpenZWave uses to send the
+        notification only copies it into a queue, it does not wait for the
+        GIL or for the watcher to return. The watcher is called from a
+        thread that handles all of the notifications in the queue each time
+        it gets the GIL.
+
         :param python_func: Watcher pointer to a function that will be
             called by the notification system.
         :type python_func: callable
-        
+
+        :param queued: queue the notifications
+        :type queued: bool, optional
+
         :rtype: None
         """
         self._watcherCallback = python_func # need to keep a reference to this
-        if not self.manager.AddWatcher(_notif_callback, <void*>python_func):
+
+        if queued:
+            _start_queue()
+
+            if not self.manager.AddWatcher(
+                _queued_notif_callback,
+                <void*>python_func
+            ):
+                self._watcherCallback = None
+                raise ValueError("call to AddWatcher failed")
+
+            self._watcherThread = threading.Thread(
+                target=_drain_notifications,
+                args=(python_func,),
+                name='libopenzwave notifications'
+            )
+            self._watcherThread.daemon = True
+            self._watcherThread.start()
+
+        elif not self.manager.AddWatcher(_notif_callback, <void*>python_func):
             raise ValueError("call to AddWatcher failed")
 
     def removeWatcher(self, python_func):
@@ -5349,16 +5777,34 @@ cdef class PyManager:
 
         :param python_func: Watcher pointer to a function
         :type python_func: callable
-        
+
         :rtype: None
         """
-        if not self.manager.RemoveWatcher(
-            _notif_callback,
-            <void*>self._watcherCallback
-        ):
-            raise ValueError("call to RemoveWatcher failed")
+        if self._watcherThread is None:
+            res = self.manager.RemoveWatcher(
+                _notif_callback,
+                <void*>self._watcherCallback
+            )
         else:
-            self._watcherCallback = None
+            res = self.manager.RemoveWatcher(
+                _queued_notif_callback,
+                <void*>self._watcherCallback
+            )
+
+        if not res:
+            raise ValueError("call to RemoveWatcher failed")
+
+        if self._watcherThread is not None:
+            # the notifications that are already in the queue are handled
+            # before the thread stops
+            _stop_queue()
+
+            if self._watcherThread is not threading.current_thread():
+                self._watcherThread.join()
+
+            self._watcherThread = None
+
+        self._watcherCallback = None
 
     # -------------------------------------------------------------------------
     # Controller commands
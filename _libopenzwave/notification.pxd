@@ -17,7 +17,7 @@ You should have received a copy of the GNU General Public License
 along with libopenzwave. If not, see http://www.gnu.org/licenses.
 
 """
-from libc.stdint cimport uint32_t, uint8_t
+from libc.stdint cimport uint32_t, uint64_t, uint8_t
 from values cimport ValueID
 
 cdef extern from *:
@@ -189,3 +189,30 @@ cdef extern from "Notification.h" namespace "OpenZWave":
         uint8_t GetByte() except +
         uint8_t GetCommand() except +
         UserAlertNotification GetUserAlertType() except +
+
+
+cdef extern from "ValueID.h" namespace "OpenZWave":
+
+    # noinspection PyClassicStyleClass,PyMissingOrEmptyDocstring,PyPep8Naming
+    cdef cppclass NotificationValueID "OpenZWave::ValueID":
+        uint64_t GetId() nogil
+
+
+cdef extern from "Notification.h" namespace "OpenZWave":
+
+    # The same class as Notification declared so it can be used without
+    # the GIL. These getters do not throw, they are used to copy a
+    # notification on the thread of the driver.
+    # noinspection PyClassicStyleClass,PyMissingOrEmptyDocstring,PyPep8Naming
+    cdef cppclass NotificationNoGIL "OpenZWave::Notification":
+        NotificationType GetType() nogil
+        uint32_t GetHomeId() nogil
+        uint8_t GetNodeId() nogil
+        NotificationValueID& GetValueID() nogil
+        uint8_t GetGroupIdx() nogil
+        uint8_t GetEvent() nogil
+        uint8_t GetButtonId() nogil
+        uint8_t GetSceneId() nogil
+        uint8_t GetNotification() nogil
+        uint8_t GetCommand() nogil
+        UserAlertNotification GetUserAlertType() nogil
@@ -72,6 +72,8 @@ cdef extern from "ValueID.h" namespace "OpenZWave::ValueID":
 cdef extern from "ValueID.h" namespace "OpenZWave":
     # noinspection PyClassicStyleClass,PyMissingOrEmptyDocstring,PyPep8Naming
     cdef cppclass ValueID:
+        # rebuilds a ValueID from the home id and GetId()
+        ValueID(uint32_t home_id, uint64_t id)
         uint32_t GetHomeId() except +
         uint8_t GetNodeId() except +
         ValueGenre GetGenre() except +
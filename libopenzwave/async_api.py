@@ -0,0 +1,478 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: asyncio support
+
+.. moduleauthor:: Kevin G Schlosser
+
+
+The signals get sent from the notification threads of the network and the
+nodes. This module hands them off to an asyncio event loop so an application
+that runs inside of an event loop does not have to do it by hand.
+
+This is the network startup example from :py:mod:`libopenzwave.signals`
+using asyncio.
+
+.. code-block:: python
+
+    import asyncio
+    import libopenzwave
+    from libopenzwave import async_api
+
+
+    async def main():
+        option = libopenzwave.ZWaveOption(user_path='~/zwave')
+        option.lock()
+
+        network = async_api.AsyncZWaveNetwork(
+            libopenzwave.ZWaveNetwork(option, auto_start=False)
+        )
+
+        await network.start()
+        await network.ready()
+
+        for node in network.network:
+            print('NODE ID:', node.id)
+
+        async with network.signals(
+            libopenzwave.SIGNAL_VALUE_CHANGED,
+            libopenzwave.SIGNAL_VALUE_REFRESHED
+        ) as stream:
+            async for event in stream:
+                print(event.signal, event.sender, event.kwargs['value_data'])
+
+        value = network.network.nodes[10].values.level
+        value_data = await network.set_value(value, 50, timeout=10.0)
+
+        await network.stop()
+
+
+    asyncio.run(main())
+"""
+
+import asyncio
+import collections
+import logging
+import functools
+
+from . import signals
+
+logger = logging.getLogger(__name__)
+
+
+SignalEvent = collections.namedtuple(
+    'SignalEvent',
+    ['signal', 'sender', 'kwargs']
+)
+"""
+Item that :py:class:`SignalStream` produces.
+
+* signal: :py:class:`libopenzwave.signals.Signal` that was sent
+* sender: object that sent the signal
+* kwargs: all other keyword arguments that were passed with the signal
+"""
+
+
+def _event_from_kwargs(kwargs):
+    kwargs = dict(kwargs)
+    signal = kwargs.pop('signal', None)
+    sender = kwargs.pop('sender', None)
+    return SignalEvent(signal, sender, kwargs)
+
+
+def wait_for_signal(*signals_, sender=None, timeout=None, loop=None):
+    """
+    Waits for one of the signals to be sent.
+
+    The receivers are registered when this function is called and not when
+    the awaitable that gets returned is awaited. A signal that gets sent
+    between calling this function and awaiting the result is still picked
+    up. The receivers are removed once the awaitable finishes so it needs
+    to be awaited.
+
+    .. code-block:: python
+
+        waiter = async_api.wait_for_signal(
+            libopenzwave.SIGNAL_VALUE_CHANGED,
+            sender=value
+        )
+        value.data = 50
+        event = await waiter
+
+    :param signals_: signals to wait for
+    :type signals_: libopenzwave.signals.Signal
+
+    :param sender: only signals sent by this object
+    :type sender: Any, optional
+
+    :param timeout: number of seconds to wait, `None` waits forever
+    :type timeout: float, None, optional
+
+    :param loop: event loop, defaults to the running loop
+    :type loop: asyncio.AbstractEventLoop, optional
+
+    :return: awaitable that results in a :py:class:`SignalEvent`
+    :rtype: Awaitable[SignalEvent]
+
+    :raises: asyncio.TimeoutError if the timeout expires.
+    """
+    waiter = _SignalWaiter(signals_, sender, loop)
+    return waiter.result(timeout)
+
+
+class _SignalWaiter(object):
+    # registers the receivers right away, the future is resolved with the
+    # first signal that comes in.
+
+    def __init__(self, signals_, sender, loop=None):
+        if loop is None:
+            loop = asyncio.get_running_loop()
+
+        self.loop = loop
+        self.future = loop.create_future()
+        self.signals = signals_
+        self.sender = sender
+
+        for signal in signals_:
+            signal.register(self, sender)
+
+    def __set_result(self, event):
+        if not self.future.done():
+            self.future.set_result(event)
+
+    def __call__(self, **kwargs):
+        if not self.future.done():
+            self.loop.call_soon_threadsafe(
+                self.__set_result,
+                _event_from_kwargs(kwargs)
+            )
+
+    async def wait(self, timeout=None):
+        return await asyncio.wait_for(asyncio.shield(self.future), timeout)
+
+    async def result(self, timeout=None):
+        try:
+            return await self.wait(timeout)
+        finally:
+            self.close()
+
+    def close(self):
+        for signal in self.signals:
+            signals.dispatcher.disconnect(self, signal, self.sender)
+
+
+class SignalStream(object):
+    """
+    Async iterator of signals.
+
+    .. code-block:: python
+
+        stream = SignalStream(
+            libopenzwave.SIGNAL_VALUE_CHANGED,
+            sender=value
+        )
+
+        async with stream:
+            async for event in stream:
+                print(event.kwargs['value_data'])
+
+
+    The stream holds a bounded queue. When the application does not keep up
+    with the signals the oldest queued signal is thrown away, the number of
+    thrown away signals is available from :py:attr:`dropped`.
+
+    :param signals_: signals to iterate over
+    :type signals_: libopenzwave.signals.Signal
+
+    :param sender: only signals sent by this object
+    :type sender: Any, optional
+
+    :param max_size: maximum number of queued signals
+    :type max_size: int, optional
+
+    :param loop: event loop, defaults to the running loop
+    :type loop: asyncio.AbstractEventLoop, optional
+    """
+
+    def __init__(self, *signals_, sender=None, max_size=1000, loop=None):
+        if loop is None:
+            loop = asyncio.get_running_loop()
+
+        self.loop = loop
+        self.signals = signals_
+        self.sender = sender
+        self.dropped = 0
+
+        self.__queue = asyncio.Queue(max_size)
+        self.__closed = False
+
+        for signal in signals_:
+            signal.register(self, sender)
+
+    def __put(self, event):
+        if self.__closed:
+            return
+
+        if self.__queue.full():
+            self.__queue.get_nowait()
+            self.dropped += 1
+
+        self.__queue.put_nowait(event)
+
+    def __call__(self, **kwargs):
+        if not self.__closed:
+            self.loop.call_soon_threadsafe(
+                self.__put,
+                _event_from_kwargs(kwargs)
+            )
+
+    @property
+    def is_closed(self):
+        """
+        :rtype: bool
+        """
+        return self.__closed
+
+    def close(self):
+        """
+        Unregisters from the signals and ends the iteration.
+
+        Signals that are already queued are still returned.
+        """
+        if self.__closed:
+            return
+
+        self.__closed = True
+
+        for signal in self.signals:
+            signals.dispatcher.disconnect(self, signal, self.sender)
+
+        # wakes up a pending __anext__
+        if self.__queue.full():
+            self.__queue.get_nowait()
+            self.dropped += 1
+
+        self.__queue.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.__closed and self.__queue.empty():
+            raise StopAsyncIteration
+
+        event = await self.__queue.get()
+
+        if event is None:
+            raise StopAsyncIteration
+
+        return event
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncZWaveNetwork(object):
+    """
+    asyncio wrapper around :py:class:`libopenzwave.network.ZWaveNetwork`
+
+    Calls into the network that can block (starting the network, setting a
+    value) are run in the default executor of the loop.
+
+    :param network: network to wrap, create it using `auto_start=False`
+    :type network: libopenzwave.network.ZWaveNetwork
+
+    :param loop: event loop, defaults to the running loop
+    :type loop: asyncio.AbstractEventLoop, optional
+    """
+
+    def __init__(self, network, loop=None):
+        self.network = network
+        self.__loop = loop
+
+    @property
+    def loop(self):
+        """
+        :rtype: asyncio.AbstractEventLoop
+        """
+        if self.__loop is None:
+            return asyncio.get_running_loop()
+
+        return self.__loop
+
+    def __run(self, func, *args):
+        return self.loop.run_in_executor(None, functools.partial(func, *args))
+
+    async def start(self, timeout=None):
+        """
+        Starts the network.
+
+        Returns once the driver has started, at this point the cached nodes
+        have been loaded and the controller is available.
+
+        :param timeout: number of seconds to wait, `None` waits forever
+        :type timeout: float, None, optional
+
+        :raises: RuntimeError if the network failed to start.
+        :raises: asyncio.TimeoutError if the timeout expires.
+        """
+        if self.network.state >= self.network.STATE_STARTED:
+            return
+
+        waiter = _SignalWaiter(
+            (signals.SIGNAL_NETWORK_STARTED, signals.SIGNAL_NETWORK_FAILED),
+            None,
+            self.loop
+        )
+
+        try:
+            await self.__run(self.network.start)
+            event = await waiter.wait(timeout)
+        finally:
+            waiter.close()
+
+        if event.signal == signals.SIGNAL_NETWORK_FAILED:
+            raise RuntimeError('Z-Wave network failed to start')
+
+    async def ready(self, timeout=None):
+        """
+        Waits until the network is ready.
+
+        :param timeout: number of seconds to wait, `None` waits forever
+        :type timeout: float, None, optional
+
+        :raises: RuntimeError if the network failed.
+        :raises: asyncio.TimeoutError if the timeout expires.
+        """
+        waiter = _SignalWaiter(
+            (signals.SIGNAL_NETWORK_READY, signals.SIGNAL_NETWORK_FAILED),
+            None,
+            self.loop
+        )
+
+        try:
+            # checked after registering so the signal can not be missed
+            if self.network.is_ready:
+                return
+
+            event = await waiter.wait(timeout)
+        finally:
+            waiter.close()
+
+        if event.signal == signals.SIGNAL_NETWORK_FAILED:
+            raise RuntimeError('Z-Wave network failed')
+
+    async def stop(self, timeout=None):
+        """
+        Stops the network.
+
+        :param timeout: number of seconds to wait, `None` waits forever
+        :type timeout: float, None, optional
+
+        :raises: asyncio.TimeoutError if the timeout expires.
+        """
+        if self.network.state == self.network.STATE_STOPPED:
+            return
+
+        waiter = _SignalWaiter(
+            (signals.SIGNAL_NETWORK_STOPPED,),
+            None,
+            self.loop
+        )
+
+        try:
+            # stopping the network blocks while the dataset gets written
+            await self.__run(self.network.stop)
+            await waiter.wait(timeout)
+        finally:
+            waiter.close()
+
+    def signals(self, *signals_, sender=None, max_size=1000):
+        """
+        Creates a :py:class:`SignalStream`.
+
+        :param signals_: signals to iterate over
+        :type signals_: libopenzwave.signals.Signal
+
+        :param sender: only signals sent by this object
+        :type sender: Any, optional
+
+        :param max_size: maximum number of queued signals
+        :type max_size: int, optional
+
+        :rtype: SignalStream
+        """
+        return SignalStream(
+            *signals_,
+            sender=sender,
+            max_size=max_size,
+            loop=self.loop
+        )
+
+    def wait_for_signal(self, *signals_, sender=None, timeout=None):
+        """
+        See :py:func:`wait_for_signal`.
+
+        :rtype: Awaitable[SignalEvent]
+        """
+        return wait_for_signal(
+            *signals_,
+            sender=sender,
+            timeout=timeout,
+            loop=self.loop
+        )
+
+    async def set_value(self, value, data, timeout=None):
+        """
+        Sets the data of a value.
+
+        Resolves when the value reports back with a changed or refreshed
+        notification.
+
+        :param value: value to set
+        :type value: libopenzwave.value.ZWaveValue
+
+        :param data: new data
+        :type data: str, float, int, bool
+
+        :param timeout: number of seconds to wait, `None` waits forever
+        :type timeout: float, None, optional
+
+        :return: the data that was passed with the signal
+        :rtype: libopenzwave.value.ZWaveValueData
+
+        :raises: asyncio.TimeoutError if the timeout expires.
+        """
+        waiter = _SignalWaiter(
+            (signals.SIGNAL_VALUE_CHANGED, signals.SIGNAL_VALUE_REFRESHED),
+            value,
+            self.loop
+        )
+
+        try:
+            await self.__run(setattr, value, 'data', data)
+            event = await waiter.wait(timeout)
+        finally:
+            waiter.close()
+
+        return event.kwargs.get('value_data', None)
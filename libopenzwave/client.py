@@ -30,10 +30,16 @@ import json
 import socket
 import ssl
 import time
+import itertools
+from concurrent.futures import Future
 from uuid import uuid4
 from collections import deque
 
+from . import remote_codec
 from . import remote_encryption
+from . import remote_protocol
+from . import remote_snapshot
+from . import remote_subscription
 
 
 try:
@@ -43,13 +49,52 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# number of seconds to wait for the server to reply to the hello of the
+# binary protocol. A server that does not support the binary protocol does
+# not reply and the client connects again using the JSON protocol.
+HELLO_TIMEOUT = 5.0
+
+# number of seconds between attempts to connect again after the connection
+# to a server that supports resuming has been lost
+RECONNECT_INTERVAL = 5.0
+
+# smallest number of seconds between acknowledging the notifications that
+# have been processed
+ACK_INTERVAL = 0.1
+
+
+class _Snapshot(object):
+    # placed into the notification queue in place of the notifications the
+    # snapshot turns into. The client network gets compared with the
+    # snapshot once the notifications that were queued before it have been
+    # passed to the network.
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def notifications(self, network):
+        for notification in remote_snapshot.removed(self.snapshot, network):
+            yield notification
+
+        for notification in remote_snapshot.notifications(self.snapshot):
+            yield notification
+
 
 class Client(threading.Thread):
     """
     TODO: client.Client class docstring
     """
 
-    def __init__(self, host, port, password, key, server_cert, client_cert):
+    def __init__(
+        self,
+        host,
+        port,
+        password,
+        key,
+        server_cert,
+        client_cert,
+        protocol=remote_protocol.PROTOCOL_BINARY
+    ):
         """
         
         :param host:
@@ -69,6 +114,11 @@ class Client(threading.Thread):
 
         :param client_cert:
         :type client_cert: str
+
+        :param protocol: wire protocol to use, falls back to
+            `remote_protocol.PROTOCOL_JSON` if the server does not support
+            the binary protocol.
+        :type protocol: int, optional
         """
         self.host = host
         self.port = port
@@ -77,10 +127,26 @@ class Client(threading.Thread):
         self.server_cert = server_cert
         self.socket = None
         self.network = None
+        self.__password = password
         self.__aes = remote_encryption.AESCipher(password)
+        # binary protocol, set once the session has been started
+        self.__cipher = None
         self.message_cache = {}
         self.cache_lock = threading.Lock()
         self.results = {}
+        self.protocol = protocol
+        self.__message_ids = itertools.count(1)
+        self.__send_lock = threading.Lock()
+        # results of the requests sent using the binary protocol
+        self.__futures = {}
+        self.__buffer = remote_protocol.FrameBuffer()
+        # protocol version the server agreed to, the session of the server
+        # and the sequence number of the last notification that was received
+        self.version = 0
+        self.session = None
+        self.sequence = 0
+        self.subscription = None
+        self.__acked = 0
 
         self.exit_event = threading.Event()
 
@@ -102,15 +168,47 @@ class Client(threading.Thread):
         """
         TODO: client.Client.notification_loop docstring
         """
+        last_ack = 0.0
+        processed = 0
+
         while not self.exit_event.is_set():
 
             while self.notification_queue:
                 notification, message_id = self.notification_queue.popleft()
 
-                try:
-                    signal = pickle.loads(
-                        notification.encode('ISO-8859-1')
+                if isinstance(notification, _Snapshot):
+                    self.notification_queue.extendleft(
+                        (n, None) for n in reversed(list(
+                            notification.notifications(self.network)
+                        ))
                     )
+                    continue
+
+                # the message id of a notification is only a sequence
+                # number when using the binary protocol
+                if message_id and self.version:
+                    processed = max(processed, message_id)
+
+                try:
+                    if isinstance(notification, str):
+                        notification = notification.encode('ISO-8859-1')
+
+                    # the binary protocol decodes the notifications when
+                    # they are received
+                    if isinstance(notification, bytes):
+                        signal = pickle.loads(notification)
+                    else:
+                        signal = notification
+
+                    # the JSON protocol does not support subscriptions, the
+                    # server sends all of the notifications
+                    if (
+                        self.subscription is not None and
+                        not self.version and
+                        not self.subscription.matches(signal)
+                    ):
+                        continue
+
                     logger.debug(
                         'incoming notification ({0}):\n    {1}'.format(
                             self.host,
@@ -123,9 +221,33 @@ class Client(threading.Thread):
                     import traceback
                     logger.error(traceback.format_exc())
 
+            if processed > self.__acked and self.version:
+                wait = last_ack + ACK_INTERVAL - time.time()
+
+                if wait <= 0:
+                    self.__send_ack(processed)
+                    last_ack = time.time()
+                else:
+                    # the ack gets sent once ACK_INTERVAL has passed if
+                    # no more notifications come in before then
+                    self.notification_event.wait(wait)
+                    self.notification_event.clear()
+                    continue
+
             self.notification_event.wait()
             self.notification_event.clear()
 
+    def __send_ack(self, sequence):
+        # a single ack covers every notification up to the sequence number
+        try:
+            self.__send_frame(remote_protocol.FRAME_ACK, sequence, b'')
+        except (socket.error, AttributeError):
+            # the connection is being made again, the server starts over
+            # with the acks of a new connection
+            pass
+
+        self.__acked = sequence
+
     def process_loop(self):
         """
         TODO: client.Client.process_loop docstring
@@ -249,8 +371,38 @@ class Client(threading.Thread):
         )
 
         self.network = network
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.connect((self.host, self.port))
+        self.socket = self.__connect()
+
+        if self.protocol == remote_protocol.PROTOCOL_BINARY:
+            if not self.__negotiate():
+                logger.info(
+                    'server ({0}:{1}) does not support the binary protocol, '
+                    'connecting using the JSON protocol'.format(
+                        self.host,
+                        self.port
+                    )
+                )
+
+                self.socket.close()
+                self.protocol = remote_protocol.PROTOCOL_JSON
+                self.__buffer = remote_protocol.FrameBuffer()
+                self.socket = self.__connect()
+
+            else:
+                self.__resume()
+
+        logger.debug(
+            'connected to server ({0}:{1})'.format(self.host, self.port)
+        )
+
+        threading.Thread.start(self)
+
+    def __connect(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.connect((self.host, self.port))
+        # requests are small and get sent without waiting for the results
+        # of the previous ones, the Nagle algorithm would hold them back.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
         if None not in (
             self.key,
@@ -266,29 +418,327 @@ class Client(threading.Thread):
             )
 
             if ssl.HAS_SNI:
-                self.socket = context.wrap_socket(
-                    self.socket,
+                sock = context.wrap_socket(
+                    sock,
                     server_hostname=self.host
                 )
             else:
-                self.socket = context.wrap_socket(self.socket)
+                sock = context.wrap_socket(sock)
+
+        sock.settimeout(5.0)
+        return sock
+
+    def __negotiate(self):
+        # sends the hello of the binary protocol and waits for the reply
+        self.socket.settimeout(HELLO_TIMEOUT)
+
+        try:
+            self.socket.sendall(remote_protocol.encode_hello())
+
+            while len(self.__buffer) < remote_protocol.HELLO.size:
+                if not remote_protocol.is_hello(self.__buffer.peek()):
+                    return False
 
-        self.socket.settimeout(5.0)
+                if not self.__buffer.recv_into(self.socket):
+                    return False
+
+        except socket.error:
+            return False
+
+        finally:
+            self.socket.settimeout(5.0)
+
+        version = remote_protocol.decode_hello(
+            self.__buffer.read(remote_protocol.HELLO.size)
+        )
+
+        if version != remote_protocol.PROTOCOL_VERSION:
+            return False
+
+        if not self.__start_session():
+            return False
+
+        self.version = version
+        return True
+
+    def __start_session(self):
+        # exchanges the randoms the keys of the session are made from, these
+        # frames are not encrypted
+        client_random = remote_encryption.SessionCipher.random()
+
+        try:
+            self.socket.sendall(
+                remote_protocol.encode_frame(
+                    remote_protocol.FRAME_SESSION,
+                    0,
+                    client_random
+                )
+            )
+
+            while True:
+                for frame_type, _, payload in self.__buffer.frames():
+                    if (
+                        frame_type != remote_protocol.FRAME_SESSION or
+                        len(payload) != remote_encryption.SESSION_RANDOM_SIZE
+                    ):
+                        return False
+
+                    self.__cipher = remote_encryption.SessionCipher(
+                        self.__password,
+                        client_random,
+                        bytes(payload),
+                        False
+                    )
+                    return True
+
+                if not self.__buffer.recv_into(self.socket):
+                    return False
+
+        except (socket.error, remote_protocol.ProtocolError):
+            return False
+
+    def __resume(self):
+        # tells the server which notification was received last, the server
+        # replies with the notifications that have been missed or with a
+        # snapshot of the network. the subscription is sent first so the
+        # notifications that have been missed get filtered.
+        if self.subscription is not None:
+            self.__send_subscription()
+
+        self.__send_frame(
+            remote_protocol.FRAME_RESUME,
+            0,
+            json.dumps(
+                dict(session=self.session, sequence=self.sequence)
+            ).encode('utf-8')
+        )
+
+    def __send_subscription(self):
+        self.__send_frame(
+            remote_protocol.FRAME_SUBSCRIBE,
+            0,
+            json.dumps(self.subscription.to_dict()).encode('utf-8')
+        )
+
+    def subscribe(
+        self,
+        nodes=None,
+        command_classes=None,
+        value_ids=None,
+        genres=None,
+        coalesce=0.0
+    ):
+        """
+        Selects the value notifications that get received.
+
+        See :py:mod:`libopenzwave.remote_subscription`. Calling this without
+        any arguments receives all of the notifications again.
+
+        The server does the filtering when the binary protocol is used. The
+        JSON protocol filters the notifications when they are received and
+        they do not get coalesced.
+
+        :param nodes: node ids
+        :type nodes: Iterable[int], optional
+
+        :param command_classes: command class ids
+        :type command_classes: Iterable[int], optional
+
+        :param value_ids: value ids
+        :type value_ids: Iterable[int], optional
+
+        :param genres: genre names
+        :type genres: Iterable[str], optional
+
+        :param coalesce: number of seconds the server holds the value
+            notifications so only the latest one for each value gets sent
+        :type coalesce: float, optional
+
+        :rtype: libopenzwave.remote_subscription.Subscription
+        """
+        self.subscription = remote_subscription.Subscription(
+            nodes=nodes,
+            command_classes=command_classes,
+            value_ids=value_ids,
+            genres=genres,
+            coalesce=coalesce
+        )
+
+        if self.version and self.socket is not None:
+            self.__send_subscription()
+
+        return self.subscription
+
+    def __reconnect(self):
+        while not self.exit_event.is_set():
+            self.__buffer = remote_protocol.FrameBuffer()
+            self.__cipher = None
+
+            try:
+                self.socket = self.__connect()
+
+                if self.__negotiate():
+                    self.__resume()
+                    logger.info('reconnected to server: ' + self.host)
+                    return True
+
+                self.socket.close()
+                logger.error(
+                    'server ({0}:{1}) does not support the binary '
+                    'protocol anymore'.format(
+                        self.host,
+                        self.port
+                    )
+                )
+                return False
+
+            except socket.error:
+                self.exit_event.wait(RECONNECT_INTERVAL)
+
+        return False
+
+    def __send_frame(self, frame_type, message_id, payload):
+        # the frames have to be encrypted in the order they are sent
+        with self.__send_lock:
+            # the connection is being made again and the session has not
+            # been started yet
+            if self.__cipher is None:
+                raise ConnectionError('not connected to the server')
+
+            frame = remote_protocol.encode_frame(
+                frame_type,
+                message_id,
+                payload,
+                self.__cipher
+            )
+            self.socket.sendall(frame)
+
+    def __decrypt(self, frame_type, message_id, payload):
+        if self.__cipher is None:
+            raise remote_protocol.ProtocolError(
+                'frame received before the session was started'
+            )
 
+        return remote_protocol.decrypt_frame(
+            self.__cipher,
+            frame_type,
+            message_id,
+            payload
+        )
+
+    def __run_binary(self):
+        buf = self.__buffer
+
+        while not self.exit_event.is_set():
+            try:
+                if not buf.recv_into(self.socket):
+                    break
+            except socket.timeout:
+                continue
+            except socket.error:
+                break
+
+            try:
+                for frame_type, message_id, payload in buf.frames():
+                    payload = self.__decrypt(frame_type, message_id, payload)
+
+                    if frame_type == remote_protocol.FRAME_RESULT:
+                        future = self.__futures.pop(message_id, None)
+
+                        if future is not None:
+                            future.set_result(remote_codec.decode(payload))
+
+                    elif frame_type == remote_protocol.FRAME_NOTIFICATION:
+                        # a message id of 0 is a notification without a
+                        # sequence number
+                        if message_id:
+                            if message_id <= self.sequence:
+                                continue
+
+                            self.sequence = message_id
+
+                        self.notification_queue.append(
+                            (remote_codec.decode(payload), message_id)
+                        )
+                        self.notification_event.set()
+
+                    elif frame_type == remote_protocol.FRAME_SNAPSHOT:
+                        self.__apply_snapshot(remote_codec.decode(payload))
+
+                    elif frame_type == remote_protocol.FRAME_RESUME:
+                        logger.debug(
+                            'resumed at sequence {0} ({1})'.format(
+                                message_id,
+                                self.host
+                            )
+                        )
+
+                    else:
+                        logger.debug(
+                            'unknown frame type from server ({0}): '
+                            '{1}'.format(self.host, frame_type)
+                        )
+
+            except (remote_protocol.ProtocolError, ValueError):
+                import traceback
+                logger.error(traceback.format_exc())
+                break
+
+        while self.__futures:
+            _, future = self.__futures.popitem()
+            future.set_exception(ConnectionError('server disconnected'))
+
+    def __apply_snapshot(self, snapshot):
         logger.debug(
-            'connected to server ({0}:{1})'.format(self.host, self.port)
+            'incoming snapshot at sequence {0} ({1})'.format(
+                snapshot['sequence'],
+                self.host
+            )
         )
 
-        threading.Thread.start(self)
+        self.session = snapshot['session']
+        self.sequence = snapshot['sequence']
+
+        if snapshot['network'] is not None:
+            # the nodes and values that were removed while the client was
+            # not connected are removed from the client network as well
+            self.notification_queue.append(
+                (_Snapshot(snapshot['network']), None)
+            )
+            self.notification_event.set()
 
     def run(self):
         """
         TODO: client.Client.run docstring
         """
-        data = ''
-
         logger.debug('client socket listener thread started')
 
+        while True:
+            if self.protocol == remote_protocol.PROTOCOL_BINARY:
+                self.__run_binary()
+            else:
+                self.__run_json()
+
+            try:
+                self.socket.close()
+            except socket.error:
+                pass
+
+            logger.info('server disconnected: ' + self.host)
+
+            if (
+                self.exit_event.is_set() or
+                self.protocol != remote_protocol.PROTOCOL_BINARY or
+                not self.__reconnect()
+            ):
+                break
+
+        self.socket = None
+        logger.debug('client socket listener thread stopped')
+
+    def __run_json(self):
+        data = ''
+
         while not self.exit_event.is_set():
             try:
                 new_data = self.socket.recv(8192)
@@ -317,16 +767,6 @@ class Client(threading.Thread):
                 self.process_queue.append(message)
                 self.processing_event.set()
 
-        try:
-            self.socket.close()
-        except socket.error:
-            pass
-
-        logger.info('server disconnected: ' + self.host)
-
-        self.socket = None
-        logger.debug('client socket listener thread stopped')
-
     def stop(self):
         """
         TODO: client.Client.stop docstring
@@ -347,9 +787,15 @@ class Client(threading.Thread):
 
         logger.debug('stopping client socket listener thread')
 
-        if self.socket is not None:
-            self.socket.shutdown(socket.SHUT_RDWR)
-            self.socket.close()
+        # the listener thread sets the socket to None when it stops
+        sock = self.socket
+
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+                sock.close()
+            except socket.error:
+                pass
 
         if self.is_alive():
             self.join()
@@ -359,6 +805,9 @@ class Client(threading.Thread):
         :param msg:
         :type msg: dict
         """
+        if self.protocol == remote_protocol.PROTOCOL_BINARY:
+            return self.send_async(msg).result()
+
         # noinspection PyShadowingBuiltins
         id = str(uuid4())
         msg['id'] = id
@@ -383,3 +832,73 @@ class Client(threading.Thread):
 
         result = self.results.pop(id)
         return result
+
+    def __send_request(self, frame_type, msg):
+        message_id = next(self.__message_ids)
+        future = self.__futures[message_id] = Future()
+
+        logger.debug('<-- ({0}) {1}'.format(message_id, msg))
+
+        try:
+            self.__send_frame(
+                frame_type,
+                message_id,
+                json.dumps(msg).encode('utf-8')
+            )
+        except socket.error:
+            del self.__futures[message_id]
+            raise
+
+        return future
+
+    def send_async(self, msg):
+        """
+        Sends a request without waiting for the result.
+
+        Only available when using the binary protocol. Any number of requests
+        can be waiting for a result, the server returns the results in the
+        order the requests were sent.
+
+        .. code-block:: python
+
+            futures = [
+                client.send_async(
+                    dict(func='getNodeName', args=[home_id, i], kwargs={})
+                )
+                for i in range(1, 233)
+            ]
+
+            names = [future.result() for future in futures]
+
+        :param msg: `dict(func=name, args=args, kwargs=kwargs)`
+        :type msg: dict
+
+        :rtype: concurrent.futures.Future
+        """
+        if self.protocol != remote_protocol.PROTOCOL_BINARY:
+            future = Future()
+            future.set_result(self.send(msg))
+            return future
+
+        return self.__send_request(remote_protocol.FRAME_REQUEST, msg)
+
+    def send_batch(self, msgs):
+        """
+        Sends a list of requests in a single frame.
+
+        The server runs the requests in order and returns all of the results
+        in a single frame.
+
+        :param msgs: list of `dict(func=name, args=args, kwargs=kwargs)`
+        :type msgs: List[dict]
+
+        :return: the results in the same order as the requests
+        :rtype: list
+        """
+        if self.protocol != remote_protocol.PROTOCOL_BINARY:
+            return [self.send(msg) for msg in msgs]
+
+        return self.__send_request(
+            remote_protocol.FRAME_BATCH,
+            list(msgs)
+        ).result()
@@ -49,280 +49,422 @@ along with python-openzwave. If not, see http://www.gnu.org/licenses.
 #
 # In the node.py file I have commented on how the nodes are built.
 
-from .alarm import Alarm
-from .antitheft import Antitheft
-from .application_capability import ApplicationCapability
-from .application_status import ApplicationStatus
-from .association import Association
-from .association_command_configuration import AssociationCommandConfiguration
-from .association_grp_info import AssociationGroupInfo
-from .authentication import Authentication
-from .authentication_media_write import AuthenticationMediaWrite
-from .av_content_directory_md import AVContentDirectoryMD
-from .av_content_search_md import AVContentSearchMD
-from .av_renderer_status import AVRendererStatus
-from .av_tagging_md import AVTaggingMD
-from .barrier_operator import BarrierOperator
-from .basic import Basic
-from .basic_tariff_info import BasicTariffInfo
-from .basic_window_covering import BasicWindowCovering
-from .battery import Battery
-from .central_scene import CentralScene
-from .chimney_fan import ChimneyFan
-from .climate_control_schedule import ClimateControlSchedule
-from .clock import Clock
-from .configuration import Configuration
-from .controller_replication import ControllerReplication
-from .crc_16_encap import CRC16Encap
-from .dcp_config import DCPConfig
-from .dcp_monitor import DCPMonitor
-from .device_reset_locally import DeviceResetLocally
-from .dmx import DMX
-from .door_lock import DoorLock
-from .door_lock_logging import DoorLockLogging
-from .energy_production import EnergyProduction
-from .entry_control import EntryControl
-from .firmware_update_md import FirmwareUpdateMD
-from .geographic_location import GeographicLocation
-from .grouping_name import GroupingName
-from .hail import Hail
-from .hrv_control import HRVControl
-from .hrv_status import HRVStatus
-from .humidity_control_mode import HumidityControlMode
-from .humidity_control_operating_state import HumidityControlOperatingState
-from .humidity_control_setpoint import HumidityControlSetpoint
-from .inclusion_controller import InclusionController
-from .indicator import Indicator
-from .ip_association import IPAssociation
-from .ip_configuration import IPConfiguration
-from .ir_repeater import IRRepeater
-from .irrigation import Irrigation
-from .language import Language
-from .lock import Lock
-from .mailbox import Mailbox
-from .manufacturer_proprietary import ManufacturerProprietary
-from .manufacturer_specific import ManufacturerSpecific
-from .mark import Mark
-from .meter import Meter
-from .meter_pulse import MeterPulse
-from .meter_tbl_config import MeterTableConfig
-from .meter_tbl_monitor import MeterTableMonitor
-from .meter_tbl_push import MeterTablePush
-from .mtp_window_covering import MTPWindowCovering
-from .multi_channel import MultiChannel
-from .multi_channel_association import MultiChannelAssociation
-from .multi_cmd import MultiCommand
-from .network_management_basic import NetworkManagementBasic
-from .network_management_inclusion import NetworkManagementInclusion
-from .network_management_installation_maintenance import NetworkManagementInstallationMaintenance
-from .network_management_primary import NetworkManagementPrimary
-from .network_management_proxy import NetworkManagementProxy
-from .non_interoperable import NonInteroperable
-from .no_operation import NoOperation
-from .node_naming import NodeNaming
-from .node_provisioning import NodeProvisioning
-from .notification import Notification
-from .powerlevel import Powerlevel
-from .prepayment import Prepayment
-from .prepayment_encapsulation import PrepaymentEncapsulation
-from .protection import Protection
-from .proprietary import Proprietary
-from .rate_tbl_config import RateTableConfig
-from .rate_tbl_monitor import RateTableMonitor
-from .remote_association_activate import RemoteAssociationActivate
-from .remote_association import RemoteAssociation
-from .scene_activation import SceneActivation
-from .scene_actuator_conf import SceneActuatorConfig
-from .scene_controller_conf import SceneControllerConfig
-from .schedule import Schedule
-from .schedule_entry_lock import ScheduleEntryLock
-from .screen_attributes import ScreenAttributes
-from .screen_md import ScreenMD
-from .security import Security
-from .security_2 import Security2
-from .security_scheme0_mark import SecurityScheme0Mark
-from .security_panel_mode import SecurityPanelMode
-from .security_panel_zone import SecurityPanelZone
-from .security_panel_zone_sensor import SecurityPanelZoneSensor
-from .sensor_alarm import SensorAlarm
-from .sensor_binary import SensorBinary
-from .sensor_configuration import SensorConfiguration
-from .sensor_multilevel import SensorMultilevel
-from .silence_alarm import SilenceAlarm
-from .simple_av_control import SimpleAVControl
-from .sound_switch import SoundSwitch
-from .supervision import Supervision
-from .switch_all import SwitchAll
-from .switch_binary import SwitchBinary
-from .switch_color import SwitchColor
-from .switch_multilevel import SwitchMultilevel
-from .switch_toggle_binary import SwitchToggleBinary
-from .switch_toggle_multilevel import SwitchToggleMultilevel
-from .tariff_config import TariffConfig
-from .tariff_tbl_monitor import TariffTableMonitor
-from .thermostat_fan_mode import ThermostatFanMode
-from .thermostat_fan_state import ThermostatFanState
-from .thermostat_mode import ThermostatMode
-from .thermostat_operating_state import ThermostatOperatingState
-from .thermostat_setback import ThermostatSetback
-from .thermostat_setpoint import ThermostatSetpoint
-from .time import Time
-from .time_parameters import TimeParameters
-from .transport_service import TransportService
-from .user_code import UserCode
-from .version import Version
-from .wake_up import WakeUp
-from .window_covering import WindowCovering
-from .zensor_net import ZensorNet
-from .zip import ZIP
-from .zip_6lowpan import ZIP6Lowpan
-from .zip_gateway import ZIPGateway
-from .zip_naming import ZIPNaming
-from .zip_nd import ZIPND
-from .zip_portal import ZIPPortal
-from .zwave_plus_info import ZwavePlusInfo
+import importlib
+import sys
+
 from .zwave_cmd_class import ZWaveCommandClass
 
-# COMMAND_CLASS_ALARM = Alarm
-COMMAND_CLASS_ALARM = Alarm
-COMMAND_CLASS_ANTITHEFT = Antitheft
-COMMAND_CLASS_APPLICATION_CAPABILITY = ApplicationCapability
-COMMAND_CLASS_APPLICATION_STATUS = ApplicationStatus
-COMMAND_CLASS_ASSOCIATION = Association
-COMMAND_CLASS_ASSOCIATION_COMMAND_CONFIGURATION = (
-    AssociationCommandConfiguration
-)
-COMMAND_CLASS_ASSOCIATION_GRP_INFO = AssociationGroupInfo
-COMMAND_CLASS_AUTHENTICATION = Authentication
-COMMAND_CLASS_AUTHENTICATION_MEDIA_WRITE = AuthenticationMediaWrite
-COMMAND_CLASS_AV_CONTENT_DIRECTORY_MD = AVContentDirectoryMD
-COMMAND_CLASS_AV_CONTENT_SEARCH_MD = AVContentSearchMD
-COMMAND_CLASS_AV_RENDERER_STATUS = AVRendererStatus
-COMMAND_CLASS_AV_TAGGING_MD = AVTaggingMD
-COMMAND_CLASS_BARRIER_OPERATOR = BarrierOperator
-COMMAND_CLASS_BASIC = Basic
-COMMAND_CLASS_BASIC_TARIFF_INFO = BasicTariffInfo
-COMMAND_CLASS_BASIC_WINDOW_COVERING = BasicWindowCovering
-COMMAND_CLASS_BATTERY = Battery
-COMMAND_CLASS_CENTRAL_SCENE = CentralScene
-COMMAND_CLASS_CHIMNEY_FAN = ChimneyFan
-COMMAND_CLASS_CLIMATE_CONTROL_SCHEDULE = ClimateControlSchedule
-COMMAND_CLASS_CLOCK = Clock
-COMMAND_CLASS_CONFIGURATION = Configuration
-COMMAND_CLASS_CONTROLLER_REPLICATION = ControllerReplication
-COMMAND_CLASS_CRC_16_ENCAP = CRC16Encap
-COMMAND_CLASS_DCP_CONFIG = DCPConfig
-COMMAND_CLASS_DCP_MONITOR = DCPMonitor
-COMMAND_CLASS_DEVICE_RESET_LOCALLY = DeviceResetLocally
-COMMAND_CLASS_DMX = DMX
-COMMAND_CLASS_DOOR_LOCK = DoorLock
-COMMAND_CLASS_DOOR_LOCK_LOGGING = DoorLockLogging
-COMMAND_CLASS_ENERGY_PRODUCTION = EnergyProduction
-COMMAND_CLASS_ENTRY_CONTROL = EntryControl
-COMMAND_CLASS_FIRMWARE_UPDATE_MD = FirmwareUpdateMD
-COMMAND_CLASS_GEOGRAPHIC_LOCATION = GeographicLocation
-COMMAND_CLASS_GROUPING_NAME = GroupingName
-COMMAND_CLASS_HAIL = Hail
-COMMAND_CLASS_HRV_CONTROL = HRVControl
-COMMAND_CLASS_HRV_STATUS = HRVStatus
-COMMAND_CLASS_HUMIDITY_CONTROL_MODE = HumidityControlMode
-COMMAND_CLASS_HUMIDITY_CONTROL_OPERATING_STATE = (
-    HumidityControlOperatingState
-)
-COMMAND_CLASS_HUMIDITY_CONTROL_SETPOINT = HumidityControlSetpoint
-COMMAND_CLASS_INCLUSION_CONTROLLER = InclusionController
-COMMAND_CLASS_INDICATOR = Indicator
-COMMAND_CLASS_IP_ASSOCIATION = IPAssociation
-COMMAND_CLASS_IP_CONFIGURATION = IPConfiguration
-COMMAND_CLASS_IR_REPEATER = IRRepeater
-COMMAND_CLASS_IRRIGATION = Irrigation
-COMMAND_CLASS_LANGUAGE = Language
-COMMAND_CLASS_LOCK = Lock
-COMMAND_CLASS_MAILBOX = Mailbox
-COMMAND_CLASS_MANUFACTURER_PROPRIETARY = ManufacturerProprietary
-COMMAND_CLASS_MANUFACTURER_SPECIFIC = ManufacturerSpecific
-COMMAND_CLASS_MARK = Mark
-COMMAND_CLASS_METER = Meter
-COMMAND_CLASS_METER_PULSE = MeterPulse
-COMMAND_CLASS_METER_TBL_CONFIG = MeterTableConfig
-COMMAND_CLASS_METER_TBL_MONITOR = MeterTableMonitor
-COMMAND_CLASS_METER_TBL_PUSH = MeterTablePush
-COMMAND_CLASS_MTP_WINDOW_COVERING = MTPWindowCovering
-COMMAND_CLASS_MULTI_CHANNEL = MultiChannel
-COMMAND_CLASS_MULTI_CHANNEL_ASSOCIATION = MultiChannelAssociation
-COMMAND_CLASS_MULTI_CMD = MultiCommand
-COMMAND_CLASS_NETWORK_MANAGEMENT_BASIC = NetworkManagementBasic
-COMMAND_CLASS_NETWORK_MANAGEMENT_INCLUSION = NetworkManagementInclusion
-COMMAND_CLASS_NETWORK_MANAGEMENT_INSTALLATION_MAINTENANCE = (
-    NetworkManagementInstallationMaintenance
-)
-COMMAND_CLASS_NETWORK_MANAGEMENT_PRIMARY = NetworkManagementPrimary
-COMMAND_CLASS_NETWORK_MANAGEMENT_PROXY = NetworkManagementProxy
-COMMAND_CLASS_NON_INTEROPERABLE = NonInteroperable
-COMMAND_CLASS_NO_OPERATION = NoOperation
-COMMAND_CLASS_NODE_NAMING = NodeNaming
-COMMAND_CLASS_NODE_PROVISIONING = NodeProvisioning
-COMMAND_CLASS_NOTIFICATION = Notification
-COMMAND_CLASS_POWERLEVEL = Powerlevel
-COMMAND_CLASS_PREPAYMENT = Prepayment
-COMMAND_CLASS_PREPAYMENT_ENCAPSULATION = PrepaymentEncapsulation
-COMMAND_CLASS_PROTECTION = Protection
-COMMAND_CLASS_PROPRIETARY = Proprietary
-COMMAND_CLASS_RATE_TBL_CONFIG = RateTableConfig
-COMMAND_CLASS_RATE_TBL_MONITOR = RateTableMonitor
-COMMAND_CLASS_REMOTE_ASSOCIATION_ACTIVATE = RemoteAssociationActivate
-COMMAND_CLASS_REMOTE_ASSOCIATION = RemoteAssociation
-COMMAND_CLASS_SCENE_ACTIVATION = SceneActivation
-COMMAND_CLASS_SCENE_ACTUATOR_CONF = SceneActuatorConfig
-COMMAND_CLASS_SCENE_CONTROLLER_CONF = SceneControllerConfig
-COMMAND_CLASS_SCHEDULE = Schedule
-COMMAND_CLASS_SCHEDULE_ENTRY_LOCK = ScheduleEntryLock
-COMMAND_CLASS_SCREEN_ATTRIBUTES = ScreenAttributes
-COMMAND_CLASS_SCREEN_MD = ScreenMD
-COMMAND_CLASS_SECURITY = Security
-COMMAND_CLASS_SECURITY_2 = Security2
-COMMAND_CLASS_SECURITY_SCHEME0_MARK = SecurityScheme0Mark
-COMMAND_CLASS_SECURITY_PANEL_MODE = SecurityPanelMode
-COMMAND_CLASS_SECURITY_PANEL_ZONE = SecurityPanelZone
-COMMAND_CLASS_SECURITY_PANEL_ZONE_SENSOR = SecurityPanelZoneSensor
-COMMAND_CLASS_SENSOR_ALARM = SensorAlarm
-COMMAND_CLASS_SENSOR_BINARY = SensorBinary
-COMMAND_CLASS_SENSOR_CONFIGURATION = SensorConfiguration
-COMMAND_CLASS_SENSOR_MULTILEVEL = SensorMultilevel
-COMMAND_CLASS_SILENCE_ALARM = SilenceAlarm
-COMMAND_CLASS_SIMPLE_AV_CONTROL = SimpleAVControl
-COMMAND_CLASS_SOUND_SWITCH = SoundSwitch
-COMMAND_CLASS_SUPERVISION = Supervision
-COMMAND_CLASS_SWITCH_ALL = SwitchAll
-COMMAND_CLASS_SWITCH_BINARY = SwitchBinary
-COMMAND_CLASS_SWITCH_COLOR = SwitchColor
-COMMAND_CLASS_SWITCH_MULTILEVEL = SwitchMultilevel
-COMMAND_CLASS_SWITCH_TOGGLE_BINARY = SwitchToggleBinary
-COMMAND_CLASS_SWITCH_TOGGLE_MULTILEVEL = SwitchToggleMultilevel
-COMMAND_CLASS_TARIFF_CONFIG = TariffConfig
-COMMAND_CLASS_TARIFF_TBL_MONITOR = TariffTableMonitor
-COMMAND_CLASS_THERMOSTAT_FAN_MODE = ThermostatFanMode
-COMMAND_CLASS_THERMOSTAT_FAN_STATE = ThermostatFanState
-COMMAND_CLASS_THERMOSTAT_MODE = ThermostatMode
-COMMAND_CLASS_THERMOSTAT_OPERATING_STATE = ThermostatOperatingState
-COMMAND_CLASS_THERMOSTAT_SETBACK = ThermostatSetback
-COMMAND_CLASS_THERMOSTAT_SETPOINT = ThermostatSetpoint
-COMMAND_CLASS_TIME = Time
-COMMAND_CLASS_TIME_PARAMETERS = TimeParameters
-COMMAND_CLASS_TRANSPORT_SERVICE = TransportService
-COMMAND_CLASS_USER_CODE = UserCode
-COMMAND_CLASS_VERSION = Version
-COMMAND_CLASS_WAKE_UP = WakeUp
-COMMAND_CLASS_WINDOW_COVERING = WindowCovering
-COMMAND_CLASS_ZENSOR_NET = ZensorNet
-COMMAND_CLASS_ZIP = ZIP
-COMMAND_CLASS_ZIP_6LOWPAN = ZIP6Lowpan
-COMMAND_CLASS_ZIP_GATEWAY = ZIPGateway
-COMMAND_CLASS_ZIP_NAMING = ZIPNaming
-COMMAND_CLASS_ZIP_ND = ZIPND
-COMMAND_CLASS_ZIP_PORTAL = ZIPPortal
 ZWAVE_CMD_CLASS = ZWaveCommandClass
-COMMAND_CLASS_ZWAVEPLUS_INFO = ZwavePlusInfo
+
+# The modules of the command classes are only imported when one of the
+# command classes in them gets used, importing all of them takes longer then
+# the rest of the library. See __getattr__ at the bottom of this module.
+#
+# name -> (module, class name, class id)
+_LAZY_COMMAND_CLASSES = {
+    'COMMAND_CLASS_ALARM': ('alarm', 'Alarm', 0x71),
+    'COMMAND_CLASS_ANTITHEFT': ('antitheft', 'Antitheft', 0x5D),
+    'COMMAND_CLASS_APPLICATION_CAPABILITY': (
+        'application_capability',
+        'ApplicationCapability',
+        0x57
+    ),
+    'COMMAND_CLASS_APPLICATION_STATUS': (
+        'application_status',
+        'ApplicationStatus',
+        0x22
+    ),
+    'COMMAND_CLASS_ASSOCIATION': ('association', 'Association', 0x85),
+    'COMMAND_CLASS_ASSOCIATION_COMMAND_CONFIGURATION': (
+        'association_command_configuration',
+        'AssociationCommandConfiguration',
+        0x9B
+    ),
+    'COMMAND_CLASS_ASSOCIATION_GRP_INFO': (
+        'association_grp_info',
+        'AssociationGroupInfo',
+        0x59
+    ),
+    'COMMAND_CLASS_AUTHENTICATION': ('authentication', 'Authentication', 0xA1),
+    'COMMAND_CLASS_AUTHENTICATION_MEDIA_WRITE': (
+        'authentication_media_write',
+        'AuthenticationMediaWrite',
+        0xA2
+    ),
+    'COMMAND_CLASS_AV_CONTENT_DIRECTORY_MD': (
+        'av_content_directory_md',
+        'AVContentDirectoryMD',
+        0x95
+    ),
+    'COMMAND_CLASS_AV_CONTENT_SEARCH_MD': (
+        'av_content_search_md',
+        'AVContentSearchMD',
+        0x97
+    ),
+    'COMMAND_CLASS_AV_RENDERER_STATUS': (
+        'av_renderer_status',
+        'AVRendererStatus',
+        0x96
+    ),
+    'COMMAND_CLASS_AV_TAGGING_MD': ('av_tagging_md', 'AVTaggingMD', 0x99),
+    'COMMAND_CLASS_BARRIER_OPERATOR': (
+        'barrier_operator',
+        'BarrierOperator',
+        0x66
+    ),
+    'COMMAND_CLASS_BASIC': ('basic', 'Basic', 0x20),
+    'COMMAND_CLASS_BASIC_TARIFF_INFO': (
+        'basic_tariff_info',
+        'BasicTariffInfo',
+        0x36
+    ),
+    'COMMAND_CLASS_BASIC_WINDOW_COVERING': (
+        'basic_window_covering',
+        'BasicWindowCovering',
+        0x50
+    ),
+    'COMMAND_CLASS_BATTERY': ('battery', 'Battery', 0x80),
+    'COMMAND_CLASS_CENTRAL_SCENE': ('central_scene', 'CentralScene', 0x5B),
+    'COMMAND_CLASS_CHIMNEY_FAN': ('chimney_fan', 'ChimneyFan', 0x2A),
+    'COMMAND_CLASS_CLIMATE_CONTROL_SCHEDULE': (
+        'climate_control_schedule',
+        'ClimateControlSchedule',
+        0x46
+    ),
+    'COMMAND_CLASS_CLOCK': ('clock', 'Clock', 0x81),
+    'COMMAND_CLASS_CONFIGURATION': ('configuration', 'Configuration', 0x70),
+    'COMMAND_CLASS_CONTROLLER_REPLICATION': (
+        'controller_replication',
+        'ControllerReplication',
+        0x21
+    ),
+    'COMMAND_CLASS_CRC_16_ENCAP': ('crc_16_encap', 'CRC16Encap', 0x56),
+    'COMMAND_CLASS_DCP_CONFIG': ('dcp_config', 'DCPConfig', 0x3A),
+    'COMMAND_CLASS_DCP_MONITOR': ('dcp_monitor', 'DCPMonitor', 0x3B),
+    'COMMAND_CLASS_DEVICE_RESET_LOCALLY': (
+        'device_reset_locally',
+        'DeviceResetLocally',
+        0x5A
+    ),
+    'COMMAND_CLASS_DMX': ('dmx', 'DMX', 0x65),
+    'COMMAND_CLASS_DOOR_LOCK': ('door_lock', 'DoorLock', 0x62),
+    'COMMAND_CLASS_DOOR_LOCK_LOGGING': (
+        'door_lock_logging',
+        'DoorLockLogging',
+        0x4C
+    ),
+    'COMMAND_CLASS_ENERGY_PRODUCTION': (
+        'energy_production',
+        'EnergyProduction',
+        0x90
+    ),
+    'COMMAND_CLASS_ENTRY_CONTROL': ('entry_control', 'EntryControl', 0x6F),
+    'COMMAND_CLASS_FIRMWARE_UPDATE_MD': (
+        'firmware_update_md',
+        'FirmwareUpdateMD',
+        0x7A
+    ),
+    'COMMAND_CLASS_GEOGRAPHIC_LOCATION': (
+        'geographic_location',
+        'GeographicLocation',
+        0x8C
+    ),
+    'COMMAND_CLASS_GROUPING_NAME': ('grouping_name', 'GroupingName', 0x7B),
+    'COMMAND_CLASS_HAIL': ('hail', 'Hail', 0x82),
+    'COMMAND_CLASS_HRV_CONTROL': ('hrv_control', 'HRVControl', 0x39),
+    'COMMAND_CLASS_HRV_STATUS': ('hrv_status', 'HRVStatus', 0x37),
+    'COMMAND_CLASS_HUMIDITY_CONTROL_MODE': (
+        'humidity_control_mode',
+        'HumidityControlMode',
+        0x6D
+    ),
+    'COMMAND_CLASS_HUMIDITY_CONTROL_OPERATING_STATE': (
+        'humidity_control_operating_state',
+        'HumidityControlOperatingState',
+        0x6E
+    ),
+    'COMMAND_CLASS_HUMIDITY_CONTROL_SETPOINT': (
+        'humidity_control_setpoint',
+        'HumidityControlSetpoint',
+        0x64
+    ),
+    'COMMAND_CLASS_INCLUSION_CONTROLLER': (
+        'inclusion_controller',
+        'InclusionController',
+        0x74
+    ),
+    'COMMAND_CLASS_INDICATOR': ('indicator', 'Indicator', 0x87),
+    'COMMAND_CLASS_IP_ASSOCIATION': ('ip_association', 'IPAssociation', 0x5C),
+    'COMMAND_CLASS_IP_CONFIGURATION': (
+        'ip_configuration',
+        'IPConfiguration',
+        0x9A
+    ),
+    'COMMAND_CLASS_IR_REPEATER': ('ir_repeater', 'IRRepeater', 0xA0),
+    'COMMAND_CLASS_IRRIGATION': ('irrigation', 'Irrigation', 0x6B),
+    'COMMAND_CLASS_LANGUAGE': ('language', 'Language', 0x89),
+    'COMMAND_CLASS_LOCK': ('lock', 'Lock', 0x76),
+    'COMMAND_CLASS_MAILBOX': ('mailbox', 'Mailbox', 0x69),
+    'COMMAND_CLASS_MANUFACTURER_PROPRIETARY': (
+        'manufacturer_proprietary',
+        'ManufacturerProprietary',
+        0x91
+    ),
+    'COMMAND_CLASS_MANUFACTURER_SPECIFIC': (
+        'manufacturer_specific',
+        'ManufacturerSpecific',
+        0x72
+    ),
+    'COMMAND_CLASS_MARK': ('mark', 'Mark', 0xEF),
+    'COMMAND_CLASS_METER': ('meter', 'Meter', 0x32),
+    'COMMAND_CLASS_METER_PULSE': ('meter_pulse', 'MeterPulse', 0x35),
+    'COMMAND_CLASS_METER_TBL_CONFIG': (
+        'meter_tbl_config',
+        'MeterTableConfig',
+        0x3C
+    ),
+    'COMMAND_CLASS_METER_TBL_MONITOR': (
+        'meter_tbl_monitor',
+        'MeterTableMonitor',
+        0x3D
+    ),
+    'COMMAND_CLASS_METER_TBL_PUSH': ('meter_tbl_push', 'MeterTablePush', 0x3E),
+    'COMMAND_CLASS_MTP_WINDOW_COVERING': (
+        'mtp_window_covering',
+        'MTPWindowCovering',
+        0x51
+    ),
+    'COMMAND_CLASS_MULTI_CHANNEL': ('multi_channel', 'MultiChannel', 0x60),
+    'COMMAND_CLASS_MULTI_CHANNEL_ASSOCIATION': (
+        'multi_channel_association',
+        'MultiChannelAssociation',
+        0x8E
+    ),
+    'COMMAND_CLASS_MULTI_CMD': ('multi_cmd', 'MultiCommand', 0x8F),
+    'COMMAND_CLASS_NETWORK_MANAGEMENT_BASIC': (
+        'network_management_basic',
+        'NetworkManagementBasic',
+        0x4D
+    ),
+    'COMMAND_CLASS_NETWORK_MANAGEMENT_INCLUSION': (
+        'network_management_inclusion',
+        'NetworkManagementInclusion',
+        0x34
+    ),
+    'COMMAND_CLASS_NETWORK_MANAGEMENT_INSTALLATION_MAINTENANCE': (
+        'network_management_installation_maintenance',
+        'NetworkManagementInstallationMaintenance',
+        0x67
+    ),
+    'COMMAND_CLASS_NETWORK_MANAGEMENT_PRIMARY': (
+        'network_management_primary',
+        'NetworkManagementPrimary',
+        0x54
+    ),
+    'COMMAND_CLASS_NETWORK_MANAGEMENT_PROXY': (
+        'network_management_proxy',
+        'NetworkManagementProxy',
+        0x52
+    ),
+    'COMMAND_CLASS_NON_INTEROPERABLE': (
+        'non_interoperable',
+        'NonInteroperable',
+        0xF0
+    ),
+    'COMMAND_CLASS_NO_OPERATION': ('no_operation', 'NoOperation', 0x00),
+    'COMMAND_CLASS_NODE_NAMING': ('node_naming', 'NodeNaming', 0x77),
+    'COMMAND_CLASS_NODE_PROVISIONING': (
+        'node_provisioning',
+        'NodeProvisioning',
+        0x78
+    ),
+    'COMMAND_CLASS_NOTIFICATION': ('notification', 'Notification', 0x71),
+    'COMMAND_CLASS_POWERLEVEL': ('powerlevel', 'Powerlevel', 0x73),
+    'COMMAND_CLASS_PREPAYMENT': ('prepayment', 'Prepayment', 0x3F),
+    'COMMAND_CLASS_PREPAYMENT_ENCAPSULATION': (
+        'prepayment_encapsulation',
+        'PrepaymentEncapsulation',
+        0x41
+    ),
+    'COMMAND_CLASS_PROTECTION': ('protection', 'Protection', 0x75),
+    'COMMAND_CLASS_PROPRIETARY': ('proprietary', 'Proprietary', 0x88),
+    'COMMAND_CLASS_RATE_TBL_CONFIG': (
+        'rate_tbl_config',
+        'RateTableConfig',
+        0x48
+    ),
+    'COMMAND_CLASS_RATE_TBL_MONITOR': (
+        'rate_tbl_monitor',
+        'RateTableMonitor',
+        0x49
+    ),
+    'COMMAND_CLASS_REMOTE_ASSOCIATION_ACTIVATE': (
+        'remote_association_activate',
+        'RemoteAssociationActivate',
+        0x7C
+    ),
+    'COMMAND_CLASS_REMOTE_ASSOCIATION': (
+        'remote_association',
+        'RemoteAssociation',
+        0x7D
+    ),
+    'COMMAND_CLASS_SCENE_ACTIVATION': (
+        'scene_activation',
+        'SceneActivation',
+        0x2B
+    ),
+    'COMMAND_CLASS_SCENE_ACTUATOR_CONF': (
+        'scene_actuator_conf',
+        'SceneActuatorConfig',
+        0x2C
+    ),
+    'COMMAND_CLASS_SCENE_CONTROLLER_CONF': (
+        'scene_controller_conf',
+        'SceneControllerConfig',
+        0x2D
+    ),
+    'COMMAND_CLASS_SCHEDULE': ('schedule', 'Schedule', 0x53),
+    'COMMAND_CLASS_SCHEDULE_ENTRY_LOCK': (
+        'schedule_entry_lock',
+        'ScheduleEntryLock',
+        0x4E
+    ),
+    'COMMAND_CLASS_SCREEN_ATTRIBUTES': (
+        'screen_attributes',
+        'ScreenAttributes',
+        0x93
+    ),
+    'COMMAND_CLASS_SCREEN_MD': ('screen_md', 'ScreenMD', 0x92),
+    'COMMAND_CLASS_SECURITY': ('security', 'Security', 0x98),
+    'COMMAND_CLASS_SECURITY_2': ('security_2', 'Security2', 0x9F),
+    'COMMAND_CLASS_SECURITY_SCHEME0_MARK': (
+        'security_scheme0_mark',
+        'SecurityScheme0Mark',
+        0xF100
+    ),
+    'COMMAND_CLASS_SECURITY_PANEL_MODE': (
+        'security_panel_mode',
+        'SecurityPanelMode',
+        0x24
+    ),
+    'COMMAND_CLASS_SECURITY_PANEL_ZONE': (
+        'security_panel_zone',
+        'SecurityPanelZone',
+        0x2E
+    ),
+    'COMMAND_CLASS_SECURITY_PANEL_ZONE_SENSOR': (
+        'security_panel_zone_sensor',
+        'SecurityPanelZoneSensor',
+        0x2F
+    ),
+    'COMMAND_CLASS_SENSOR_ALARM': ('sensor_alarm', 'SensorAlarm', 0x9C),
+    'COMMAND_CLASS_SENSOR_BINARY': ('sensor_binary', 'SensorBinary', 0x30),
+    'COMMAND_CLASS_SENSOR_CONFIGURATION': (
+        'sensor_configuration',
+        'SensorConfiguration',
+        0x9E
+    ),
+    'COMMAND_CLASS_SENSOR_MULTILEVEL': (
+        'sensor_multilevel',
+        'SensorMultilevel',
+        0x31
+    ),
+    'COMMAND_CLASS_SILENCE_ALARM': ('silence_alarm', 'SilenceAlarm', 0x9D),
+    'COMMAND_CLASS_SIMPLE_AV_CONTROL': (
+        'simple_av_control',
+        'SimpleAVControl',
+        0x94
+    ),
+    'COMMAND_CLASS_SOUND_SWITCH': ('sound_switch', 'SoundSwitch', 0x79),
+    'COMMAND_CLASS_SUPERVISION': ('supervision', 'Supervision', 0x6C),
+    'COMMAND_CLASS_SWITCH_ALL': ('switch_all', 'SwitchAll', 0x27),
+    'COMMAND_CLASS_SWITCH_BINARY': ('switch_binary', 'SwitchBinary', 0x25),
+    'COMMAND_CLASS_SWITCH_COLOR': ('switch_color', 'SwitchColor', 0x33),
+    'COMMAND_CLASS_SWITCH_MULTILEVEL': (
+        'switch_multilevel',
+        'SwitchMultilevel',
+        0x26
+    ),
+    'COMMAND_CLASS_SWITCH_TOGGLE_BINARY': (
+        'switch_toggle_binary',
+        'SwitchToggleBinary',
+        0x28
+    ),
+    'COMMAND_CLASS_SWITCH_TOGGLE_MULTILEVEL': (
+        'switch_toggle_multilevel',
+        'SwitchToggleMultilevel',
+        0x29
+    ),
+    'COMMAND_CLASS_TARIFF_CONFIG': ('tariff_config', 'TariffConfig', 0x4A),
+    'COMMAND_CLASS_TARIFF_TBL_MONITOR': (
+        'tariff_tbl_monitor',
+        'TariffTableMonitor',
+        0x4B
+    ),
+    'COMMAND_CLASS_THERMOSTAT_FAN_MODE': (
+        'thermostat_fan_mode',
+        'ThermostatFanMode',
+        0x44
+    ),
+    'COMMAND_CLASS_THERMOSTAT_FAN_STATE': (
+        'thermostat_fan_state',
+        'ThermostatFanState',
+        0x45
+    ),
+    'COMMAND_CLASS_THERMOSTAT_MODE': (
+        'thermostat_mode',
+        'ThermostatMode',
+        0x40
+    ),
+    'COMMAND_CLASS_THERMOSTAT_OPERATING_STATE': (
+        'thermostat_operating_state',
+        'ThermostatOperatingState',
+        0x42
+    ),
+    'COMMAND_CLASS_THERMOSTAT_SETBACK': (
+        'thermostat_setback',
+        'ThermostatSetback',
+        0x47
+    ),
+    'COMMAND_CLASS_THERMOSTAT_SETPOINT': (
+        'thermostat_setpoint',
+        'ThermostatSetpoint',
+        0x43
+    ),
+    'COMMAND_CLASS_TIME': ('time', 'Time', 0x8A),
+    'COMMAND_CLASS_TIME_PARAMETERS': (
+        'time_parameters',
+        'TimeParameters',
+        0x8B
+    ),
+    'COMMAND_CLASS_TRANSPORT_SERVICE': (
+        'transport_service',
+        'TransportService',
+        0x55
+    ),
+    'COMMAND_CLASS_USER_CODE': ('user_code', 'UserCode', 0x63),
+    'COMMAND_CLASS_VERSION': ('version', 'Version', 0x86),
+    'COMMAND_CLASS_WAKE_UP': ('wake_up', 'WakeUp', 0x84),
+    'COMMAND_CLASS_WINDOW_COVERING': (
+        'window_covering',
+        'WindowCovering',
+        0x6A
+    ),
+    'COMMAND_CLASS_ZENSOR_NET': ('zensor_net', 'ZensorNet', 0x02),
+    'COMMAND_CLASS_ZIP': ('zip', 'ZIP', 0x23),
+    'COMMAND_CLASS_ZIP_6LOWPAN': ('zip_6lowpan', 'ZIP6Lowpan', 0x4F),
+    'COMMAND_CLASS_ZIP_GATEWAY': ('zip_gateway', 'ZIPGateway', 0x5F),
+    'COMMAND_CLASS_ZIP_NAMING': ('zip_naming', 'ZIPNaming', 0x68),
+    'COMMAND_CLASS_ZIP_ND': ('zip_nd', 'ZIPND', 0x58),
+    'COMMAND_CLASS_ZIP_PORTAL': ('zip_portal', 'ZIPPortal', 0x61),
+    'COMMAND_CLASS_ZWAVEPLUS_INFO': ('zwave_plus_info', 'ZwavePlusInfo', 0x5E)
+}
+
+# class name -> (module, class name)
+_LAZY_CLASSES = dict(
+    (class_name, (module_name, class_name))
+    for module_name, class_name, _ in _LAZY_COMMAND_CLASSES.values()
+)
 
 
 class CommandClassString(str):
@@ -510,6 +652,29 @@ class COMMAND_CLASSES_(object):
             'COMMAND_CLASS_ZWAVEPLUS_INFO'
         ]
 
+        # class id -> names of the command classes that use the id. The
+        # names are stored and not the classes because a plugin is able to
+        # replace a class in this module and because the classes are only
+        # imported when they are used.
+        self._ids = {}
+
+        for attr_name in self._attr_names:
+            class_id = _LAZY_COMMAND_CLASSES[attr_name][2]
+            self._ids[class_id] = self._ids.get(class_id, ()) + (attr_name,)
+
+        self._names = frozenset(self._attr_names)
+
+        # command class -> CommandClassString
+        self._strings = {}
+
+    def ids(self):
+        """
+        Ids of the command classes, the command classes do not get imported.
+
+        :rtype: List[int]
+        """
+        return sorted(self._ids.keys())
+
     def str_wrapper(self, cc_id):
         """
         :param cc_id: int
@@ -517,6 +682,9 @@ class COMMAND_CLASSES_(object):
         """
         cc = self[cc_id]
 
+        if cc in self._strings:
+            return self._strings[cc]
+
         command_class = type(
             cc.class_desc,
             (CommandClassString,),
@@ -527,29 +695,30 @@ class COMMAND_CLASSES_(object):
                 '_cc': cc,
             }
         )
-        
-        return command_class(cc.class_desc)
+
+        res = self._strings[cc] = command_class(cc.class_desc)
+        return res
 
     def __getitem__(self, item):
         """
         :param item: int, str
         :rtype: Any
         """
-        import sys
         mod = sys.modules[__name__]
 
         if isinstance(item, int):
-            for attr_name in self._attr_names:
-                cc = getattr(mod, attr_name)
-
-                if cc.class_id == item:
-                    return cc
-            raise IndexError('Command class does not exist ({0})'.format(item))
+            try:
+                attr_name = self._ids[item][0]
+            except KeyError:
+                raise IndexError(
+                    'Command class does not exist ({0})'.format(item)
+                )
+
+            return getattr(mod, attr_name)
         else:
             return getattr(mod, item)
 
     def __iter__(self):
-        import sys
         mod = sys.modules[__name__]
 
         for attr_name in self._attr_names:
@@ -557,17 +726,69 @@ class COMMAND_CLASSES_(object):
 
     def __contains__(self, item):
         """
-        :param item: int, str
+        :param item: class id, COMMAND_CLASS_* name or command class
+        :type item: int, str, ZWaveCommandClass
         :rtype: bool
         """
-        import sys
+        if isinstance(item, int):
+            return item in self._ids
+
+        # CommandClassString does not hash like a str, it is checked using
+        # the class id
+        if isinstance(item, str) and not isinstance(item, CommandClassString):
+            return item in self._names
+
         mod = sys.modules[__name__]
 
-        for attr_name in self._attr_names:
+        try:
+            attr_names = self._ids[item.class_id]
+        except (AttributeError, KeyError, TypeError):
+            return False
+
+        for attr_name in attr_names:
             if getattr(mod, attr_name) == item:
                 return True
-        
+
         return False
 
 
 COMMAND_CLASSES = COMMAND_CLASSES_()
+
+
+def __getattr__(name):
+    """
+    Imports the module of a command class the first time it is used.
+
+    :param name: COMMAND_CLASS_* name or class name
+    :type name: str
+    """
+    if name in _LAZY_COMMAND_CLASSES:
+        module_name = _LAZY_COMMAND_CLASSES[name][0]
+    elif name in _LAZY_CLASSES:
+        module_name = _LAZY_CLASSES[name][0]
+    else:
+        raise AttributeError(
+            'module {0!r} has no attribute {1!r}'.format(__name__, name)
+        )
+
+    module = importlib.import_module('.' + module_name, __name__)
+    namespace = globals()
+
+    # all of the names for the module are set so this only happens once
+    for attr_name, (mod_name, class_name, _) in (
+        _LAZY_COMMAND_CLASSES.items()
+    ):
+        if mod_name == module_name:
+            cls = getattr(module, class_name)
+            namespace[attr_name] = cls
+            namespace[class_name] = cls
+
+    return namespace[name]
+
+
+def __dir__():
+    return sorted(
+        set(globals()) |
+        set(_LAZY_COMMAND_CLASSES) |
+        set(_LAZY_CLASSES)
+    )
@@ -33,33 +33,30 @@ from .. import singleton
 ZWAVE_CMD_CLASS = 0x01
 
 
-class ValueIndexMeta(type):
+class _ValueIndexesDoc(object):
+    """
+    Builds the docstring of a ValueIndexes class the first time it is read.
 
-    def __new__(mcs, name, bases, dct):
-        cls = (
-            super(ValueIndexMeta, mcs).__new__(mcs, name, bases, dct)
-        )
+    Building the docstrings for all of the command classes when they get
+    imported takes longer than everything else the import does.
+    """
 
-        try:
-            ValueIndexes
-        except NameError:
-            return cls
+    def __init__(self, doc):
+        self.__doc = doc
 
-        if cls.__doc__ is None:
-            cls.__doc__ = ValueIndexes.__doc__
+    def __get__(self, instance, owner):
+        doc = self.__doc
 
-        if cls.__doc__ != ValueIndexes.__doc__:
-            cls.__doc__ = (
-                ValueIndexes.__doc__ +
-                '\n'.encode('utf-8') +
-                cls.__doc__
-            )
+        if doc is None:
+            doc = ValueIndexes.__doc__
+
+        if doc != ValueIndexes.__doc__:
+            doc = ValueIndexes.__doc__ + '\n' + doc
 
-        instance = cls()
-        cls.__doc__ += '\n\n        '
+        doc += '\n\n        '
 
         index_doc = []
-        for key, value in instance:
+        for key, value in owner():
             index_doc += [
                 '            * `{key}`: `{value}`'.format(
                     key=key,
@@ -68,14 +65,33 @@ class ValueIndexMeta(type):
             ]
 
         if index_doc:
-            cls.__doc__ += 'Available Value ValueIndexes:\n\n'
-            cls.__doc__ += '\n'.join(index_doc)
+            doc += 'Available Value ValueIndexes:\n\n'
+            doc += '\n'.join(index_doc)
         else:
-            cls.__doc__ += (
+            doc += (
                 'There are no available value indexes for this command class'
             )
 
-        cls.__doc__ += '\n'
+        doc += '\n'
+
+        # the built docstring replaces this object
+        type.__setattr__(owner, '__doc__', doc)
+        return doc
+
+
+class ValueIndexMeta(type):
+
+    def __new__(mcs, name, bases, dct):
+        cls = (
+            super(ValueIndexMeta, mcs).__new__(mcs, name, bases, dct)
+        )
+
+        try:
+            ValueIndexes
+        except NameError:
+            return cls
+
+        cls.__doc__ = _ValueIndexesDoc(dct.get('__doc__', None))
         return cls
 
 
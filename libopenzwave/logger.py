@@ -144,6 +144,11 @@ class _Logger(logging.Logger):
 
         logging.Logger.setLevel(self, level)
 
+        # utils imports this module so it may not be loaded yet.
+        utils = sys.modules.get(__name__.rsplit('.', 1)[0] + '.utils', None)
+        if hasattr(utils, 'update_logit'):
+            utils.update_logit()
+
         log_level_mapping = {
             logging.DEBUG: 'Debug',
             logging.WARNING: 'Warning',
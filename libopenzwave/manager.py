@@ -35,8 +35,35 @@ from .command_classes import COMMAND_CLASSES
 
 
 COMMAND_CLASS_IDS = list(
-    cls.class_id for cls in COMMAND_CLASSES
-    if cls.class_id <= 255
+    cls_id for cls_id in COMMAND_CLASSES.ids()
+    if cls_id <= 255
+)
+
+# manager methods that getNodeInfo calls, the keys are the keys of the dict
+# that gets returned. Every method is called using (home_id, node_id)
+NODE_INFO = (
+    ('name', 'getNodeName'),
+    ('location', 'getNodeLocation'),
+    ('product_name', 'getNodeProductName'),
+    ('product_type', 'getNodeProductType'),
+    ('product_id', 'getNodeProductId'),
+    ('version', 'getNodeVersion'),
+    ('max_baud_rate', 'getNodeMaxBaudRate'),
+    ('security', 'getNodeSecurity'),
+    ('beaming_device', 'isNodeBeamingDevice'),
+    ('routing_device', 'isNodeRoutingDevice'),
+    ('node_type', 'getNodeType'),
+    ('frequent_listening_device', 'isNodeFrequentListeningDevice'),
+    ('manufacturer_id', 'getNodeManufacturerId'),
+    ('manufacturer_name', 'getNodeManufacturerName'),
+    ('listening_device', 'isNodeListeningDevice'),
+    ('security_device', 'isNodeSecurityDevice'),
+    ('role', 'getNodeRole'),
+    ('device_type', 'getNodeDeviceType'),
+    ('basic', 'getNodeBasic'),
+    ('generic', 'getNodeGeneric'),
+    ('specific', 'getNodeSpecific'),
+    ('neighbors', 'getNodeNeighbors'),
 )
 
 logger = logging.getLogger(__name__)
@@ -104,6 +131,9 @@ else:
                 self.removeDriver = pseudo_manager.removeDriver
                 self.create = pseudo_manager.create
                 self.getNodeClassIds = pseudo_manager.getNodeClassIds
+                self.getNodeInfo = pseudo_manager.getNodeInfo
+                self.getNodeMetaData = pseudo_manager.getNodeMetaData
+                self.batch = pseudo_manager.batch
 
         def __getattr__(self, item):
             """
@@ -151,6 +181,85 @@ else:
 
             return cls_ids
 
+        @utils.logit
+        def getNodeInfo(self, home_id, node_id):
+            """
+            Collects the information of a node.
+
+            When connected to a remote server this runs on the server so it
+            is a single request instead of one for every piece of
+            information.
+
+            :param home_id:
+            :type home_id: int
+
+            :param node_id:
+            :type node_id: int
+
+            :return: see :py:data:`NODE_INFO` for the keys
+            :rtype: dict
+            """
+            return dict(
+                (key, getattr(self, method)(home_id, node_id))
+                for key, method in NODE_INFO
+            )
+
+        @utils.logit
+        def getNodeMetaData(self, home_id, node_id, meta_data_ids):
+            """
+            Same as calling getMetaData for each of the meta data ids.
+
+            :param home_id:
+            :type home_id: int
+
+            :param node_id:
+            :type node_id: int
+
+            :param meta_data_ids:
+            :type meta_data_ids: List[int]
+
+            :return: the meta data in the same order as `meta_data_ids`
+            :rtype: List[str]
+            """
+            return [
+                self.getMetaData(home_id, node_id, meta_data_id)
+                for meta_data_id in meta_data_ids
+            ]
+
+        def batch(self, calls):
+            """
+            Calls a list of manager methods.
+
+            When connected to a remote server all of the calls are sent to the
+            server in a single request.
+
+            .. code-block:: python
+
+                name, location = network.manager.batch([
+                    ('getNodeName', (home_id, node_id)),
+                    ('getNodeLocation', (home_id, node_id))
+                ])
+
+            :param calls: `(method name, args)` or
+                `(method name, args, kwargs)`
+            :type calls: List[tuple]
+
+            :return: the return values in the same order as the calls
+            :rtype: list
+            """
+            res = []
+
+            for call in calls:
+                if len(call) == 2:
+                    name, args = call
+                    kwargs = {}
+                else:
+                    name, args, kwargs = call
+
+                res += [getattr(self, name)(*args, **kwargs)]
+
+            return res
+
         def addDriver(self, driver):
             """
             :param driver:
@@ -196,10 +305,13 @@ else:
 
             self.__manager.addDriver(driver)
 
-        def addWatcher(self, callback):
+        def addWatcher(self, callback, queued=False):
             """
             :param callback:
             :type callback: callable
+
+            :param queued: queue the notifications
+            :type queued: bool, optional
             """
             if self.__server is not None:
                 self.__callback = callback
@@ -208,9 +320,9 @@ else:
                     self.__callback(notif)
                     self.__server.send(notif)
 
-                self.__manager.addWatcher(notif_callback)
+                self.__manager.addWatcher(notif_callback, queued)
             else:
-                self.__manager.addWatcher(callback)
+                self.__manager.addWatcher(callback, queued)
 
         def removeWatcher(self, callback):
             """
@@ -329,9 +441,10 @@ class PseudoManager(object):
         )
         self.__client.start(self.__network)
 
-    def addWatcher(self, _):
+    def addWatcher(self, _, queued=False):
         """
         :param _:
+        :param queued:
         """
         pass
 
@@ -363,3 +476,48 @@ class PseudoManager(object):
         )
         result = self.__client.send(data)
         return result
+
+    @utils.logit
+    def getNodeInfo(self, *args, **kwargs):
+        """
+        :param *args:
+        :param **kwargs:
+        """
+        data = dict(
+            func='getNodeInfo',
+            args=args,
+            kwargs=kwargs
+        )
+        return self.__client.send(data)
+
+    @utils.logit
+    def getNodeMetaData(self, *args, **kwargs):
+        """
+        :param *args:
+        :param **kwargs:
+        """
+        data = dict(
+            func='getNodeMetaData',
+            args=args,
+            kwargs=kwargs
+        )
+        return self.__client.send(data)
+
+    @utils.logit
+    def batch(self, calls):
+        """
+        :param calls:
+        :type calls: List[tuple]
+        """
+        data = []
+
+        for call in calls:
+            if len(call) == 2:
+                name, args = call
+                kwargs = {}
+            else:
+                name, args, kwargs = call
+
+            data += [dict(func=name, args=args, kwargs=kwargs)]
+
+        return self.__client.send_batch(data)
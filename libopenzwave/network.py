@@ -434,6 +434,40 @@ SIGNAL_CONTROLLER_COMMAND
 
     ignoreSubsequent = True
 
+    # openzwave notifications get routed to these methods, see
+    # notification_handler.NotificationRouter. Notification types that do
+    # not have a handler get passed to the node.
+    notification_router = notification_handler.NotificationRouter(
+        '_handle_node_notification'
+    )
+
+    for _notification_type, _handler in (
+        (PyNotifications.DriverFailed, '_handle_driver_failed'),
+        (PyNotifications.DriverReady, '_handle_driver_ready'),
+        (PyNotifications.DriverReset, '_handle_driver_reset'),
+        (PyNotifications.DriverRemoved, '_handle_driver_removed'),
+        (
+            PyNotifications.ManufacturerSpecificDBReady,
+            '_handle_manufacturer_specific_db_ready'
+        ),
+        (PyNotifications.AllNodesQueried, '_handle_nodes_queried'),
+        (PyNotifications.AwakeNodesQueried, '_handle_nodes_queried'),
+        (PyNotifications.AllNodesQueriedSomeDead, '_handle_nodes_queried'),
+        (PyNotifications.ControllerCommand, '_handle_controller_command'),
+        (PyNotifications.NodeAdded, '_handle_node_added'),
+        (
+            PyNotifications.EssentialNodeQueriesComplete,
+            '_handle_essential_node_queries_complete'
+        ),
+        (PyNotifications.NodeNew, '_handle_node_new'),
+        (PyNotifications.Notification, '_handle_notification_code'),
+        (PyNotifications.UserAlerts, '_handle_user_alerts'),
+    ):
+        notification_router.register(_notification_type, _handler)
+
+    del _notification_type
+    del _handler
+
     def __init__(self, options, auto_start=True):
         """
         Initialize zwave network
@@ -623,7 +657,10 @@ SIGNAL_CONTROLLER_COMMAND
             self._manager.create()
 
         self._started = True
-        self._manager.addWatcher(self._zwcallback)
+        self._manager.addWatcher(
+            self._zwcallback,
+            self._options.queued_notifications
+        )
         self._manager.addDriver(self._options.device)
 
     @utils.logit
@@ -722,6 +759,9 @@ SIGNAL_CONTROLLER_COMMAND
                 network=self,
             )
 
+            logger.debug('writing dataset')
+            self._xml_handler.write_file(force=True)
+
             logger.debug('stopping network notification handler')
             self._notification_handler.stop()
             logger.debug('network notification handler stopped')
@@ -1108,350 +1148,367 @@ SIGNAL_CONTROLLER_COMMAND
         """
         logger.debug('zwcallback notif=%s', notif)
 
-        if notif == PyNotifications.DriverFailed:
-            def _do():
-                for n in self._nodes.values():
-                    n.destroy()
+        self.notification_router.route(self, notif)
 
-                self._nodes.clear()
-                self._manager = None
-                self._state = self.STATE_FAILED
+    @utils.logit
+    def _handle_node_notification(self, notif):
+        # notifications that do not have a handler for the network get
+        # passed to the node
+        if notif.node_id == 0:
+            logger.warning('Skipping unhandled notification [%s]', notif)
 
-                signals.SIGNAL_NETWORK_FAILED.send(
-                    sender=self,
-                    network=self
-                )
-                self._controller = None
+        elif notif.node_id in self._pending_node_addition:
+            self._pending_node_addition[notif.node_id] += [notif]
+        else:
+            node = self.nodes[str(notif.node_id) + '.1']
+            node._handle_notification(notif)  # NOQA
 
-            self._notification_handler.add(_do)
-            self._notification_handler.stop()
+    @utils.logit
+    def _handle_driver_failed(self, notif):
+        def _do():
+            for n in self._nodes.values():
+                n.destroy()
 
-        elif notif == PyNotifications.DriverReady:
+            self._nodes.clear()
+            self._manager = None
+            self._state = self.STATE_FAILED
 
-            from .controller import ZWaveController
+            signals.SIGNAL_NETWORK_FAILED.send(
+                sender=self,
+                network=self
+            )
+            self._controller = None
 
-            id_ = notif.home_id
-            if id_ != self._object_id:
-                self._xml_handler['home_id'] = '0x{0:X}'.format(id_)
+        self._notification_handler.add(_do)
+        self._notification_handler.stop()
 
-            self._object_id = id_
+    @utils.logit
+    def _handle_driver_ready(self, notif):
+        from .controller import ZWaveController
 
-            if self._controller is None:
-                node_id = str(notif.node_id) + '.1'
-                self._controller = self.nodes[node_id] = (
-                    ZWaveController(node_id, self, None, None)
-                 )
+        id_ = notif.home_id
+        if id_ != self._object_id:
+            self._xml_handler['home_id'] = '0x{0:X}'.format(id_)
 
-            self._state = self.STATE_STARTED
+        self._object_id = id_
 
-            logger.info(
-                'home_id 0x%0.8x, controller node id is %d',
-                self.home_id,
-                notif.node_id
-            )
-            logger.info(
-                'connected to Z-Wave network using library %s',
-                self._controller.library_description
-            )
+        if self._controller is None:
+            node_id = str(notif.node_id) + '.1'
+            self._controller = self.nodes[node_id] = (
+                ZWaveController(node_id, self, None, None)
+             )
+
+        self._state = self.STATE_STARTED
+
+        logger.info(
+            'home_id 0x%0.8x, controller node id is %d',
+            self.home_id,
+            notif.node_id
+        )
+        logger.info(
+            'connected to Z-Wave network using library %s',
+            self._controller.library_description
+        )
 
-            signals.SIGNAL_NETWORK_STARTED.send(
+        signals.SIGNAL_NETWORK_STARTED.send(
+            sender=self,
+            network=self,
+            controller=self._controller
+        )
+
+    @utils.logit
+    def _handle_driver_reset(self, notif):
+        event = threading.Event()
+
+        def _do():
+            for n in self._nodes:
+                n.destroy()
+
+            self._nodes.clear()
+            self._state = self.STATE_RESET
+
+            signals.SIGNAL_NETWORK_RESET.send(
                 sender=self,
                 network=self,
                 controller=self._controller
             )
+            logger.debug(
+                'Z-Wave network driver has been reset. resetting nodes.'
+            )
+            event.set()
 
-        elif notif == PyNotifications.DriverReset:
-            event = threading.Event()
+        self._notification_handler.add(_do)
+        event.wait()
 
-            def _do():
-                for n in self._nodes:
-                    n.destroy()
+    @utils.logit
+    def _handle_driver_removed(self, notif):
+        event = threading.Event()
 
-                self._nodes.clear()
-                self._state = self.STATE_RESET
+        def _do():
+            for n in self._nodes:
+                n.destroy()
 
-                signals.SIGNAL_NETWORK_RESET.send(
-                    sender=self,
-                    network=self,
-                    controller=self._controller
-                )
-                logger.debug(
-                    'Z-Wave network driver has been reset. resetting nodes.'
-                )
-                event.set()
+            self.nodes.clear()
+            self._state = self.STATE_STOPPED
+            self._manager = None
+            self._controller = None
 
-            self._notification_handler.add(_do)
-            event.wait()
+            signals.SIGNAL_NETWORK_STOPPED.send(sender=self, network=self)
+            event.set()
 
-        elif notif == PyNotifications.DriverRemoved:
-            event = threading.Event()
+        self._notification_handler.add(_do)
+        event.wait()
+
+    @utils.logit
+    def _handle_manufacturer_specific_db_ready(self, notif):
+        def _do(n):
+            signals.SIGNAL_NETWORK_MANUFACTURER_DB_READY.send(
+                sender=self,
+                network=self,
+                notif=n
+            )
+
+        self._notification_handler.add(_do, notif)
+
+    @utils.logit
+    def _handle_nodes_queried(self, notif):
+        # the network signals get queued once the notifications that were
+        # queued for the nodes before this one have been processed. This
+        # does not block the openzwave thread and the notifications that
+        # come in after this one do not hold off the signals.
+        node_work = notification_handler.NotificationHandler.node_work
+
+        if notif == PyNotifications.AllNodesQueried:
 
             def _do():
-                for n in self._nodes:
-                    n.destroy()
+                self._state = self.STATE_READY
 
-                self.nodes.clear()
-                self._state = self.STATE_STOPPED
-                self._manager = None
-                self._controller = None
+                dead = []
+                sleeping = []
+                awake = []
 
-                signals.SIGNAL_NETWORK_STOPPED.send(sender=self, network=self)
-                event.set()
+                for nd in self.nodes.values():
+                    if nd.is_failed:
+                        dead += [nd]
+                    elif nd.is_awake:
+                        awake += [nd]
+                    else:
+                        sleeping += [nd]
 
-            self._notification_handler.add(_do)
-            event.wait()
+                signals.SIGNAL_NODES_LOADED.send(
+                    sender=self,
+                    network=self,
+                    controller=self._controller,
+                    sleeping=sleeping,
+                    dead=dead,
+                    awake=awake
 
-        elif notif == PyNotifications.ManufacturerSpecificDBReady:
-            def _do(n):
-                signals.SIGNAL_NETWORK_MANUFACTURER_DB_READY.send(
+                )
+                signals.SIGNAL_NODES_LOADED_ALL.send(
                     sender=self,
                     network=self,
-                    notif=n
+                    controller=self._controller
+                )
+                signals.SIGNAL_NETWORK_READY.send(
+                    sender=self,
+                    network=self
                 )
 
-            self._notification_handler.add(_do, notif)
+            node_work.call_when_processed(
+                self._notification_handler.add,
+                _do
+            )
 
-        elif notif in (
-            PyNotifications.AllNodesQueriedSomeDead,
-            PyNotifications.AwakeNodesQueried,
-            PyNotifications.AllNodesQueried
-        ):
-            import time
-            handlers = notification_handler.NotificationHandler.node_handlers
-            while True:
-                for handler in handlers:
-                    if handler.is_busy:
-                        time.sleep(0.01)
-                        break
-                else:
-                    break
+        elif notif == PyNotifications.AwakeNodesQueried:
 
-            if notif == PyNotifications.AllNodesQueried:
+            def _do(home_id):
+                self._object_id = home_id
+                if self._state < self.STATE_AWAKE:
+                    self._state = self.STATE_AWAKE
 
-                def _do():
-                    self._state = self.STATE_READY
+                dead = []
+                sleeping = []
+                awake = []
 
-                    dead = []
-                    sleeping = []
-                    awake = []
+                for nd in self.nodes.values():
+                    if nd.is_failed:
+                        dead += [nd]
+                    elif nd.is_awake:
+                        awake += [nd]
+                    else:
+                        sleeping += [nd]
 
-                    for nd in self.nodes.values():
-                        if nd.is_failed:
-                            dead += [nd]
-                        elif nd.is_awake:
-                            awake += [nd]
-                        else:
-                            sleeping += [nd]
+                signals.SIGNAL_NODES_LOADED.send(
+                    sender=self,
+                    network=self,
+                    controller=self._controller,
+                    sleeping=sleeping,
+                    dead=dead,
+                    awake=awake
 
-                    signals.SIGNAL_NODES_LOADED.send(
-                        sender=self,
-                        network=self,
-                        controller=self._controller,
-                        sleeping=sleeping,
-                        dead=dead,
-                        awake=awake
+                )
+                signals.SIGNAL_NODES_LOADED_AWAKE.send(
+                    sender=self,
+                    network=self,
+                    controller=self._controller,
+                    sleeping=sleeping
+                )
+                signals.SIGNAL_NETWORK_READY.send(
+                    sender=self,
+                    network=self
+                )
 
-                    )
-                    signals.SIGNAL_NODES_LOADED_ALL.send(
-                        sender=self,
-                        network=self,
-                        controller=self._controller
-                    )
-                    signals.SIGNAL_NETWORK_READY.send(
-                        sender=self,
-                        network=self
-                    )
+            node_work.call_when_processed(
+                self._notification_handler.add,
+                _do,
+                notif.home_id
+            )
 
-                self._notification_handler.add(_do)
+        elif notif == PyNotifications.AllNodesQueriedSomeDead:
 
-            elif notif == PyNotifications.AwakeNodesQueried:
+            def _do(home_id):
+                self._object_id = home_id
+                self._state = self.STATE_READY
 
-                def _do(home_id):
-                    self._object_id = home_id
-                    if self._state < self.STATE_AWAKE:
-                        self._state = self.STATE_AWAKE
+                dead = []
+                sleeping = []
+                awake = []
 
-                    dead = []
-                    sleeping = []
-                    awake = []
+                for nd in self.nodes.values():
+                    if nd.is_failed:
+                        dead += [nd]
+                    elif nd.is_awake:
+                        awake += [nd]
+                    else:
+                        sleeping += [nd]
 
-                    for nd in self.nodes.values():
-                        if nd.is_failed:
-                            dead += [nd]
-                        elif nd.is_awake:
-                            awake += [nd]
-                        else:
-                            sleeping += [nd]
+                signals.SIGNAL_NODES_LOADED.send(
+                    sender=self,
+                    network=self,
+                    controller=self._controller,
+                    sleeping=sleeping,
+                    dead=dead,
+                    awake=awake
 
-                    signals.SIGNAL_NODES_LOADED.send(
-                        sender=self,
-                        network=self,
-                        controller=self._controller,
-                        sleeping=sleeping,
-                        dead=dead,
-                        awake=awake
+                )
+                signals.SIGNAL_NODES_LOADED_SOME_DEAD.send(
+                    sender=self,
+                    network=self,
+                    controller=self._controller,
+                    dead=dead
+                )
+                signals.SIGNAL_NETWORK_READY.send(
+                    sender=self,
+                    network=self
+                )
 
-                    )
-                    signals.SIGNAL_NODES_LOADED_AWAKE.send(
-                        sender=self,
-                        network=self,
-                        controller=self._controller,
-                        sleeping=sleeping
-                    )
-                    signals.SIGNAL_NETWORK_READY.send(
-                        sender=self,
-                        network=self
-                    )
+            node_work.call_when_processed(
+                self._notification_handler.add,
+                _do,
+                notif.home_id
+            )
 
-                self._notification_handler.add(_do, notif.home_id)
+    @utils.logit
+    def _handle_node_added(self, notif):
+        if str(notif.node_id) + '.1' not in list(self.nodes.keys()):
+            self._pending_node_addition[notif.node_id] = []
 
-            elif notif == PyNotifications.AllNodesQueriedSomeDead:
+    @utils.logit
+    def _handle_essential_node_queries_complete(self, notif):
+        def _do(node_id_):
+            n_id = str(node_id_) + '.1'
 
-                def _do(home_id):
-                    self._object_id = home_id
-                    self._state = self.STATE_READY
+            if n_id in list(self.nodes.keys()):
+                nd = self.nodes[n_id]
+            else:
+                from .node import ZWaveNode
 
-                    dead = []
-                    sleeping = []
-                    awake = []
+                nd = self.nodes[n_id] = ZWaveNode(n_id, self, None, None)
 
-                    for nd in self.nodes.values():
-                        if nd.is_failed:
-                            dead += [nd]
-                        elif nd.is_awake:
-                            awake += [nd]
-                        else:
-                            sleeping += [nd]
+            nd._update_dataset()  # NOQA
 
-                    signals.SIGNAL_NODES_LOADED.send(
-                        sender=self,
-                        network=self,
-                        controller=self._controller,
-                        sleeping=sleeping,
-                        dead=dead,
-                        awake=awake
+            signals.SIGNAL_NODE_LOADING_ESSENTIAL.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=nd
+            )
+            pending_notifications = (
+                self._pending_node_addition.pop(node_id_, [])
+            )
 
-                    )
-                    signals.SIGNAL_NODES_LOADED_SOME_DEAD.send(
-                        sender=self,
-                        network=self,
-                        controller=self._controller,
-                        dead=dead
-                    )
-                    signals.SIGNAL_NETWORK_READY.send(
-                        sender=self,
-                        network=self
-                    )
+            for item in pending_notifications:
+                self._zwcallback(item)
 
-                self._notification_handler.add(_do, notif.home_id)
+        self._notification_handler.add(_do, notif.node_id)
 
-        # elif notif == PyNotifications.MsgComplete:
-        #     self._notification_handler.add(
-        #         signals.SIGNAL_MSG_COMPLETE.send,
-        #         sender=self,
-        #         network=self,
-        #     )
+    @utils.logit
+    def _handle_node_new(self, notif):
+        if notif.node_id == 0:
+            logger.warning('Skipping unhandled notification [%s]', notif)
+            return
 
-        elif notif == PyNotifications.ControllerCommand:
-            self._handle_controller_command(notif)
+        def _do(node_id_):
+            signals.SIGNAL_NODE_NEW.send(
+                sender=self,
+                network=self,
+                controller=self._controller,
+                node_id=node_id_
+            )
 
-        elif notif == PyNotifications.NodeAdded:
-            if str(notif.node_id) + '.1' not in list(self.nodes.keys()):
-                self._pending_node_addition[notif.node_id] = []
+        self._notification_handler.add(_do, notif.node_id)
 
-        elif notif == PyNotifications.EssentialNodeQueriesComplete:
-            def _do(node_id_):
-                n_id = str(node_id_) + '.1'
+    @utils.logit
+    def _handle_notification_code(self, notif):
+        if notif.node_id != 0:
+            self._handle_node_notification(notif)
+            return
 
-                if n_id in list(self.nodes.keys()):
-                    nd = self.nodes[n_id]
-                else:
-                    from .node import ZWaveNode
+        def _do(code):
+            signals.SIGNAL_NOTIFICATION.send(
+                sender=self,
+                network=self,
+                controller=self._controller,
+                notification_code=code,
+            )
 
-                    nd = self.nodes[n_id] = ZWaveNode(n_id, self, None, None)
+        self._notification_handler.add(_do, notif.notification_code)
 
-                nd._update_dataset()  # NOQA
+    @utils.logit
+    def _handle_user_alerts(self, notif):
+        if notif.node_id != 0:
+            self._handle_node_notification(notif)
+            return
 
-                signals.SIGNAL_NODE_LOADING_ESSENTIAL.send(
+        def _do(alert):
+            if alert == signals.SIGNAL_ALERT_DNS_ERROR:
+                signals.SIGNAL_ALERT_DNS_ERROR.send(
                     sender=self,
-                    network=self.network,
-                    controller=self.network.controller,
-                    node=nd
+                    network=self,
                 )
-                pending_notifications = (
-                    self._pending_node_addition.pop(node_id_, [])
+            elif alert == signals.SIGNAL_ALERT_UNSUPPORTED_CONTROLLER:
+                signals.SIGNAL_ALERT_UNSUPPORTED_CONTROLLER.send(
+                    sender=self,
+                    network=self,
                 )
-
-                for item in pending_notifications:
-                    self._zwcallback(item)
-
-            self._notification_handler.add(_do, notif.node_id)
-
-        elif notif.node_id != 0:
-            if notif == PyNotifications.NodeNew:
-                def _do(node_id_):
-                    signals.SIGNAL_NODE_NEW.send(
-                        sender=self,
-                        network=self,
-                        controller=self._controller,
-                        node_id=node_id_
-                    )
-
-                self._notification_handler.add(_do, notif.node_id)
-
-            else:
-                if notif.node_id in self._pending_node_addition:
-                    self._pending_node_addition[notif.node_id] += [notif]
-                else:
-                    node = self.nodes[str(notif.node_id) + '.1']
-                    node._handle_notification(notif)  # NOQA
-
-        elif notif == PyNotifications.Notification:
-            def _do(code):
-                signals.SIGNAL_NOTIFICATION.send(
+            elif alert == signals.SIGNAL_ALERT_APPLICATION_STATUS_RETRY:
+                signals.SIGNAL_ALERT_APPLICATION_STATUS_RETRY.send(
+                    sender=self,
+                    network=self,
+                )
+            elif alert == signals.SIGNAL_ALERT_APPLICATION_STATUS_QUEUED:
+                signals.SIGNAL_ALERT_APPLICATION_STATUS_QUEUED.send(
                     sender=self,
                     network=self,
-                    controller=self._controller,
-                    notification_code=code,
                 )
 
-            self._notification_handler.add(_do, notif.notification_code)
-
-        elif notif == PyNotifications.UserAlerts:
-            def _do(alert):
-                if alert == signals.SIGNAL_ALERT_DNS_ERROR:
-                    signals.SIGNAL_ALERT_DNS_ERROR.send(
-                        sender=self,
-                        network=self,
-                    )
-                elif alert == signals.SIGNAL_ALERT_UNSUPPORTED_CONTROLLER:
-                    signals.SIGNAL_ALERT_UNSUPPORTED_CONTROLLER.send(
-                        sender=self,
-                        network=self,
-                    )
-                elif alert == signals.SIGNAL_ALERT_APPLICATION_STATUS_RETRY:
-                    signals.SIGNAL_ALERT_APPLICATION_STATUS_RETRY.send(
-                        sender=self,
-                        network=self,
-                    )
-                elif alert == signals.SIGNAL_ALERT_APPLICATION_STATUS_QUEUED:
-                    signals.SIGNAL_ALERT_APPLICATION_STATUS_QUEUED.send(
-                        sender=self,
-                        network=self,
-                    )
-
-                elif alert == signals.SIGNAL_ALERT_APPLICATION_STATUS_REJECTED:
-                    signals.SIGNAL_ALERT_APPLICATION_STATUS_REJECTED.send(
-                        sender=self,
-                        network=self,
-                    )
-
-            self._notification_handler.add(_do, notif.user_alert)
+            elif alert == signals.SIGNAL_ALERT_APPLICATION_STATUS_REJECTED:
+                signals.SIGNAL_ALERT_APPLICATION_STATUS_REJECTED.send(
+                    sender=self,
+                    network=self,
+                )
 
-        # elif notif_type == self.SIGNAL_NODE_READY:
-        #     self._handleNodeReady,
-        else:
-            logger.warning('Skipping unhandled notification [%s]', notif)
+        self._notification_handler.add(_do, notif.user_alert)
 
     @utils.logit
     def _handle_controller_command(self, notif):
@@ -340,33 +340,36 @@ class URLs(object):
         home_id = self._network.home_id
         node_id = self._node.id.node_id
 
+        (
+            ozw_info,
+            ozw_product,
+            product_image,
+            product_manual,
+            product,
+            product_support
+        ) = manager.getNodeMetaData(home_id, node_id, [0, 1, 2, 4, 5, 10])
+
         handler.OZWInfo = xml_handler.XMLElement('OZWInfo')
-        ozw_info = manager.getMetaData(home_id, node_id, 0)
         if ozw_info.strip():
             handler.OZWInfo.text = ozw_info
 
         handler.OZWProduct = xml_handler.XMLElement('OZWProduct')
-        ozw_product = manager.getMetaData(home_id, node_id, 1)
         if ozw_product.strip():
             handler.OZWProduct.text = ozw_product
 
         handler.ProductImage = xml_handler.XMLElement('ProductImage')
-        product_image = manager.getMetaData(home_id, node_id, 2)
         if product_image.strip():
             handler.ProductImage.text = product_image
 
         handler.ProductManual = xml_handler.XMLElement('ProductManual')
-        product_manual = manager.getMetaData(home_id, node_id, 4)
         if product_manual.strip():
             handler.ProductManual.text = product_manual
 
         handler.Product = xml_handler.XMLElement('Product')
-        product = manager.getMetaData(home_id, node_id, 5)
         if product.strip():
             handler.Product.text = product
 
         handler.ProductSupport = xml_handler.XMLElement('ProductSupport')
-        product_support = manager.getMetaData(home_id, node_id, 10)
         if product_support.strip():
             handler.ProductSupport.text = product_support
 
@@ -503,24 +506,23 @@ class Help(object):
             home_id = self._network.home_id
             node_id = self._node.id.node_id
 
+            inclusion, exclusion, reset, wakeup = (
+                manager.getNodeMetaData(home_id, node_id, [6, 7, 8, 9])
+            )
+
             handler.Inclusion = xml_handler.XMLElement('Inclusion')
-            inclusion = manager.getMetaData(home_id, node_id, 6)
             if inclusion.strip():
                 handler.Inclusion.text = inclusion
 
             handler.Exclusion = xml_handler.XMLElement('Exclusion')
-            exclusion = manager.getMetaData(home_id, node_id, 7)
             if exclusion.strip():
                 handler.Exclusion.text = exclusion
 
             handler.Reset = xml_handler.XMLElement('Reset')
-            reset = manager.getMetaData(home_id, node_id, 8)
             if reset.strip():
                 handler.Reset.text = reset
 
             handler.Wakeup = xml_handler.XMLElement('Wakeup')
-
-            wakeup = manager.getMetaData(home_id, node_id, 9)
             if wakeup.strip():
                 handler.Wakeup.text = wakeup
 
@@ -534,6 +536,35 @@ class ZWaveNode(ZWaveObject):
     _command_classes = []
     _bases = ()
 
+    # openzwave notifications get routed to these methods, see
+    # notification_handler.NotificationRouter
+    notification_router = notification_handler.NotificationRouter()
+
+    for _notification_type, _handler in (
+        (PyNotifications.ValueAdded, '_handle_value'),
+        (PyNotifications.ValueRemoved, '_handle_value'),
+        (PyNotifications.ValueChanged, '_handle_value'),
+        (PyNotifications.ValueRefreshed, '_handle_value'),
+        (PyNotifications.Notification, '_handle_notification_code'),
+        (PyNotifications.NodeRemoved, '_handle_node_removed'),
+        (PyNotifications.UserAlerts, '_handle_user_alerts'),
+        (PyNotifications.NodeQueriesComplete, '_handle_node_queries_complete'),
+        (PyNotifications.Group, '_handle_group'),
+        (PyNotifications.NodeNaming, '_handle_node_naming'),
+        (PyNotifications.NodeProtocolInfo, '_handle_node_protocol_info'),
+        (PyNotifications.PollingDisabled, '_handle_polling_disabled'),
+        (PyNotifications.PollingEnabled, '_handle_polling_enabled'),
+        (PyNotifications.CreateButton, '_handle_create_button'),
+        (PyNotifications.DeleteButton, '_handle_delete_button'),
+        (PyNotifications.ButtonOn, '_handle_button_on'),
+        (PyNotifications.ButtonOff, '_handle_button_off'),
+        (PyNotifications.NodeEvent, '_handle_node_event'),
+    ):
+        notification_router.register(_notification_type, _handler)
+
+    del _notification_type
+    del _handler
+
     def __init__(
         self,
         node_id,
@@ -722,59 +753,44 @@ class ZWaveNode(ZWaveObject):
             else:
                 handler = xml_handler.XMLElement('VirtualNode')
 
-            handler.Description = xml_handler.XMLElement('Description')
-            handler.Description.text = (
-                self._network.manager.getMetaData(h_id, n_id, 3)
+            # these are single requests when connected to a remote server
+            info = manager.getNodeInfo(h_id, n_id)
+            description, zwave_frequency = (
+                manager.getNodeMetaData(h_id, n_id, [3, 11])
             )
+            neighbors = info['neighbors']
+
+            handler.Description = xml_handler.XMLElement('Description')
+            handler.Description.text = description
 
             self.network.xml_handler.Nodes.append(handler)
 
             handler['id'] = self.id
-            handler['name'] = manager.getNodeName(h_id, n_id)
-            handler['location'] = manager.getNodeLocation(h_id, n_id)
-            handler['product_name'] = manager.getNodeProductName(h_id, n_id)
-            handler['product_type'] = manager.getNodeProductType(h_id, n_id)
-            handler['product_id'] = manager.getNodeProductId(h_id, n_id)
-            handler['version'] = manager.getNodeVersion(h_id, n_id)
-            handler['max_baud_rate'] = manager.getNodeMaxBaudRate(h_id, n_id)
-            handler['zwave_frequency'] = manager.getMetaData(h_id, n_id, 11)
-            handler['security'] = manager.getNodeSecurity(h_id, n_id)
-            handler['beaming_device'] = manager.isNodeBeamingDevice(h_id, n_id)
-            handler['routing_device'] = manager.isNodeRoutingDevice(h_id, n_id)
-            handler['node_type'] = manager.getNodeType(h_id, n_id)
+            handler['name'] = info['name']
+            handler['location'] = info['location']
+            handler['product_name'] = info['product_name']
+            handler['product_type'] = info['product_type']
+            handler['product_id'] = info['product_id']
+            handler['version'] = info['version']
+            handler['max_baud_rate'] = info['max_baud_rate']
+            handler['zwave_frequency'] = zwave_frequency
+            handler['security'] = info['security']
+            handler['beaming_device'] = info['beaming_device']
+            handler['routing_device'] = info['routing_device']
+            handler['node_type'] = info['node_type']
             handler['frequent_listening_device'] = (
-                manager.isNodeFrequentListeningDevice(h_id, n_id)
-            )
-            handler['manufacturer_id'] = (
-                manager.getNodeManufacturerId(h_id, n_id)
-            )
-            handler['manufacturer_name'] = (
-                manager.getNodeManufacturerName(h_id, n_id)
-            )
-            handler['listening_device'] = (
-                manager.isNodeListeningDevice(h_id, n_id)
-            )
-            handler['security_device'] = (
-                manager.isNodeSecurityDevice(h_id, n_id)
-            )
-            handler['role_type'] = "0x{0:04X}".format(
-                manager.getNodeRole(h_id, n_id)
-            )
-            handler['device_type'] = "0x{0:04X}".format(
-                manager.getNodeDeviceType(h_id, n_id)
-            )
-            handler['basic_type'] = "0x{0:04X}".format(
-                manager.getNodeBasic(h_id, n_id)
-            )
-            handler['generic_type'] = "0x{0:04X}".format(
-                manager.getNodeGeneric(h_id, n_id)
-            )
-            handler['specific_type'] = "0x{0:04X}".format(
-                manager.getNodeSpecific(h_id, n_id)
-            )
-            handler['controller_type'] = "0x{0:04X}".format(
-                manager.getNodeBasic(h_id, n_id)
+                info['frequent_listening_device']
             )
+            handler['manufacturer_id'] = info['manufacturer_id']
+            handler['manufacturer_name'] = info['manufacturer_name']
+            handler['listening_device'] = info['listening_device']
+            handler['security_device'] = info['security_device']
+            handler['role_type'] = "0x{0:04X}".format(info['role'])
+            handler['device_type'] = "0x{0:04X}".format(info['device_type'])
+            handler['basic_type'] = "0x{0:04X}".format(info['basic'])
+            handler['generic_type'] = "0x{0:04X}".format(info['generic'])
+            handler['specific_type'] = "0x{0:04X}".format(info['specific'])
+            handler['controller_type'] = "0x{0:04X}".format(info['basic'])
 
             from .command_classes import COMMAND_CLASSES
 
@@ -806,9 +822,9 @@ class ZWaveNode(ZWaveObject):
             self._tmp_xml_handler = None
         else:
             handler = self._xml_handler
+            neighbors = manager.getNodeNeighbors(h_id, n_id)
 
         handler.Neighbors = xml_handler.XMLElement('Neighbors')
-        neighbors = manager.getNodeNeighbors(h_id, n_id)
 
         for neighbor_id in sorted(neighbors):
             neighbor = xml_handler.XMLElement('Neighbor')
@@ -1034,295 +1050,291 @@ class ZWaveNode(ZWaveObject):
 
     @utils.logit
     def _handle_notification(self, notif):
-        if notif.value is not None:
-            self._handle_value(notif)
+        self.notification_router.route(self, notif)
 
-        elif notif == PyNotifications.Notification:
-            def _do(c):
-                signals.SIGNAL_NOTIFICATION.send(
-                    sender=self,
-                    network=self.network,
-                    controller=self.network.controller,
-                    node=self,
-                    notification_code=c
-                )
-
-            self._notification_handler.add(_do, notif.notification_code)
-
-        elif notif == PyNotifications.NodeRemoved:
-            def _do():
-                if self._parent_node is None:
-                    for node in list(self.network.nodes.values())[:]:
-                        if node == self:
-                            continue
-
-                        if node.id.node_id == self.id.node_id:
-                            node._handle_notification(notif)  # NOQA
-
-                del self.network.nodes[self.id]
-
-                self._xml_handler.parent.remove(self._xml_handler)
-
-                if self._parent_node is None:
-
-                    signals.SIGNAL_NODE_REMOVED.send(
-                        sender=self.network,
-                        network=self.network,
-                        controller=self.network.controller,
-                        node=self
-                    )
-                else:
-                    signals.SIGNAL_VIRTUAL_NODE_REMOVED.send(
-                        sender=self.network,
-                        network=self.network,
-                        controller=self.network.controller,
-                        node=self
-                    )
-
-            self._notification_handler.add(_do)
-
-        elif notif == PyNotifications.UserAlerts:
-            def _do(alert):
-                if alert.idx != 0:
-                    signals.SIGNAL_USER_ALERTS.send(
-                        sender=self,
-                        network=self.network,
-                        controller=self.network.controller,
-                        node=self,
-                        user_alert=alert
-                    )
-                    for signal in (
-                        signals.SIGNAL_ALERT_CONFIG_OUT_OF_DATE,
-                        signals.SIGNAL_ALERT_MFS_OUT_OF_DATE,
-                        signals.SIGNAL_ALERT_CONFIG_FILE_DOWNLOAD_FAILED,
-                        signals.SIGNAL_ALERT_RELOAD_REQUIRED
-                    ):
-                        if signal == alert:
-                            signal.send(
-                                sender=self,
-                                network=self.network,
-                                controller=self.network.controller,
-                                node=self
-                            )
-                            break
-
-            self._notification_handler.add(_do, notif.user_alerts)
-
-        elif notif == PyNotifications.NodeQueriesComplete:
-            def _do():
-                with self._value_lock:
-                    self._is_cache = False
-                    self._is_ready = True
-                    self._update_dataset()
-
-                    for value in self:
-                        if not value.is_ready:
-                            value._is_ready = True
-
-                            signals.SIGNAL_VALUE_READY.send(
-                                sender=self,
-                                network=self.network,
-                                controller=self.network.controller,
-                                node=self,
-                                value=value,
-                                value_data=value.data
-                            )
-
-                if self._parent_node is None:
-                    for node in list(self.network.nodes.values())[:]:
-                        if node == self:
-                            continue
-
-                        if node.id.node_id == self.id.node_id:
-                            node._handle_notification(notif)  # NOQA
-
-                    signals.SIGNAL_NODE_READY.send(
-                        sender=self,
-                        network=self.network,
-                        controller=self.network.controller,
-                        node=self
-                    )
-                else:
-                    if self._xml_handler is None:
-                        self._update_dataset()
-                        del self._instances[self.__instance_key__]  # NOQA
-                        del self.network.nodes[self.id]
-
-                        node = ZWaveNode(
-                            self.id,
-                            self.network,
-                            self._xml_handler,
-                            self._parent  # NOQA
-                        )
-                        node._is_ready = True
-
-                        for value_id in node.values.keys()[:]:
-                            del node.values[value_id]
+    @utils.logit
+    def _handle_notification_code(self, notif):
+        def _do(c):
+            signals.SIGNAL_NOTIFICATION.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self,
+                notification_code=c
+            )
 
-                        for value in self.values.values():
-                            node.values[value.id] = value
-                            value._parent = node
-                            value._xml_handler.parent = node.xml_handler  # NOQA
+        self._notification_handler.add(_do, notif.notification_code)
 
-                            self._xml_handler.parent.remove(  # NOQA
-                                self._xml_handler
-                            )
+    @utils.logit
+    def _handle_node_removed(self, notif):
+        def _do():
+            if self._parent_node is None:
+                for node in list(self.network.nodes.values())[:]:
+                    if node == self:
+                        continue
 
-                    signals.SIGNAL_VIRTUAL_NODE_READY.send(
-                        sender=self,
-                        network=self.network,
-                        controller=self.network.controller,
-                        node=self
-                    )
+                    if node.id.node_id == self.id.node_id:
+                        node._handle_notification(notif)  # NOQA
 
-            if not self._is_ready:
-                self._notification_handler.add(_do)
+            del self.network.nodes[self.id]
 
-        elif notif == PyNotifications.Group:
-            def _do(g_id):
+            self._xml_handler.parent.remove(self._xml_handler)
 
-                for group in self.association_groups:
-                    if group.id == g_id:
-                        break
-                else:
-                    return
+            if self._parent_node is None:
 
-                signals.SIGNAL_NODE_ASSOCIATION_GROUP.send(
-                    sender=self,
+                signals.SIGNAL_NODE_REMOVED.send(
+                    sender=self.network,
                     network=self.network,
                     controller=self.network.controller,
-                    node=self,
-                    group=group
+                    node=self
                 )
-
-            self._notification_handler.add(_do, notif.group_id)
-
-        elif notif == PyNotifications.NodeNaming:
-            def _do():
-                signals.SIGNAL_NODE_NAMING.send(
-                    sender=self,
+            else:
+                signals.SIGNAL_VIRTUAL_NODE_REMOVED.send(
+                    sender=self.network,
                     network=self.network,
                     controller=self.network.controller,
                     node=self
                 )
 
-            self._notification_handler.add(_do)
+        self._notification_handler.add(_do)
 
-        elif notif == PyNotifications.NodeProtocolInfo:
-            def _do():
-                signals.SIGNAL_NODE_PROTOCOL_INFO.send(
+    @utils.logit
+    def _handle_user_alerts(self, notif):
+        def _do(alert):
+            if alert.idx != 0:
+                signals.SIGNAL_USER_ALERTS.send(
                     sender=self,
                     network=self.network,
                     controller=self.network.controller,
-                    node=self
+                    node=self,
+                    user_alert=alert
                 )
+                for signal in (
+                    signals.SIGNAL_ALERT_CONFIG_OUT_OF_DATE,
+                    signals.SIGNAL_ALERT_MFS_OUT_OF_DATE,
+                    signals.SIGNAL_ALERT_CONFIG_FILE_DOWNLOAD_FAILED,
+                    signals.SIGNAL_ALERT_RELOAD_REQUIRED
+                ):
+                    if signal == alert:
+                        signal.send(
+                            sender=self,
+                            network=self.network,
+                            controller=self.network.controller,
+                            node=self
+                        )
+                        break
 
-            self._notification_handler.add(_do)
+        self._notification_handler.add(_do, notif.user_alert)
 
-        elif notif == PyNotifications.PollingDisabled:
-            def _do():
-                signals.SIGNAL_NODE_POLLING_DISABLED.send(
-                    sender=self,
-                    network=self.network,
-                    controller=self.network.controller,
-                    node=self
-                )
+    @utils.logit
+    def _handle_node_queries_complete(self, notif):
+        def _do():
+            with self._value_lock:
+                self._is_cache = False
+                self._is_ready = True
+                self._update_dataset()
+
+                for value in self:
+                    if not value.is_ready:
+                        value._is_ready = True
+
+                        signals.SIGNAL_VALUE_READY.send(
+                            sender=self,
+                            network=self.network,
+                            controller=self.network.controller,
+                            node=self,
+                            value=value,
+                            value_data=value.data
+                        )
 
-            self._notification_handler.add(_do)
+            if self._parent_node is None:
+                for node in list(self.network.nodes.values())[:]:
+                    if node == self:
+                        continue
+
+                    if node.id.node_id == self.id.node_id:
+                        node._handle_notification(notif)  # NOQA
 
-        elif notif == PyNotifications.PollingEnabled:
-            def _do():
-                signals.SIGNAL_NODE_POLLING_ENABLED.send(
+                signals.SIGNAL_NODE_READY.send(
                     sender=self,
                     network=self.network,
                     controller=self.network.controller,
                     node=self
                 )
+            else:
+                if self._xml_handler is None:
+                    self._update_dataset()
+                    del self._instances[self.__instance_key__]  # NOQA
+                    del self.network.nodes[self.id]
 
-            self._notification_handler.add(_do)
+                    node = ZWaveNode(
+                        self.id,
+                        self.network,
+                        self._xml_handler,
+                        self._parent  # NOQA
+                    )
+                    node._is_ready = True
 
-        elif notif == PyNotifications.CreateButton:
-            def _do():
-                signals.SIGNAL_NODE_CREATE_BUTTON.send(
-                    sender=self,
-                    network=self.network,
-                    controller=self.network.controller,
-                    node=self
-                )
+                    for value_id in node.values.keys()[:]:
+                        del node.values[value_id]
 
-            self._notification_handler.add(_do)
+                    for value in self.values.values():
+                        node.values[value.id] = value
+                        value._parent = node
+                        value._xml_handler.parent = node.xml_handler  # NOQA
 
-        elif notif == PyNotifications.DeleteButton:
-            def _do():
-                signals.SIGNAL_NODE_DELETE_BUTTON.send(
+                        self._xml_handler.parent.remove(  # NOQA
+                            self._xml_handler
+                        )
+
+                signals.SIGNAL_VIRTUAL_NODE_READY.send(
                     sender=self,
                     network=self.network,
                     controller=self.network.controller,
                     node=self
                 )
 
+        if not self._is_ready:
             self._notification_handler.add(_do)
 
-        elif notif == PyNotifications.ButtonOn:
+    @utils.logit
+    def _handle_group(self, notif):
+        def _do(g_id):
 
-            def _do():
-                signals.SIGNAL_NODE_BUTTON_ON.send(
-                    sender=self,
-                    network=self.network,
-                    controller=self.network.controller,
-                    node=self
-                )
+            for group in self.association_groups:
+                if group.id == g_id:
+                    break
+            else:
+                return
+
+            signals.SIGNAL_NODE_ASSOCIATION_GROUP.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self,
+                group=group
+            )
 
-            self._notification_handler.add(_do)
+        self._notification_handler.add(_do, notif.group_id)
 
-        elif notif == PyNotifications.ButtonOff:
+    @utils.logit
+    def _handle_node_naming(self, notif):
+        def _do():
+            signals.SIGNAL_NODE_NAMING.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self
+            )
 
-            def _do():
-                signals.SIGNAL_NODE_BUTTON_OFF.send(
-                    sender=self,
-                    network=self.network,
-                    controller=self.network.controller,
-                    node=self
-                )
+        self._notification_handler.add(_do)
 
-            self._notification_handler.add(_do)
+    @utils.logit
+    def _handle_node_protocol_info(self, notif):
+        def _do():
+            signals.SIGNAL_NODE_PROTOCOL_INFO.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self
+            )
 
-        elif notif == PyNotifications.NodeEvent:
+        self._notification_handler.add(_do)
 
-            def _do(event):
-                signals.SIGNAL_NODE_EVENT.send(
-                    sender=self,
-                    network=self.network,
-                    controller=self.network.controller,
-                    node=self,
-                    event=event
-                )
+    @utils.logit
+    def _handle_polling_disabled(self, notif):
+        def _do():
+            signals.SIGNAL_NODE_POLLING_DISABLED.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self
+            )
 
-            self._notification_handler.add(_do, notif.event)
+        self._notification_handler.add(_do)
 
     @utils.logit
-    def _handle_value(self, notif):
-        def _do(n):
-            for value_id, value in list(self.values.items())[:]:
-                if value_id == n.value.id:
-                    break
+    def _handle_polling_enabled(self, notif):
+        def _do():
+            signals.SIGNAL_NODE_POLLING_ENABLED.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self
+            )
 
-                if value_id > -1:
-                    continue
+        self._notification_handler.add(_do)
 
-                cc_id = value.command_class.class_id
+    @utils.logit
+    def _handle_create_button(self, notif):
+        def _do():
+            signals.SIGNAL_NODE_CREATE_BUTTON.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self
+            )
 
-                if (
-                    cc_id == n.value.command_class and
-                    value.index == n.value.index and
-                    value.instance == n.value.instance
-                ):
-                    value._id = n.value.id
-                    self.values[n.value.id] = self.values.pop(value_id)
-                    value._update_dataset()  # NOQA
-                    break
-            else:
-                value = None
+        self._notification_handler.add(_do)
+
+    @utils.logit
+    def _handle_delete_button(self, notif):
+        def _do():
+            signals.SIGNAL_NODE_DELETE_BUTTON.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self
+            )
+
+        self._notification_handler.add(_do)
+
+    @utils.logit
+    def _handle_button_on(self, notif):
+        def _do():
+            signals.SIGNAL_NODE_BUTTON_ON.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self
+            )
+
+        self._notification_handler.add(_do)
+
+    @utils.logit
+    def _handle_button_off(self, notif):
+        def _do():
+            signals.SIGNAL_NODE_BUTTON_OFF.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self
+            )
+
+        self._notification_handler.add(_do)
+
+    @utils.logit
+    def _handle_node_event(self, notif):
+        def _do(event):
+            signals.SIGNAL_NODE_EVENT.send(
+                sender=self,
+                network=self.network,
+                controller=self.network.controller,
+                node=self,
+                event=event
+            )
+
+        self._notification_handler.add(_do, notif.event)
+
+    @utils.logit
+    def _handle_value(self, notif):
+        def _do(n):
+            value = self.values.resolve(
+                n.value.id,
+                n.value.command_class,
+                n.value.instance,
+                n.value.index
+            )
 
             if n == PyNotifications.ValueAdded and value is None:
                 from .value import ZWaveValue
@@ -2249,8 +2261,13 @@ class ZWaveNode(ZWaveObject):
 
         :rtype: bool
         """
+        if other is self:
+            return True
         if isinstance(other, ZWaveNode):
-            return self.id.node_id == other.id
+            return (
+                self._object_id == other._object_id and
+                self._network is other._network
+            )
         if isinstance(other, int):
             for cls in self._bases:
                 if cls.class_id == other:
@@ -2277,4 +2294,4 @@ class ZWaveNode(ZWaveObject):
         """
         :rtype: hash
         """
-        return hash(repr(self))
+        return self._hash
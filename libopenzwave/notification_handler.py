@@ -27,12 +27,23 @@ This file is part of the **libopenzwave** project
 import traceback
 import threading
 import logging
-from collections import deque
+import sys
+from collections import deque, OrderedDict
 
 from . import utils
 
 use_single_handler = False
 
+# Number of threads that process the node notifications. When set to 0 every
+# node gets a thread of its own.
+worker_pool_size = 0
+
+# Collect the full name, file and line of the code that queued a function
+# when it gets queued. This walks the frame stack and is slow, by default only
+# the code object of the caller is stored and the names are built when the
+# queued function raises an exception.
+CAPTURE_CALLER_STACK = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,11 +66,212 @@ class HandlerMeta(type):
         return instance
 
 
+class WorkCounter(object):
+    """
+    Keeps track of the queued notifications that have not been processed yet.
+
+    Every queued notification gets a ticket, the tickets are handed out in
+    the order the notifications get queued. This is used to hold off on
+    something until the node notifications that were queued before it have
+    been processed without having to poll the handlers. The notifications
+    that get queued after that point are not waited for.
+    """
+
+    def __init__(self):
+        self.__last_ticket = 0
+        # tickets that have not been processed, oldest first
+        self.__pending = OrderedDict()
+        self.__condition = threading.Condition(threading.Lock())
+        # (last ticket that has to be processed, func, args), the tickets
+        # only ever go up so this is sorted
+        self.__callbacks = deque()
+
+    @property
+    def count(self):
+        """
+        :rtype: int
+        """
+        return len(self.__pending)
+
+    def increment(self):
+        """
+        :return: ticket for the queued notification
+        :rtype: int
+        """
+        with self.__condition:
+            self.__last_ticket += 1
+            ticket = self.__last_ticket
+            self.__pending[ticket] = None
+
+        return ticket
+
+    def decrement(self, *tickets):
+        """
+        :param tickets: tickets of the notifications that have been processed
+            or thrown away
+        :type tickets: int
+        """
+        with self.__condition:
+            for ticket in tickets:
+                self.__pending.pop(ticket, None)
+
+            if self.__pending:
+                oldest = next(iter(self.__pending))
+            else:
+                oldest = None
+                self.__condition.notify_all()
+
+            callbacks = []
+
+            while self.__callbacks and (
+                oldest is None or self.__callbacks[0][0] < oldest
+            ):
+                callbacks.append(self.__callbacks.popleft()[1:])
+
+        self.__run_callbacks(callbacks)
+
+    @staticmethod
+    def __run_callbacks(callbacks):
+        for func, args in callbacks:
+            try:
+                func(*args)
+            except Exception:  # NOQA
+                logger.error(traceback.format_exc())
+
+    def wait(self, timeout=None):
+        """
+        Blocks until there is nothing left to process.
+
+        :param timeout: number of seconds to wait, `None` waits forever
+        :type timeout: float, None, optional
+
+        :return: `False` if the timeout expired
+        :rtype: bool
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: not self.__pending,
+                timeout
+            )
+
+    def call_when_processed(self, func, *args):
+        """
+        Calls `func` once the notifications that are queued at this point
+        have been processed.
+
+        This does not block. Notifications that get queued after this call
+        do not hold off `func`, so a node that keeps sending notifications
+        is not able to delay it forever. If there is nothing left to process
+        `func` is called right away, otherwise it is called from the thread
+        that processes the last of those notifications.
+
+        :param func: function to call
+        :type func: callable
+
+        :param args: arguments to pass to `func`
+        """
+        with self.__condition:
+            if self.__pending:
+                self.__callbacks.append((self.__last_ticket, func, args))
+                return
+
+        self.__run_callbacks([(func, args)])
+
+
+class WorkerPool(object):
+    """
+    Fixed number of threads that process the queues of the node handlers.
+
+    A handler that has something queued is placed into the ready queue of the
+    pool once. Only one thread processes a handler at a time so the
+    notifications of a node are still processed in the order they came in.
+    The threads wait for a handler to become ready, there is no polling.
+    """
+
+    instance = None
+
+    # number of queued items a thread processes for a handler before it moves
+    # on to the next handler, this keeps a busy node from starving the others
+    batch_size = 32
+
+    def __init__(self, size):
+        self.size = size
+        self.__ready = deque()
+        self.__condition = threading.Condition(threading.Lock())
+        self.__stop = False
+        self.__threads = []
+
+    @classmethod
+    def get(cls):
+        if cls.instance is None:
+            cls.instance = cls(max(1, worker_pool_size))
+        return cls.instance
+
+    @property
+    def is_pool_thread(self):
+        return threading.current_thread() in self.__threads
+
+    def start(self):
+        with self.__condition:
+            if self.__threads:
+                return
+
+            self.__stop = False
+
+            for i in range(self.size):
+                thread = threading.Thread(
+                    name='libopenzwave-ThreadWorker_Pool:' + str(i),
+                    target=self.run
+                )
+                thread.daemon = True
+                self.__threads.append(thread)
+                thread.start()
+
+    def schedule(self, handler):
+        with self.__condition:
+            self.__ready.append(handler)
+            self.__condition.notify()
+
+    def run(self):
+        while True:
+            with self.__condition:
+                while not self.__ready and not self.__stop:
+                    self.__condition.wait()
+
+                if not self.__ready:
+                    break
+
+                handler = self.__ready.popleft()
+
+            # noinspection PyProtectedMember
+            if handler._process(self.batch_size):  # NOQA
+                self.schedule(handler)
+
+    def stop(self):
+        with self.__condition:
+            self.__stop = True
+            self.__condition.notify_all()
+            threads = self.__threads[:]
+
+        for thread in threads:
+            if thread != threading.current_thread():
+                thread.join()
+
+        with self.__condition:
+            self.__threads = []
+
+        if WorkerPool.instance is self:
+            WorkerPool.instance = None
+
+
 class NotificationHandler(object, metaclass=HandlerMeta):
 
     network_handler = None
     node_handlers = []
 
+    # queued notifications of the node handlers
+    node_work = WorkCounter()
+
     def __init__(self, obj):
         self.__stop_event = threading.Event()
         self.__stall_event = threading.Event()
@@ -67,12 +279,23 @@ class NotificationHandler(object, metaclass=HandlerMeta):
         self.__queue = deque()
         self.__processing = False
         self.__obj = obj
+        self.__pool = None
+        # set while a node handler is in the ready queue of the pool or is
+        # being processed by one of the threads in the pool
+        self.__scheduled = False
+        self.__idle_event = threading.Event()
+        self.__idle_event.set()
         from .network import ZWaveNetwork
 
         if isinstance(obj, ZWaveNetwork):
             self.name = 'libopenzwave-ThreadWorker_NetworkId:' + str(obj.id)
+            self.__counter = None
         else:
             self.name = 'libopenzwave-ThreadWorker_NodeId:' + str(obj.id)
+            self.__counter = NotificationHandler.node_work
+
+            if worker_pool_size > 0:
+                self.__pool = WorkerPool.get()
 
         self.__thread = threading.Thread(
             name=self.name,
@@ -87,18 +310,30 @@ class NotificationHandler(object, metaclass=HandlerMeta):
         if self.__stop_event.is_set():
             return
 
-        if not self.__thread.is_alive():
+        if self.__pool is not None:
+            self.__pool.start()
+
+        elif not self.__thread.is_alive():
             self.__stall_event.clear()
             self.__thread.start()
 
     @property
     def is_alive(self):
+        if self.__pool is not None:
+            # the pool threads are always alive, this keeps the network
+            # handler from trying to start the handler
+            return True
+
         return self.__thread.is_alive()
 
     @property
     def is_busy(self):
-        if list(self.__queue):
+        if self.__queue:
             return True
+
+        if self.__pool is not None:
+            return not self.__idle_event.is_set()
+
         return False
 
     def add(self, func, *args, **kwargs):
@@ -106,9 +341,53 @@ class NotificationHandler(object, metaclass=HandlerMeta):
             return
 
         worker = NotificationWorker(func, *args, **kwargs)
+
+        if self.__counter is not None:
+            worker.ticket = self.__counter.increment()
+
+        if self.__pool is not None:
+            with self.__start_lock:
+                self.__queue.append(worker)
+
+                if self.__scheduled:
+                    return
+
+                self.__scheduled = True
+                self.__idle_event.clear()
+
+            self.__pool.schedule(self)
+            return
+
         self.__queue.append(worker)
         self.__stall_event.set()
 
+    def _process(self, count):
+        # Called by a thread in the worker pool. Returns True if there are
+        # still items in the queue and the handler needs to be scheduled
+        # again.
+        while count:
+            try:
+                worker = self.__queue.popleft()
+            except IndexError:
+                break
+
+            worker.do()
+
+            if worker.has_exception:
+                worker.log_exception()
+
+            self.__counter.decrement(worker.ticket)
+            count -= 1
+
+        with self.__start_lock:
+            if self.__queue:
+                return True
+
+            self.__scheduled = False
+            self.__idle_event.set()
+
+        return False
+
     def run(self):
         while not self.__stall_event.is_set():
             if self.__stop_event.is_set() and not self.__queue:
@@ -118,9 +397,10 @@ class NotificationHandler(object, metaclass=HandlerMeta):
                 if self.__obj.xml_handler.is_dirty:
                     self.__obj.xml_handler.write_file()
 
-                for nh in NotificationHandler.node_handlers:
-                    if nh.is_busy and not nh.is_alive:
-                        nh.start()
+                if WorkerPool.instance is None:
+                    for nh in NotificationHandler.node_handlers:
+                        if nh.is_busy and not nh.is_alive:
+                            nh.start()
 
             while self.__queue:
                 self.__processing = True
@@ -130,6 +410,9 @@ class NotificationHandler(object, metaclass=HandlerMeta):
                 if worker.has_exception:
                     worker.log_exception()
 
+                if self.__counter is not None:
+                    self.__counter.decrement(worker.ticket)
+
             if self != NotificationHandler.network_handler:
                 self.__processing = False
                 self.__stall_event.wait(3.0)
@@ -138,20 +421,48 @@ class NotificationHandler(object, metaclass=HandlerMeta):
             else:
                 if self.__processing:
                     self.__processing = False
-                else:
+                elif WorkerPool.instance is None:
                     self.__stall_event.wait(0.1)
+                else:
+                    # the node handlers get started by the pool, only the
+                    # dataset needs to be checked
+                    self.__stall_event.wait(1.0)
 
             self.__stall_event.clear()
 
         self.__stall_event.clear()
+
+        if self.__stop_event.is_set():
+            self.__discard()
+
         self.__thread = threading.Thread(
             name=self.name,
             target=self.run
         )
         self.__thread.daemon = True
 
+    def __discard(self):
+        # whatever is still queued after the handler has been stopped is
+        # never going to get processed
+        workers = list(self.__queue)
+        self.__queue.clear()
+
+        if workers and self.__counter is not None:
+            self.__counter.decrement(*(worker.ticket for worker in workers))
+
     def stop(self):
         self.__stop_event.set()
+
+        if self.__pool is not None:
+            # the queue is emptied by the pool. Waiting from inside of the
+            # pool could dead lock when all of the threads are waiting.
+            if not self.__pool.is_pool_thread:
+                self.__idle_event.wait()
+
+            if self in NotificationHandler.node_handlers:
+                NotificationHandler.node_handlers.remove(self)
+            return
+
         self.__stall_event.set()
         if threading.current_thread() != self:
             if (
@@ -160,8 +471,14 @@ class NotificationHandler(object, metaclass=HandlerMeta):
             ):
                 self.__thread.join()
 
+        if not self.__thread.is_alive():
+            self.__discard()
+
         if self == NotificationHandler.network_handler:
             NotificationHandler.network_handler = None
+
+            if WorkerPool.instance is not None:
+                WorkerPool.instance.stop()
         elif self in NotificationHandler.node_handlers:
             NotificationHandler.node_handlers.remove(self)
 
@@ -171,17 +488,44 @@ class NotificationWorker(object):
         self.__func = func
         self.__args = args
         self.__kwargs = kwargs
-        self.__wait_event = threading.Event()
         self.__exception = None
         self.__result = None
-        self.__caller = utils.caller_name()
-        self.__file_name, self.__line_no = utils.get_line_and_file(3)
+        # set by the node handlers, see WorkCounter
+        self.ticket = None
+
+        if CAPTURE_CALLER_STACK:
+            self.__caller = utils.caller_name()
+            self.__file_name, self.__line_no = utils.get_line_and_file(3)
+            self.__code = None
+        else:
+            # only references to the code object and the module name of the
+            # caller are kept. The names get built if there is an exception.
+            try:
+                # noinspection PyProtectedMember
+                frame = sys._getframe(2)  # NOQA
+            except ValueError:
+                # noinspection PyProtectedMember
+                frame = sys._getframe(1)  # NOQA
+
+            self.__code = frame.f_code
+            self.__line_no = frame.f_lineno
+            self.__caller = frame.f_globals.get('__name__', '<string>')
+            self.__file_name = None
 
     @utils.logit
     def do(self):
         try:
             self.__func(*self.__args, **self.__kwargs)
         except Exception:  # NOQA
+            if self.__code is not None:
+                self.__file_name = self.__code.co_filename
+                self.__caller += '.' + getattr(
+                    self.__code,
+                    'co_qualname',
+                    self.__code.co_name
+                ).replace('<locals>.', '')
+                self.__code = None
+
             calling_logger = utils.calling_function_logger(self.__caller)
 
             if calling_logger is None:
@@ -200,8 +544,6 @@ class NotificationWorker(object):
 
             self.__exception = (calling_logger, msg)
 
-        self.__wait_event.clear()
-
     @property
     def has_exception(self):
         return self.__exception is not None
@@ -209,3 +551,121 @@ class NotificationWorker(object):
     def log_exception(self):
         calling_logger, msg = self.__exception
         calling_logger.error(msg)
+
+
+class NotificationRouter(object):
+    """
+    Routes openzwave notifications by the notification type.
+
+    The handlers are looked up using the integer value of the notification
+    type so routing a notification does not depend on how many types have
+    handlers.
+
+    A handler is either a callable that gets called with the object that
+    received the notification and the notification, or the name of a method
+    on that object which gets called with the notification. Using the name
+    allows a subclass to override the handling of a notification type.
+
+    .. code-block:: python
+
+        def on_node_event(node, notif):
+            print(node.id, notif.event)
+
+        ZWaveNode.notification_router.register(
+            PyNotifications.NodeEvent,
+            on_node_event
+        )
+
+    When there is more then a single handler for a notification type they are
+    called in the order they were registered. The default handler is used for
+    notification types that do not have any handlers, registering a handler
+    for one of those types replaces the default handling of the type.
+
+    :param default: handler for notification types that do not have any
+        handlers registered.
+    :type default: callable, str, optional
+    """
+
+    def __init__(self, default=None):
+        self.__default = None if default is None else (default,)
+        self.__handlers = {}
+        self.__lock = threading.Lock()
+
+    def register(self, notification_type, handler):
+        """
+        Adds a handler for a notification type.
+
+        :param notification_type: notification type
+        :type notification_type: int, _libopenzwave.NotificationItem
+
+        :param handler: handler
+        :type handler: callable, str
+        """
+        key = int(notification_type)
+
+        with self.__lock:
+            handlers = self.__handlers.get(key, ())
+
+            if handler not in handlers:
+                # the tuple is replaced and never changed so routing does
+                # not need the lock.
+                self.__handlers[key] = handlers + (handler,)
+
+    def unregister(self, notification_type, handler):
+        """
+        Removes a handler for a notification type.
+
+        :param notification_type: notification type
+        :type notification_type: int, _libopenzwave.NotificationItem
+
+        :param handler: handler
+        :type handler: callable, str
+        """
+        key = int(notification_type)
+
+        with self.__lock:
+            handlers = tuple(
+                h for h in self.__handlers.get(key, ()) if h != handler
+            )
+
+            if handlers:
+                self.__handlers[key] = handlers
+            else:
+                self.__handlers.pop(key, None)
+
+    def handlers(self, notification_type):
+        """
+        Handlers of a notification type.
+
+        :param notification_type: notification type
+        :type notification_type: int, _libopenzwave.NotificationItem
+
+        :rtype: tuple
+        """
+        return self.__handlers.get(int(notification_type), ())
+
+    def route(self, obj, notif):
+        """
+        Passes a notification to the handlers of its type.
+
+        :param obj: object that received the notification
+        :type obj: Any
+
+        :param notif: notification
+        :type notif: _libopenzwave.ZWaveNotification
+
+        :return: `False` if there is no handler for the notification
+        :rtype: bool
+        """
+        handlers = self.__handlers.get(int(notif.type), self.__default)
+
+        if handlers is None:
+            return False
+
+        for handler in handlers:
+            if isinstance(handler, str):
+                getattr(obj, handler)(notif)
+            else:
+                handler(obj, notif)
+
+        return True
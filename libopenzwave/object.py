@@ -58,6 +58,9 @@ class ZWaveObject(object, metaclass=InstanceSingleton):
         self._object_id = object_id
         self._xml_handler = xml_data
         self._dataset_loaded = False
+        # the hash is computed a single time. Only a single instance exists
+        # for an id so the hash does not need to change if the id does.
+        self._hash = hash(object_id)
 
     @property
     def xml_handler(self):
@@ -73,8 +76,11 @@ class ZWaveObject(object, metaclass=InstanceSingleton):
 
         :rtype: bool
         """
+        if other is self:
+            return True
+
         if isinstance(other, ZWaveObject):
-            return object.__eq__(self, other)
+            return False
 
         if isinstance(other, int):
             if hasattr(self, '_cls_ids'):
@@ -103,7 +109,7 @@ class ZWaveObject(object, metaclass=InstanceSingleton):
         """
         :rtype: hash
         """
-        return hash(str(self))
+        return self._hash
 
     @property
     def id(self):
@@ -130,6 +130,7 @@ class ZWaveOption(_libopenzwave.PyOptions):
         self.__ssl_key_path = None
         self.__ssl_server_cert_path = None
         self.__ssl_client_cert_path = None
+        self.__queued_notifications = False
         self._local_connection = True
         self.__is_locked = False
 
@@ -401,6 +402,41 @@ class ZWaveOption(_libopenzwave.PyOptions):
 
         notification_handler.use_single_handler = value
 
+    @property
+    def notification_worker_pool_size(self):
+        """
+        Number of threads that process the node notifications.
+
+        When this is set to 0 every node gets a thread worker of its own, see
+        :py:attr:`single_notification_handler`. On a large network that is a
+        lot of threads that keep getting stopped and started again.
+
+        When set to a number larger than 0 the notifications of all of the
+        nodes are processed by a fixed number of threads. The notifications
+        of a single node are still processed one at a time and in the order
+        they came in. The threads sleep until there is a notification to
+        process.
+
+        This has no effect when :py:attr:`single_notification_handler` is set
+        to `True`.
+
+        Defaulted to `0`
+
+        :param value: number of threads
+        :type value: int
+
+        :return: number of threads
+        :rtype: int
+        """
+        from . import notification_handler
+        return notification_handler.worker_pool_size
+
+    @notification_worker_pool_size.setter
+    def notification_worker_pool_size(self, value):
+        from . import notification_handler
+
+        notification_handler.worker_pool_size = int(value)
+
     @property
     def admin_password(self):
         """
@@ -439,6 +475,29 @@ class ZWaveOption(_libopenzwave.PyOptions):
         if self._local_connection:
             self.__use_server = value
 
+    @property
+    def queued_notifications(self):
+        """
+        Get/Set queued notifications.
+
+        When `True` the notifications from OpenZWave are copied into a queue
+        and handled in batches by a thread of their own. The thread
+        OpenZWave uses to send the notifications does not have to wait for
+        the notifications to be handled. This helps on a busy network.
+
+        Defaulted to `False`
+
+        :param value: `True` to queue the notifications and `False` to not.
+        :type value: bool
+
+        :rtype: bool
+        """
+        return self.__queued_notifications
+
+    @queued_notifications.setter
+    def queued_notifications(self, value):
+        self.__queued_notifications = value
+
     @property
     def ssl_key_path(self):
         """
@@ -0,0 +1,626 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Typed encoding for the binary wire protocol
+
+.. moduleauthor:: Kevin G Schlosser
+
+
+The binary protocol used to pickle the payloads. Pickle ties the data to the
+layout of the Python objects and unpickling data that comes from the network
+can run any code the sender wants it to.
+
+This module encodes the payloads using a small set of types. Every item
+starts with a tag byte
+
+* none, true, false
+* integers (small, 64 bit and arbitrary size)
+* float (double)
+* str (utf-8), bytes
+* list, tuple, dict, set
+* enumeration item (name of the enumeration and index of the item)
+* notification and value
+
+An enumeration item is any item of one of the enumerations in
+`_libopenzwave`, the receiving end turns it back into the item of the same
+enumeration. This is done wherever the item is, the result of a manager
+call or a snapshot gets the same items the local library would return.
+
+A notification is encoded as the notification type id, the home id, the
+node id and a bit mask of the fields that are set, followed by the fields
+that are set. A value is encoded the same way starting with the value id.
+The enumeration of those fields is already known so only the index of the
+item is sent.
+
+Anything that is not one of these types can not be encoded, there is no way
+to make the receiving end create an object of a type it is not expecting.
+"""
+
+import struct
+
+
+TAG_NONE = 0x00
+TAG_TRUE = 0x01
+TAG_FALSE = 0x02
+TAG_UINT8 = 0x03
+TAG_INT = 0x04
+TAG_BIG_INT = 0x05
+TAG_FLOAT = 0x06
+TAG_STR = 0x07
+TAG_BYTES = 0x08
+TAG_LIST = 0x09
+TAG_TUPLE = 0x0A
+TAG_DICT = 0x0B
+TAG_SET = 0x0C
+TAG_ENUM = 0x0D
+TAG_NOTIFICATION = 0x0E
+TAG_VALUE = 0x0F
+TAG_ENUM_ITEM = 0x10
+
+_UINT16 = struct.Struct('!H')
+_UINT32 = struct.Struct('!I')
+_INT64 = struct.Struct('!q')
+_DOUBLE = struct.Struct('!d')
+
+# type id, home id, node id, field mask
+_NOTIFICATION = struct.Struct('!HIHH')
+# value id, field mask
+_VALUE = struct.Struct('!QH')
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# (attribute name, name of the enumeration in _libopenzwave)
+NOTIFICATION_FIELDS = (
+    ('value', None),
+    ('group_id', None),
+    ('event', None),
+    ('notification_code', None),
+    ('controller_state', 'PyControllerState'),
+    ('controller_error', 'PyControllerError'),
+    ('controller_command', 'PyControllerCommand'),
+    ('button_id', None),
+    ('scene_id', None),
+    ('user_alert', 'PyUserAlerts'),
+)
+
+VALUE_FIELDS = (
+    ('command_class', None),
+    ('instance', None),
+    ('index', None),
+    ('genre', 'PyGenres'),
+    ('type', 'PyValueTypes'),
+    ('data', None),
+    ('label', None),
+    ('units', None),
+    ('is_read_only', None),
+)
+
+
+class CodecError(ValueError):
+    pass
+
+
+def _encode_none(_, out):
+    out.append(TAG_NONE)
+
+
+def _encode_bool(obj, out):
+    out.append(TAG_TRUE if obj else TAG_FALSE)
+
+
+def _encode_int(obj, out):
+    if 0 <= obj <= 0xFF:
+        out.append(TAG_UINT8)
+        out.append(obj)
+    elif _INT64_MIN <= obj <= _INT64_MAX:
+        out.append(TAG_INT)
+        out += _INT64.pack(obj)
+    else:
+        data = int(obj).to_bytes(
+            (obj.bit_length() + 8) // 8,
+            'big',
+            signed=True
+        )
+        out.append(TAG_BIG_INT)
+        out += _UINT32.pack(len(data))
+        out += data
+
+
+def _encode_float(obj, out):
+    out.append(TAG_FLOAT)
+    out += _DOUBLE.pack(obj)
+
+
+def _encode_str(obj, out):
+    data = obj.encode('utf-8')
+    out.append(TAG_STR)
+    out += _UINT32.pack(len(data))
+    out += data
+
+
+def _encode_bytes(obj, out):
+    out.append(TAG_BYTES)
+    out += _UINT32.pack(len(obj))
+    out += obj
+
+
+def _encode_sequence(tag, items, out):
+    out.append(tag)
+    out += _UINT32.pack(len(items))
+
+    for item in items:
+        _encode(item, out)
+
+
+def _encode_list(obj, out):
+    _encode_sequence(TAG_LIST, obj, out)
+
+
+def _encode_tuple(obj, out):
+    _encode_sequence(TAG_TUPLE, obj, out)
+
+
+def _encode_set(obj, out):
+    _encode_sequence(TAG_SET, list(obj), out)
+
+
+def _encode_dict(obj, out):
+    out.append(TAG_DICT)
+    out += _UINT32.pack(len(obj))
+
+    for key, value in obj.items():
+        _encode(key, out)
+        _encode(value, out)
+
+
+_ENCODERS = {
+    type(None): _encode_none,
+    bool: _encode_bool,
+    int: _encode_int,
+    float: _encode_float,
+    str: _encode_str,
+    bytes: _encode_bytes,
+    bytearray: _encode_bytes,
+    list: _encode_list,
+    tuple: _encode_tuple,
+    dict: _encode_dict,
+    set: _encode_set,
+    frozenset: _encode_set,
+}
+
+
+def _encode_enum_item(obj, out):
+    # returns False if the object is not an item of one of the enumerations
+    try:
+        name, index = _enum_names()[id(obj)]
+    except KeyError:
+        # an item that is not the one held by the enumeration, it is looked
+        # up using the name and the index of the item
+        try:
+            name, index = _enum_names()[(str(obj), obj.index)]
+        except (KeyError, TypeError):
+            return False
+
+    data = name.encode('utf-8')
+    out.append(TAG_ENUM_ITEM)
+    out.append(len(data))
+    out += data
+    out += _UINT16.pack(index)
+    return True
+
+
+def _encode(obj, out):
+    try:
+        encoder = _ENCODERS[type(obj)]
+    except KeyError:
+        # enumeration items are str subclasses that carry an index
+        if (
+            isinstance(obj, str) and
+            isinstance(getattr(obj, 'index', None), int) and
+            _encode_enum_item(obj, out)
+        ):
+            return
+
+        # subclasses of the supported types, bool has to be checked before
+        # int
+        for cls in (bool, int, float, str, bytes, list, tuple, dict, set):
+            if isinstance(obj, cls):
+                encoder = _ENCODERS[cls]
+                break
+        else:
+            raise TypeError(
+                'unable to encode object of type {0}'.format(
+                    type(obj).__name__
+                )
+            )
+
+    encoder(obj, out)
+
+
+def _encode_enum(item, out):
+    # enumeration items are str subclasses that carry an index, the index
+    # is sent in place of the name.
+    if isinstance(item, int):
+        index = item
+    else:
+        index = getattr(item, 'index', None)
+
+    if isinstance(index, int) and not isinstance(index, bool) and (
+        0 <= index <= 0xFFFF
+    ):
+        out.append(TAG_ENUM)
+        out += _UINT16.pack(index)
+    else:
+        _encode(item, out)
+
+
+def _encode_fields(obj, fields, out):
+    # returns the mask of the fields that are set, the fields get added to
+    # out
+    mask = 0
+
+    for i, (name, enum) in enumerate(fields):
+        item = getattr(obj, name, None)
+
+        if item is None:
+            continue
+
+        mask |= 1 << i
+
+        if name == 'value':
+            _encode_value(item, out)
+        elif enum is None:
+            _encode(item, out)
+        else:
+            _encode_enum(item, out)
+
+    return mask
+
+
+def _encode_value(value, out):
+    out.append(TAG_VALUE)
+    start = len(out)
+    out += _VALUE.pack(value.id, 0)
+    mask = _encode_fields(value, VALUE_FIELDS, out)
+    _VALUE.pack_into(out, start, value.id, mask)
+
+
+def encode(obj):
+    """
+    Encodes an object.
+
+    :param obj: object made up of the supported types
+    :type obj: Any
+
+    :rtype: bytes
+
+    :raises: TypeError if something in the object can not be encoded
+    """
+    out = bytearray()
+    _encode(obj, out)
+    return bytes(out)
+
+
+def encode_notification(notification):
+    """
+    Encodes a notification.
+
+    :param notification: notification
+    :type notification: _libopenzwave.ZWaveNotification
+
+    :rtype: bytes
+
+    :raises: TypeError if a field of the notification can not be encoded
+    """
+    out = bytearray()
+    out.append(TAG_NOTIFICATION)
+    out += _NOTIFICATION.pack(0, 0, 0, 0)
+    mask = _encode_fields(notification, NOTIFICATION_FIELDS, out)
+    _NOTIFICATION.pack_into(
+        out,
+        1,
+        int(notification.type),
+        notification.home_id,
+        int(notification.node_id),
+        mask
+    )
+    return bytes(out)
+
+
+# enumeration name -> {index: item}
+_enum_tables = {}
+# id of an item or (name of the item, index) -> (enumeration name, index)
+_enum_items = {}
+_classes = []
+
+
+def _load_enums():
+    # imported when needed so the server and the client can be imported
+    # without the extension module
+    if _enum_tables:
+        return
+
+    try:
+        import _libopenzwave
+    except ImportError:
+        return
+
+    enum_cls = getattr(_libopenzwave, 'Enum', None)
+
+    if not isinstance(enum_cls, type):
+        return
+
+    for name, enum in sorted(vars(_libopenzwave).items()):
+        if not isinstance(enum, enum_cls):
+            continue
+
+        table = {}
+
+        for item in enum.values():
+            index = int(item)
+
+            if not 0 <= index <= 0xFFFF:
+                continue
+
+            table[index] = item
+            _enum_items[id(item)] = (name, index)
+            _enum_items.setdefault((str(item), index), (name, index))
+
+        _enum_tables[name] = table
+
+
+def _enum_names():
+    if not _enum_tables:
+        _load_enums()
+
+    return _enum_items
+
+
+def _enum_table(name):
+    if not _enum_tables:
+        _load_enums()
+
+    try:
+        return _enum_tables[name]
+    except KeyError:
+        raise CodecError('unknown enumeration {0!r}'.format(name))
+
+
+def _enum_item(name, index):
+    return _enum_table(name).get(index, index)
+
+
+def _notification_classes():
+    # imported when needed so the server and the client can be imported
+    # without the extension module
+    if not _classes:
+        from _libopenzwave import ZWaveNotification, Value
+        _classes.extend((ZWaveNotification, Value))
+
+    return _classes
+
+
+def _decode_length(data, offset):
+    return _UINT32.unpack_from(data, offset)[0], offset + 4
+
+
+def _decode_uint8(data, offset):
+    return data[offset], offset + 1
+
+
+def _decode_int(data, offset):
+    return _INT64.unpack_from(data, offset)[0], offset + 8
+
+
+def _decode_big_int(data, offset):
+    length, offset = _decode_length(data, offset)
+    end = offset + length
+    return int.from_bytes(data[offset:end], 'big', signed=True), end
+
+
+def _decode_float(data, offset):
+    return _DOUBLE.unpack_from(data, offset)[0], offset + 8
+
+
+def _decode_str(data, offset):
+    length, offset = _decode_length(data, offset)
+    end = offset + length
+
+    if end > len(data):
+        raise CodecError('data ended early')
+
+    return str(data[offset:end], 'utf-8'), end
+
+
+def _decode_bytes(data, offset):
+    length, offset = _decode_length(data, offset)
+    end = offset + length
+
+    if end > len(data):
+        raise CodecError('data ended early')
+
+    return bytes(data[offset:end]), end
+
+
+def _decode_items(data, offset):
+    count, offset = _decode_length(data, offset)
+    items = []
+
+    for _ in range(count):
+        item, offset = _decode(data, offset)
+        items.append(item)
+
+    return items, offset
+
+
+def _decode_tuple(data, offset):
+    items, offset = _decode_items(data, offset)
+    return tuple(items), offset
+
+
+def _decode_set(data, offset):
+    items, offset = _decode_items(data, offset)
+    return set(items), offset
+
+
+def _decode_dict(data, offset):
+    count, offset = _decode_length(data, offset)
+    res = {}
+
+    for _ in range(count):
+        key, offset = _decode(data, offset)
+        res[key], offset = _decode(data, offset)
+
+    return res, offset
+
+
+def _decode_enum(data, offset, enum=None):
+    index = _UINT16.unpack_from(data, offset)[0]
+
+    if enum is not None:
+        index = _enum_item(enum, index)
+
+    return index, offset + 2
+
+
+def _decode_enum_item(data, offset):
+    length = data[offset]
+    offset += 1
+    end = offset + length
+    name = str(data[offset:end], 'utf-8')
+    index = _UINT16.unpack_from(data, end)[0]
+
+    try:
+        item = _enum_table(name)[index]
+    except KeyError:
+        raise CodecError(
+            'unknown item {0} of enumeration {1!r}'.format(index, name)
+        )
+
+    return item, end + 2
+
+
+def _decode_fields(obj, fields, mask, data, offset):
+    for i, (name, enum) in enumerate(fields):
+        if mask & (1 << i):
+            if data[offset] == TAG_ENUM:
+                item, offset = _decode_enum(data, offset + 1, enum)
+            else:
+                item, offset = _decode(data, offset)
+
+            setattr(obj, name, item)
+
+    return offset
+
+
+def _decode_value(data, offset):
+    value_id, mask = _VALUE.unpack_from(data, offset)
+    value = _notification_classes()[1](value_id)
+    offset = _decode_fields(
+        value,
+        VALUE_FIELDS,
+        mask,
+        data,
+        offset + _VALUE.size
+    )
+    return value, offset
+
+
+def _decode_notification(data, offset):
+    type_id, home_id, node_id, mask = _NOTIFICATION.unpack_from(data, offset)
+    notification = _notification_classes()[0](
+        _enum_item('PyNotifications', type_id),
+        home_id,
+        node_id
+    )
+    offset = _decode_fields(
+        notification,
+        NOTIFICATION_FIELDS,
+        mask,
+        data,
+        offset + _NOTIFICATION.size
+    )
+    return notification, offset
+
+
+_DECODERS = {
+    TAG_NONE: lambda data, offset: (None, offset),
+    TAG_TRUE: lambda data, offset: (True, offset),
+    TAG_FALSE: lambda data, offset: (False, offset),
+    TAG_UINT8: _decode_uint8,
+    TAG_INT: _decode_int,
+    TAG_BIG_INT: _decode_big_int,
+    TAG_FLOAT: _decode_float,
+    TAG_STR: _decode_str,
+    TAG_BYTES: _decode_bytes,
+    TAG_LIST: _decode_items,
+    TAG_TUPLE: _decode_tuple,
+    TAG_DICT: _decode_dict,
+    TAG_SET: _decode_set,
+    TAG_ENUM: _decode_enum,
+    TAG_NOTIFICATION: _decode_notification,
+    TAG_VALUE: _decode_value,
+    TAG_ENUM_ITEM: _decode_enum_item,
+}
+
+
+def _decode(data, offset):
+    tag = data[offset]
+
+    try:
+        decoder = _DECODERS[tag]
+    except KeyError:
+        raise CodecError('unknown tag 0x{0:02X}'.format(tag))
+
+    return decoder(data, offset + 1)
+
+
+def decode(data):
+    """
+    Decodes data made by :py:func:`encode` or :py:func:`encode_notification`.
+
+    :param data: encoded data
+    :type data: bytes, memoryview
+
+    :rtype: Any
+
+    :raises: CodecError if the data is not valid
+    """
+    if isinstance(data, memoryview):
+        data = bytes(data)
+
+    try:
+        res, offset = _decode(data, 0)
+    except (IndexError, struct.error):
+        raise CodecError('data ended early')
+    except RecursionError:
+        raise CodecError('data is nested too deep')
+    except UnicodeDecodeError:
+        raise CodecError('str is not valid utf-8')
+    except TypeError:
+        # a list or a dict used as a key of a dict or as an item of a set
+        raise CodecError('unhashable key or set item')
+
+    if offset != len(data):
+        raise CodecError('extra data after the end')
+
+    return res
@@ -22,14 +22,53 @@ This file is part of the **libopenzwave** project
 :synopsis: Remote connection encryption
 
 .. moduleauthor:: Kevin G Schlosser
+
+
+:py:class:`AESCipher` uses the key that is made from the password for every
+message. Each message gets a random IV, gets padded and with the JSON
+protocol gets base64 encoded.
+
+:py:class:`SessionCipher` is used by the binary protocol. Both
+ends of the connection send :py:data:`SESSION_RANDOM_SIZE` random bytes when
+the connection is made. The password is put through PBKDF2 using the randoms
+as the salt, so every guess at the password of a recorded session costs
+:py:data:`PBKDF2_ITERATIONS` rounds of HMAC-SHA256. The result goes through
+HKDF to make keys for each direction of the connection that are only used
+for that connection.
+
+The cipher for each direction is made once and the frames are encrypted
+using AES-CTR as a single stream, so there is no IV or padding. Each frame
+gets a tag that is an HMAC-SHA256 of the frame number, the frame header and
+the encrypted payload. AES-GCM would do the same thing but pycryptodome
+takes longer to make a GCM cipher than it takes to encrypt a notification,
+and a GCM cipher has to be made for every frame.
 """
 
 import base64
 import hashlib
+import hmac
 import os
+import struct
 
 # noinspection PyPackageRequirements
 from Crypto.Cipher import AES  # NOQA
+# noinspection PyPackageRequirements
+from Crypto.Hash import SHA256  # NOQA
+# noinspection PyPackageRequirements
+from Crypto.Protocol.KDF import HKDF  # NOQA
+
+
+# number of random bytes each end sends when a session is started
+SESSION_RANDOM_SIZE = 16
+
+# size of the tag that gets added to each frame
+TAG_SIZE = 16
+
+# number of PBKDF2 rounds the password goes through for each session
+PBKDF2_ITERATIONS = 100000
+
+_SESSION_CONTEXT = b'libopenzwave remote session'
+_FRAME_NUMBER = struct.Struct('!Q')
 
 
 class AESCipher(object):
@@ -83,3 +122,148 @@ class AESCipher(object):
     @staticmethod
     def _unpad(s):
         return s[:-ord(s[len(s)-1:])]
+
+
+def _password_bytes(password):
+    if isinstance(password, bytes):
+        return password
+
+    return password.encode('ISO-8859-1')
+
+
+class SessionCipher(object):
+    """
+    Authenticated stream cipher for a single connection.
+
+    Frames have to be decrypted in the same order they have been encrypted
+    in. A frame that has been dropped, sent again or moved fails to
+    decrypt.
+
+    Making the cipher runs the password through PBKDF2, which takes a
+    while on purpose.
+
+    :param password: password
+    :type password: str
+
+    :param client_random: random bytes sent by the client
+    :type client_random: bytes
+
+    :param server_random: random bytes sent by the server
+    :type server_random: bytes
+
+    :param is_server: `True` if this is the server end of the connection
+    :type is_server: bool
+    """
+
+    overhead = TAG_SIZE
+
+    def __init__(self, password, client_random, server_random, is_server):
+        salt = client_random + server_random
+        secret = hashlib.pbkdf2_hmac(
+            'sha256',
+            _password_bytes(password),
+            _SESSION_CONTEXT + salt,
+            PBKDF2_ITERATIONS
+        )
+        client_key, client_mac, server_key, server_mac = HKDF(
+            secret,
+            32,
+            salt,
+            SHA256,
+            num_keys=4,
+            context=_SESSION_CONTEXT
+        )
+
+        if is_server:
+            encrypt_keys = server_key, server_mac
+            decrypt_keys = client_key, client_mac
+        else:
+            encrypt_keys = client_key, client_mac
+            decrypt_keys = server_key, server_mac
+
+        # each direction has its own keys so the counters of the 2 streams
+        # can both start at 0
+        self.__encrypt_cipher = AES.new(
+            encrypt_keys[0],
+            AES.MODE_CTR,
+            nonce=b'',
+            initial_value=0
+        )
+        self.__encrypt_mac = encrypt_keys[1]
+        self.__encrypt_count = 0
+
+        self.__decrypt_cipher = AES.new(
+            decrypt_keys[0],
+            AES.MODE_CTR,
+            nonce=b'',
+            initial_value=0
+        )
+        self.__decrypt_mac = decrypt_keys[1]
+        self.__decrypt_count = 0
+
+    @staticmethod
+    def random():
+        """
+        :return: random bytes to send when starting a session
+        :rtype: bytes
+        """
+        return os.urandom(SESSION_RANDOM_SIZE)
+
+    @staticmethod
+    def __tag(key, count, header, enc):
+        return hmac.digest(
+            key,
+            _FRAME_NUMBER.pack(count) + header + enc,
+            'sha256'
+        )[:TAG_SIZE]
+
+    def encrypt(self, raw, header=b''):
+        """
+        :param raw: data to encrypt
+        :type raw: bytes
+
+        :param header: data that is not encrypted but is covered by the tag
+        :type header: bytes, optional
+
+        :return: encrypted data followed by the tag
+        :rtype: bytes
+        """
+        enc = self.__encrypt_cipher.encrypt(raw)
+        tag = self.__tag(
+            self.__encrypt_mac,
+            self.__encrypt_count,
+            header,
+            enc
+        )
+        self.__encrypt_count += 1
+        return enc + tag
+
+    def decrypt(self, enc, header=b''):
+        """
+        :param enc: encrypted data followed by the tag
+        :type enc: bytes, memoryview
+
+        :param header: data the tag covers that is not encrypted
+        :type header: bytes, optional
+
+        :rtype: bytes
+
+        :raises: ValueError if the data has been changed or is not in order
+        """
+        if len(enc) < TAG_SIZE:
+            raise ValueError('encrypted data is too short')
+
+        data = bytes(enc[:-TAG_SIZE])
+        tag = self.__tag(
+            self.__decrypt_mac,
+            self.__decrypt_count,
+            header,
+            data
+        )
+
+        if not hmac.compare_digest(tag, bytes(enc[-TAG_SIZE:])):
+            raise ValueError('MAC check failed')
+
+        # the stream only moves once the frame is known to be good
+        self.__decrypt_count += 1
+        return self.__decrypt_cipher.decrypt(data)
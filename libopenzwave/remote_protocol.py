@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Binary wire protocol for the remote server and client
+
+.. moduleauthor:: Kevin G Schlosser
+
+
+The original wire protocol sends newline terminated JSON messages. The
+contents of a message get pickled, placed into JSON, encrypted, base64
+encoded and placed into JSON again.
+
+The binary protocol sends length prefixed frames. After connecting the
+client sends a hello which holds :py:data:`MAGIC` and the highest protocol
+version the client supports. The server replies with a hello holding the
+version that is going to be used. A server that does not support the binary
+protocol never replies, the client then connects again using the JSON
+protocol.
+
+Right after the hello the client sends a session frame that holds random
+bytes and the server replies with a session frame that holds its own random
+bytes, these 2 frames are not encrypted. Every frame after that is encrypted
+using :py:class:`libopenzwave.remote_encryption.SessionCipher`.
+
+Every frame after the hello starts with a header
+
+* length of the payload (uint32)
+* frame type (uint8)
+* message id (uint32)
+
+followed by the encrypted payload. The payloads of the notifications,
+snapshots and results are encoded using :py:mod:`libopenzwave.remote_codec`,
+the payloads of the requests are JSON. The message id is a counter that is
+kept by the side that sends the frame, a result frame carries the message id
+of the request it is the result of. The client can send requests without
+waiting for the results of the previous requests. A batch frame holds a list
+of requests that the server runs in order, the result frame holds a list of
+the results.
+
+The message id of a notification frame is a sequence number. The client
+sends a resume frame after the session has been started, it holds the
+session of the server and the sequence number of the last notification the
+client has received. When the server still has the notifications that came
+after that sequence number it replies with a resume frame followed by those
+notifications. Otherwise it replies with a snapshot frame that holds the
+whole network (see :py:mod:`libopenzwave.remote_snapshot`) and the sequence
+number the snapshot is current to.
+
+The subscribe frame holds the
+:py:class:`libopenzwave.remote_subscription.Subscription` of the client and
+can be sent at any time after the session has been started. The client also
+acknowledges the notifications it has processed by sending an ack frame, the
+message id of the ack frame is the sequence number of the last notification
+that has been processed. A single ack covers every notification up to that
+sequence number. The server uses the acks to know how far behind a client
+is.
+"""
+
+import struct
+
+
+PROTOCOL_JSON = 0
+PROTOCOL_BINARY = 1
+
+PROTOCOL_VERSION = 1
+
+MAGIC = b'OZWB'
+
+HELLO = struct.Struct('!4sB')
+HEADER = struct.Struct('!IBI')
+
+FRAME_REQUEST = 0x01
+FRAME_RESULT = 0x02
+FRAME_NOTIFICATION = 0x03
+FRAME_BATCH = 0x04
+FRAME_RESUME = 0x05
+FRAME_SNAPSHOT = 0x06
+FRAME_SUBSCRIBE = 0x07
+FRAME_ACK = 0x08
+FRAME_SESSION = 0x09
+
+# largest payload that is accepted, anything larger means the stream is
+# out of sync or the remote end is misbehaving.
+MAX_PAYLOAD_SIZE = 16 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode_hello(version=PROTOCOL_VERSION):
+    """
+    :param version: protocol version
+    :type version: int
+
+    :rtype: bytes
+    """
+    return HELLO.pack(MAGIC, version)
+
+
+def decode_hello(data):
+    """
+    :param data: received data
+    :type data: bytes
+
+    :return: protocol version, `None` if `data` is not a hello
+    :rtype: int, None
+    """
+    if len(data) < HELLO.size:
+        return None
+
+    magic, version = HELLO.unpack_from(data)
+
+    if magic != MAGIC:
+        return None
+
+    return version
+
+
+def is_hello(data):
+    """
+    Checks if the start of the data that has been received could be a hello.
+
+    :param data: received data
+    :type data: bytes
+
+    :rtype: bool
+    """
+    return MAGIC.startswith(bytes(data[:len(MAGIC)]))
+
+
+def encode_frame(frame_type, message_id, payload, cipher=None):
+    """
+    :param frame_type: one of the `FRAME_*` constants
+    :type frame_type: int
+
+    :param message_id: message id
+    :type message_id: int
+
+    :param payload: payload
+    :type payload: bytes
+
+    :param cipher: session cipher, the payload gets encrypted and the
+        header is covered by the tag
+    :type cipher: libopenzwave.remote_encryption.SessionCipher, optional
+
+    :rtype: bytes
+    """
+    if cipher is None:
+        return HEADER.pack(len(payload), frame_type, message_id) + payload
+
+    header = HEADER.pack(
+        len(payload) + cipher.overhead,
+        frame_type,
+        message_id
+    )
+    return header + cipher.encrypt(payload, header)
+
+
+def decrypt_frame(cipher, frame_type, message_id, payload):
+    """
+    Decrypts the payload of a frame that has been encrypted using a session
+    cipher.
+
+    :param cipher: session cipher
+    :type cipher: libopenzwave.remote_encryption.SessionCipher
+
+    :param frame_type: frame type
+    :type frame_type: int
+
+    :param message_id: message id
+    :type message_id: int
+
+    :param payload: encrypted payload
+    :type payload: bytes, memoryview
+
+    :rtype: bytes
+
+    :raises: ValueError if the frame has been changed
+    """
+    return cipher.decrypt(
+        payload,
+        HEADER.pack(len(payload), frame_type, message_id)
+    )
+
+
+class FrameBuffer(object):
+    """
+    Receive buffer for the binary protocol.
+
+    The data is received directly into a buffer that gets reused. The
+    payloads that :py:meth:`frames` returns are views into that buffer so
+    they are only valid until data gets received into the buffer again.
+
+    :param size: starting size of the buffer, the buffer grows when a frame
+        is larger
+    :type size: int, optional
+    """
+
+    def __init__(self, size=65536):
+        self.__buffer = bytearray(size)
+        self.__view = memoryview(self.__buffer)
+        self.__start = 0
+        self.__end = 0
+
+    def __len__(self):
+        return self.__end - self.__start
+
+    def __make_room(self, size):
+        # moves the data that has not been processed to the front of the
+        # buffer, a larger buffer is made if there is not enough room
+        length = self.__end - self.__start
+
+        if self.__start == self.__end:
+            self.__start = self.__end = 0
+
+        if len(self.__buffer) - self.__end >= size:
+            return
+
+        if length + size > len(self.__buffer):
+            new_size = len(self.__buffer)
+
+            while length + size > new_size:
+                new_size *= 2
+
+            buf = bytearray(new_size)
+            buf[:length] = self.__view[self.__start:self.__end]
+            self.__buffer = buf
+            self.__view = memoryview(buf)
+
+        else:
+            self.__view[:length] = self.__view[self.__start:self.__end]
+
+        self.__start = 0
+        self.__end = length
+
+    def recv_into(self, sock, size=8192):
+        """
+        Receives data from a socket.
+
+        :param sock: socket to receive from
+        :type sock: socket.socket
+
+        :param size: maximum number of bytes to receive
+        :type size: int, optional
+
+        :return: number of bytes received, 0 if the socket has been closed
+        :rtype: int
+        """
+        self.__make_room(size)
+        count = sock.recv_into(self.__view[self.__end:self.__end + size])
+        self.__end += count
+        return count
+
+    def feed(self, data):
+        """
+        Adds data to the buffer.
+
+        :param data: data
+        :type data: bytes
+        """
+        self.__make_room(len(data))
+        self.__view[self.__end:self.__end + len(data)] = data
+        self.__end += len(data)
+
+    def read(self, size):
+        """
+        Removes data from the front of the buffer.
+
+        :param size: number of bytes
+        :type size: int
+
+        :rtype: bytes
+        """
+        size = min(size, self.__end - self.__start)
+        data = bytes(self.__view[self.__start:self.__start + size])
+        self.__start += size
+        return data
+
+    def peek(self):
+        """
+        :return: the data in the buffer that has not been processed
+        :rtype: memoryview
+        """
+        return self.__view[self.__start:self.__end]
+
+    def frames(self):
+        """
+        Returns the complete frames that are in the buffer.
+
+        :return: iterator of `(frame type, message id, payload)`
+        :rtype: Iterator[Tuple[int, int, memoryview]]
+
+        :raises: ProtocolError if a frame is larger than
+            :py:data:`MAX_PAYLOAD_SIZE`
+        """
+        header_size = HEADER.size
+
+        while self.__end - self.__start >= header_size:
+            length, frame_type, message_id = HEADER.unpack_from(
+                self.__buffer,
+                self.__start
+            )
+
+            if length > MAX_PAYLOAD_SIZE:
+                raise ProtocolError('frame too large ({0})'.format(length))
+
+            start = self.__start + header_size
+            end = start + length
+
+            if end > self.__end:
+                break
+
+            self.__start = end
+            yield frame_type, message_id, self.__view[start:end]
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Network snapshot for the remote server and client
+
+.. moduleauthor:: Kevin G Schlosser
+
+
+When a client connects the server has to send it the network. This used to
+be done by sending a notification for every node and every value, each one
+encoded and encrypted on its own.
+
+A snapshot holds the state of the network using only builtin types so it
+gets encoded using :py:mod:`libopenzwave.remote_codec` and encrypted a
+single time. The client turns the snapshot back into the notifications that
+the network needs to build the nodes and the values without anything going
+over the connection.
+
+A client that connects again gets a snapshot when the server is not able to
+send the notifications it has missed. The client network already has nodes
+and values at that point, :py:func:`removed` makes the notifications that
+remove the ones that are not in the snapshot anymore.
+
+.. code-block:: python
+
+    {
+        'home_id': 0xE1A2B3C4,
+        'controller_id': 1,
+        'is_ready': True,
+        'nodes': [
+            # node id, is ready, is sleeping, is failed, values
+            (
+                1,
+                True,
+                False,
+                False,
+                [
+                    # id, command class, instance, index, genre, type,
+                    # data, label, units, is read only
+                    (
+                        72057594055229441,
+                        0x25,
+                        1,
+                        0,
+                        'User',
+                        'Bool',
+                        False,
+                        'Switch',
+                        '',
+                        False
+                    ),
+                ]
+            ),
+        ]
+    }
+"""
+
+VALUE_FIELDS = (
+    'id',
+    'command_class',
+    'instance',
+    'index',
+    'genre',
+    'type',
+    'data',
+    'label',
+    'units',
+    'is_read_only'
+)
+
+
+def create_snapshot(network):
+    """
+    Collects the state of a network.
+
+    :param network: network
+    :type network: libopenzwave.network.ZWaveNetwork
+
+    :return: snapshot, `None` if the network has not started
+    :rtype: dict, None
+    """
+    controller = network.controller
+
+    if controller is None:
+        return None
+
+    manager = network.manager
+    nodes = {}
+
+    # the values of the endpoints are sent with the node the endpoint
+    # belongs to, the instance of the value tells the node which endpoint
+    # it is for.
+    for node in list(network.nodes.values()):
+        node_id = node.id.node_id
+
+        if node_id not in nodes:
+            nodes[node_id] = [node_id, False, False, False, []]
+
+        entry = nodes[node_id]
+
+        if not node.is_endpoint:
+            entry[1] = node.is_ready
+            entry[2] = node.is_sleeping
+            entry[3] = node.is_failed
+
+        for value in node:
+            entry[4].append((
+                value.id,
+                value.command_class.class_id,
+                value.instance,
+                value.index,
+                value.genre,
+                value.type,
+                manager.getValue(value.id),
+                value.label,
+                value.units,
+                value.is_read_only
+            ))
+
+    return dict(
+        home_id=network.home_id,
+        controller_id=controller.id.node_id,
+        is_ready=network.state == network.STATE_READY,
+        nodes=[tuple(nodes[node_id]) for node_id in sorted(nodes)]
+    )
+
+
+def notifications(snapshot):
+    """
+    Turns a snapshot into notifications.
+
+    These are the same notifications the network gets when it is started.
+
+    :param snapshot: snapshot from :py:func:`create_snapshot`
+    :type snapshot: dict
+
+    :rtype: Iterator[_libopenzwave.ZWaveNotification]
+    """
+    from _libopenzwave import (
+        PyNotifications,
+        Value,
+        ZWaveNotification,
+        PyNotificationCodes
+    )
+
+    home_id = snapshot['home_id']
+    controller_id = snapshot['controller_id']
+
+    yield ZWaveNotification(
+        PyNotifications.DriverReady,
+        home_id,
+        controller_id
+    )
+    yield ZWaveNotification(
+        PyNotifications.ManufacturerSpecificDBReady,
+        home_id,
+        0
+    )
+
+    sleeping_nodes = False
+    dead_nodes = False
+
+    for node_id, is_ready, is_sleeping, is_failed, values in (
+        snapshot['nodes']
+    ):
+        yield ZWaveNotification(PyNotifications.NodeAdded, home_id, node_id)
+        yield ZWaveNotification(
+            PyNotifications.NodeProtocolInfo,
+            home_id,
+            node_id
+        )
+        yield ZWaveNotification(
+            PyNotifications.EssentialNodeQueriesComplete,
+            home_id,
+            node_id
+        )
+
+        for fields in values:
+            notif = ZWaveNotification(
+                PyNotifications.ValueAdded,
+                home_id,
+                node_id
+            )
+            notif.value = Value(fields[0])
+
+            for name, field in zip(VALUE_FIELDS[1:], fields[1:]):
+                setattr(notif.value, name, field)
+
+            yield notif
+
+        if is_ready:
+            yield ZWaveNotification(
+                PyNotifications.NodeNaming,
+                home_id,
+                node_id
+            )
+
+            if node_id != controller_id:
+                notif = ZWaveNotification(
+                    PyNotifications.Notification,
+                    home_id,
+                    node_id
+                )
+                notif.notification_code = PyNotificationCodes.NoOperation
+                yield notif
+
+            yield ZWaveNotification(
+                PyNotifications.NodeQueriesComplete,
+                home_id,
+                node_id
+            )
+
+        if is_sleeping:
+            sleeping_nodes = True
+
+        if is_failed:
+            dead_nodes = True
+
+    if snapshot['is_ready']:
+        if dead_nodes:
+            notif_type = PyNotifications.AllNodesQueriedSomeDead
+        elif sleeping_nodes:
+            notif_type = PyNotifications.AwakeNodesQueried
+        else:
+            notif_type = PyNotifications.AllNodesQueried
+
+        yield ZWaveNotification(notif_type, home_id, 0)
+
+
+def removed(snapshot, network):
+    """
+    Turns the nodes and values a network has that are not in a snapshot into
+    notifications that remove them.
+
+    Values that have not been matched up with a value in openzwave yet
+    (negative ids that were loaded from the dataset) are left alone.
+
+    :param snapshot: snapshot from :py:func:`create_snapshot`
+    :type snapshot: dict
+
+    :param network: network the snapshot gets applied to
+    :type network: libopenzwave.network.ZWaveNetwork
+
+    :rtype: Iterator[_libopenzwave.ZWaveNotification]
+    """
+    from _libopenzwave import (
+        PyNotifications,
+        Value,
+        ZWaveNotification
+    )
+
+    home_id = snapshot['home_id']
+    value_ids = dict(
+        (node[0], set(fields[0] for fields in node[4]))
+        for node in snapshot['nodes']
+    )
+    removed_nodes = set()
+
+    for node in list(network.nodes.values()):
+        node_id = node.id.node_id
+
+        if node_id not in value_ids:
+            # removing the node removes the endpoints of the node as well
+            if node_id not in removed_nodes:
+                removed_nodes.add(node_id)
+                yield ZWaveNotification(
+                    PyNotifications.NodeRemoved,
+                    home_id,
+                    node_id
+                )
+            continue
+
+        for value in list(node):
+            if value.id < 0 or value.id in value_ids[node_id]:
+                continue
+
+            notif = ZWaveNotification(
+                PyNotifications.ValueRemoved,
+                home_id,
+                node_id
+            )
+            notif.value = Value(value.id)
+            notif.value.command_class = value.command_class.class_id
+            notif.value.instance = value.instance
+            notif.value.index = value.index
+
+            yield notif
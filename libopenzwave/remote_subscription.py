@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Notification subscriptions for the remote server and client
+
+.. moduleauthor:: Kevin G Schlosser
+
+
+A client that uses the binary protocol is able to tell the server which of
+the value notifications it wants. Only the notifications in
+:py:data:`STREAM_NOTIFICATIONS` are filtered, these are the ones a device
+like a power meter sends every second. The notifications that change what
+the network is made of (nodes and values being added or removed and so on)
+are always sent so the network of the client stays the same as the network
+of the server.
+
+A subscription can also have a coalescing window. The value notifications
+are then held by the server for the length of the window and only the
+latest notification for each value gets sent.
+
+.. code-block:: python
+
+    client.subscribe(
+        nodes=[5, 6],
+        genres=['User'],
+        coalesce=1.0
+    )
+"""
+
+# notifications that get filtered and coalesced
+STREAM_NOTIFICATIONS = frozenset(['ValueChanged', 'ValueRefreshed'])
+
+
+def is_stream(n):
+    """
+    Checks if a notification is one that gets filtered and coalesced.
+
+    :param n: notification
+    :type n: _libopenzwave.ZWaveNotification
+
+    :rtype: bool
+    """
+    return n.type in STREAM_NOTIFICATIONS and n.value is not None
+
+
+def _to_set(items, convert):
+    if items is None:
+        return None
+
+    return frozenset(convert(item) for item in items)
+
+
+class Subscription(object):
+    """
+    Which value notifications a client wants.
+
+    A filter that is `None` lets everything through.
+
+    :param nodes: node ids
+    :type nodes: Iterable[int], optional
+
+    :param command_classes: command class ids
+    :type command_classes: Iterable[int], optional
+
+    :param value_ids: value ids
+    :type value_ids: Iterable[int], optional
+
+    :param genres: genre names, `'User'`, `'Config'`, `'System'` or
+        `'Basic'`
+    :type genres: Iterable[str], optional
+
+    :param coalesce: number of seconds the value notifications are held so
+        only the latest notification for each value gets sent, 0 sends
+        them right away
+    :type coalesce: float, optional
+    """
+
+    def __init__(
+        self,
+        nodes=None,
+        command_classes=None,
+        value_ids=None,
+        genres=None,
+        coalesce=0.0
+    ):
+        self.nodes = _to_set(nodes, int)
+        self.command_classes = _to_set(command_classes, int)
+        self.value_ids = _to_set(value_ids, int)
+        self.genres = _to_set(genres, str)
+        self.coalesce = max(float(coalesce or 0.0), 0.0)
+
+    def __repr__(self):
+        return (
+            'Subscription(nodes={0}, command_classes={1}, value_ids={2}, '
+            'genres={3}, coalesce={4})'.format(
+                self.__sorted(self.nodes),
+                self.__sorted(self.command_classes),
+                self.__sorted(self.value_ids),
+                self.__sorted(self.genres),
+                self.coalesce
+            )
+        )
+
+    @staticmethod
+    def __sorted(items):
+        if items is None:
+            return None
+
+        return sorted(items)
+
+    @property
+    def is_filtered(self):
+        """
+        :return: `True` if any of the filters are set
+        :rtype: bool
+        """
+        return not (
+            self.nodes is None and
+            self.command_classes is None and
+            self.value_ids is None and
+            self.genres is None
+        )
+
+    def matches(self, n):
+        """
+        Checks if a notification gets sent to the client.
+
+        :param n: notification
+        :type n: _libopenzwave.ZWaveNotification
+
+        :rtype: bool
+        """
+        if not is_stream(n):
+            return True
+
+        value = n.value
+
+        if self.nodes is not None and n.node_id not in self.nodes:
+            return False
+
+        if (
+            self.command_classes is not None and
+            value.command_class not in self.command_classes
+        ):
+            return False
+
+        if self.value_ids is not None and value.id not in self.value_ids:
+            return False
+
+        if self.genres is not None and value.genre not in self.genres:
+            return False
+
+        return True
+
+    def to_dict(self):
+        """
+        :return: the subscription using only types JSON is able to hold
+        :rtype: dict
+        """
+        return dict(
+            nodes=self.__sorted(self.nodes),
+            command_classes=self.__sorted(self.command_classes),
+            value_ids=self.__sorted(self.value_ids),
+            genres=self.__sorted(self.genres),
+            coalesce=self.coalesce
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        :param data: from :py:meth:`to_dict`
+        :type data: dict
+
+        :rtype: Subscription
+        """
+        return cls(
+            nodes=data.get('nodes', None),
+            command_classes=data.get('command_classes', None),
+            value_ids=data.get('value_ids', None),
+            genres=data.get('genres', None),
+            coalesce=data.get('coalesce', 0.0)
+        )
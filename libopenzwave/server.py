@@ -22,13 +22,49 @@ This file is part of the **libopenzwave** project
 :synopsis: Socket server
 
 .. moduleauthor:: Kevin G Schlosser
+
+
+The server handles any number of clients from a single thread using
+:py:mod:`selectors`. Nothing is ever sent directly to a client socket, the
+data gets placed into a write buffer for the client and the server thread
+sends it when the socket is able to take it. A notification is encoded once
+and gets encrypted using the session cipher of each client, a client that is
+slow to read only grows its own write buffer.
+
+A client that has more than :py:data:`WRITE_BUFFER_HIGH_WATER` bytes waiting
+to be sent to it does not get any of its requests read until it catches up.
+A client that has more than :py:data:`MAX_WRITE_BUFFER` bytes waiting gets
+disconnected.
+
+The calls into the manager are made from a single worker thread so a call
+that takes a while does not hold up sending notifications to the clients.
+
+Every notification gets a sequence number and the last
+:py:data:`RESUME_HISTORY` notifications are kept. A client that reconnects
+gets the notifications it missed, a new client or a client that has been
+gone for too long gets a snapshot of the network followed by the
+notifications that came after the snapshot.
+
+A client can subscribe to only some of the value notifications and can ask
+for them to be coalesced (see :py:mod:`libopenzwave.remote_subscription`).
+The client acknowledges the notifications it has processed, a client that
+has more than :py:data:`MAX_UNACKED` notifications that it has not
+acknowledged gets only the latest notification for each value until it
+catches up.
 """
 
 import ssl
 import json
 import logging
-from .remote_encryption import AESCipher
+import selectors
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from .remote_encryption import AESCipher, SessionCipher, SESSION_RANDOM_SIZE
 from .import utils
+from . import remote_codec
+from . import remote_protocol
+from . import remote_snapshot
+from . import remote_subscription
 import socket
 import threading
 import time
@@ -42,6 +78,107 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# number of seconds to wait for the hello of a client that uses the binary
+# protocol. Clients that use the JSON protocol do not send anything until
+# the network has been sent to them so this is how long they are delayed.
+HELLO_TIMEOUT = 2.0
+
+# number of bytes waiting to be sent to a client before that client stops
+# having its requests read, reading starts again once the client is below
+# WRITE_BUFFER_LOW_WATER.
+WRITE_BUFFER_HIGH_WATER = 1024 * 1024
+WRITE_BUFFER_LOW_WATER = 256 * 1024
+
+# number of bytes waiting to be sent to a client before the client gets
+# disconnected.
+MAX_WRITE_BUFFER = 8 * 1024 * 1024
+
+# number of connections that can be waiting to be accepted
+LISTEN_BACKLOG = 16
+
+# number of notifications that are kept so a client that reconnects can
+# pick up where it left off
+RESUME_HISTORY = 4096
+
+# number of notifications a client has not acknowledged before the value
+# notifications for that client get coalesced, they stop being coalesced
+# once the client is below half of this.
+MAX_UNACKED = 1024
+
+_WOULD_BLOCK = (
+    BlockingIOError,
+    InterruptedError,
+    ssl.SSLWantReadError,
+    ssl.SSLWantWriteError
+)
+
+
+class ClientConnection(object):
+    """
+    A client that is connected to the :py:class:`Server`.
+
+    :param sock: client socket
+    :type sock: socket.socket
+
+    :param address: client address
+    :type address: tuple
+    """
+
+    def __init__(self, sock, address):
+        self.socket = sock
+        self.address = address[0]
+        self.protocol = None
+        self.version = 0
+        # binary protocol, set once the session has been started
+        self.cipher = None
+        self.session_started = False
+        self.buffer = remote_protocol.FrameBuffer()
+        self.json_data = b''
+        self.message_cache = {}
+        self.connected_at = time.time()
+        self.events = selectors.EVENT_READ
+        self.lock = threading.Lock()
+        self.write_buffer = bytearray()
+        # notifications for a client that is waiting for the snapshot or
+        # the notifications it missed
+        self.held = None
+        self.subscription = None
+        # value notifications that are being coalesced, value id ->
+        # (sequence number, payload)
+        self.coalesced = collections.OrderedDict()
+        self.coalesced_at = 0.0
+        self.coalesced_size = 0
+        # sequence numbers that have been sent and not acknowledged
+        self.in_flight = collections.deque()
+        self.acked = 0
+        self.is_lagging = False
+        self.is_handshaking = isinstance(sock, ssl.SSLSocket)
+        self.handshake_events = selectors.EVENT_READ
+        self.is_paused = False
+        self.is_overflowed = False
+        self.is_closed = False
+
+    @property
+    def queued(self):
+        """
+        Number of bytes waiting to be sent.
+
+        :rtype: int
+        """
+        return len(self.write_buffer)
+
+    @property
+    def coalesce(self):
+        """
+        Number of seconds the value notifications are coalesced for.
+
+        :rtype: float
+        """
+        if self.subscription is None:
+            return 0.0
+
+        return self.subscription.coalesce
+
 
 class Server(object):
     """
@@ -55,18 +192,24 @@ class Server(object):
         self.client_cert = client_cert
         self.__aes = AESCipher(password)
         self.password = password
-        self.__client = None
         self.network = None
         self.port = port
         self.host = host
         self.socket = None
         self.event = threading.Event()
         self.thread = None
-        self.client = None
-        self.message_cache = {}
-        self.cache_lock = threading.Lock()
-        self.client_address = ''
         self.watchdog_timer = 0
+        self.__ssl_context = None
+        self.__selector = None
+        self.__executor = None
+        self.__connections = set()
+        self.__wake_sockets = None
+        self.__pending = set()
+        self.__pending_lock = threading.Lock()
+        self.session = uuid4().hex
+        self.sequence = 0
+        self.__history = collections.deque(maxlen=RESUME_HISTORY)
+        self.__sequence_lock = threading.Lock()
 
     @property
     def is_alive(self):
@@ -86,184 +229,904 @@ class Server(object):
         if self.thread is None:
             logger.info('starting server: ' + self.host + ':' + str(self.port))
             self.network = network
+            self.event.clear()
+
+            if None not in (self.key, self.server_cert, self.client_cert):
+                context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+                context.minimum_version = ssl.TLSVersion.TLSv1_2
+                context.verify_mode = ssl.CERT_REQUIRED
+                context.load_cert_chain(self.server_cert, self.key)
+                context.load_verify_locations(self.client_cert)
+                self.__ssl_context = context
+
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(5.0)
             self.socket.bind((self.host, self.port))
-            self.socket.listen(1)
+            self.socket.listen(LISTEN_BACKLOG)
+            self.socket.setblocking(False)
+
+            self.__wake_sockets = socket.socketpair()
+
+            for sock in self.__wake_sockets:
+                sock.setblocking(False)
+
+            self.__selector = selectors.DefaultSelector()
+            self.__selector.register(self.socket, selectors.EVENT_READ)
+            self.__selector.register(
+                self.__wake_sockets[0],
+                selectors.EVENT_READ
+            )
+            self.__executor = ThreadPoolExecutor(1)
+
             self.thread = threading.Thread(target=self.run)
+            self.thread.daemon = True
             self.thread.start()
 
     def run(self):
         """
         TODO: server.Server.run docstring
         """
+        selector = self.__selector
+
         while not self.event.is_set():
             self.watchdog_timer = time.time()
+
             try:
-                client, client_address = self.socket.accept()
+                events = selector.select(self.__select_timeout())
+            except (OSError, ValueError):
+                if not self.event.is_set():
+                    import traceback
+                    logger.error(traceback.format_exc())
+                break
 
-                client.settimeout(5.0)
-                if None not in (
-                    self.key,
-                    self.server_cert,
-                    self.client_cert
-                ):
+            for key, mask in events:
+                if key.fileobj is self.socket:
+                    self.__accept()
+                elif key.fileobj is self.__wake_sockets[0]:
+                    self.__drain_wake()
+                else:
+                    self.__handle_events(key.data, mask)
 
-                    client = ssl.wrap_socket(
-                        client,
-                        server_side=True,
-                        ca_certs=self.client_cert,
-                        certfile=self.server_cert,
-                        keyfile=self.key,
-                        cert_reqs=ssl.CERT_REQUIRED,
-                        ssl_version=ssl.PROTOCOL_TLSv1_2
-                    )
+            self.__process_pending()
+            self.__check_timeouts()
 
-                self.client = client
-                self.client_address = client_address[0]
-
-                logger.info('client connected: ' + self.client_address)
-                self.new_client()
-
-                data = ''
-                while True:
-                    self.watchdog_timer = time.time()
-                    try:
-                        new_data = client.recv(8192)
-                    except socket.timeout:
-                        with self.cache_lock:
-                            for id_, (message, timestamp) in list(
-                                self.message_cache.items()
-                            )[:]:
-                                if time.time() - timestamp >= 5:
-                                    client.send(message)
-                                    self.message_cache[id_] = (
-                                        message,
-                                        time.time()
-                                    )
-                        continue
-                    except socket.error:
-                        break
-
-                    if not new_data:
-                        break
-
-                    data += new_data
-
-                    while '\n' in data:
-                        message, data = data.split('\n', 1)
-                        message = json.loads(message)
-
-                        if 'resend' in message:
-                            # noinspection PyShadowingBuiltins
-                            id = message['resend']
-                            with self.cache_lock:
-                                if id in self.message_cache:
-                                    resend_message = self.message_cache[id][0]
-                                    client.send(resend_message)
-                                    self.message_cache[id] = (
-                                        resend_message,
-                                        time.time()
-                                    )
-
-                        elif 'ok' in message:
-                            # noinspection PyShadowingBuiltins
-                            id = message['ok']
-                            with self.cache_lock:
-                                if id in self.message_cache:
-                                    del self.message_cache[id]
-                        else:
-                            # noinspection PyShadowingBuiltins
-                            id = message['id']
-                            contents = message['contents']
-
-                            # noinspection PyPep8
-                            try:
-                                contents = self.__aes.decrypt(contents)
-                                message = json.loads(contents)
-                                client.send(json.dumps(dict(ok=id)) + '\n')
-                            except:  # NOQA
-                                logger.debug(
-                                    'bad message from client. '
-                                    'requesting retransmit. {0}'.format(id)
-                                )
-                                client.send(json.dumps(dict(resend=id)) + '\n')
-                                continue
-
-                            output = json.dumps(message, indent=4).split('\n')
-                            output = '\n'.join(
-                                '    ' + line for line in output
-                            )
+        for connection in list(self.__connections):
+            self.__close(connection)
 
-                            logger.debug(
-                                'incoming message ({0}): \n{1}'.format(
-                                    self.client_address,
-                                    output
-                                )
-                            )
+        self.__executor.shutdown(wait=False)
 
-                            message_id = str(uuid4())
+        for sock in (self.socket,) + tuple(self.__wake_sockets):
+            try:
+                sock.close()
+            except socket.error:
+                pass
 
-                            # noinspection PyPep8
-                            try:
-                                func = getattr(
-                                    self.network.manager, message['func']
-                                )
-                                res = func(
-                                    *message['args'],
-                                    **message['kwargs']
-                                )
+        selector.close()
 
-                            except:  # NOQA
-                                import traceback
-                                logging.error(traceback.format_exc())
+        self.socket = None
+        self.thread = None
+        logger.info('server stopped')
 
-                                res = None
+    def __select_timeout(self):
+        # clients that are still negotiating need to be switched to the
+        # JSON protocol once HELLO_TIMEOUT has expired
+        timeout = 1.0
+        now = time.time()
+
+        for connection in self.__connections:
+            if connection.protocol is None:
+                timeout = min(
+                    timeout,
+                    connection.connected_at + HELLO_TIMEOUT - now
+                )
+
+            elif connection.coalesced and not connection.is_lagging:
+                timeout = min(
+                    timeout,
+                    connection.coalesced_at + connection.coalesce - now
+                )
 
-                            res = pickle.dumps(res, 2).decode('ISO-8859-1')
+        return max(timeout, 0)
 
-                            contents = dict(id=message['id'], result=res)
-                            contents = self.__aes.encrypt(json.dumps(contents))
+    def __wake(self, connection):
+        # tells the server thread that something has changed with the
+        # connection, can be called from any thread
+        with self.__pending_lock:
+            was_empty = not self.__pending
+            self.__pending.add(connection)
 
-                            res = dict(id=message_id, contents=contents)
-                            res = json.dumps(res) + '\n'
+        if was_empty:
+            try:
+                self.__wake_sockets[1].send(b'\0')
+            except (socket.error, TypeError):
+                # the socket buffer is full, which means the server thread
+                # has not gotten to it yet, or the server has stopped
+                pass
 
-                            with self.cache_lock:
-                                self.message_cache[message_id] = (
-                                    res,
-                                    time.time()
-                                )
+    def __drain_wake(self):
+        try:
+            while self.__wake_sockets[0].recv(4096):
+                pass
+        except _WOULD_BLOCK:
+            pass
+        except socket.error:
+            pass
 
-                            client.send(res)
+    def __process_pending(self):
+        with self.__pending_lock:
+            pending = self.__pending
+            self.__pending = set()
 
-                try:
-                    client.close()
-                except socket.error:
-                    pass
+        for connection in pending:
+            # stop wakes the server thread without a connection
+            if connection is None or connection.is_closed:
+                continue
 
-                logger.info('client disconnected: ' + self.client_address)
+            if connection.is_overflowed:
+                logger.warning(
+                    'client is not keeping up, disconnecting: ' +
+                    connection.address
+                )
+                self.__close(connection)
+            else:
+                self.__update_events(connection)
 
-                self.client_address = ''
-                self.client = None
+    def __check_timeouts(self):
+        now = time.time()
 
-            except socket.timeout:
+        for connection in list(self.__connections):
+            if connection.is_closed:
                 continue
 
+            if connection.protocol is None:
+                if (
+                    not connection.is_handshaking and
+                    now - connection.connected_at >= HELLO_TIMEOUT
+                ):
+                    self.__start_client(
+                        connection,
+                        remote_protocol.PROTOCOL_JSON
+                    )
+
+            elif connection.protocol == remote_protocol.PROTOCOL_BINARY:
+                if (
+                    connection.coalesced and
+                    not connection.is_lagging and
+                    now - connection.coalesced_at >= connection.coalesce
+                ):
+                    with connection.lock:
+                        self.__flush(connection)
+
+                    self.__update_events(connection)
+
+            elif connection.protocol == remote_protocol.PROTOCOL_JSON:
+                # messages that have not been acknowledged get sent again
+                resend = []
+
+                with connection.lock:
+                    for id_, (message, timestamp) in list(
+                        connection.message_cache.items()
+                    ):
+                        if now - timestamp >= 5:
+                            connection.message_cache[id_] = (message, now)
+                            resend.append(message)
+
+                for message in resend:
+                    self.__queue(connection, message)
+
+    def __accept(self):
+        while True:
+            try:
+                sock, address = self.socket.accept()
+            except _WOULD_BLOCK:
+                return
             except socket.error:
-                import traceback
-                traceback.print_exc()
-                break
+                if not self.event.is_set():
+                    import traceback
+                    logger.error(traceback.format_exc())
+                return
+
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            if self.__ssl_context is not None:
+                try:
+                    sock = self.__ssl_context.wrap_socket(
+                        sock,
+                        server_side=True,
+                        do_handshake_on_connect=False
+                    )
+                except (ssl.SSLError, socket.error):
+                    sock.close()
+                    continue
+
+            connection = ClientConnection(sock, address)
+            self.__connections.add(connection)
+            self.__selector.register(sock, connection.events, connection)
+
+    def __close(self, connection):
+        with connection.lock:
+            if connection.is_closed:
+                return
+
+            connection.is_closed = True
+            del connection.write_buffer[:]
+            connection.message_cache.clear()
+            connection.coalesced.clear()
+            connection.coalesced_size = 0
+            connection.in_flight.clear()
+
+        self.__connections.discard(connection)
+
+        if connection in self.clients:
+            # the list gets replaced and not changed so it can be iterated
+            # over from other threads
+            self.clients = [c for c in self.clients if c is not connection]
+            logger.info('client disconnected: ' + connection.address)
 
         try:
-            self.socket.close()
+            self.__selector.unregister(connection.socket)
+        except (KeyError, ValueError):
+            pass
+
+        try:
+            connection.socket.close()
         except socket.error:
             pass
 
-        self.client_address = ''
-        self.client = None
-        self.socket = None
-        self.thread = None
-        logger.info('server stopped')
+    def __update_events(self, connection):
+        if connection.is_handshaking:
+            events = connection.handshake_events
+        else:
+            events = 0
+
+            if not connection.is_paused:
+                events |= selectors.EVENT_READ
+
+            if connection.queued:
+                events |= selectors.EVENT_WRITE
+
+            if not events:
+                events = selectors.EVENT_READ
+
+        if events != connection.events:
+            connection.events = events
+            self.__selector.modify(connection.socket, events, connection)
+
+    def __handle_events(self, connection, mask):
+        if connection.is_closed:
+            return
+
+        if connection.is_handshaking:
+            self.__handshake(connection)
+            return
+
+        if mask & selectors.EVENT_WRITE:
+            self.__write(connection)
+
+        if mask & selectors.EVENT_READ and not connection.is_closed:
+            self.__read(connection)
+
+        if not connection.is_closed:
+            self.__update_events(connection)
+
+    def __handshake(self, connection):
+        try:
+            connection.socket.do_handshake()
+        except ssl.SSLWantReadError:
+            connection.handshake_events = selectors.EVENT_READ
+        except ssl.SSLWantWriteError:
+            connection.handshake_events = (
+                selectors.EVENT_READ | selectors.EVENT_WRITE
+            )
+        except (ssl.SSLError, socket.error):
+            logger.debug('SSL handshake failed: ' + connection.address)
+            self.__close(connection)
+            return
+        else:
+            connection.is_handshaking = False
+            connection.connected_at = time.time()
+
+        self.__update_events(connection)
+
+    def __write(self, connection):
+        with connection.lock:
+            try:
+                count = connection.socket.send(connection.write_buffer)
+            except _WOULD_BLOCK:
+                return
+            except socket.error:
+                count = None
+            else:
+                del connection.write_buffer[:count]
+
+        if count is None:
+            self.__close(connection)
+
+        elif (
+            connection.is_paused and
+            connection.queued < WRITE_BUFFER_LOW_WATER
+        ):
+            connection.is_paused = False
+            # an SSL socket can be holding data that the selector does not
+            # know about
+            self.__read(connection)
+
+    def __read(self, connection):
+        while not connection.is_closed:
+            if connection.queued > WRITE_BUFFER_HIGH_WATER:
+                connection.is_paused = True
+                return
+
+            try:
+                if not connection.buffer.recv_into(connection.socket):
+                    self.__close(connection)
+                    return
+            except _WOULD_BLOCK:
+                return
+            except socket.error:
+                self.__close(connection)
+                return
+
+            if connection.protocol is None:
+                self.__negotiate(connection)
+
+            if connection.protocol == remote_protocol.PROTOCOL_BINARY:
+                self.__read_binary(connection)
+
+            elif connection.protocol == remote_protocol.PROTOCOL_JSON:
+                buf = connection.buffer
+                connection.json_data += buf.read(len(buf))
+                self.__read_json(connection)
+
+    def __negotiate(self, connection):
+        # looks for the hello of a client that uses the binary protocol.
+        buf = connection.buffer
+
+        if not remote_protocol.is_hello(buf.peek()):
+            self.__start_client(connection, remote_protocol.PROTOCOL_JSON)
+            return
+
+        if len(buf) < remote_protocol.HELLO.size:
+            return
+
+        version = remote_protocol.decode_hello(buf.peek())
+
+        if version is None:
+            self.__start_client(connection, remote_protocol.PROTOCOL_JSON)
+            return
+
+        buf.read(remote_protocol.HELLO.size)
+        version = min(version, remote_protocol.PROTOCOL_VERSION)
+
+        if version < remote_protocol.PROTOCOL_VERSION:
+            # closing the connection makes the client connect again using
+            # the JSON protocol
+            logger.debug(
+                'client ({0}) uses binary protocol version {1} which is not '
+                'supported'.format(connection.address, version)
+            )
+            self.__close(connection)
+            return
+
+        connection.version = version
+        self.__queue(connection, remote_protocol.encode_hello(version))
+        self.__start_client(connection, remote_protocol.PROTOCOL_BINARY)
+
+    def __start_client(self, connection, protocol):
+        connection.protocol = protocol
+
+        if protocol == remote_protocol.PROTOCOL_BINARY:
+            logger.info(
+                'client connected: {0} (binary protocol)'.format(
+                    connection.address
+                )
+            )
+        else:
+            logger.info('client connected: ' + connection.address)
+
+        # a client using the binary protocol says where it left off before
+        # it gets anything
+        if protocol == remote_protocol.PROTOCOL_JSON:
+            with self.__sequence_lock:
+                self.clients = self.clients + [connection]
+
+            self.new_client(connection)
+
+    def __resume(self, connection, message):
+        session = message.get('session', None)
+        sequence = message.get('sequence', 0)
+
+        with self.__sequence_lock:
+            history = self.__history
+
+            if session != self.session or sequence > self.sequence:
+                missed = None
+            elif sequence == self.sequence:
+                missed = []
+            elif history and history[0][0] <= sequence + 1:
+                subscription = connection.subscription
+                missed = [
+                    item for item in history
+                    if item[0] > sequence and (
+                        subscription is None or subscription.matches(item[2])
+                    )
+                ]
+            else:
+                missed = None
+
+            snapshot_sequence = self.sequence
+            # the notifications that get sent while the snapshot is being
+            # made are held until the snapshot has been sent
+            connection.held = []
+            self.clients = self.clients + [connection]
+
+        if missed is None:
+            logger.debug(
+                'sending snapshot to client ({0}) at sequence {1}'.format(
+                    connection.address,
+                    snapshot_sequence
+                )
+            )
+            self.__executor.submit(
+                self.__send_snapshot,
+                connection,
+                snapshot_sequence
+            )
+        else:
+            logger.debug(
+                'client ({0}) resumed at sequence {1}, {2} missed '
+                'notifications'.format(
+                    connection.address,
+                    sequence,
+                    len(missed)
+                )
+            )
+
+            notifications = [
+                (message_id, payload) for message_id, payload, _ in missed
+            ]
+
+            self.__release(
+                connection,
+                remote_protocol.FRAME_RESUME,
+                sequence,
+                remote_codec.encode(dict(session=self.session)),
+                notifications
+            )
+
+    def __send_snapshot(self, connection, sequence):
+        if connection.is_closed:
+            return
+
+        # noinspection PyPep8
+        try:
+            snapshot = remote_snapshot.create_snapshot(self.network)
+            payload = remote_codec.encode(
+                dict(
+                    session=self.session,
+                    sequence=sequence,
+                    network=snapshot
+                )
+            )
+        except:  # NOQA
+            import traceback
+            logger.error(traceback.format_exc())
+
+            payload = remote_codec.encode(
+                dict(session=self.session, sequence=sequence, network=None)
+            )
+
+        self.__release(
+            connection,
+            remote_protocol.FRAME_SNAPSHOT,
+            sequence,
+            payload
+        )
+
+    @staticmethod
+    def __seal(connection, frame_type, message_id, payload):
+        # the frames have to be encrypted in the order they are sent, the
+        # lock of the connection has to be held.
+        if connection.cipher is None:
+            raise remote_protocol.ProtocolError(
+                'frame sent before the session was started'
+            )
+
+        return remote_protocol.encode_frame(
+            frame_type,
+            message_id,
+            payload,
+            connection.cipher
+        )
+
+    @staticmethod
+    def __decrypt(connection, frame_type, message_id, payload):
+        if connection.cipher is None:
+            raise remote_protocol.ProtocolError(
+                'frame received before the session was started'
+            )
+
+        return remote_protocol.decrypt_frame(
+            connection.cipher,
+            frame_type,
+            message_id,
+            payload
+        )
+
+    def __release(
+        self,
+        connection,
+        frame_type,
+        message_id,
+        payload,
+        notifications=()
+    ):
+        # sends a frame to a client followed by the notifications that have
+        # been held for it. this is done while locked so a notification that
+        # comes in at the same time can not get in front of the frame
+        with connection.lock:
+            held = connection.held or []
+            connection.held = None
+            wake = self.__append(
+                connection,
+                self.__seal(connection, frame_type, message_id, payload)
+            )
+
+            for message_id, data in list(notifications) + held:
+                wake = self.__append_notification(
+                    connection,
+                    message_id,
+                    data
+                ) or wake
+
+        if wake:
+            self.__wake(connection)
+
+    @classmethod
+    def __append_notification(cls, connection, message_id, data):
+        # the lock of the connection has to be held. the sequence number of
+        # the notification is tracked until the client acknowledges it.
+        frame = cls.__seal(
+            connection,
+            remote_protocol.FRAME_NOTIFICATION,
+            message_id,
+            data
+        )
+
+        if message_id and not connection.is_closed:
+            connection.in_flight.append(message_id)
+
+            if len(connection.in_flight) > MAX_UNACKED:
+                connection.is_lagging = True
+
+        return cls.__append(connection, frame)
+
+    @classmethod
+    def __flush(cls, connection):
+        # the lock of the connection has to be held. sends the coalesced
+        # notifications, they are in the order of their sequence numbers.
+        wake = False
+
+        for message_id, data in connection.coalesced.values():
+            wake = cls.__append_notification(
+                connection,
+                message_id,
+                data
+            ) or wake
+
+        connection.coalesced.clear()
+        connection.coalesced_size = 0
+        return wake
+
+    def __ack(self, connection, sequence):
+        # called from the server thread when a client acknowledges the
+        # notifications up to and including the sequence number
+        with connection.lock:
+            connection.acked = max(connection.acked, sequence)
+            in_flight = connection.in_flight
+
+            while in_flight and in_flight[0] <= sequence:
+                in_flight.popleft()
+
+            if (
+                connection.is_lagging and
+                len(in_flight) <= MAX_UNACKED // 2
+            ):
+                connection.is_lagging = False
+                logger.debug(
+                    'client ({0}) has caught up'.format(connection.address)
+                )
+
+                if not connection.coalesce:
+                    self.__flush(connection)
+
+    def __subscribe(self, connection, message):
+        subscription = remote_subscription.Subscription.from_dict(message)
+
+        logger.debug(
+            'client ({0}) subscribed: {1!r}'.format(
+                connection.address,
+                subscription
+            )
+        )
+
+        with connection.lock:
+            connection.subscription = subscription
+
+            if not subscription.coalesce and not connection.is_lagging:
+                self.__flush(connection)
+
+    @staticmethod
+    def __append(connection, data):
+        # the lock of the connection has to be held. returns True if the
+        # server thread needs to be woken up.
+        if connection.is_closed or connection.is_overflowed:
+            return False
+
+        if connection.queued + len(data) > MAX_WRITE_BUFFER:
+            connection.is_overflowed = True
+            return True
+
+        was_empty = not connection.write_buffer
+        connection.write_buffer += data
+        return was_empty
+
+    def __queue(self, connection, data):
+        # places data into the write buffer of a client, can be called from
+        # any thread. returns False if the client is not connected anymore.
+        with connection.lock:
+            wake = self.__append(connection, data)
+
+        if wake:
+            self.__wake(connection)
+
+        return not (connection.is_closed or connection.is_overflowed)
+
+    def __read_binary(self, connection):
+        try:
+            for frame_type, message_id, payload in connection.buffer.frames():
+                if frame_type == remote_protocol.FRAME_SESSION:
+                    self.__start_session(connection, payload)
+                    continue
+
+                # every frame gets decrypted, even the ones that are not
+                # used, the session cipher has to see all of them. the
+                # payload is a view into the receive buffer so it has to be
+                # decrypted before the buffer gets used again
+                payload = self.__decrypt(
+                    connection,
+                    frame_type,
+                    message_id,
+                    payload
+                )
+
+                if frame_type == remote_protocol.FRAME_ACK:
+                    # the payload is empty, decrypting it makes sure the
+                    # ack comes from the client
+                    self.__ack(connection, message_id)
+
+                elif frame_type == remote_protocol.FRAME_RESUME:
+                    self.__resume(connection, json.loads(payload))
+
+                elif frame_type == remote_protocol.FRAME_SUBSCRIBE:
+                    self.__subscribe(connection, json.loads(payload))
+
+                elif frame_type in (
+                    remote_protocol.FRAME_REQUEST,
+                    remote_protocol.FRAME_BATCH
+                ):
+                    message = json.loads(payload)
+                    self.__executor.submit(
+                        self.__handle_request,
+                        connection,
+                        frame_type,
+                        message_id,
+                        message
+                    )
+                else:
+                    logger.debug(
+                        'unknown frame type from client ({0}): '
+                        '{1}'.format(connection.address, frame_type)
+                    )
+
+        except (remote_protocol.ProtocolError, ValueError):
+            # a frame that can not be decrypted can not be asked for
+            # again like the JSON protocol does, the stream is out of
+            # sync or someone is messing with it.
+            import traceback
+            logger.error(traceback.format_exc())
+            self.__close(connection)
+
+    def __start_session(self, connection, client_random):
+        if (
+            connection.session_started or
+            len(client_random) != SESSION_RANDOM_SIZE
+        ):
+            raise remote_protocol.ProtocolError('unexpected session frame')
+
+        connection.session_started = True
+
+        # making the cipher is slow on purpose, it is kept off of the
+        # server thread
+        self.__executor.submit(
+            self.__create_session,
+            connection,
+            bytes(client_random)
+        )
+
+    def __create_session(self, connection, client_random):
+        server_random = SessionCipher.random()
+        cipher = SessionCipher(
+            self.password,
+            client_random,
+            server_random,
+            True
+        )
+
+        # the client does not send anything until it has the reply, so the
+        # cipher is set before the reply is queued. the reply itself is not
+        # encrypted.
+        connection.cipher = cipher
+        self.__queue(
+            connection,
+            remote_protocol.encode_frame(
+                remote_protocol.FRAME_SESSION,
+                0,
+                server_random
+            )
+        )
+
+    def __call_manager(self, message):
+        # noinspection PyPep8
+        try:
+            func = getattr(self.network.manager, message['func'])
+            return func(*message['args'], **message['kwargs'])
+        except:  # NOQA
+            import traceback
+            logging.error(traceback.format_exc())
+
+            return None
+
+    def __handle_request(self, connection, frame_type, message_id, message):
+        if connection.is_closed:
+            return
+
+        if frame_type == remote_protocol.FRAME_BATCH:
+            logger.debug(
+                'incoming batch ({0}): {1}'.format(connection.address, message)
+            )
+            result = [self.__call_manager(msg) for msg in message]
+        else:
+            logger.debug(
+                'incoming request ({0}): {1}'.format(
+                    connection.address,
+                    message
+                )
+            )
+            result = self.__call_manager(message)
+
+        try:
+            payload = remote_codec.encode(result)
+        except TypeError:
+            import traceback
+            logger.error(traceback.format_exc())
+            payload = remote_codec.encode(None)
+
+        self.__queue_frame(
+            connection,
+            remote_protocol.FRAME_RESULT,
+            message_id,
+            payload
+        )
+
+    def __queue_frame(self, connection, frame_type, message_id, payload):
+        with connection.lock:
+            if connection.is_closed:
+                return False
+
+            wake = self.__append(
+                connection,
+                self.__seal(connection, frame_type, message_id, payload)
+            )
+
+        if wake:
+            self.__wake(connection)
+
+        return not connection.is_overflowed
+
+    def __queue_json(self, connection, message_id, message):
+        # messages that get acknowledged by the client are kept until the
+        # client acknowledges them
+        if not isinstance(message, bytes):
+            message = message.encode('utf-8')
+
+        if message_id is not None:
+            with connection.lock:
+                connection.message_cache[message_id] = (message, time.time())
+
+        return self.__queue(connection, message)
+
+    def __read_json(self, connection):
+        while b'\n' in connection.json_data:
+            message, connection.json_data = (
+                connection.json_data.split(b'\n', 1)
+            )
+            message = json.loads(message.decode('utf-8'))
+
+            if 'resend' in message:
+                # noinspection PyShadowingBuiltins
+                id = message['resend']
+                with connection.lock:
+                    resend_message = connection.message_cache.get(id, None)
+
+                if resend_message is not None:
+                    self.__queue_json(connection, id, resend_message[0])
+
+            elif 'ok' in message:
+                # noinspection PyShadowingBuiltins
+                id = message['ok']
+                with connection.lock:
+                    connection.message_cache.pop(id, None)
+            else:
+                # noinspection PyShadowingBuiltins
+                id = message['id']
+                contents = message['contents']
+
+                # noinspection PyPep8
+                try:
+                    contents = self.__aes.decrypt(contents)
+                    message = json.loads(contents)
+                    self.__queue_json(
+                        connection,
+                        None,
+                        json.dumps(dict(ok=id)) + '\n'
+                    )
+                except:  # NOQA
+                    logger.debug(
+                        'bad message from client. '
+                        'requesting retransmit. {0}'.format(id)
+                    )
+                    self.__queue_json(
+                        connection,
+                        None,
+                        json.dumps(dict(resend=id)) + '\n'
+                    )
+                    continue
+
+                output = json.dumps(message, indent=4).split('\n')
+                output = '\n'.join(
+                    '    ' + line for line in output
+                )
+
+                logger.debug(
+                    'incoming message ({0}): \n{1}'.format(
+                        connection.address,
+                        output
+                    )
+                )
+
+                self.__executor.submit(
+                    self.__handle_json_request,
+                    connection,
+                    message
+                )
+
+    def __handle_json_request(self, connection, message):
+        if connection.is_closed:
+            return
+
+        message_id = str(uuid4())
+
+        res = self.__call_manager(message)
+        res = pickle.dumps(res, 2).decode('ISO-8859-1')
+
+        contents = dict(id=message['id'], result=res)
+        contents = self.__aes.encrypt(json.dumps(contents))
+
+        res = dict(id=message_id, contents=contents)
+        res = json.dumps(res) + '\n'
+
+        self.__queue_json(connection, message_id, res)
 
     def stop(self):
         """
@@ -272,42 +1135,160 @@ class Server(object):
         logger.info('stopping server: {0}:{1}'.format(self.host, self.port))
         self.event.set()
 
-        if self.socket is not None:
-            self.socket.shutdown(socket.SHUT_RDWR)
+        thread = self.thread
 
-            try:
-                self.socket.close()
-            except socket.error:
-                pass
+        if thread is not None and thread.is_alive():
+            self.__wake(None)
+            thread.join()
+
+    def __queue_notification(self, connection, message_id, data, key):
+        # key is the value id of a notification that can be coalesced, data
+        # is the encoded notification that gets encrypted when it is sent
+        with connection.lock:
+            if connection.is_closed or connection.is_overflowed:
+                return False
+
+            if connection.held is not None:
+                connection.held.append((message_id, data))
+                return True
 
-        if self.thread is not None and self.thread.is_alive():
-            self.thread.join()
+            if key is not None and (
+                connection.is_lagging or connection.coalesce
+            ):
+                coalesced = connection.coalesced
+                # wakes the server thread so it knows when to send them
+                wake = not coalesced
+
+                if wake:
+                    connection.coalesced_at = time.time()
+
+                old = coalesced.pop(key, None)
+
+                if old is not None:
+                    connection.coalesced_size -= len(old[1])
+
+                coalesced[key] = (message_id, data)
+                connection.coalesced_size += len(data)
+
+                # the coalesced notifications count towards the write buffer
+                # of a client that is not keeping up
+                if (
+                    connection.queued + connection.coalesced_size >
+                    MAX_WRITE_BUFFER
+                ):
+                    connection.is_overflowed = True
+                    wake = True
+            else:
+                # the coalesced notifications have lower sequence numbers
+                # so they have to be sent first
+                wake = self.__flush(connection)
+                wake = self.__append_notification(
+                    connection,
+                    message_id,
+                    data
+                ) or wake
+
+        if wake:
+            self.__wake(connection)
+
+        return not connection.is_overflowed
 
     @utils.logit
-    def send(self, n):
+    def send(self, n, connection=None):
         """
-        TODO: server.Server.send docstring
-        """
-        if self.client is not None:
-            message_id = str(uuid4())
+        Sends a notification to the clients.
 
-            data = dict(notification=pickle.dumps(n, 2).decode('ISO-8859-1'))
-            data = self.__aes.encrypt(json.dumps(data))
+        The notification is encoded one time for each protocol that is being
+        used, the encoded notification is then placed into the write buffer
+        of every client.
 
-            message = json.dumps(dict(id=message_id, contents=data)) + '\n'
+        :param n: notification
+        :type n: _libopenzwave.ZWaveNotification
 
-            try:
-                self.client.send(message)
-                with self.cache_lock:
-                    self.message_cache[message_id] = (message, time.time())
+        :param connection: only send the notification to this client, used
+            to send the network to clients that do not support snapshots.
+            These notifications do not get a sequence number.
+        :type connection: ClientConnection, optional
 
-                return message_id
-            except socket.error:
-                pass
+        :return: sequence number, `None` if no clients got the notification
+        :rtype: int, None
+        """
+        try:
+            payload = remote_codec.encode_notification(n)
+        except TypeError:
+            import traceback
+            logger.error(traceback.format_exc())
+            return
+
+        if connection is None:
+            with self.__sequence_lock:
+                self.sequence += 1
+                message_id = self.sequence
+                self.__history.append((message_id, payload, n))
+                clients = self.clients
+
+                # the client list and the sequence number have to match up
+                # for resuming, so the notification is queued while locked
+                return self.__send(n, message_id, payload, clients)
+
+        return self.__send(n, 0, payload, [connection])
+
+    def __send(self, n, message_id, payload, clients):
+        if not clients:
+            return
+
+        json_message = None
+        sent = False
+
+        if message_id and remote_subscription.is_stream(n):
+            key = n.value.id
+        else:
+            key = None
+
+        for client in clients:
+            if client.protocol == remote_protocol.PROTOCOL_BINARY:
+                subscription = client.subscription
+
+                if subscription is not None and not subscription.matches(n):
+                    continue
+
+                # encrypted when it is placed into the write buffer
+                sent = self.__queue_notification(
+                    client,
+                    message_id,
+                    payload,
+                    key
+                ) or sent
+
+            elif client.protocol == remote_protocol.PROTOCOL_JSON:
+                if json_message is None:
+                    json_id = str(uuid4())
+                    data = dict(
+                        notification=pickle.dumps(n, 2).decode('ISO-8859-1')
+                    )
+                    data = self.__aes.encrypt(json.dumps(data))
+                    json_message = (
+                        json.dumps(dict(id=json_id, contents=data)) + '\n'
+                    )
+
+                sent = self.__queue_json(
+                    client,
+                    json_id,
+                    json_message
+                ) or sent
 
-    def new_client(self):
+        if sent:
+            return message_id
+
+    def new_client(self, connection):
         """
-        TODO: server.Server.new_client docstring
+        Sends the network to a client that has just connected.
+
+        This is only used for clients that do not support the snapshot, the
+        network is sent as a notification for each node and each value.
+
+        :param connection: client
+        :type connection: ClientConnection
         """
 
         # noinspection PyArgumentList
@@ -319,7 +1300,15 @@ class Server(object):
                     return
 
                 def send_notif(n):
-                    message_id = self.send(n)
+                    # waits for the client to catch up so the replay does
+                    # not overflow the write buffer of the client
+                    while (
+                        connection.queued > WRITE_BUFFER_HIGH_WATER and
+                        not connection.is_closed
+                    ):
+                        time.sleep(0.01)
+
+                    message_id = self.send(n, connection)
 
                     if message_id is None:
                         return False
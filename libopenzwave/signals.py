@@ -364,96 +364,54 @@ Here is some code for an alternate way.
 
 # noinspection PyPackageRequirements
 from . import utils
+import collections
 import logging
 import threading
 
 
-class RegisteredSignal(object):
-
-    def __init__(self, signal):
-        self.__signal = signal
-        self.__items = []
-
-    def __str__(self):
-        return 'Signal: "{0}", Callbacks: {1}'.format(
-            self.__signal,
-            self.__items
-        )
-
-    def __eq__(self, other):
-        """
-        :param other:
-        :type other: "RegisteredSignal"
-
-        :rtype: bool
-        """
-        return self.__signal == other
-
-    def __ne__(self, other):
-        """
-        :param other:
-        :type other: "RegisteredSignal"
-
-        :rtype: bool
-        """
-        return not self.__eq__(self)
+logger = logging.getLogger(__name__)
 
-    def __contains__(self, item):
-        """
-        :param item:
-        :type item: callable
 
-        :rtype: bool
-        """
-        return item in self.__items
+def _signal_key(signal):
+    """
+    Returns the key a signal is stored under in the dispatcher.
 
-    def __iter__(self):
-        for item in self.__items:
-            yield item
+    :param signal: signal instance, signal id or signal name.
+    :type signal: Signal, int, str, None
 
-    def __call__(self, sender, *args, **kwargs):
-        """
-        :param sender:
-        :param *args:
-        :param **kwargs:
-        """
-        for callback, obj in self:
-            if obj in (None, sender):
-                callback(sender=sender, signal=self.__signal, *args, **kwargs)
+    :rtype: int, None
+    """
+    if signal is None:
+        return None
 
-    def remove(self, item):
-        """
-        :param item:
-        :type item: callable
-        """
-        if item in self:
-            self.__items.remove(item)
+    if isinstance(signal, Signal):
+        return signal.id
 
-    @property
-    def is_empty(self):
-        """
-        :rtype: bool
-        """
-        return bool(len(self.__items))
+    if isinstance(signal, int):
+        return signal
 
-    def __iadd__(self, other):
-        """
-        :param other:
-        :type other: callable
+    return Signal._instances[signal].id
 
-        :rtype: "RegisteredSignal"
-        """
-        if other not in self:
-            self.__items += [other]
 
-        return self
+class Dispatcher(object):
+    """
+    Routes a signal to the receivers that have been connected to it.
 
+    The receivers are stored in a dict that is keyed by the signal id and
+    then by the identity of the sender. A receiver that is connected to all
+    senders is stored under a sender key of `None`, a receiver connected to
+    all signals is stored under a signal key of `None`. The cost of sending a
+    signal is not effected by the number of receivers connected to other
+    signals or other senders.
 
-class Dispatcher(object):
+    The receivers for a signal/sender pair are stored in a tuple that gets
+    replaced when a receiver is connected or disconnected (copy on write).
+    The lock is only held when changing the connections, it is not held when
+    sending a signal or while the receivers are being called.
+    """
 
     def __init__(self):
-        self.__registered = []
-        self.__no_signal = []
+        self.__receivers = {}
         self.__lock = threading.RLock()
 
     def connect(self, receiver, signal=None, sender=None):
@@ -461,43 +419,75 @@ class Dispatcher(object):
         :param receiver:
         :param signal:
         :param sender:
+
+        :return: `True` if the receiver was connected, `False` if it is
+            already connected.
+        :rtype: bool
         """
-        with self.__lock:
+        signal_key = _signal_key(signal)
+        sender_key = None if sender is None else id(sender)
 
-            if signal is None:
-                if (receiver, sender) not in self.__no_signal:
-                    self.__no_signal += [(receiver, sender)]
-            else:
-                for reg_signal in self.__registered:
-                    if reg_signal == signal:
-                        break
-                else:
-                    reg_signal = RegisteredSignal(signal)
-                    for item in self.__no_signal:
-                        reg_signal += item
+        with self.__lock:
+            senders = self.__receivers.setdefault(signal_key, {})
+            receivers = senders.get(sender_key, ())
 
-                    self.__registered += [reg_signal]
+            for item in receivers:
+                if item[0] == receiver and item[1] is sender:
+                    return False
 
-                reg_signal += (receiver, sender)
+            senders[sender_key] = receivers + ((receiver, sender),)
+            return True
 
     def disconnect(self, receiver, signal=None, sender=None):
         """
         :param receiver:
         :param signal:
         :param sender:
+
+        :return: `True` if the receiver was disconnected, `False` if it was
+            not connected.
+        :rtype: bool
         """
+        signal_key = _signal_key(signal)
+        sender_key = None if sender is None else id(sender)
+
         with self.__lock:
+            senders = self.__receivers.get(signal_key, {})
+            receivers = senders.get(sender_key, ())
+
+            new_receivers = tuple(
+                item for item in receivers
+                if item[0] != receiver or item[1] is not sender
+            )
 
-            if signal is None:
-                if (receiver, sender) in self.__no_signal:
-                    self.__no_signal.remove((receiver, sender))
+            if len(new_receivers) == len(receivers):
+                return False
 
+            if new_receivers:
+                senders[sender_key] = new_receivers
             else:
-                for reg_signal in self.__registered[:]:
-                    reg_signal.remove((receiver, sender))
+                del senders[sender_key]
 
-                    if reg_signal.is_empty:
-                        self.__registered.remove(reg_signal)
+                if not senders:
+                    del self.__receivers[signal_key]
+
+            return True
+
+    def receivers(self, signal=None):
+        """
+        Gets the receivers that are connected to a signal.
+
+        :param signal:
+
+        :return: list of `(receiver, sender)` tuples.
+        :rtype: list
+        """
+        signal_key = _signal_key(signal)
+
+        with self.__lock:
+            senders = list(self.__receivers.get(signal_key, {}).values())
+
+        return list(item for receivers in senders for item in receivers)
 
     def send(self, signal, sender, *args, **kwargs):
         """
@@ -506,32 +496,305 @@ class Dispatcher(object):
         :param args:
         :param kwargs:
         """
-        with self.__lock:
-            for callback, obj in self.__no_signal:
-                if obj in (None, sender):
-                    callback(sender=sender, signal=signal, *args, **kwargs)
+        receivers = self.__receivers
+        sender_key = id(sender)
+        empty = {}
 
-            for reg_signal in self.__registered:
-                if reg_signal == signal:
-                    reg_signal(sender, *args, **kwargs)
+        for signal_key in (None, _signal_key(signal)):
+            senders = receivers.get(signal_key, empty)
 
+            for callback, _ in senders.get(None, ()):
+                callback(sender=sender, signal=signal, *args, **kwargs)
 
-logger = logging.getLogger(__name__)
+            if sender is not None:
+                for callback, _ in senders.get(sender_key, ()):
+                    callback(sender=sender, signal=signal, *args, **kwargs)
 
 
 dispatcher = Dispatcher()
 
 
-class _SignalMetaClass(type):
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+"""
+When the queue is full the oldest queued signal is thrown away.
+"""
+OVERFLOW_BLOCK = 'block'
+"""
+When the queue is full sending the signal waits until there is room.
+"""
+OVERFLOW_COALESCE = 'coalesce'
+"""
+A signal replaces the data of a queued signal from the same sender. When
+the queue is full and there is nothing to replace the oldest queued signal
+is thrown away.
+"""
 
-    def __new__(mcs, name, bases, dct):
-        cls = (
-            super(_SignalMetaClass, mcs).__new__(mcs, name, bases, dct)
+
+class AsyncReceiver(object):
+    """
+    Runs a receiver in its own thread.
+
+    The signals get called on the thread of the node that caused the signal.
+    If a receiver takes a while to run (database writes, http requests) that
+    node is stalled until the receiver returns. Wrapping the receiver with
+    this class puts the signal into a queue and returns right away. The
+    receiver then gets called from a worker thread that belongs to this
+    receiver.
+
+    .. code-block:: python
+
+        import libopenzwave
+        from libopenzwave import signals
+
+        def callback(sender, value_data, **kwargs):
+            # some lengthy code
+            pass
+
+        receiver = signals.AsyncReceiver(
+            callback,
+            max_size=500,
+            overflow=signals.OVERFLOW_COALESCE
         )
 
-        if name != 'Signal':
+        libopenzwave.SIGNAL_VALUE_CHANGED.register(receiver)
+
+        print(receiver.queue_depth, receiver.dropped)
+
+        # the wrapped callback can be used to unregister
+        libopenzwave.SIGNAL_VALUE_CHANGED.unregister(callback)
+        receiver.stop()
+
+
+    :param receiver: callback function
+    :type receiver: callable
 
-            doc = """
+    :param max_size: maximum number of queued signals
+    :type max_size: int, optional
+
+    :param overflow: what to do when the queue is full.
+        :py:data:`OVERFLOW_DROP_OLDEST`, :py:data:`OVERFLOW_BLOCK` or
+        :py:data:`OVERFLOW_COALESCE`
+    :type overflow: str, optional
+
+    :param block_timeout: number of seconds to wait for room in the queue
+        when using :py:data:`OVERFLOW_BLOCK`. The signal is dropped if there
+        is still no room. `None` waits forever.
+    :type block_timeout: float, None, optional
+    """
+
+    def __init__(
+        self,
+        receiver,
+        max_size=100,
+        overflow=OVERFLOW_DROP_OLDEST,
+        block_timeout=None
+    ):
+        if overflow not in (
+            OVERFLOW_DROP_OLDEST,
+            OVERFLOW_BLOCK,
+            OVERFLOW_COALESCE
+        ):
+            raise ValueError('unknown overflow policy {0}'.format(overflow))
+
+        if max_size < 1:
+            raise ValueError('max_size needs to be 1 or larger')
+
+        self.receiver = receiver
+        self.max_size = max_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self.__queue = collections.deque()
+        self.__pending = {}
+        self.__condition = threading.Condition()
+        self.__thread = None
+        self.__stop = False
+
+        self.__dropped = 0
+        self.__coalesced = 0
+        self.__delivered = 0
+        self.__max_queue_depth = 0
+
+    @property
+    def queue_depth(self):
+        """
+        Number of signals waiting to be passed to the receiver.
+
+        :rtype: int
+        """
+        return len(self.__queue)
+
+    @property
+    def max_queue_depth(self):
+        """
+        Largest number of signals that have been waiting at the same time.
+
+        :rtype: int
+        """
+        return self.__max_queue_depth
+
+    @property
+    def dropped(self):
+        """
+        Number of signals that were thrown away because the queue was full.
+
+        :rtype: int
+        """
+        return self.__dropped
+
+    @property
+    def coalesced(self):
+        """
+        Number of signals that replaced a queued signal from the same sender.
+
+        :rtype: int
+        """
+        return self.__coalesced
+
+    @property
+    def delivered(self):
+        """
+        Number of signals that have been passed to the receiver.
+
+        :rtype: int
+        """
+        return self.__delivered
+
+    def __call__(self, *args, **kwargs):
+        signal = kwargs.get('signal', None)
+        sender = kwargs.get('sender', None)
+        key = (signal, id(sender))
+
+        with self.__condition:
+            if self.__stop:
+                return
+
+            if self.overflow == OVERFLOW_COALESCE and key in self.__pending:
+                # the entry keeps its place in the queue but gets the
+                # newest data
+                entry = self.__pending[key]
+                entry[1] = args
+                entry[2] = kwargs
+                self.__coalesced += 1
+                return
+
+            if len(self.__queue) >= self.max_size:
+                if self.overflow == OVERFLOW_BLOCK:
+                    self.__condition.wait_for(
+                        lambda: (
+                            self.__stop or
+                            len(self.__queue) < self.max_size
+                        ),
+                        self.block_timeout
+                    )
+
+                    if self.__stop or len(self.__queue) >= self.max_size:
+                        self.__dropped += 1
+                        return
+                else:
+                    self.__remove_entry(self.__queue.popleft())
+                    self.__dropped += 1
+
+            entry = [key, args, kwargs]
+            self.__queue.append(entry)
+
+            if self.overflow == OVERFLOW_COALESCE:
+                self.__pending[key] = entry
+
+            if len(self.__queue) > self.__max_queue_depth:
+                self.__max_queue_depth = len(self.__queue)
+
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    name='libopenzwave-AsyncReceiver:' + repr(self.receiver),
+                    target=self.__run
+                )
+                self.__thread.daemon = True
+                self.__thread.start()
+
+            self.__condition.notify_all()
+
+    def __remove_entry(self, entry):
+        if self.__pending.get(entry[0], None) is entry:
+            del self.__pending[entry[0]]
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                while not self.__queue and not self.__stop:
+                    self.__condition.wait()
+
+                if not self.__queue:
+                    self.__thread = None
+                    break
+
+                entry = self.__queue.popleft()
+                self.__remove_entry(entry)
+                self.__condition.notify_all()
+
+            _, args, kwargs = entry
+
+            try:
+                self.receiver(*args, **kwargs)
+            except:  # NOQA
+                import traceback
+                logger.error(
+                    'receiver {0} raised an exception.\n{1}'.format(
+                        repr(self.receiver),
+                        traceback.format_exc()
+                    )
+                )
+
+            self.__delivered += 1
+
+    def stop(self, timeout=None):
+        """
+        Stops the worker thread.
+
+        The signals that are already queued get passed to the receiver
+        before the thread exits.
+
+        :param timeout: number of seconds to wait for the thread to exit
+        :type timeout: float, None, optional
+        """
+        with self.__condition:
+            self.__stop = True
+            thread = self.__thread
+            self.__condition.notify_all()
+
+        if thread is not None and thread != threading.current_thread():
+            thread.join(timeout)
+
+    def __eq__(self, other):
+        if isinstance(other, AsyncReceiver):
+            return other is self
+
+        return self.receiver == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.receiver)
+
+    def __repr__(self):
+        return '<AsyncReceiver: {0}>'.format(repr(self.receiver))
+
+
+class _SignalRegister(object):
+    """
+    Adds the register method to a signal class the first time it is used.
+
+    The register method of each signal has a docstring that is made from
+    the docstring of the signal. Making all of them when the module gets
+    imported slows down the import.
+    """
+
+    def __init__(self, doc):
+        self.__doc = doc
+
+    def __get__(self, instance, owner):
+        doc = """
             Register a callback for a signal.
             
             {params}
@@ -542,32 +805,46 @@ class _SignalMetaClass(type):
             
             """
 
-            if cls.__doc__ is None:
-                doc = doc.format(params='')
+        if self.__doc is None:
+            doc = doc.format(params='')
 
-            else:
-                doc = doc.format(
-                    params='\n'.join(
-                        '        ' + d for d in cls.__doc__.split('\n')
-                    ).lstrip()
-                )
+        else:
+            doc = doc.format(
+                params='\n'.join(
+                    '        ' + d for d in self.__doc.split('\n')
+                ).lstrip()
+            )
+
+        def register(self, receiver, sender=None):
+            Signal.register(self, receiver, sender)
 
-            def register(self, receiver, sender=None):
-                Signal.register(self, receiver, sender)
+        register.__doc__ = doc
 
-            def unregister(self, receiver, sender=None):
-                """
-                Unregister a callback from a signal.
+        # the method replaces this object
+        setattr(owner, 'register', register)
+        return register.__get__(instance, owner)
+
+
+def _unregister(self, receiver, sender=None):
+    """
+    Unregister a callback from a signal.
 
-                For more information see..
-                :py:func:`libopenzwave.signals.Signal.unregister`
-                """
-                Signal.unregister(self, receiver, sender)
+    For more information see..
+    :py:func:`libopenzwave.signals.Signal.unregister`
+    """
+    Signal.unregister(self, receiver, sender)
 
-            register.__doc__ = doc
 
-            setattr(cls, 'register', register)
-            setattr(cls, 'unregister', unregister)
+class _SignalMetaClass(type):
+
+    def __new__(mcs, name, bases, dct):
+        cls = (
+            super(_SignalMetaClass, mcs).__new__(mcs, name, bases, dct)
+        )
+
+        if name != 'Signal':
+            setattr(cls, 'register', _SignalRegister(dct.get('__doc__')))
+            setattr(cls, 'unregister', _unregister)
 
         description = dct['description']
 
@@ -678,15 +955,13 @@ class Signal(str, metaclass=_SignalMetaClass):
     _instances = {}
     id = -1
     description = ''
-    _callbacks = None
     _s = ''
 
-    @classmethod
     def __new__(cls, *args, **kwargs):
-
-        self = super(Signal, cls).__new__(*args, **kwargs)
-        setattr(self, '_s', args[1])
-        setattr(self, '_callbacks', [])
+        self = super(Signal, cls).__new__(cls, *args, **kwargs)
+        self._s = args[0]
+        Signal._instances[self._s] = self
+        return self
 
     @utils.logit
     def register(self, receiver, sender=None):
@@ -702,9 +977,7 @@ class Signal(str, metaclass=_SignalMetaClass):
         :return: `None`
         """
 
-        if (receiver, sender) not in self._callbacks:
-            self._callbacks.append((receiver, sender))
-            dispatcher.connect(receiver, self, sender)
+        dispatcher.connect(receiver, self, sender)
 
     @utils.logit
     def unregister(self, receiver, sender=None):
@@ -734,25 +1007,21 @@ class Signal(str, metaclass=_SignalMetaClass):
 
         :raises: ValueError if there was no registration
         """
-        if receiver is None and sender is None:
-            for callback, obj in self._callbacks[:]:
-                self._callbacks.remove((callback, obj))
-                dispatcher.disconnect(callback, self, obj)
-
-        elif receiver is not None and sender is None:
-            for callback, obj in self._callbacks[:]:
-                if callback == receiver:
-                    self._callbacks.remove((callback, obj))
-                    dispatcher.disconnect(callback, self, obj)
-
-        elif receiver is None and sender is not None:
-            for callback, obj in self._callbacks[:]:
-                if obj == sender:
-                    self._callbacks.remove((callback, obj))
-                    dispatcher.disconnect(callback, self, obj)
-        else:
-            self._callbacks.remove((receiver, sender))
-            dispatcher.disconnect(receiver, self, sender)
+        if receiver is not None and sender is not None:
+            if not dispatcher.disconnect(receiver, self, sender):
+                raise ValueError(
+                    'receiver {0} is not registered'.format(repr(receiver))
+                )
+            return
+
+        for callback, obj in dispatcher.receivers(self):
+            if receiver is not None and callback != receiver:
+                continue
+
+            if sender is not None and obj is not sender:
+                continue
+
+            dispatcher.disconnect(callback, self, obj)
 
     @utils.logit
     def send(self, sender=None, *args, **kwargs):  # NOQA
@@ -763,10 +1032,7 @@ class Signal(str, metaclass=_SignalMetaClass):
         :param args:
         :param kwargs:
         """
-
-        for callback, obj in self._callbacks:
-            if obj is None or sender == obj:
-                callback(signal=self, sender=sender, *args, **kwargs)
+        dispatcher.send(self, sender, *args, **kwargs)
 
     def __eq__(self, other):
         """
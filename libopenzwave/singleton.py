@@ -55,7 +55,6 @@ def _destroy(self):
 
 BASE_PATH = os.path.dirname(__file__)
 
-_ZWAVE_MODULES = []
 _ORIGINAL_ZWAVE_CLASSES = []
 _REPLACED_ZWAVE_CLASSES = []
 OZW_MOD_NAME = __name__.rsplit('.', 1)[0]
@@ -63,28 +62,111 @@ CC_MOD_NAME = OZW_MOD_NAME + '.command_classes'
 BASE_MODULE = os.path.split(BASE_PATH)[-1]
 
 
-def build_module_list(path):
-    """
-    :param path:
-    """
-    head, tail = os.path.split(path)
-    mod = tail
-    while not mod.startswith(BASE_MODULE):
-        head, tail = os.path.split(head)
-        mod = tail + '.' + mod
+# the dynamically built node classes. The nodes that support the same
+# command classes share a single class so the class is only built once.
+# The key holds the command class classes, and the classes are dropped
+# when a plugin replaces one of the ZWave classes.
+_NODE_CLASSES = {}
 
-    for f in os.listdir(path):
-        if f == 'plugins':
-            continue
 
-        if f.endswith('.py') and '__init__' not in f:
-            _ZWAVE_MODULES.append(mod + '.' + f.rstrip('.py'))
+def _node_class(cls, command_class_ids):
+    """
+    Gets the class for a node.
 
-        elif os.path.isdir(os.path.join(path, f)):
-            build_module_list(os.path.join(path, f))
+    :param cls: ZWaveNode or ZWaveController
+    :type cls: type
 
+    :param command_class_ids: ids of the command classes the node supports
+    :type command_class_ids: Iterable[int]
 
-build_module_list(BASE_PATH)
+    :rtype: type
+    """
+    from .command_classes import COMMAND_CLASSES
+    from .node import ZWaveNode
+
+    # we need to set the bases of the node. ZWaveNode being the
+    # primary parent class.
+    bases = []
+
+    # see if a python command class id is in the list returned for
+    # the node. If it is in the list then add the class to the bases.
+    # the bases are kept in the order the command classes are in.
+
+    for class_id in command_class_ids:
+        base = COMMAND_CLASSES[class_id]
+
+        if base not in bases:
+            bases.append(base)
+
+    bases = tuple(bases)
+    key = (cls, bases)
+
+    if key in _NODE_CLASSES:
+        return _NODE_CLASSES[key]
+
+    # we need to supply a custom __init__ to our dynamically
+    # created class in order to properly start all of the parent
+    # classes
+
+    # noinspection PyShadowingBuiltins
+
+    # we use type to make the new class supplying it with the
+    # custom __init__ and the bases. the __init__ iterates through
+    # the bases and calls the constructor for each of them. at the
+    # time each base class is constructed if it is a command class
+    # it adds it's id to _cls_ids. this is done so we can use
+    # equality testing to identify if a node supports a specific
+    # command class.
+
+    # as an example. if we wanted to turn on a light switch
+    # if node == command_class.COMMAND_CLASS_BINARY_SWITCH:
+    #     node.state = True
+
+    # I found this to be a much better mechanism for testing node
+    # types then having to add a method to ZWaveNode to check.
+    # not to mention having ZWaveNode contain all the various
+    # properties and methods for all command classes can get a wee
+    # bit difficult to follow. So if a node is not a binary switch
+    # then it is not going to have the property state. it removes
+    # any checking that would need to be done inside of the
+    # property/method to ensure the node is the proper type
+
+    # this same equality testing also works on the values. It's a
+    # simple to use mechanism. the equality test is only performed
+    # against the command classes of a node/value if the object
+    # passed is an int, if testing 2 nodes it will check to see if
+    # the networks and ids match. because of the use of the
+    # singleton only a single node instance on a network can exist
+
+    def __init__(self, id, net, xml, *a, **k):
+        self._bases = bases
+        cls.__init__(self, id, net, xml, *a, **k)
+        self.__name__ = 'ZWaveNode'
+
+        class_ids = []
+        for cmd_cls in self._bases:
+            class_ids += [cmd_cls.class_id]
+            cmd_cls.__init__(self)
+
+        self._command_classes = class_ids[:]
+
+    def __repr__(self):
+        output = object.__repr__(self)
+        output.replace('ZWaveNode', 'Dynamic_ZWaveNode')
+        return output
+
+    zwave_node = type(
+        'ZWaveNode',
+        (cls,) + bases,
+        {
+            '__init__':   __init__,
+            '__repr__':   __repr__,
+            '__module__': ZWaveNode.__module__
+        }
+    )
+
+    _NODE_CLASSES[key] = zwave_node
+    return zwave_node
 
 
 class InstanceSingleton(type):
@@ -166,6 +248,7 @@ class InstanceSingleton(type):
                 if base in _REPLACED_ZWAVE_CLASSES:
                     _REPLACED_ZWAVE_CLASSES.remove(base)
                     _REPLACED_ZWAVE_CLASSES.append(cls)
+                    _NODE_CLASSES.clear()
                 else:
                     continue
 
@@ -183,12 +266,12 @@ class InstanceSingleton(type):
                 else:
                     mod = sys.modules[OZW_MOD_NAME]
 
-                for item in dir(mod):
-                    value = getattr(mod, item)
-
+                # only the names that are set in the module are checked, the
+                # command classes that have not been imported yet get the
+                # subclass from their own module when they are imported.
+                for item, value in list(mod.__dict__.items()):
                     if value == base:
                         setattr(mod, item, cls)
-                        mod.__dict__[item] = cls
                 break
 
     # noinspection PyProtectedMember
@@ -229,10 +312,6 @@ class InstanceSingleton(type):
 
             from .command_classes import COMMAND_CLASSES
 
-            # we need to set the bases of the node. ZWaveNode being the
-            # primary parent class.
-            bases = set()
-
             # we then make a call to the network manager to get the
             # command classes the node supports.
 
@@ -258,74 +337,7 @@ class InstanceSingleton(type):
                     if cc.class_id not in command_class_ids:
                         command_class_ids += [cc.class_id]
 
-            # see if a python command class id is in the list returned for
-            # the node. If it is in the list then add the class to the bases.
-
-            for class_id in command_class_ids:
-                bases.add(COMMAND_CLASSES[class_id])
-
-            # we need to supply a custom __init__ to our dynamically
-            # created class in order to properly start all of the parent
-            # classes
-
-            # noinspection PyShadowingBuiltins
-
-            # we use type to make the new class supplying it with the
-            # custom __init__ and the bases. the __init__ iterates through
-            # the bases and calls the constructor for each of them. at the
-            # time each base class is constructed if it is a command class
-            # it adds it's id to _cls_ids. this is done so we can use
-            # equality testing to identify if a node supports a specific
-            # command class.
-
-            # as an example. if we wanted to turn on a light switch
-            # if node == command_class.COMMAND_CLASS_BINARY_SWITCH:
-            #     node.state = True
-
-            # I found this to be a much better mechanism for testing node
-            # types then having to add a method to ZWaveNode to check.
-            # not to mention having ZWaveNode contain all the various
-            # properties and methods for all command classes can get a wee
-            # bit difficult to follow. So if a node is not a binary switch
-            # then it is not going to have the property state. it removes
-            # any checking that would need to be done inside of the
-            # property/method to ensure the node is the proper type
-
-            # this same equality testing also works on the values. It's a
-            # simple to use mechanism. the equality test is only performed
-            # against the command classes of a node/value if the object
-            # passed is an int, if testing 2 nodes it will check to see if
-            # the networks and ids match. because of the use of the
-            # singleton only a single node instance on a network can exist
-
-            bases = tuple(base for base in bases)
-
-            def __init__(self, id, net, xml, *a, **k):
-                self._bases = bases
-                cls.__init__(self, id, net, xml, *a, **k)
-                self.__name__ = 'ZWaveNode'
-
-                class_ids = []
-                for cmd_cls in self._bases:
-                    class_ids += [cmd_cls.class_id]
-                    cmd_cls.__init__(self)
-
-                self._command_classes = class_ids[:]
-
-            def __repr__(self):
-                output = object.__repr__(self)
-                output.replace('ZWaveNode', 'Dynamic_ZWaveNode')
-                return output
-
-            zwave_node = type(
-                'ZWaveNode',
-                (cls,) + bases,
-                {
-                    '__init__':   __init__,
-                    '__repr__':   __repr__,
-                    '__module__': ZWaveNode.__module__
-                }
-            )
+            zwave_node = _node_class(cls, command_class_ids)
 
             instance = zwave_node(node_id, network, xml_data, *args, **kwargs)
             instance.__instance_key__ = key
@@ -179,6 +179,96 @@ def caller_name(start=2):
     return ".".join(res)
 
 
+_LOGIT_LEVELS = (
+    LOGGING_DATA_PATH,
+    LOGGING_DATA_PATH_WITH_RETURN,
+    LOGGING_TIME_FUNCTION_CALLS,
+    logging.DEBUG
+)
+
+# [function, wrapper, logger] for every function decorated with logit
+_logit_functions = []
+_logit_lock = threading.RLock()
+
+
+def _logit_owner(func):
+    # returns the object that holds the function as an attribute.
+    names = func.__qualname__.split('.')[:-1]
+    owner = sys.modules.get(func.__module__, None)
+
+    for name in names:
+        if owner is None:
+            break
+
+        owner = vars(owner).get(name, None)
+
+    return owner
+
+
+def update_logit():
+    """
+    Swaps the functions decorated with :py:func:`logit` in and out.
+
+    When the log level of the module a function is in is not one of the data
+    path levels the bare function is placed in the class or module that
+    holds it, so calling it does not go through the wrapper at all. This
+    gets called when the log level of a libopenzwave logger changes. It only
+    needs to be called by hand if the log level gets changed in some other
+    way.
+    """
+    with _logit_lock:
+        mapping = {}
+        owners = {}
+
+        for func, wrapper, lgr in _logit_functions:
+            if lgr.getEffectiveLevel() in _LOGIT_LEVELS:
+                target = wrapper
+            else:
+                target = func
+
+            mapping[id(func)] = target
+            mapping[id(wrapper)] = target
+
+            owner = _logit_owner(func)
+            if owner is None:
+                continue
+
+            owners[id(owner)] = owner
+
+            # the class may have been replaced with a subclass
+            for cls in getattr(owner, '__mro__', ())[1:-1]:
+                owners[id(cls)] = cls
+
+        def swap(obj):
+            if isinstance(obj, property):
+                fget, fset, fdel = (
+                    mapping.get(id(f), f)
+                    for f in (obj.fget, obj.fset, obj.fdel)
+                )
+
+                if (fget, fset, fdel) == (obj.fget, obj.fset, obj.fdel):
+                    return obj
+
+                return type(obj)(fget, fset, fdel, obj.__doc__)
+
+            if isinstance(obj, (staticmethod, classmethod)):
+                func_ = mapping.get(id(obj.__func__), obj.__func__)
+
+                if func_ is obj.__func__:
+                    return obj
+
+                return type(obj)(func_)
+
+            return mapping.get(id(obj), obj)
+
+        for owner in owners.values():
+            for name, attr in list(vars(owner).items()):
+                new_attr = swap(attr)
+
+                if new_attr is not attr:
+                    setattr(owner, name, new_attr)
+
+
 def logit(func):
     """
     log_it
@@ -190,6 +280,10 @@ def logit(func):
     the location of the function/method/property. that has been wrapped by
     this decorator. As well as the parameter names and data that was passed
     including any defaulted parameters.
+
+    The wrapper is only used when the logger for the module the function is
+    in is set to one of the data path levels or `logging.DEBUG`, otherwise
+    the function is called directly. See :py:func:`update_logit`.
     """
     if func.__code__.co_flags & 0x20:
         return func
@@ -204,12 +298,7 @@ def logit(func):
 
     def wrapper(*args, **kwargs):
 
-        if lgr.getEffectiveLevel() in (
-            LOGGING_DATA_PATH,
-            LOGGING_DATA_PATH_WITH_RETURN,
-            LOGGING_TIME_FUNCTION_CALLS,
-            logging.DEBUG
-        ):
+        if lgr.getEffectiveLevel() in _LOGIT_LEVELS:
 
             if 'self' in kwargs:
                 self = kwargs['self']
@@ -324,7 +413,20 @@ def logit(func):
         return result
 
     wrapper.__doc__ = func.__doc__
-    return update_wrapper(wrapper, func)
+    wrapper = update_wrapper(wrapper, func)
+
+    # functions that are defined inside of other functions can not be
+    # swapped, they always get the wrapper.
+    if '<locals>' in func.__qualname__:
+        return wrapper
+
+    with _logit_lock:
+        _logit_functions.append((func, wrapper, lgr))
+
+    if lgr.getEffectiveLevel() in _LOGIT_LEVELS:
+        return wrapper
+
+    return func
 
 
 def log_it_with_return(func):
@@ -499,6 +499,9 @@ class ZWaveValue(ZWaveObject):
         ZWaveObject.__init__(self, id_, network=network, xml_data=xml_data)
         logger.debug(u"Create object value (valueId:%s)", id_)
         self._parent = parent
+        # a value loaded from the saved dataset has a temporary id until
+        # OpenZWave adds it, the id property returns the real id.
+        self._hash = hash(self.id)
 
         if (
             self.command_class in (
@@ -580,12 +583,22 @@ class ZWaveValue(ZWaveObject):
                     value=self
                 )
 
-    def _id(self, new_id):
+    def _set_id(self, new_id):
+        """
+        Changes the temporary id of a value loaded from the saved dataset.
+
+        The hash is made again from the new id. :py:class:`ZWaveValues`
+        moves the value to the new id, a set or dict made by anything else
+        has to add the value again.
+
+        :param new_id: id OpenZWave has given the value
+        :type new_id: int
+        """
         self._object_id = new_id
-        if self._xml_handler is not None:
-            self._xml_handler['id'] = '0x{0:04X}'.format(self.id)
+        self._hash = hash(new_id)
 
-    _id = property(fset=_id)
+        if self._xml_handler is not None:
+            self._xml_handler['id'] = '0x{0:04X}'.format(new_id)
 
     @property
     def id(self):
@@ -794,6 +807,8 @@ class ZWaveValue(ZWaveObject):
         :param other:
         :rtype: bool
         """
+        if other is self:
+            return True
         if isinstance(other, ZWaveValue):
             return other.id == self.id
         try:
@@ -801,6 +816,12 @@ class ZWaveValue(ZWaveObject):
         except AttributeError:
             return False
 
+    def __hash__(self):
+        """
+        :rtype: hash
+        """
+        return self._hash
+
     @property
     def is_ready(self):
         return self._is_ready
@@ -1773,6 +1794,11 @@ class ZWaveValues(object):
         """
         self._node = node
         self._values = {}
+        # (command class id, instance, index) -> temporary id of a value
+        # loaded from the saved dataset, this lets the notification find the
+        # value without going through all of the values of the node.
+        self._index = {}
+        self._index_keys = {}
         self._lock = threading.Lock()
 
         for base in node._bases:
@@ -1816,8 +1842,7 @@ class ZWaveValues(object):
                             with self._lock:
                                 self.__dict__[name] = value
 
-                        with self._lock:
-                            self._values[key] = value
+                        self.__add(key, value)
                         return
 
         output = (
@@ -1841,10 +1866,79 @@ class ZWaveValues(object):
             value.instance
         )
         logger.warning(output)
+        self.__add(key, value)
+
+    def __add(self, key, value):
+        if key < 0:
+            # only the values loaded from the saved dataset are indexed
+            index_key = (
+                value.command_class.class_id,
+                value.instance,
+                value.index
+            )
+        else:
+            index_key = None
 
         with self._lock:
             self._values[key] = value
 
+            if index_key is not None:
+                self._index[index_key] = key
+                self._index_keys[key] = index_key
+
+    def __remove_index(self, key):
+        # the lock has to be held
+        index_key = self._index_keys.pop(key, None)
+
+        if index_key is not None and self._index.get(index_key) == key:
+            del self._index[index_key]
+
+    def resolve(self, value_id, command_class, instance, index):
+        """
+        Finds the value a notification is for.
+
+        A value that has been loaded from the saved dataset is stored using
+        a temporary id until OpenZWave adds the value. When the value gets
+        found using the command class, instance and index it is moved to
+        `value_id`.
+
+        :param value_id: id of the value
+        :type value_id: int
+
+        :param command_class: command class id of the value
+        :type command_class: int
+
+        :param instance: instance of the value
+        :type instance: int
+
+        :param index: index of the value
+        :type index: int
+
+        :return: the value, `None` if it is not found
+        :rtype: Optional[ZWaveValue]
+        """
+        with self._lock:
+            value = self._values.get(value_id, None)
+
+            if value is not None:
+                return value
+
+            index_key = (command_class, instance, index)
+            key = self._index.get(index_key, None)
+
+            if key is None:
+                return None
+
+            del self._index[index_key]
+            del self._index_keys[key]
+
+            value = self._values.pop(key)
+            value._set_id(value_id)
+            self._values[value_id] = value
+
+        value._update_dataset()  # NOQA
+        return value
+
     @utils.logit
     def __getattr__(self, item):
         """
@@ -1878,6 +1972,7 @@ class ZWaveValues(object):
         with self._lock:
             if key in self._values:
                 del self._values[key]
+                self.__remove_index(key)
 
     def keys(self):
         with self._lock:
@@ -1904,4 +1999,6 @@ class ZWaveValues(object):
         :param key:
         """
         with self._lock:
-            return self._values.pop(key)
+            value = self._values.pop(key)
+            self.__remove_index(key)
+            return value
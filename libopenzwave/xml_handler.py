@@ -26,10 +26,18 @@ This file is part of the **libopenzwave** project
 
 import threading
 import logging
+import time
 import os
+import re
+import shutil
+import tempfile
 
 VALIDATE_XML_ON_SAVE = False
 
+# number of seconds changes to the dataset are collected before the file
+# gets written.
+WRITE_FILE_DELAY = 2.0
+
 logger = logging.getLogger(__name__)
 
 ESCAPE_CHARS = (
@@ -48,6 +56,26 @@ UNESCAPE_CHARS = (
     ('&apos;', "'")
 )
 
+# matches comments, the xml declaration, doctypes and start/end tags.
+# groups: closing slash, tag name, attributes, self closing slash
+_TOKEN_RE = re.compile(
+    r'<!--.*?-->|<\?.*?\?>|<![^>]*>|'
+    r'<(/?)\s*([^\s/>]+)((?:[^>"\']|"[^"]*"|\'[^\']*\')*?)\s*(/?)\s*>',
+    re.DOTALL
+)
+
+# groups: attribute name, double quoted value, single quoted value
+_ATTRIBUTE_RE = re.compile(
+    r'([^\s=]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')'
+)
+
+
+def _unescape(value):
+    if '&' in value:
+        for item in UNESCAPE_CHARS:
+            value = value.replace(*item)
+    return value
+
 
 class XMLAttributes(object):
 
@@ -142,122 +170,108 @@ class XMLElement(object):
         self.__parent = None
         self.__attrib = XMLAttributes(self)
         self.__children = []
+        self.__revision = 0
+        self.__cache = None
 
     @classmethod
     def from_string(cls, str_element):
-        str_element = str_element.split('?>', 1)[-1].strip()
+        """
+        Builds an element tree from an xml string.
 
-        while '<!--' in str_element:
-            front = str_element.split('<!--', 1)[0]
-            back = str_element.split('-->', 1)[-1]
+        The document is tokenized in a single pass. Start tags, end tags,
+        comments and the xml declaration are matched with one regular
+        expression and the tree is built using a stack of the open elements,
+        so the time it takes is linear to the size of the document.
 
-            str_element = front + back.lstrip()
+        The root element is an instance of the class this method is called
+        on, all of the sub elements are :py:class:`XMLElement` instances.
 
-        elements = list(
-            item.strip() for item in str_element.strip().split('<')
-            if item.strip()
-        )
+        :param str_element: xml data
+        :type str_element: str
 
-        attr_line = elements.pop(0)
+        :rtype: XMLElement
+        """
+        root = None
+        stack = []
+        text = []
+        pos = 0
 
-        attr_line = attr_line.split('>')
+        for match in _TOKEN_RE.finditer(str_element):
+            closing, tag, attr_line, self_closing = match.groups()
 
-        if len(attr_line) == 2:
-            attr_line, text = attr_line
-        else:
-            attr_line = attr_line[0]
-            text = ''
+            if stack and text is not None:
+                text.append(str_element[pos:match.start()])
 
-        attr_line = attr_line.split(' ', 1)
+            pos = match.end()
 
-        if len(attr_line) == 2:
-            tag, attr_line = attr_line
-        else:
-            tag = attr_line[0]
-            attr_line = ''
+            if tag is None:
+                # comment, xml declaration or doctype
+                continue
 
-        if tag.endswith('/') or attr_line.endswith('/'):
-            sub_nodes = []
-        else:
-            sub_nodes = elements[:-1]
+            if closing:
+                if not stack or stack[-1][0].tag != tag:
+                    raise ValueError(
+                        'Unexpected closing tag {0} '
+                        'at position {1}'.format(repr(tag), match.start())
+                    )
 
-        tag = tag.rstrip('/').strip()
-        attr_line = attr_line.rstrip('/').strip()
-        text = text.strip()
+                element, text = stack.pop()
+                if text:
+                    element._set_text_from_xml(''.join(text))
 
-        self = cls(tag)
+                if not stack:
+                    break
 
-        quote_count = None
+                # only the text ahead of the first child element is kept
+                text = None
+                continue
 
-        key = ''
-        value = ''
+            if root is None:
+                element = root = cls(tag)
+            else:
+                element = XMLElement(tag)
 
-        for char in list(attr_line):
-            if quote_count is None and char in (' ', '\n', '\t'):
-                continue
+            if attr_line:
+                for key, value1, value2 in _ATTRIBUTE_RE.findall(attr_line):
+                    element[key] = _unescape(value1 or value2)
 
-            if quote_count is None and char == '=':
-                quote_count = 0
-                continue
+            if stack:
+                parent = stack[-1][0]
+                element.__parent = parent
+                parent.__children.append(element)
 
-            if char in ('"', "'"):
-                if quote_count == 0:
-                    quote_count = 1
-                    continue
-                else:
-                    quote_count = None
+            if self_closing:
+                if not stack:
+                    break
+                text = None
+            else:
+                text = []
+                stack.append((element, text))
 
-                    for item in UNESCAPE_CHARS:
-                        value = value.replace(*item)
+        if root is None:
+            raise ValueError('No xml element found.')
 
-                    self[key.strip()] = value
-                    key = ''
-                    value = ''
-                    continue
+        if stack:
+            raise ValueError(
+                'Element {0} is not closed.'.format(repr(stack[-1][0].tag))
+            )
 
-            if quote_count == 1:
-                value += char
-            else:
-                key += char
+        return root
 
-        if key and value:
-            self[key.strip()] = value
+    def _set_text_from_xml(self, text):
+        text = _unescape(text.strip())
 
         if text:
-            for item in UNESCAPE_CHARS:
-                text = text.replace(*item)
-
             num_indents = 0
 
             for line in text.splitlines():
                 indent_count = line.count('    ')
 
-                for i in range(indent_count, -1, -1):
-                    if line.startswith('    ' * indent_count):
-                        num_indents = i
-                        break
+                if line.startswith('    ' * indent_count):
+                    num_indents = indent_count
 
             self.text = text.replace('    ' * num_indents, '').strip('\n')
 
-        while sub_nodes:
-            sub_element = sub_nodes.pop(0)
-            if sub_element.endswith('/>'):
-                self.append(XMLElement.from_string('<' + sub_element))
-                continue
-
-            sub_tag = sub_element.split(' ', 1)[0]
-            sub_tag = sub_tag.split('>')[0].strip()
-
-            while (
-                not '/' + sub_tag + '>' in sub_element and
-                not '/' + sub_tag + ' >' in sub_element
-            ):
-                sub_element += '<' + sub_nodes.pop(0)
-
-            self.append(XMLElement.from_string('<' + sub_element))
-
-        return self
-
     def clear(self):
         for child in self.__children:
             child.parent = None
@@ -290,6 +304,8 @@ class XMLElement(object):
         except AttributeError:
             self.__tag = value
 
+        self.save()
+
     @property
     def text(self):
         try:
@@ -300,22 +316,39 @@ class XMLElement(object):
     @text.setter
     def text(self, value):
         if value is None:
-            self.__text = None
-            return
-
-        try:
-            text = value.encode('utf-8')
-        except UnicodeEncodeError:
-            text = value
+            text = None
+        else:
+            try:
+                text = value.encode('utf-8')
+            except UnicodeEncodeError:
+                text = value
 
-        self.__text = text
+        if text != self.__text:
+            self.__text = text
+            self.save()
 
     def __str__(self):
-        output = '<' + self.tag
+        return self._to_string(0)
+
+    def _to_string(self, depth):
+        # The serialized text of an element is cached along with the
+        # revision of the element and the depth it was serialized at.
+        # save() bumps the revision of the element and all of its parents
+        # so only the elements along the path to a change get rebuilt, the
+        # cached text gets used for everything else.
+        revision = self.__revision
+        cache = self.__cache
+
+        if cache is not None and cache[0] == revision and cache[1] == depth:
+            return cache[2]
+
+        indent = '    ' * depth
+        output = '<' + self.__tag
         output += str(self.__attrib)
 
         if self.__text is None and not self.__children:
-            output += '/>\n'
+            output = indent + output + '/>\n'
+            self.__cache = (revision, depth, output)
             return output
 
         output += '>\n'
@@ -334,22 +367,23 @@ class XMLElement(object):
                 '\n' not in text and
                 not self.__children
             ):
-                output = output[:-1] + text
+                output = indent + output[:-1] + text
                 output += '</{0}>\n'.format(self.__tag)
+                self.__cache = (revision, depth, output)
                 return output
 
-            else:
-                text = list(
-                    '    ' + line for line in text.splitlines()
-                )
-                output += ''.join(text) + '\n'
-
-        if self.__children:
-            for child in self.__children:
-                child = str(child)
-                child = '\n'.join('    ' + line for line in child.splitlines())
-                output += child + '\n'
-        output += '</{0}>\n'.format(self.__tag)
+            output = indent + output + ''.join(
+                indent + '    ' + line + '\n' for line in text.splitlines()
+            )
+        else:
+            output = indent + output
+
+        output += ''.join(
+            child._to_string(depth + 1) for child in self.__children
+        )
+        output += indent + '</{0}>\n'.format(self.__tag)
+
+        self.__cache = (revision, depth, output)
         return output
 
     @property
@@ -364,6 +398,8 @@ class XMLElement(object):
         self.__parent = new_parent
 
     def save(self):
+        self.__revision += 1
+
         if self.__parent is not None:
             self.__parent.save()
 
@@ -427,6 +463,7 @@ class XMLElement(object):
                 try:
                     self.__children[key] = value
                     value.parent = self
+                    self.save()
                 except IndexError:
                     raise IndexError(key)
 
@@ -530,6 +567,7 @@ class XMLRootElement(XMLElement):
     def __init__(self, tag):
         self.__xml_file = None
         self.__is_dirty = False
+        self.__dirty_time = None
         self.__lock = threading.RLock()
         XMLElement.__init__(self, tag)
 
@@ -545,28 +583,112 @@ class XMLRootElement(XMLElement):
     def is_dirty(self):
         return self.__is_dirty
 
+    @classmethod
+    def from_string(cls, str_element):
+        """
+        Builds an element tree from an xml string.
+
+        See :py:meth:`XMLElement.from_string`. Loading the data is not a
+        change to the dataset so the root is not marked as dirty.
+
+        :param str_element: xml data
+        :type str_element: str
+
+        :rtype: XMLRootElement
+        """
+        root = super(XMLRootElement, cls).from_string(str_element)
+        root.__is_dirty = False
+        root.__dirty_time = None
+        return root
+
     def save(self):
-        self.__is_dirty = True
+        XMLElement.save(self)
+
+        if not self.__is_dirty:
+            self.__dirty_time = time.time()
+            self.__is_dirty = True
+
+    def write_file(self, force=False):
+        """
+        Writes the tree to :py:attr:`xml_file` if there have been changes.
+
+        Changes are coalesced, the file is not written until
+        :py:data:`WRITE_FILE_DELAY` seconds have passed since the first
+        change that has not been written. Only the elements that have changed
+        get serialized again. The data is written to a temporary file which
+        then replaces the dataset file so a partially written dataset is
+        never left behind.
+
+        :param force: write the file without waiting for the delay
+        :type force: bool, optional
 
-    def write_file(self):
+        :return: `True` if the file was written else `False`
+        :rtype: bool
+        """
         with self.__lock:
-            if self.xml_file is not None and self.__is_dirty:
-                self.__is_dirty = False
-                data = str(self)
+            if self.xml_file is None or not self.__is_dirty:
+                return False
 
-                if VALIDATE_XML_ON_SAVE:
-                    try:
-                        _ = XMLElement.from_string(data)
-                    except:
-                        import traceback
-                        logger.error(
-                            'dataset xml validation failed.\n' +
-                            traceback.format_exc()
-                        )
-                        return
+            if (
+                not force and
+                time.time() - self.__dirty_time < WRITE_FILE_DELAY
+            ):
+                return False
+
+            self.__is_dirty = False
+            data = str(self)
+
+            if VALIDATE_XML_ON_SAVE:
+                try:
+                    _ = XMLElement.from_string(data)
+                except:
+                    import traceback
+                    logger.error(
+                        'dataset xml validation failed.\n' +
+                        traceback.format_exc()
+                    )
+                    return False
+
+            # every write gets its own temporary file in the same directory,
+            # os.replace is only atomic on the same file system.
+            temp_file = None
+
+            try:
+                fd, temp_file = tempfile.mkstemp(
+                    prefix=os.path.basename(self.xml_file) + '.',
+                    suffix='.tmp',
+                    dir=os.path.dirname(os.path.abspath(self.xml_file))
+                )
 
-                with open(self.xml_file, 'w') as f:
+                with os.fdopen(fd, 'w') as f:
                     f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                if os.path.exists(self.xml_file):
+                    # mkstemp creates the file readable by the owner only
+                    shutil.copymode(self.xml_file, temp_file)
+
+                os.replace(temp_file, self.xml_file)
+            except:
+                if temp_file is not None and os.path.exists(temp_file):
+                    try:
+                        os.remove(temp_file)
+                    except OSError:
+                        pass
+
+                import traceback
+                logger.error(
+                    'unable to write dataset file {0}.\n'.format(
+                        self.xml_file
+                    ) +
+                    traceback.format_exc()
+                )
+                self.__dirty_time = time.time()
+                self.__is_dirty = True
+                return False
+
+            return True
 
     @staticmethod
     def handle_file(file_path):
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Helpers shared by the benchmarks.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import timeit
+import unittest
+
+
+class BenchmarkCase(unittest.TestCase):
+    """
+    Parent class for the benchmarks.
+
+    The benchmarks do not need a controller or the openzwave library. The
+    timings are written to stderr so they show up when running the
+    benchmarks with `python -m unittest -v tests.benchmark`.
+    """
+
+    repeat = 3
+
+    def bench(self, label, func, number=1, repeat=None):
+        """
+        Times a callable.
+
+        :param label: name printed along with the timing
+        :type label: str
+
+        :param func: callable to time
+        :type func: callable
+
+        :param number: number of calls per run
+        :type number: int
+
+        :param repeat: number of runs, defaults to :py:attr:`repeat`
+        :type repeat: int, optional
+
+        :return: best time of a single call in seconds
+        :rtype: float
+        """
+        if repeat is None:
+            repeat = self.repeat
+
+        timer = timeit.Timer(func)
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+        sys.stderr.write(
+            '\n    {0:<50} {1:>12.3f} us'.format(label, best * 1000000.0)
+        )
+        return best
+
+
+def build_network_xml(node_count, values_per_node=10):
+    """
+    Creates a synthetic "zwave database" string.
+
+    :param node_count: number of nodes in the dataset
+    :type node_count: int
+
+    :param values_per_node: number of values for each node
+    :type values_per_node: int
+
+    :rtype: str
+    """
+    output = [
+        '<?xml version="1.0" encoding="utf-8" ?>\n',
+        '<!-- synthetic dataset -->\n',
+        '<Network home_id="0xE1A2B3C4">\n',
+        '    <Controller id="1" name="Controller"/>\n',
+        '    <Nodes>\n'
+    ]
+
+    for node_id in range(2, node_count + 2):
+        output += [
+            '        <Node id="{0}" name="Node &amp; {0}" '
+            'location="Room {1}">\n'.format(node_id, node_id % 12),
+            '            <Description>Synthetic node {0}</Description>\n'
+            ''.format(node_id),
+            '            <CommandClasses>\n',
+            '                <CommandClass id="37"/>\n',
+            '                <CommandClass id="38"/>\n',
+            '            </CommandClasses>\n',
+            '            <Values>\n'
+        ]
+
+        for index in range(values_per_node):
+            output += [
+                '                <Value id="{0}" label="Value {1}" '
+                'units="&lt;C&gt;" index="{1}" instance="1">\n'
+                ''.format((node_id << 32) | index, index),
+                '                    <CommandClass id="38"/>\n',
+                '                    <Help>\n',
+                '                        Line one of the help text &lt;1&gt;\n',
+                '                        Line two of the help text\n',
+                '                    </Help>\n',
+                '                    <Data value="{0}" index="None">{0}'
+                '</Data>\n'.format(index),
+                '                </Value>\n'
+            ]
+        output += [
+            '            </Values>\n',
+            '        </Node>\n'
+        ]
+
+    output += [
+        '    </Nodes>\n',
+        '    <Locations/>\n',
+        '</Network>\n'
+    ]
+    return ''.join(output)
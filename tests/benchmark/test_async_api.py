@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Tests for the asyncio support.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import asyncio
+import threading
+import unittest
+
+from libopenzwave import signals, async_api, state
+from .common import BenchmarkCase
+
+
+class Sender(object):
+    pass
+
+
+class Network(object):
+    # stands in for ZWaveNetwork, the signals are sent from another thread
+    # the same way the notification thread of the network sends them.
+    STATE_STOPPED = state.STATE_STOPPED
+    STATE_STARTED = state.STATE_STARTED
+
+    def __init__(self, fail=False):
+        self.state = self.STATE_STOPPED
+        self.is_ready = False
+        self.fail = fail
+        self.start_count = 0
+        self.stop_thread = None
+
+    def start(self):
+        self.start_count += 1
+
+        if self.fail:
+            send_from_thread(signals.SIGNAL_NETWORK_FAILED, self)
+        else:
+            self.state = self.STATE_STARTED
+            send_from_thread(signals.SIGNAL_NETWORK_STARTED, self)
+
+    def ready(self):
+        self.is_ready = True
+        send_from_thread(signals.SIGNAL_NETWORK_READY, self)
+
+    def stop(self):
+        self.stop_thread = threading.current_thread()
+        self.state = self.STATE_STOPPED
+        threading.Thread(
+            target=signals.SIGNAL_NETWORK_STOPPED.send,
+            kwargs=dict(sender=self)
+        ).start()
+
+
+class Value(object):
+
+    def __init__(self, signal=signals.SIGNAL_VALUE_CHANGED):
+        self.signal = signal
+        self._data = None
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        # a change of another value is sent first, it has to be ignored
+        send_from_thread(self.signal, Value(), value_data=None)
+
+        self._data = data
+        send_from_thread(self.signal, self, value_data=data)
+
+
+def send_from_thread(signal, sender, **kwargs):
+    thread = threading.Thread(
+        target=signal.send,
+        kwargs=dict(sender=sender, **kwargs)
+    )
+    thread.start()
+    thread.join()
+
+
+class TestAsyncAPI(BenchmarkCase):
+
+    def test_000_wait_for_signal(self):
+        sender = Sender()
+
+        async def run():
+            waiter = async_api.wait_for_signal(
+                signals.SIGNAL_VALUE_CHANGED,
+                signals.SIGNAL_VALUE_REFRESHED,
+                sender=sender,
+                timeout=5.0
+            )
+
+            # sent before the waiter is awaited
+            send_from_thread(signals.SIGNAL_VALUE_CHANGED, Sender())
+            send_from_thread(
+                signals.SIGNAL_VALUE_REFRESHED,
+                sender,
+                value_data=1
+            )
+            return await waiter
+
+        event = asyncio.run(run())
+        self.assertEqual(event.signal, signals.SIGNAL_VALUE_REFRESHED)
+        self.assertIs(event.sender, sender)
+        self.assertEqual(event.kwargs, dict(value_data=1))
+        self.assertEqual(
+            signals.dispatcher.receivers(signals.SIGNAL_VALUE_REFRESHED),
+            []
+        )
+
+    def test_001_timeout(self):
+        async def run():
+            await async_api.wait_for_signal(
+                signals.SIGNAL_VALUE_CHANGED,
+                timeout=0.01
+            )
+
+        self.assertRaises(asyncio.TimeoutError, asyncio.run, run())
+
+    def test_002_signal_stream(self):
+        sender = Sender()
+
+        async def run():
+            events = []
+
+            async with async_api.SignalStream(
+                signals.SIGNAL_VALUE_CHANGED,
+                sender=sender,
+                max_size=2
+            ) as stream:
+                for i in range(3):
+                    send_from_thread(
+                        signals.SIGNAL_VALUE_CHANGED,
+                        sender,
+                        value_data=i
+                    )
+                send_from_thread(signals.SIGNAL_VALUE_CHANGED, Sender())
+
+                await asyncio.sleep(0.01)
+
+                async for event in stream:
+                    events.append(event.kwargs['value_data'])
+                    if len(events) == 2:
+                        stream.close()
+
+            return events, stream.dropped
+
+        self.assertEqual(asyncio.run(run()), ([1, 2], 1))
+
+    def assertNoReceivers(self, *signals_):
+        for signal in signals_:
+            self.assertEqual(signals.dispatcher.receivers(signal), [])
+
+    def test_003_network_start(self):
+        network = Network()
+
+        async def run():
+            async_network = async_api.AsyncZWaveNetwork(network)
+            await async_network.start(timeout=5.0)
+            # already started, the network does not get started again
+            await async_network.start(timeout=5.0)
+
+        asyncio.run(run())
+        self.assertEqual(network.state, state.STATE_STARTED)
+        self.assertEqual(network.start_count, 1)
+        self.assertNoReceivers(
+            signals.SIGNAL_NETWORK_STARTED,
+            signals.SIGNAL_NETWORK_FAILED
+        )
+
+    def test_004_network_start_failed(self):
+        network = Network(fail=True)
+
+        async def run():
+            await async_api.AsyncZWaveNetwork(network).start(timeout=5.0)
+
+        self.assertRaises(RuntimeError, asyncio.run, run())
+        self.assertNoReceivers(
+            signals.SIGNAL_NETWORK_STARTED,
+            signals.SIGNAL_NETWORK_FAILED
+        )
+
+    def test_005_network_ready(self):
+        network = Network()
+
+        async def run():
+            async_network = async_api.AsyncZWaveNetwork(network)
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.01, network.ready)
+
+            await async_network.ready(timeout=5.0)
+            self.assertTrue(network.is_ready)
+
+            # returns right away when the network is already ready
+            await async_network.ready(timeout=0.01)
+
+        asyncio.run(run())
+        self.assertNoReceivers(
+            signals.SIGNAL_NETWORK_READY,
+            signals.SIGNAL_NETWORK_FAILED
+        )
+
+    def test_006_network_ready_failed(self):
+        network = Network()
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.call_later(
+                0.01,
+                send_from_thread,
+                signals.SIGNAL_NETWORK_FAILED,
+                network
+            )
+            await async_api.AsyncZWaveNetwork(network).ready(timeout=5.0)
+
+        self.assertRaises(RuntimeError, asyncio.run, run())
+
+    def test_007_network_stop(self):
+        network = Network()
+        network.state = state.STATE_STARTED
+
+        async def run():
+            async_network = async_api.AsyncZWaveNetwork(network)
+            await async_network.stop(timeout=5.0)
+            # already stopped, no signal is waited for
+            await async_network.stop(timeout=0.01)
+
+        asyncio.run(run())
+        self.assertEqual(network.state, state.STATE_STOPPED)
+        # the loop is not blocked while the network stops
+        self.assertIsNotNone(network.stop_thread)
+        self.assertIsNot(network.stop_thread, threading.current_thread())
+        self.assertNoReceivers(signals.SIGNAL_NETWORK_STOPPED)
+
+    def test_008_set_value(self):
+        async def run(value):
+            async_network = async_api.AsyncZWaveNetwork(Network())
+            return await async_network.set_value(value, 50, timeout=5.0)
+
+        for signal in (
+            signals.SIGNAL_VALUE_CHANGED,
+            signals.SIGNAL_VALUE_REFRESHED
+        ):
+            value = Value(signal)
+
+            self.assertEqual(asyncio.run(run(value)), 50)
+            self.assertEqual(value.data, 50)
+
+        self.assertNoReceivers(
+            signals.SIGNAL_VALUE_CHANGED,
+            signals.SIGNAL_VALUE_REFRESHED
+        )
+
+    def test_009_set_value_timeout(self):
+        class SilentValue(object):
+            data = None
+
+        async def run():
+            await async_api.AsyncZWaveNetwork(Network()).set_value(
+                SilentValue(),
+                50,
+                timeout=0.01
+            )
+
+        self.assertRaises(asyncio.TimeoutError, asyncio.run, run())
+        self.assertNoReceivers(
+            signals.SIGNAL_VALUE_CHANGED,
+            signals.SIGNAL_VALUE_REFRESHED
+        )
+
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
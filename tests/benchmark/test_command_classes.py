@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for looking up command classes.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import pkgutil
+import unittest
+import importlib
+
+from libopenzwave import command_classes
+from libopenzwave.command_classes import COMMAND_CLASSES
+from .common import BenchmarkCase
+
+
+def legacy_getitem(item):
+    # the lookup COMMAND_CLASSES used before the ids were indexed.
+    # it is kept here only to compare the two.
+    mod = sys.modules[command_classes.__name__]
+
+    for attr_name in COMMAND_CLASSES._attr_names:
+        cc = getattr(mod, attr_name)
+
+        if cc.class_id == item:
+            return cc
+
+    raise IndexError('Command class does not exist ({0})'.format(item))
+
+
+class TestCommandClasses(BenchmarkCase):
+
+    def test_000_getitem(self):
+        for cc in COMMAND_CLASSES:
+            self.assertIs(
+                COMMAND_CLASSES[cc.class_id],
+                legacy_getitem(cc.class_id)
+            )
+
+        self.assertIs(
+            COMMAND_CLASSES['COMMAND_CLASS_SWITCH_BINARY'],
+            command_classes.COMMAND_CLASS_SWITCH_BINARY
+        )
+        # Alarm and Notification share an id, the first one is returned
+        self.assertIs(
+            COMMAND_CLASSES[0x71],
+            command_classes.COMMAND_CLASS_ALARM
+        )
+        self.assertRaises(IndexError, COMMAND_CLASSES.__getitem__, 0xFFFF)
+
+    def test_001_contains(self):
+        # command classes
+        self.assertIn(
+            command_classes.COMMAND_CLASS_NOTIFICATION,
+            COMMAND_CLASSES
+        )
+        self.assertIn(command_classes.COMMAND_CLASS_METER, COMMAND_CLASSES)
+        self.assertIn(COMMAND_CLASSES.str_wrapper(0x32), COMMAND_CLASSES)
+        self.assertNotIn(
+            command_classes.zwave_cmd_class.ZWaveCommandClass,
+            COMMAND_CLASSES
+        )
+
+        # class ids
+        self.assertIn(0x25, COMMAND_CLASSES)
+        self.assertIn(0x32, COMMAND_CLASSES)
+        self.assertIn(0x71, COMMAND_CLASSES)
+        self.assertNotIn(0xFFFF, COMMAND_CLASSES)
+        self.assertNotIn(-1, COMMAND_CLASSES)
+
+        for class_id in COMMAND_CLASSES.ids():
+            self.assertIn(class_id, COMMAND_CLASSES)
+
+        # names
+        self.assertIn('COMMAND_CLASS_SWITCH_BINARY', COMMAND_CLASSES)
+        self.assertIn('COMMAND_CLASS_ALARM', COMMAND_CLASSES)
+        self.assertNotIn('COMMAND_CLASS_DOES_NOT_EXIST', COMMAND_CLASSES)
+        self.assertNotIn('SwitchBinary', COMMAND_CLASSES)
+
+        self.assertNotIn(None, COMMAND_CLASSES)
+        self.assertNotIn(object(), COMMAND_CLASSES)
+
+    def test_002_str_wrapper(self):
+        wrapper = COMMAND_CLASSES.str_wrapper(0x25)
+
+        self.assertIs(COMMAND_CLASSES.str_wrapper(0x25), wrapper)
+        self.assertEqual(str(wrapper), 'COMMAND_CLASS_SWITCH_BINARY')
+        self.assertEqual(wrapper, 0x25)
+        self.assertEqual(int(wrapper), 0x25)
+        self.assertIsNot(COMMAND_CLASSES.str_wrapper(0x26), wrapper)
+
+    def test_003_lazy_table(self):
+        # the table the command classes are imported from is written by
+        # hand, every entry has to match the class it names
+        table = command_classes._LAZY_COMMAND_CLASSES
+        base = command_classes.zwave_cmd_class.ZWaveCommandClass
+        found = set()
+
+        for name, (module_name, class_name, class_id) in table.items():
+            module = importlib.import_module(
+                '.' + module_name,
+                command_classes.__name__
+            )
+            cls = getattr(module, class_name)
+
+            self.assertTrue(issubclass(cls, base), name)
+            self.assertEqual(cls.class_id, class_id, name)
+            self.assertEqual(cls.class_desc, name)
+            found.add(cls)
+
+        # and every command class is in the table
+        for module_info in pkgutil.iter_modules(command_classes.__path__):
+            module = importlib.import_module(
+                '.' + module_info.name,
+                command_classes.__name__
+            )
+
+            for value in vars(module).values():
+                if (
+                    isinstance(value, type) and
+                    issubclass(value, base) and
+                    value is not base and
+                    value.__module__ == module.__name__
+                ):
+                    self.assertIn(value, found)
+
+    def test_100_benchmark(self):
+        # the last command class is the worst case for the linear search
+        class_id = list(COMMAND_CLASSES)[-1].class_id
+
+        self.bench(
+            'linear search by id',
+            lambda: legacy_getitem(class_id),
+            number=5000
+        )
+        self.bench(
+            'COMMAND_CLASSES[id]',
+            lambda: COMMAND_CLASSES[class_id],
+            number=5000
+        )
+        self.bench(
+            'COMMAND_CLASSES.str_wrapper(id)',
+            lambda: COMMAND_CLASSES.str_wrapper(class_id),
+            number=5000
+        )
+        sys.stderr.write('\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
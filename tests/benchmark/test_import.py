@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for importing libopenzwave.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import os
+import sys
+import subprocess
+import unittest
+
+from libopenzwave import signals
+from libopenzwave.command_classes import COMMAND_CLASSES
+from .common import BenchmarkCase
+
+CC_PACKAGE = 'libopenzwave.command_classes'
+
+LOADED = '''
+import sys
+import libopenzwave
+{0}
+print(len(list(
+    name for name in sys.modules
+    if name.startswith('{1}.')
+)))
+'''
+
+
+def run(args):
+    # every import is done in a new interpreter, the modules are already
+    # imported in this one.
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(path for path in sys.path if path)
+
+    proc = subprocess.Popen(
+        [sys.executable] + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env
+    )
+    stdout, stderr = proc.communicate()
+
+    if proc.returncode:
+        raise RuntimeError(stderr.decode('utf-8'))
+
+    return stdout.decode('utf-8'), stderr.decode('utf-8')
+
+
+def loaded_count(code=''):
+    stdout, _ = run(['-c', LOADED.format(code, CC_PACKAGE)])
+    return int(stdout.strip())
+
+
+def import_times():
+    # cumulative import time in microseconds of every module
+    _, stderr = run(['-X', 'importtime', '-c', 'import libopenzwave'])
+    times = {}
+
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue
+
+    return times
+
+
+class TestImport(BenchmarkCase):
+
+    def test_000_lazy_command_classes(self):
+        count = loaded_count()
+        total = len(list(COMMAND_CLASSES))
+
+        self.assertLess(count, total // 4)
+        self.assertEqual(
+            loaded_count(
+                'from libopenzwave.command_classes import '
+                'COMMAND_CLASS_SWITCH_BINARY'
+            ),
+            count + 1
+        )
+        self.assertGreaterEqual(
+            loaded_count('list(libopenzwave.command_classes.COMMAND_CLASSES)'),
+            total
+        )
+
+    def test_001_command_class_names(self):
+        from libopenzwave import command_classes
+
+        cc = command_classes.COMMAND_CLASS_SWITCH_BINARY
+
+        self.assertIs(command_classes.SwitchBinary, cc)
+        self.assertEqual(cc.class_id, 0x25)
+        self.assertIn('COMMAND_CLASS_METER', dir(command_classes))
+        self.assertRaises(
+            AttributeError,
+            getattr,
+            command_classes,
+            'COMMAND_CLASS_DOES_NOT_EXIST'
+        )
+        self.assertEqual(
+            COMMAND_CLASSES.ids(),
+            sorted(set(cc.class_id for cc in COMMAND_CLASSES))
+        )
+
+    def test_002_docstrings(self):
+        indexes = COMMAND_CLASSES[0x25].ValueIndexes
+
+        self.assertIn('* `switch_binary_state`: `0`', indexes.__doc__)
+        self.assertIsInstance(indexes.__dict__['__doc__'], str)
+
+        signal = type(signals.SIGNAL_NODE_ADDED)
+        register = signal.register
+
+        self.assertIn(':py:class:`libopenzwave.network.ZWaveNetwork`', (
+            register.__doc__
+        ))
+        self.assertIs(signal.__dict__['register'], register)
+
+    def test_100_benchmark(self):
+        times = list(import_times() for _ in range(self.repeat))
+
+        for name in ('libopenzwave', CC_PACKAGE):
+            best = min(t[name] for t in times)
+
+            sys.stderr.write(
+                '\n    {0:<50} {1:>12.3f} ms'.format(
+                    'import ' + name,
+                    best / 1000.0
+                )
+            )
+
+        sys.stderr.write(
+            '\n    {0:<50} {1:>12d}\n'.format(
+                'command class modules imported',
+                loaded_count()
+            )
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
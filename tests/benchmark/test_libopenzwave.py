@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Smoke tests for the compiled extension.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+import importlib.machinery
+
+logger = logging.getLogger(__name__)
+
+try:
+    import _libopenzwave
+except ImportError:
+    _libopenzwave = None
+
+# the benchmarks can be run against a stand in for the extension, these
+# tests need the real one
+BUILT = _libopenzwave is not None and getattr(
+    _libopenzwave,
+    '__file__',
+    ''
+).endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES))
+
+
+@unittest.skipIf(not BUILT, '_libopenzwave is not built')
+class ManagerCase(unittest.TestCase):
+    """
+    Starts a manager that does not have a controller.
+    """
+
+    def setUp(self):
+        self.user_path = tempfile.mkdtemp()
+
+        try:
+            self.options = _libopenzwave.PyOptions(
+                user_path=self.user_path,
+                cmd_line='--Logging false --ConsoleOutput false'
+            )
+        except _libopenzwave.LibZWaveException as err:
+            shutil.rmtree(self.user_path)
+            self.skipTest(str(err))
+
+        self.options.create()
+        self.options.lock()
+
+        self.manager = _libopenzwave.PyManager()
+        self.manager.create()
+
+    def tearDown(self):
+        self.manager.destroy()
+        self.options.destroy()
+        shutil.rmtree(self.user_path)
+
+
+class TestQueuedNotifications(ManagerCase):
+
+    def test_000_queued(self):
+        # a serial port that does not exist makes the driver fail, which
+        # sends a notification through the queue
+        serial_port = os.path.join(self.user_path, 'ttyUSB0')
+        notifications = []
+        threads = set()
+        event = threading.Event()
+
+        def callback(notif):
+            notifications.append(notif)
+            threads.add(threading.current_thread().name)
+            event.set()
+
+        self.manager.addWatcher(callback, queued=True)
+        self.manager.addDriver(serial_port)
+
+        try:
+            self.assertTrue(event.wait(30))
+        finally:
+            self.manager.removeDriver(serial_port)
+            self.manager.removeWatcher(callback)
+
+        self.assertIsInstance(
+            notifications[0],
+            _libopenzwave.ZWaveNotification
+        )
+        self.assertEqual(threads, {'libopenzwave notifications'})
+
+        # the thread that drains the queue stops with the watcher
+        self.assertNotIn(
+            'libopenzwave notifications',
+            [thread.name for thread in threading.enumerate()]
+        )
+
+    def test_001_restart(self):
+        # the queue can be started again once it has been stopped
+        def callback(_):
+            pass
+
+        for _ in range(3):
+            self.manager.addWatcher(callback, queued=True)
+            self.manager.removeWatcher(callback)
+
+        self.assertNotIn(
+            'libopenzwave notifications',
+            [thread.name for thread in threading.enumerate()]
+        )
+
+
+class TestValueReads(ManagerCase):
+
+    def test_000_get_values(self):
+        # there is no controller so none of the ids are known, the ones
+        # that do not fit in a value id are left out as well
+        self.assertEqual(
+            self.manager.getValues([0, 1, 0x1000000000000, -1, 2 ** 64]),
+            {}
+        )
+        self.assertEqual(self.manager.getValues([]), {})
+        self.assertEqual(self.manager.getValues(iter([-5, 2 ** 70])), {})
+
+    def test_001_node_value_snapshot(self):
+        self.assertEqual(
+            self.manager.getNodeValueSnapshot(0x01234567, 1),
+            {}
+        )
+
+        # ids that can not be a home id or a node id
+        self.assertEqual(self.manager.getNodeValueSnapshot(-1, 300), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,525 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for the notification handler.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import time
+import logging
+import threading
+import unittest
+
+from libopenzwave import notification_handler
+from .common import BenchmarkCase
+
+
+def queue_function(func, *args):
+    # stands in for NotificationHandler.add
+    return notification_handler.NotificationWorker(func, *args)
+
+
+def raise_exception():
+    raise RuntimeError('test')
+
+
+class Node(object):
+
+    def handle_notification(self):
+        return queue_function(raise_exception)
+
+
+class TestNotificationWorker(BenchmarkCase):
+
+    def tearDown(self):
+        notification_handler.CAPTURE_CALLER_STACK = False
+
+    def test_000_exception_names_caller(self):
+        worker = Node().handle_notification()
+        worker.do()
+
+        self.assertTrue(worker.has_exception)
+
+        with self.assertLogs(__name__, logging.ERROR) as logs:
+            worker.log_exception()
+
+        output = '\n'.join(logs.output)
+        self.assertIn(__name__ + '.Node.handle_notification', output)
+        self.assertIn(__file__.rstrip('c'), output)
+        self.assertIn('RuntimeError: test', output)
+
+    def test_100_benchmark(self):
+        # the notifications get queued from a thread that is 20 or so frames
+        # deep
+        def nested(depth, func):
+            if depth:
+                return nested(depth - 1, func)
+
+            return func()
+
+        self.bench(
+            'NotificationWorker()',
+            lambda: nested(20, lambda: queue_function(raise_exception)),
+            number=1000
+        )
+
+        notification_handler.CAPTURE_CALLER_STACK = True
+
+        self.bench(
+            'NotificationWorker(), CAPTURE_CALLER_STACK = True',
+            lambda: nested(20, lambda: queue_function(raise_exception)),
+            number=10,
+            repeat=1
+        )
+        sys.stderr.write('\n')
+
+
+class FakeNode(object):
+
+    def __init__(self, id_):
+        self.id = id_
+
+
+def create_handlers(count):
+    handlers = []
+    for i in range(count):
+        handler = notification_handler.NotificationHandler(FakeNode(i))
+        handler.start()
+        handlers.append(handler)
+
+    return handlers
+
+
+class TestWorkerPool(BenchmarkCase):
+
+    def setUp(self):
+        notification_handler.worker_pool_size = 4
+
+    def tearDown(self):
+        notification_handler.worker_pool_size = 0
+
+        for handler in notification_handler.NotificationHandler.node_handlers[:]:
+            handler.stop()
+
+        if notification_handler.WorkerPool.instance is not None:
+            notification_handler.WorkerPool.instance.stop()
+
+    def test_000_order_per_node(self):
+        handlers = create_handlers(20)
+        results = {}
+        running = set()
+        overlap = []
+        lock = threading.Lock()
+
+        def task(handler_id, index):
+            with lock:
+                if handler_id in running:
+                    overlap.append(handler_id)
+                running.add(handler_id)
+
+            time.sleep(0.0001)
+            results.setdefault(handler_id, []).append(index)
+
+            with lock:
+                running.discard(handler_id)
+
+        for index in range(50):
+            for i, handler in enumerate(handlers):
+                handler.add(task, i, index)
+
+        for handler in handlers:
+            handler.stop()
+
+        self.assertEqual(overlap, [])
+        self.assertEqual(len(results), 20)
+        for indexes in results.values():
+            self.assertEqual(indexes, list(range(50)))
+
+        pool_threads = [
+            thread for thread in threading.enumerate()
+            if thread.name.startswith('libopenzwave-ThreadWorker_Pool')
+        ]
+        self.assertEqual(len(pool_threads), 4)
+
+    def test_100_benchmark(self):
+        def run(node_count, task_count):
+            handlers = create_handlers(node_count)
+            event = threading.Event()
+            remaining = [node_count * task_count]
+            lock = threading.Lock()
+
+            def task():
+                with lock:
+                    remaining[0] -= 1
+                    if not remaining[0]:
+                        event.set()
+
+            for _ in range(task_count):
+                for handler in handlers:
+                    handler.add(task)
+
+            event.wait()
+            thread_count = threading.active_count()
+
+            for handler in handlers:
+                handler.stop()
+
+            return thread_count
+
+        thread_count = []
+
+        self.bench(
+            '230 nodes, 10 notifications each, worker pool',
+            lambda: thread_count.append(run(230, 10)),
+            repeat=3
+        )
+        pool_threads = thread_count[-1]
+
+        notification_handler.worker_pool_size = 0
+        if notification_handler.WorkerPool.instance is not None:
+            notification_handler.WorkerPool.instance.stop()
+
+        self.bench(
+            '230 nodes, 10 notifications each, thread per node',
+            lambda: thread_count.append(run(230, 10)),
+            repeat=3
+        )
+        node_threads = thread_count[-1]
+
+        sys.stderr.write(
+            '\n    threads: worker pool {0}, thread per node {1}'.format(
+                pool_threads,
+                node_threads
+            )
+        )
+
+        self.assertLess(pool_threads, node_threads)
+
+
+class TestWorkCounter(BenchmarkCase):
+
+    def tearDown(self):
+        for handler in notification_handler.NotificationHandler.node_handlers[:]:
+            handler.stop()
+
+        if notification_handler.WorkerPool.instance is not None:
+            notification_handler.WorkerPool.instance.stop()
+
+        notification_handler.worker_pool_size = 0
+
+    def run_idle_callback(self):
+        node_work = notification_handler.NotificationHandler.node_work
+        handlers = create_handlers(10)
+        release = threading.Event()
+        processed = []
+        called = []
+
+        def task(index):
+            release.wait()
+            processed.append(index)
+
+        for index in range(10):
+            for handler in handlers:
+                handler.add(task, index)
+
+        def callback():
+            called.append(len(processed))
+            idle.set()
+
+        idle = threading.Event()
+        start = time.time()
+        node_work.call_when_processed(callback)
+        # the callback gets registered without blocking
+        self.assertLess(time.time() - start, 0.1)
+        self.assertEqual(called, [])
+        self.assertEqual(node_work.count, 100)
+
+        release.set()
+        self.assertTrue(node_work.wait(10.0))
+        self.assertTrue(idle.wait(10.0))
+        self.assertEqual(called, [100])
+        self.assertEqual(node_work.count, 0)
+
+        # nothing is queued, the callback gets called right away
+        node_work.call_when_processed(lambda: called.append(len(processed)))
+        self.assertEqual(called, [100, 100])
+
+        for handler in handlers:
+            handler.stop()
+
+    def test_000_idle_callback_thread_per_node(self):
+        self.run_idle_callback()
+
+    def test_001_idle_callback_worker_pool(self):
+        notification_handler.worker_pool_size = 4
+        self.run_idle_callback()
+
+    def run_busy_callback(self):
+        # the nodes keep sending notifications while the callback waits,
+        # only the ones queued before the callback hold it off
+        node_work = notification_handler.NotificationHandler.node_work
+        handlers = create_handlers(10)
+        release = threading.Event()
+        called = threading.Event()
+        stop = threading.Event()
+        processed = set()
+        state = {}
+
+        def task(key):
+            release.wait()
+            processed.add(key)
+
+        for index in range(10):
+            for i, handler in enumerate(handlers):
+                handler.add(task, ('before', i, index))
+
+        def callback():
+            state['processed'] = set(processed)
+            called.set()
+
+        node_work.call_when_processed(callback)
+
+        def feed():
+            index = 0
+
+            while not stop.is_set():
+                for i, handler in enumerate(handlers):
+                    handler.add(task, ('after', i, index))
+
+                index += 1
+                time.sleep(0.001)
+
+        thread = threading.Thread(target=feed)
+        thread.start()
+
+        try:
+            time.sleep(0.05)
+            self.assertFalse(called.is_set())
+
+            release.set()
+            self.assertTrue(called.wait(10.0))
+        finally:
+            stop.set()
+            thread.join()
+
+        self.assertEqual(
+            set(key for key in state['processed'] if key[0] == 'before'),
+            set(
+                ('before', i, index)
+                for index in range(10)
+                for i in range(10)
+            )
+        )
+
+        for handler in handlers:
+            handler.stop()
+
+    def test_002_busy_callback_thread_per_node(self):
+        self.run_busy_callback()
+
+    def test_003_busy_callback_worker_pool(self):
+        notification_handler.worker_pool_size = 4
+        self.run_busy_callback()
+
+    def test_004_tickets(self):
+        counter = notification_handler.WorkCounter()
+        called = []
+
+        first = counter.increment()
+        second = counter.increment()
+        counter.call_when_processed(called.append, 1)
+        third = counter.increment()
+        counter.call_when_processed(called.append, 2)
+
+        # processed out of order, the first one is still pending
+        counter.decrement(second)
+        self.assertEqual(called, [])
+
+        counter.decrement(first)
+        self.assertEqual(called, [1])
+        self.assertEqual(counter.count, 1)
+
+        counter.decrement(third)
+        self.assertEqual(called, [1, 2])
+        self.assertTrue(counter.wait(0))
+
+
+class NotificationItem(str):
+    # same comparison as _libopenzwave.NotificationItem
+
+    def __new__(cls, name, index):
+        self = str.__new__(cls, name)
+        self.index = index
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, int):
+            return other == self.index
+
+        return str.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __int__(self):
+        return self.index
+
+    def __hash__(self):
+        return hash(str(self))
+
+
+NOTIFICATION_TYPES = [
+    NotificationItem(name, index) for index, name in enumerate((
+        'ValueAdded', 'ValueRemoved', 'ValueChanged', 'ValueRefreshed',
+        'Group', 'NodeNew', 'NodeAdded', 'NodeRemoved', 'NodeProtocolInfo',
+        'NodeNaming', 'NodeEvent', 'PollingDisabled', 'PollingEnabled',
+        'SceneEvent', 'CreateButton', 'DeleteButton', 'ButtonOn', 'ButtonOff'
+    ))
+]
+
+
+class Notification(object):
+
+    def __init__(self, notification_type):
+        self.type = notification_type
+
+    def __eq__(self, other):
+        # same comparison as _libopenzwave.ZWaveNotification
+        return other == self.type
+
+
+class Receiver(object):
+
+    def __init__(self):
+        self.received = []
+
+    def _handle_button_off(self, notif):
+        self.received.append(('method', notif.type))
+
+
+class TestNotificationRouter(BenchmarkCase):
+
+    def test_000_route(self):
+        router = notification_handler.NotificationRouter()
+        receiver = Receiver()
+        button_off = NOTIFICATION_TYPES[-1]
+
+        def handler(obj, notif):
+            obj.received.append(('function', notif.type))
+
+        router.register(button_off, '_handle_button_off')
+        router.register(button_off, handler)
+        # registering the same handler a second time does nothing
+        router.register(int(button_off), handler)
+
+        self.assertTrue(router.route(receiver, Notification(button_off)))
+        self.assertEqual(
+            receiver.received,
+            [('method', button_off), ('function', button_off)]
+        )
+
+        self.assertFalse(
+            router.route(receiver, Notification(NOTIFICATION_TYPES[0]))
+        )
+
+        router.unregister(button_off, '_handle_button_off')
+        self.assertEqual(router.handlers(button_off), (handler,))
+        router.unregister(button_off, handler)
+        self.assertEqual(router.handlers(button_off), ())
+
+    def test_001_default(self):
+        router = notification_handler.NotificationRouter('_handle_button_off')
+        receiver = Receiver()
+
+        self.assertTrue(
+            router.route(receiver, Notification(NOTIFICATION_TYPES[0]))
+        )
+        self.assertEqual(receiver.received, [('method', NOTIFICATION_TYPES[0])])
+
+    def test_002_node_new(self):
+        from libopenzwave.network import ZWaveNetwork
+
+        class Handler(object):
+            def __init__(self):
+                self.added = []
+
+            def add(self, func, *args):
+                self.added.append(args)
+
+        class Network(object):
+            _controller = None
+
+            def __init__(self):
+                self._notification_handler = Handler()
+
+        class NodeNew(object):
+            def __init__(self, node_id):
+                self.node_id = node_id
+
+        network = Network()
+        ZWaveNetwork._handle_node_new(network, NodeNew(0))
+        ZWaveNetwork._handle_node_new(network, NodeNew(5))
+
+        # node id 0 is not a node
+        self.assertEqual(network._notification_handler.added, [(5,)])
+
+    def test_100_benchmark(self):
+        def handler(_, __):
+            pass
+
+        def chain(_, notif):
+            # the if/elif chain that was used to route the notifications
+            for notification_type in NOTIFICATION_TYPES:
+                if notif == notification_type:
+                    handler(_, notif)
+                    break
+
+        router = notification_handler.NotificationRouter()
+
+        for notification_type in NOTIFICATION_TYPES:
+            router.register(notification_type, handler)
+
+        first = Notification(NOTIFICATION_TYPES[0])
+        last = Notification(NOTIFICATION_TYPES[-1])
+
+        self.bench('if/elif, first type', lambda: chain(None, first), 10000)
+        self.bench(
+            'if/elif, last type',
+            lambda: chain(None, last),
+            10000
+        )
+        self.bench(
+            'NotificationRouter, first type',
+            lambda: router.route(None, first),
+            10000
+        )
+        self.bench(
+            'NotificationRouter, last type',
+            lambda: router.route(None, last),
+            10000
+        )
+        sys.stderr.write('\n')
+
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
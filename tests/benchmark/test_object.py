@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for hashing and comparing nodes and values.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import unittest
+
+from libopenzwave import signals
+from libopenzwave import notification_handler
+from libopenzwave import xml_handler
+from libopenzwave.node import ZWaveNode
+from libopenzwave.value import ZWaveValue
+from .common import BenchmarkCase
+
+COUNT = 500
+METER = 0x32
+
+NODE_XML = (
+    '<Node id="{0}">'
+    '<CommandClasses><CommandClass id="0x{1:02X}"/></CommandClasses>'
+    '<Values>{2}</Values>'
+    '</Node>'
+)
+
+VALUE_XML = (
+    '<Value id="0x{0:04X}" type="Decimal" genre="User" index="{1}" '
+    'endpoint="0" label="Value {1}">'
+    '<CommandClass id="{2}" symbol="COMMAND_CLASS_METER"/>'
+    '</Value>'
+)
+
+
+class Manager(object):
+    # stands in for the parts of PyManager the constructors use. The value
+    # ids are made up so the index is in the lower 8 bits.
+
+    @staticmethod
+    def getNodeClassIds(_, __):
+        return [METER]
+
+    @staticmethod
+    def getValueCommandClass(_):
+        return METER
+
+    @staticmethod
+    def getValueType(_):
+        return 'Decimal'
+
+    @staticmethod
+    def getValueInstance(_):
+        return 1
+
+    @staticmethod
+    def getValueIndex(value_id):
+        return value_id & 0xFF
+
+
+class Network(object):
+    home_id = 0xE1A2B3C4
+    controller = None
+
+    def __init__(self):
+        self.manager = Manager()
+
+
+def make_node(network, node_id):
+    return ZWaveNode('{0}.1'.format(node_id), network, None)
+
+
+def make_value(node, value_id):
+    # the way ZWaveNode._handle_value adds a value OpenZWave has added
+    value = ZWaveValue(value_id, node.network, node, None)
+    node.values[value_id] = value
+    return value
+
+
+def load_node(network, node_id, saved_ids):
+    # a node and its values loaded from the saved dataset
+    values = ''.join(
+        VALUE_XML.format(value_id, value_id & 0xFF, METER)
+        for value_id in saved_ids
+    )
+    xml_data = xml_handler.XMLElement.from_string(
+        NODE_XML.format(node_id, METER, values)
+    )
+    return ZWaveNode('{0}.1'.format(node_id), network, xml_data)
+
+
+def legacy_hash(node):
+    # the hash ZWaveNode used before the hash was computed a single time,
+    # the dynamic node class uses object.__repr__.
+    return hash(repr(node))
+
+
+class TestObject(BenchmarkCase):
+
+    def setUp(self):
+        self.network = Network()
+
+    def tearDown(self):
+        handlers = notification_handler.NotificationHandler.node_handlers
+        for handler in handlers[:]:
+            handler.stop()
+
+    def test_000_node(self):
+        node1 = make_node(self.network, 5)
+        node2 = make_node(self.network, 6)
+        node3 = make_node(Network(), 5)
+
+        self.assertIs(make_node(self.network, 5), node1)
+        self.assertEqual(node1, node1)
+        self.assertEqual(hash(node1), hash(node1.id))
+        self.assertEqual(node1, METER)
+        self.assertNotEqual(node1, node2)
+        self.assertNotEqual(node1, node3)
+        self.assertEqual(hash(node1), hash(node3))
+        self.assertIn(node1, {node1, node2})
+        self.assertNotIn(node3, {node1, node2})
+
+    def test_001_value(self):
+        node1 = make_node(self.network, 5)
+        node2 = make_node(self.network, 6)
+
+        value1 = make_value(node1, 0x500)
+        value2 = make_value(node2, 0x500)
+        value3 = make_value(node1, 0x501)
+
+        self.assertIs(make_value(node1, 0x500), value1)
+        self.assertIsNot(value1, value2)
+        self.assertEqual(value1, value2)
+        self.assertEqual(hash(value1), hash(value2))
+        self.assertNotEqual(value1, value3)
+        self.assertEqual(len({value1, value2, value3}), 2)
+        self.assertEqual(value1.index, 0)
+        self.assertIs(node1.values[0x500], value1)
+
+    def test_002_value_gets_id(self):
+        saved_ids = (0x500, 0x501)
+        node = load_node(self.network, 5, saved_ids)
+        values = list(node.values.values())
+        value = next(v for v in values if v.index == 1)
+        value_hash = hash(value)
+        value_set = set(values)
+
+        self.assertEqual(len(value_set), 2)
+        self.assertLess(value.object_id, 0)
+        self.assertEqual(value.id, 0x501)
+        self.assertEqual(value_hash, hash(0x501))
+
+        # OpenZWave adds the value, the notification finds it using the
+        # command class, instance and index.
+        self.assertIs(node.values.resolve(0x501, METER, 1, 1), value)
+        self.assertEqual(value.object_id, 0x501)
+        self.assertEqual(value.id, 0x501)
+        self.assertEqual(value.xml_handler['id'], '0x0501')
+        self.assertIs(node.values[0x501], value)
+
+        # the hash is made from the real id, which is the saved id here
+        self.assertEqual(hash(value), value_hash)
+        self.assertIn(value, value_set)
+
+        # the same value on another network is equal to it
+        other = make_value(make_node(Network(), 5), 0x501)
+        self.assertEqual(value, other)
+        self.assertIn(other, value_set)
+
+    def test_100_benchmark_membership(self):
+        nodes = list(
+            make_node(self.network, i) for i in range(1, COUNT + 1)
+        )
+        node = nodes[COUNT // 2]
+        node_set = set(nodes)
+        legacy_set = set(legacy_hash(n) for n in nodes)
+
+        self.assertIn(node, node_set)
+
+        self.bench(
+            'legacy node hash, set membership',
+            lambda: legacy_hash(node) in legacy_set,
+            number=20000
+        )
+        self.bench(
+            'ZWaveNode hash, set membership',
+            lambda: node in node_set,
+            number=20000
+        )
+
+        values = list(make_value(node, i << 8) for i in range(COUNT))
+        value_dict = dict((value, None) for value in values)
+        value = values[COUNT // 2]
+
+        self.assertIn(value, value_dict)
+
+        self.bench(
+            'ZWaveValue hash, dict membership',
+            lambda: value in value_dict,
+            number=20000
+        )
+        sys.stderr.write('\n')
+
+    def test_101_benchmark_signal(self):
+        dispatcher = signals.Dispatcher()
+        signal = signals.SIGNAL_VALUE_CHANGED
+        nodes = list(
+            make_node(self.network, i) for i in range(1, COUNT + 1)
+        )
+        node = nodes[COUNT // 2]
+        watched = set(nodes[::2])
+        calls = []
+
+        def receiver(sender, **_):
+            if sender in watched:
+                calls.append(sender)
+
+        dispatcher.connect(receiver, signal)
+
+        self.bench(
+            'send, receiver checks sender membership',
+            lambda: dispatcher.send(signal, node, value_data=1),
+            number=20000
+        )
+        sys.stderr.write('\n')
+
+        self.assertTrue(calls)
+        self.assertIs(calls[0], node)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,1381 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Tests and benchmarks for the remote server and client.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import base64
+import socket
+import threading
+import unittest
+from uuid import uuid4
+
+from libopenzwave import remote_codec
+from libopenzwave import remote_protocol
+from libopenzwave import remote_snapshot
+from .common import BenchmarkCase
+
+try:
+    from Crypto.Cipher import AES
+    from Crypto.Util import Padding
+    from libopenzwave import remote_encryption
+    from libopenzwave import server
+    from libopenzwave import client
+except ImportError:
+    remote_encryption = None
+
+try:
+    import _libopenzwave
+except ImportError:
+    _libopenzwave = None
+
+
+PASSWORD = 'benchmark password'
+
+
+def create_notification(index):
+    n = _libopenzwave.ZWaveNotification(
+        _libopenzwave.PyNotifications.ValueChanged,
+        0xE1A2B3C4,
+        index % 230
+    )
+    n.value = _libopenzwave.Value((index % 230) << 32 | index)
+    n.value.command_class = 0x32
+    n.value.instance = 1
+    n.value.index = index % 8
+    n.value.genre = _libopenzwave.PyGenres.User
+    n.value.type = _libopenzwave.PyValueTypes.Decimal
+    n.value.data = float(index)
+    n.value.label = 'Power'
+    n.value.units = 'W'
+    n.value.is_read_only = True
+    return n
+
+
+def notification_fields(n):
+    # ZWaveNotification only compares the notification type
+    value = n.value
+
+    if value is not None:
+        value = (value.id,) + tuple(
+            getattr(value, name) for name, _ in remote_codec.VALUE_FIELDS
+        )
+
+    return (int(n.type), n.home_id, n.node_id, value) + tuple(
+        getattr(n, name) for name, _ in remote_codec.NOTIFICATION_FIELDS[1:]
+    )
+
+
+def notifications_fields(notifications):
+    return [notification_fields(n) for n in notifications]
+
+
+def legacy_encrypt(aes, raw):
+    # AESCipher.encrypt working on bytes
+    iv = os.urandom(16)
+    cipher = AES.new(aes.key, AES.MODE_CBC, iv)
+    return base64.b64encode(iv + cipher.encrypt(Padding.pad(raw, aes.bs)))
+
+
+def legacy_decrypt(aes, enc):
+    # AESCipher.decrypt working on bytes
+    enc = base64.b64decode(enc)
+    cipher = AES.new(aes.key, AES.MODE_CBC, enc[:16])
+    return Padding.unpad(cipher.decrypt(enc[16:]), aes.bs)
+
+
+def legacy_encode(aes, n):
+    # same layers as server.Server.send using the JSON protocol
+    data = dict(notification=pickle.dumps(n, 2).decode('ISO-8859-1'))
+    data = legacy_encrypt(aes, json.dumps(data).encode('utf-8'))
+    data = data.decode('ascii')
+    return (json.dumps(dict(id=str(uuid4()), contents=data)) + '\n').encode()
+
+
+def legacy_decode(aes, data):
+    # same layers as client.Client using the JSON protocol
+    data = data.decode()
+    result = []
+
+    while '\n' in data:
+        message, data = data.split('\n', 1)
+        message = json.loads(message)
+        contents = json.loads(legacy_decrypt(aes, message['contents']))
+        result.append(
+            pickle.loads(contents['notification'].encode('ISO-8859-1'))
+        )
+
+    return result
+
+
+def create_session():
+    # the ciphers of the client and the server for a session
+    client_random = remote_encryption.SessionCipher.random()
+    server_random = remote_encryption.SessionCipher.random()
+
+    return (
+        remote_encryption.SessionCipher(
+            PASSWORD,
+            client_random,
+            server_random,
+            False
+        ),
+        remote_encryption.SessionCipher(
+            PASSWORD,
+            client_random,
+            server_random,
+            True
+        )
+    )
+
+
+def start_session(sock):
+    # the handshake client.Client does, returns the cipher of the client
+    client_random = remote_encryption.SessionCipher.random()
+    buf = remote_protocol.FrameBuffer()
+
+    sock.sendall(remote_protocol.encode_hello())
+    sock.sendall(
+        remote_protocol.encode_frame(
+            remote_protocol.FRAME_SESSION,
+            0,
+            client_random
+        )
+    )
+
+    while len(buf) < remote_protocol.HELLO.size:
+        buf.recv_into(sock)
+
+    remote_protocol.decode_hello(buf.read(remote_protocol.HELLO.size))
+
+    while True:
+        for frame_type, _, payload in buf.frames():
+            return remote_encryption.SessionCipher(
+                PASSWORD,
+                client_random,
+                bytes(payload),
+                False
+            )
+
+        buf.recv_into(sock)
+
+
+def binary_encode(cipher, message_id, n):
+    # same as server.Server.send using the binary protocol
+    return remote_protocol.encode_frame(
+        remote_protocol.FRAME_NOTIFICATION,
+        message_id,
+        remote_codec.encode_notification(n),
+        cipher
+    )
+
+
+def binary_decode(cipher, buf, data):
+    # same as client.Client using the binary protocol
+    buf.feed(data)
+    return [
+        remote_codec.decode(
+            remote_protocol.decrypt_frame(
+                cipher,
+                frame_type,
+                message_id,
+                payload
+            )
+        )
+        for frame_type, message_id, payload in buf.frames()
+    ]
+
+
+class TestFrameBuffer(BenchmarkCase):
+
+    def test_000_partial_frames(self):
+        data = b''.join(
+            remote_protocol.encode_frame(
+                remote_protocol.FRAME_NOTIFICATION,
+                i,
+                b'payload ' + str(i).encode() * i
+            )
+            for i in range(100)
+        )
+
+        buf = remote_protocol.FrameBuffer(64)
+        frames = []
+
+        for i in range(0, len(data), 7):
+            buf.feed(data[i:i + 7])
+            frames.extend(
+                (frame_type, message_id, bytes(payload))
+                for frame_type, message_id, payload in buf.frames()
+            )
+
+        self.assertEqual(len(buf), 0)
+        self.assertEqual(len(frames), 100)
+
+        for i, (frame_type, message_id, payload) in enumerate(frames):
+            self.assertEqual(frame_type, remote_protocol.FRAME_NOTIFICATION)
+            self.assertEqual(message_id, i)
+            self.assertEqual(payload, b'payload ' + str(i).encode() * i)
+
+    def test_001_hello(self):
+        hello = remote_protocol.encode_hello()
+
+        self.assertTrue(remote_protocol.is_hello(hello[:2]))
+        self.assertFalse(remote_protocol.is_hello(b'{"id"'))
+        self.assertEqual(
+            remote_protocol.decode_hello(hello),
+            remote_protocol.PROTOCOL_VERSION
+        )
+        self.assertIsNone(remote_protocol.decode_hello(b'{"id": 1}'))
+
+    def test_002_too_large(self):
+        buf = remote_protocol.FrameBuffer()
+        buf.feed(
+            remote_protocol.HEADER.pack(
+                remote_protocol.MAX_PAYLOAD_SIZE + 1,
+                remote_protocol.FRAME_NOTIFICATION,
+                1
+            )
+        )
+
+        with self.assertRaises(remote_protocol.ProtocolError):
+            list(buf.frames())
+
+
+class TestCodec(BenchmarkCase):
+
+    def test_000_round_trip(self):
+        obj = dict(
+            none=None,
+            bools=[True, False],
+            ints=(0, 255, 256, -1, 1 << 62, -(1 << 70), 1 << 100),
+            float=1.5,
+            str=u'K\xfcche',
+            bytes=b'\x00\xff',
+            set={1, 2, 3},
+            nested=[dict(a=(1, [2, 3]))],
+        )
+        obj[7] = 'int key'
+
+        self.assertEqual(remote_codec.decode(remote_codec.encode(obj)), obj)
+
+        data = remote_codec.encode((1, 2))
+        self.assertIsInstance(remote_codec.decode(data), tuple)
+        self.assertEqual(remote_codec.decode(memoryview(data)), (1, 2))
+
+    def test_001_invalid(self):
+        with self.assertRaises(TypeError):
+            remote_codec.encode(object())
+
+        data = remote_codec.encode(['label', 1.5])
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(data[:-1])
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(data + b'\x00')
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(b'\xff')
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_002_notification(self):
+        n = create_notification(12)
+        decoded = remote_codec.decode(remote_codec.encode_notification(n))
+
+        self.assertIsInstance(decoded, _libopenzwave.ZWaveNotification)
+        self.assertIsInstance(decoded.value, _libopenzwave.Value)
+        self.assertEqual(notification_fields(decoded), notification_fields(n))
+        self.assertIs(decoded.type, n.type)
+        self.assertIs(decoded.value.genre, n.value.genre)
+
+        n = _libopenzwave.ZWaveNotification(
+            _libopenzwave.PyNotifications.ControllerCommand,
+            0xE1A2B3C4,
+            1
+        )
+        n.controller_state = _libopenzwave.PyControllerState.Waiting
+        n.controller_error = _libopenzwave.PyControllerError.None_
+        n.controller_command = _libopenzwave.PyControllerCommand.AddDevice
+        decoded = remote_codec.decode(remote_codec.encode_notification(n))
+
+        self.assertEqual(notification_fields(decoded), notification_fields(n))
+        self.assertIs(decoded.controller_state, n.controller_state)
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_003_enum_items(self):
+        genre = _libopenzwave.PyGenres.User
+        value_type = _libopenzwave.PyValueTypes.Bool
+        state = _libopenzwave.PyControllerState.Waiting
+        # a manager result and a value of a snapshot
+        obj = dict(
+            genre=genre,
+            types=[value_type],
+            value=(72057594055229441, 0x25, 1, 0, genre, value_type),
+            states={state: 'waiting'}
+        )
+
+        decoded = remote_codec.decode(remote_codec.encode(obj))
+
+        self.assertEqual(decoded, obj)
+        self.assertIs(decoded['genre'], genre)
+        self.assertIs(decoded['types'][0], value_type)
+        self.assertIs(decoded['value'][4], genre)
+        self.assertIs(decoded['value'][5], value_type)
+        self.assertIs(list(decoded['states'])[0], state)
+        self.assertEqual(int(decoded['genre']), int(genre))
+        self.assertEqual(decoded['genre'].doc, genre.doc)
+
+        # an item that is equal to an item of an enumeration but is not the
+        # same object
+        copy = _libopenzwave.EnumItem(str(genre)).set(genre.index, '')
+        self.assertIs(remote_codec.decode(remote_codec.encode(copy)), genre)
+
+        # a str subclass that is not an enumeration item
+        class Name(str):
+            index = 0xFFFF
+
+        decoded = remote_codec.decode(remote_codec.encode(Name('name')))
+        self.assertEqual(decoded, 'name')
+        self.assertIs(type(decoded), str)
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(
+                bytes([remote_codec.TAG_ENUM_ITEM, 7]) + b'Unknown\x00\x01'
+            )
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(
+                bytes([remote_codec.TAG_ENUM_ITEM, 8]) + b'PyGenres\xff\xff'
+            )
+
+    def test_004_invalid_structure(self):
+        # a list nested deeper than the recursion limit
+        data = bytes([remote_codec.TAG_LIST, 0, 0, 0, 1]) * 100000
+        data += bytes([remote_codec.TAG_NONE])
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(data)
+
+        # a list used as the key of a dict and as an item of a set
+        empty_list = bytes([remote_codec.TAG_LIST, 0, 0, 0, 0])
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(
+                bytes([remote_codec.TAG_DICT, 0, 0, 0, 1]) +
+                empty_list +
+                bytes([remote_codec.TAG_NONE])
+            )
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(
+                bytes([remote_codec.TAG_SET, 0, 0, 0, 1]) + empty_list
+            )
+
+        with self.assertRaises(remote_codec.CodecError):
+            remote_codec.decode(
+                bytes([remote_codec.TAG_STR, 0, 0, 0, 1, 0xFF])
+            )
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_100_benchmark(self):
+        notifications = [create_notification(i) for i in range(1000)]
+        pickled = [
+            pickle.dumps(n, pickle.HIGHEST_PROTOCOL) for n in notifications
+        ]
+        encoded = [remote_codec.encode_notification(n) for n in notifications]
+
+        self.bench(
+            'pickle, encode 1000 notifications',
+            lambda: [
+                pickle.dumps(n, pickle.HIGHEST_PROTOCOL)
+                for n in notifications
+            ]
+        )
+        self.bench(
+            'remote_codec, encode 1000 notifications',
+            lambda: [
+                remote_codec.encode_notification(n) for n in notifications
+            ]
+        )
+        self.bench(
+            'pickle, decode 1000 notifications',
+            lambda: [pickle.loads(data) for data in pickled]
+        )
+        self.bench(
+            'remote_codec, decode 1000 notifications',
+            lambda: [remote_codec.decode(data) for data in encoded]
+        )
+
+        pickle_size = sum(len(data) for data in pickled) / 1000.0
+        codec_size = sum(len(data) for data in encoded) / 1000.0
+
+        sys.stderr.write(
+            '\n    pickle: {0:.0f} bytes/notification'
+            '\n    remote_codec: {1:.0f} bytes/notification'.format(
+                pickle_size,
+                codec_size
+            )
+        )
+
+        self.assertLess(codec_size, pickle_size)
+
+
+@unittest.skipIf(remote_encryption is None, 'pycryptodome is not installed')
+class TestEncryption(BenchmarkCase):
+
+    create_session = staticmethod(create_session)
+
+    @staticmethod
+    def decrypt(cipher, frame):
+        buf = remote_protocol.FrameBuffer()
+        buf.feed(frame)
+        frame_type, message_id, payload = next(buf.frames())
+        return remote_protocol.decrypt_frame(
+            cipher,
+            frame_type,
+            message_id,
+            payload
+        )
+
+    def test_000_session(self):
+        client_cipher, server_cipher = self.create_session()
+
+        for i in range(10):
+            frame = remote_protocol.encode_frame(
+                remote_protocol.FRAME_REQUEST,
+                i,
+                b'request %d' % i,
+                client_cipher
+            )
+            self.assertNotIn(b'request', frame)
+            self.assertEqual(
+                self.decrypt(server_cipher, frame),
+                b'request %d' % i
+            )
+
+            frame = remote_protocol.encode_frame(
+                remote_protocol.FRAME_RESULT,
+                i,
+                b'',
+                server_cipher
+            )
+            self.assertEqual(self.decrypt(client_cipher, frame), b'')
+
+    def test_001_tampering(self):
+        client_cipher, server_cipher = self.create_session()
+
+        def frame():
+            return remote_protocol.encode_frame(
+                remote_protocol.FRAME_ACK,
+                10,
+                b'payload',
+                client_cipher
+            )
+
+        data = frame()
+
+        # payload, header and a frame that gets sent again
+        for bad in (
+            data[:-1] + bytes([data[-1] ^ 1]),
+            data[:5] + bytes([data[5] ^ 1]) + data[6:]
+        ):
+            with self.assertRaises(ValueError):
+                self.decrypt(server_cipher, bad)
+
+        self.assertEqual(self.decrypt(server_cipher, data), b'payload')
+
+        with self.assertRaises(ValueError):
+            self.decrypt(server_cipher, data)
+
+        # a frame that has been dropped
+        frame()
+
+        with self.assertRaises(ValueError):
+            self.decrypt(server_cipher, frame())
+
+        # a different session
+        client_cipher, _ = self.create_session()
+
+        with self.assertRaises(ValueError):
+            self.decrypt(server_cipher, frame())
+
+    def test_002_order(self):
+        client_cipher, server_cipher = self.create_session()
+
+        frames = [
+            remote_protocol.encode_frame(
+                remote_protocol.FRAME_NOTIFICATION,
+                i,
+                ('frame %d' % i).encode(),
+                server_cipher
+            )
+            for i in range(3)
+        ]
+
+        # frames that are out of order
+        for bad in (frames[1], frames[2]):
+            with self.assertRaises(ValueError):
+                self.decrypt(client_cipher, bad)
+
+        self.assertEqual(self.decrypt(client_cipher, frames[0]), b'frame 0')
+
+        # frames that are sent again
+        with self.assertRaises(ValueError):
+            self.decrypt(client_cipher, frames[0])
+
+        self.assertEqual(self.decrypt(client_cipher, frames[1]), b'frame 1')
+
+        for bad in (frames[0], frames[1]):
+            with self.assertRaises(ValueError):
+                self.decrypt(client_cipher, bad)
+
+        self.assertEqual(self.decrypt(client_cipher, frames[2]), b'frame 2')
+
+    def test_003_password(self):
+        client_random = remote_encryption.SessionCipher.random()
+        server_random = remote_encryption.SessionCipher.random()
+
+        server_cipher = remote_encryption.SessionCipher(
+            PASSWORD,
+            client_random,
+            server_random,
+            True
+        )
+        client_cipher = remote_encryption.SessionCipher(
+            PASSWORD + 'x',
+            client_random,
+            server_random,
+            False
+        )
+
+        frame = remote_protocol.encode_frame(
+            remote_protocol.FRAME_ACK,
+            1,
+            b'payload',
+            client_cipher
+        )
+
+        with self.assertRaises(ValueError):
+            self.decrypt(server_cipher, frame)
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_100_benchmark(self):
+        aes = remote_encryption.AESCipher(PASSWORD)
+        _, server_cipher = self.create_session()
+        payloads = [
+            remote_codec.encode_notification(create_notification(i))
+            for i in range(1000)
+        ]
+
+        def run_legacy():
+            # JSON protocol
+            return [legacy_encrypt(aes, payload) for payload in payloads]
+
+        def run_session():
+            return [
+                remote_protocol.encode_frame(
+                    remote_protocol.FRAME_NOTIFICATION,
+                    i,
+                    payload,
+                    server_cipher
+                )
+                for i, payload in enumerate(payloads)
+            ]
+
+        self.bench('AES-CBC + base64, encrypt 1000', run_legacy)
+        self.bench('session, encrypt 1000', run_session)
+
+        data = run_legacy()
+        self.bench(
+            'AES-CBC + base64, decrypt 1000',
+            lambda: [legacy_decrypt(aes, d) for d in data]
+        )
+
+        # the frames have to be decrypted in the order they were encrypted
+        # in and only once, so a new session is used
+        client_cipher, server_cipher = self.create_session()
+        sealed = [run_session() for _ in range(10)]
+        sealed_iter = iter(sealed)
+        self.bench(
+            'session, decrypt 1000',
+            lambda: [
+                self.decrypt(client_cipher, frame)
+                for frame in next(sealed_iter)
+            ],
+            repeat=len(sealed)
+        )
+
+        def size(run):
+            return sum(len(d) for d in run()) / 1000.0
+
+        sys.stderr.write(
+            '\n    payload: {0:.0f} bytes/message'
+            '\n    AES-CBC + base64: {1:.0f} bytes/message'
+            '\n    session frame: {2:.0f} bytes/message'.format(
+                size(lambda: payloads),
+                size(run_legacy),
+                size(run_session)
+            )
+        )
+
+        self.assertLess(size(run_session), size(run_legacy))
+
+
+class Manager(object):
+
+    @staticmethod
+    def getValue(value_id):  # NOQA
+        return value_id * 2
+
+
+class ServerNetwork(object):
+    manager = Manager()
+    controller = None
+
+
+class CommandClass(object):
+
+    def __init__(self, class_id):
+        self.class_id = class_id
+
+
+class SnapshotValue(object):
+    # stands in for libopenzwave.value.ZWaveValue
+
+    def __init__(self, node_id, index):
+        self.id = node_id << 32 | index
+        self.command_class = CommandClass(0x31)
+        self.instance = 1
+        self.index = index
+        self.genre = 'User'
+        self.type = 'Decimal'
+        self.label = 'Sensor {0}'.format(index)
+        self.units = 'C'
+        self.is_read_only = True
+
+
+class SnapshotNodeId(str):
+
+    @property
+    def node_id(self):
+        return int(self.split('.')[0])
+
+
+class SnapshotNode(object):
+    # stands in for libopenzwave.node.ZWaveNode
+
+    def __init__(self, node_id, value_count):
+        self.id = SnapshotNodeId('{0}.1'.format(node_id))
+        self.is_endpoint = False
+        self.is_ready = True
+        self.is_sleeping = node_id % 5 == 0
+        self.is_failed = False
+        self.values = [
+            SnapshotValue(node_id, i) for i in range(value_count)
+        ]
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+class SnapshotNetwork(ServerNetwork):
+    STATE_READY = 10
+
+    def __init__(self, node_count, value_count):
+        self.home_id = 0xE1A2B3C4
+        self.state = self.STATE_READY
+        self.nodes = dict(
+            ('{0}.1'.format(i), SnapshotNode(i, value_count))
+            for i in range(1, node_count + 1)
+        )
+        self.controller = self.nodes['1.1']
+
+
+def notification_key(n):
+    value_id = None if n.value is None else n.value.id
+    return n.type, n.node_id, value_id
+
+
+class ClientNetwork(object):
+
+    def __init__(self, nodes=None):
+        self.notifications = []
+        self.event = threading.Event()
+        self.nodes = {} if nodes is None else nodes
+
+    def _zwcallback(self, notif):
+        self.notifications.append(notif)
+        self.event.set()
+
+
+@unittest.skipIf(remote_encryption is None, 'pycryptodome is not installed')
+class TestRemote(BenchmarkCase):
+
+    def setUp(self):
+        self.server = server.Server(
+            '127.0.0.1',
+            0,
+            PASSWORD,
+            None,
+            None,
+            None
+        )
+        self.server.start(ServerNetwork())
+        self.port = self.server.socket.getsockname()[1]
+        self.client = None
+
+        self.clients = []
+
+    def tearDown(self):
+        for c in self.clients:
+            c.stop()
+
+        self.server.stop()
+
+    def connect(self, network=None):
+        self.client = client.Client(
+            '127.0.0.1',
+            self.port,
+            PASSWORD,
+            None,
+            None,
+            None
+        )
+        self.clients.append(self.client)
+
+        if network is None:
+            network = ClientNetwork()
+
+        self.client.start(network)
+        return network
+
+    def wait_for_client(self, count=1):
+        start = time.time()
+        while len(self.server.clients) < count and time.time() - start < 5:
+            time.sleep(0.01)
+
+        self.assertEqual(len(self.server.clients), count)
+
+    @staticmethod
+    def wait_for(func, timeout=10.0):
+        start = time.time()
+        while not func() and time.time() - start < timeout:
+            time.sleep(0.01)
+
+        return func()
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_000_binary_protocol(self):
+        network = self.connect()
+        self.assertEqual(
+            self.client.protocol,
+            remote_protocol.PROTOCOL_BINARY
+        )
+        self.assertEqual(
+            self.client.send(dict(func='getValue', args=[21], kwargs={})),
+            42
+        )
+
+        self.wait_for_client()
+        self.assertEqual(
+            self.server.clients[0].protocol,
+            remote_protocol.PROTOCOL_BINARY
+        )
+        self.assertIsNotNone(self.server.clients[0].cipher)
+
+        notif = create_notification(7)
+        self.assertIsNotNone(self.server.send(notif))
+        self.assertTrue(network.event.wait(5.0))
+        self.assertEqual(
+            notifications_fields(network.notifications),
+            notifications_fields([notif])
+        )
+
+    def test_001_pipelining(self):
+        self.connect()
+
+        futures = [
+            self.client.send_async(dict(func='getValue', args=[i], kwargs={}))
+            for i in range(100)
+        ]
+
+        self.assertEqual(
+            [future.result(5.0) for future in futures],
+            [i * 2 for i in range(100)]
+        )
+
+    def test_002_batch(self):
+        self.connect()
+
+        self.assertEqual(
+            self.client.send_batch([
+                dict(func='getValue', args=[i], kwargs={})
+                for i in range(100)
+            ]),
+            [i * 2 for i in range(100)]
+        )
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_003_fan_out(self):
+        networks = [self.connect() for _ in range(4)]
+        self.wait_for_client(4)
+
+        notifications = [create_notification(i) for i in range(100)]
+
+        for n in notifications:
+            self.assertIsNotNone(self.server.send(n))
+
+        for network in networks:
+            self.assertTrue(
+                self.wait_for(lambda: len(network.notifications) == 100)
+            )
+            self.assertEqual(
+                notifications_fields(network.notifications),
+                notifications_fields(notifications)
+            )
+
+        # every client can still make requests
+        for c in self.clients:
+            self.assertEqual(
+                c.send(dict(func='getValue', args=[4], kwargs={})),
+                8
+            )
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_004_slow_client(self):
+        max_write_buffer = server.MAX_WRITE_BUFFER
+        server.MAX_WRITE_BUFFER = 256 * 1024
+
+        # starts a session and never reads anything after that
+        slow = socket.create_connection(('127.0.0.1', self.port))
+        slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        cipher = start_session(slow)
+        slow.sendall(
+            remote_protocol.encode_frame(
+                remote_protocol.FRAME_RESUME,
+                0,
+                json.dumps(dict(session=None, sequence=0)).encode(),
+                cipher
+            )
+        )
+        self.wait_for_client(1)
+
+        try:
+            network = self.connect()
+            self.wait_for_client(2)
+
+            slow_connection = self.server.clients[0]
+            notifications = []
+
+            for i in range(4000):
+                n = create_notification(i)
+                n.value.label = 'x' * 4096
+                notifications.append(n)
+
+            # the notifications are sent at the rate the fast client reads
+            # them, the slow client falls behind until it is disconnected.
+            for i in range(0, 4000, 20):
+                start = time.time()
+                for n in notifications[i:i + 20]:
+                    self.server.send(n)
+
+                # sending never waits on the slow client
+                self.assertLess(time.time() - start, 1.0)
+                self.assertTrue(
+                    self.wait_for(
+                        lambda: len(network.notifications) == i + 20
+                    )
+                )
+
+            self.assertEqual(
+                notifications_fields(network.notifications),
+                notifications_fields(notifications)
+            )
+
+            self.assertTrue(self.wait_for(lambda: slow_connection.is_closed))
+            self.assertEqual(len(self.server.clients), 1)
+            self.assertEqual(
+                self.client.send(dict(func='getValue', args=[5], kwargs={})),
+                10
+            )
+        finally:
+            server.MAX_WRITE_BUFFER = max_write_buffer
+            slow.close()
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_005_snapshot(self):
+        self.server.network = SnapshotNetwork(10, 10)
+        expected = [
+            notification_key(n) for n in remote_snapshot.notifications(
+                remote_snapshot.create_snapshot(self.server.network)
+            )
+        ]
+
+        network = self.connect()
+        self.assertTrue(
+            self.wait_for(lambda: len(network.notifications) >= len(expected))
+        )
+        self.assertEqual(
+            [notification_key(n) for n in network.notifications],
+            expected
+        )
+        self.assertEqual(self.client.session, self.server.session)
+        self.assertEqual(self.client.sequence, self.server.sequence)
+
+        notif = create_notification(1)
+        sequence = self.server.send(notif)
+        self.assertTrue(
+            self.wait_for(lambda: self.client.sequence == sequence)
+        )
+        self.assertTrue(
+            self.wait_for(
+                lambda: notification_fields(network.notifications[-1]) ==
+                notification_fields(notif)
+            )
+        )
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_006_resume(self):
+        self.server.network = SnapshotNetwork(10, 10)
+        bootstrap_count = len(list(
+            remote_snapshot.notifications(
+                remote_snapshot.create_snapshot(self.server.network)
+            )
+        ))
+
+        network = self.connect()
+        notifications = [create_notification(i) for i in range(20)]
+
+        self.assertTrue(
+            self.wait_for(
+                lambda: len(network.notifications) == bootstrap_count
+            )
+        )
+
+        for n in notifications[:10]:
+            self.server.send(n)
+
+        self.assertTrue(self.wait_for(lambda: self.client.sequence == 10))
+
+        # the connection drops and notifications keep coming in while the
+        # client connects again
+        self.client.socket.shutdown(socket.SHUT_RDWR)
+
+        for n in notifications[10:]:
+            self.server.send(n)
+
+        self.assertTrue(self.wait_for(lambda: self.client.sequence == 20))
+        self.assertTrue(
+            self.wait_for(
+                lambda: len(network.notifications) == bootstrap_count + 20
+            )
+        )
+        time.sleep(0.1)
+
+        # the snapshot did not get sent again
+        self.assertEqual(len(network.notifications), bootstrap_count + 20)
+        self.assertEqual(
+            notifications_fields(network.notifications[bootstrap_count:]),
+            notifications_fields(notifications)
+        )
+
+    def wait_for_subscription(self):
+        self.wait_for_client()
+        self.assertTrue(
+            self.wait_for(lambda: self.server.clients[0].subscription)
+        )
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_007_subscription(self):
+        network = self.connect()
+        self.client.subscribe(nodes=[1, 2], genres=['User'])
+        self.wait_for_subscription()
+
+        notifications = [create_notification(i) for i in range(5)]
+        notifications[2].value.genre = _libopenzwave.PyGenres.Config
+
+        # the server does the filtering
+        self.assertIsNone(self.server.send(notifications[0]))
+        self.assertIsNotNone(self.server.send(notifications[1]))
+        self.assertIsNone(self.server.send(notifications[2]))
+        self.assertIsNone(self.server.send(notifications[3]))
+
+        # notifications that are not value changes are always sent
+        node_added = _libopenzwave.ZWaveNotification(
+            _libopenzwave.PyNotifications.NodeAdded,
+            0xE1A2B3C4,
+            4
+        )
+        self.assertIsNotNone(self.server.send(node_added))
+
+        self.assertTrue(self.wait_for(lambda: len(network.notifications) == 2))
+        self.assertEqual(
+            notifications_fields(network.notifications),
+            notifications_fields([notifications[1], node_added])
+        )
+
+        # receives everything again
+        self.client.subscribe()
+        self.assertTrue(
+            self.wait_for(
+                lambda: not self.server.clients[0].subscription.is_filtered
+            )
+        )
+        self.assertIsNotNone(self.server.send(notifications[3]))
+        self.assertTrue(self.wait_for(lambda: len(network.notifications) == 3))
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_008_coalesce(self):
+        network = self.connect()
+        self.client.subscribe(coalesce=0.2)
+        self.wait_for_subscription()
+
+        notifications = []
+
+        for i in range(100):
+            n = create_notification(i % 5)
+            n.value.data = float(i)
+            notifications.append(n)
+            self.server.send(n)
+
+        self.assertTrue(self.wait_for(lambda: len(network.notifications) == 5))
+        time.sleep(0.3)
+
+        # only the latest notification for each value in the order they
+        # came in
+        self.assertEqual(
+            notifications_fields(network.notifications),
+            notifications_fields(notifications[-5:])
+        )
+        self.assertEqual(self.client.sequence, self.server.sequence)
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_009_ack(self):
+        max_unacked = server.MAX_UNACKED
+        server.MAX_UNACKED = 10
+
+        try:
+            network = self.connect()
+            self.wait_for_client()
+            connection = self.server.clients[0]
+
+            # the client processes the notifications slower than they
+            # come in
+            callback = network._zwcallback
+
+            def slow_callback(notif):
+                time.sleep(0.005)
+                callback(notif)
+
+            network._zwcallback = slow_callback
+
+            latest = {}
+
+            for i in range(500):
+                n = create_notification(i % 10)
+                n.value.data = float(i)
+                latest[n.value.id] = n
+                self.server.send(n)
+
+            self.assertTrue(
+                self.wait_for(lambda: connection.acked == self.server.sequence)
+            )
+            self.assertFalse(connection.is_lagging)
+            self.assertFalse(connection.in_flight)
+            self.assertLess(len(network.notifications), 500)
+
+            received = {}
+
+            for n in network.notifications:
+                received[n.value.id] = n
+
+            self.assertEqual(
+                sorted(notifications_fields(received.values())),
+                sorted(notifications_fields(latest.values()))
+            )
+        finally:
+            server.MAX_UNACKED = max_unacked
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_010_snapshot_removes(self):
+        self.server.network = SnapshotNetwork(10, 10)
+        # the client network has the nodes from the first connection
+        network = self.connect(
+            ClientNetwork(dict(SnapshotNetwork(10, 10).nodes))
+        )
+
+        def snapshot_keys():
+            return [
+                notification_key(n) for n in remote_snapshot.notifications(
+                    remote_snapshot.create_snapshot(self.server.network)
+                )
+            ]
+
+        expected = snapshot_keys()
+        self.assertTrue(
+            self.wait_for(lambda: len(network.notifications) == len(expected))
+        )
+        # nothing is removed when the network matches the snapshot
+        self.assertEqual(
+            [notification_key(n) for n in network.notifications],
+            expected
+        )
+
+        # the server is restarted while the client is not connected and a
+        # node and a value get removed, the client is not able to resume
+        # so it gets a snapshot.
+        self.client.socket.shutdown(socket.SHUT_RDWR)
+        del self.server.network.nodes['10.1']
+        del self.server.network.nodes['3.1'].values[5]
+        self.server.session = uuid4().hex
+
+        bootstrap_count = len(expected)
+        expected = [
+            (_libopenzwave.PyNotifications.ValueRemoved, 3, 3 << 32 | 5),
+            (_libopenzwave.PyNotifications.NodeRemoved, 10, None)
+        ] + snapshot_keys()
+
+        self.assertTrue(
+            self.wait_for(
+                lambda: self.client.session == self.server.session and
+                len(network.notifications) == bootstrap_count + len(expected)
+            )
+        )
+        self.assertEqual(
+            [
+                notification_key(n)
+                for n in network.notifications[bootstrap_count:]
+            ],
+            expected
+        )
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_100_benchmark(self):
+        aes = remote_encryption.AESCipher(PASSWORD)
+        notifications = [create_notification(i) for i in range(1000)]
+
+        def run_legacy():
+            data = b''.join(legacy_encode(aes, n) for n in notifications)
+            self.assertEqual(len(legacy_decode(aes, data)), 1000)
+            return data
+
+        buf = remote_protocol.FrameBuffer()
+        client_cipher, server_cipher = create_session()
+
+        def run_binary():
+            data = b''.join(
+                binary_encode(server_cipher, i, n)
+                for i, n in enumerate(notifications)
+            )
+            self.assertEqual(
+                len(binary_decode(client_cipher, buf, data)),
+                1000
+            )
+            return data
+
+        legacy = self.bench('JSON protocol, 1000 notifications', run_legacy)
+        binary = self.bench('binary protocol, 1000 notifications', run_binary)
+
+        sys.stderr.write(
+            '\n    JSON protocol: {0:.0f} messages/s, {1:.0f} bytes/message'
+            '\n    binary protocol: {2:.0f} messages/s, '
+            '{3:.0f} bytes/message'.format(
+                1000 / legacy,
+                len(run_legacy()) / 1000.0,
+                1000 / binary,
+                len(run_binary()) / 1000.0
+            )
+        )
+
+        self.assertLess(len(run_binary()), len(run_legacy()))
+
+    def test_101_benchmark_requests(self):
+        self.connect()
+        messages = [
+            dict(func='getValue', args=[i], kwargs={})
+            for i in range(120)
+        ]
+
+        self.bench(
+            '120 requests, one at a time',
+            lambda: [self.client.send(message) for message in messages]
+        )
+        # on the loopback there is next to no latency, pipelining makes a
+        # difference when the server is on another machine.
+        self.bench(
+            '120 requests, pipelined',
+            lambda: [
+                future.result() for future in
+                [self.client.send_async(message) for message in messages]
+            ]
+        )
+        self.bench(
+            '120 requests, batch',
+            lambda: self.client.send_batch(messages)
+        )
+        sys.stderr.write('\n')
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_103_benchmark_bootstrap(self):
+        network = SnapshotNetwork(50, 20)
+        buf = remote_protocol.FrameBuffer()
+        client_cipher, server_cipher = create_session()
+
+        def run_replay():
+            # a notification for every node and value, each one encoded and
+            # encrypted on its own
+            snapshot = remote_snapshot.create_snapshot(network)
+            data = b''.join(
+                binary_encode(server_cipher, 0, n)
+                for n in remote_snapshot.notifications(snapshot)
+            )
+            binary_decode(client_cipher, buf, data)
+            return data
+
+        def run_snapshot():
+            snapshot = remote_snapshot.create_snapshot(network)
+            data = remote_protocol.encode_frame(
+                remote_protocol.FRAME_SNAPSHOT,
+                0,
+                pickle.dumps(
+                    dict(session='', sequence=0, network=snapshot),
+                    pickle.HIGHEST_PROTOCOL
+                ),
+                server_cipher
+            )
+            buf.feed(data)
+            for frame_type, message_id, payload in buf.frames():
+                snapshot = pickle.loads(
+                    remote_protocol.decrypt_frame(
+                        client_cipher,
+                        frame_type,
+                        message_id,
+                        payload
+                    )
+                )
+                list(remote_snapshot.notifications(snapshot['network']))
+            return data
+
+        self.bench('bootstrap 50 nodes, notification replay', run_replay)
+        self.bench('bootstrap 50 nodes, snapshot', run_snapshot)
+
+        sys.stderr.write(
+            '\n    notification replay: {0} bytes'
+            '\n    snapshot: {1} bytes'.format(
+                len(run_replay()),
+                len(run_snapshot())
+            )
+        )
+
+        self.assertLess(len(run_snapshot()), len(run_replay()))
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_102_benchmark_fan_out(self):
+        notifications = [create_notification(i) for i in range(1000)]
+        networks = []
+        results = []
+
+        for count in (1, 8):
+            while len(networks) < count:
+                networks.append(self.connect())
+
+            self.wait_for_client(count)
+
+            start = time.time()
+            for n in notifications:
+                self.server.send(n)
+            queued = time.time() - start
+
+            for network in networks:
+                self.assertTrue(
+                    self.wait_for(lambda: len(network.notifications) == 1000)
+                )
+                del network.notifications[:]
+
+            results.append((count, queued, time.time() - start))
+
+        for count, queued, delivered in results:
+            sys.stderr.write(
+                '\n    {0} client(s): 1000 notifications queued in '
+                '{1:.1f} ms, delivered in {2:.1f} ms'.format(
+                    count,
+                    queued * 1000,
+                    delivered * 1000
+                )
+            )
+
+    @unittest.skipIf(_libopenzwave is None, '_libopenzwave is not built')
+    def test_104_benchmark_coalesce(self):
+        # 20 power meters that report 5 times a second for 2 seconds
+        plain = self.connect()
+        coalesced = self.connect()
+        self.client.subscribe(coalesce=1.0)
+        self.wait_for_client(2)
+        self.assertTrue(
+            self.wait_for(
+                lambda: any(c.subscription for c in self.server.clients)
+            )
+        )
+
+        count = 0
+
+        for i in range(10):
+            for meter in range(20):
+                n = create_notification(meter)
+                n.value.data = float(i)
+                self.server.send(n)
+                count += 1
+
+            time.sleep(0.2)
+
+        self.assertTrue(self.wait_for(lambda: len(plain.notifications) == 200))
+        self.assertTrue(
+            self.wait_for(
+                lambda: self.clients[1].sequence == self.server.sequence
+            )
+        )
+
+        sys.stderr.write(
+            '\n    no subscription: {0} of {1} notifications received'
+            '\n    coalesce 1 second: {2} of {1} notifications '
+            'received'.format(
+                len(plain.notifications),
+                count,
+                len(coalesced.notifications)
+            )
+        )
+
+        self.assertLess(len(coalesced.notifications), count)
+        self.assertEqual(
+            [n.value.data for n in coalesced.notifications[-20:]],
+            [9.0] * 20
+        )
+
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
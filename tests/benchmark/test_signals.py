@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for the signal dispatcher.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import threading
+import time
+import unittest
+
+from libopenzwave import signals
+from .common import BenchmarkCase
+
+
+class Sender(object):
+    pass
+
+
+class TestDispatcher(BenchmarkCase):
+
+    def setUp(self):
+        self.dispatcher = signals.Dispatcher()
+        self.signal = signals.SIGNAL_VALUE_CHANGED
+
+    def test_000_connect_send_disconnect(self):
+        sender1 = Sender()
+        sender2 = Sender()
+        calls = []
+
+        def receiver(sender, signal, **kwargs):
+            calls.append((sender, signal, kwargs))
+
+        self.assertTrue(
+            self.dispatcher.connect(receiver, self.signal, sender1)
+        )
+        self.assertFalse(
+            self.dispatcher.connect(receiver, self.signal, sender1)
+        )
+        self.dispatcher.connect(receiver, signals.SIGNAL_NODE_ADDED)
+
+        self.dispatcher.send(self.signal, sender1, value_data=1)
+        self.dispatcher.send(self.signal, sender2, value_data=2)
+        self.dispatcher.send(signals.SIGNAL_NODE_ADDED, sender2)
+
+        self.assertEqual(
+            calls,
+            [
+                (sender1, self.signal, dict(value_data=1)),
+                (sender2, signals.SIGNAL_NODE_ADDED, {})
+            ]
+        )
+
+        self.assertTrue(
+            self.dispatcher.disconnect(receiver, self.signal, sender1)
+        )
+        self.assertFalse(
+            self.dispatcher.disconnect(receiver, self.signal, sender1)
+        )
+        self.assertEqual(self.dispatcher.receivers(self.signal), [])
+
+    def test_001_all_signals(self):
+        calls = []
+
+        def receiver(signal, **_):
+            calls.append(signal)
+
+        self.dispatcher.connect(receiver)
+        self.dispatcher.send(self.signal, Sender())
+        self.dispatcher.send(signals.SIGNAL_NODE_ADDED, None)
+
+        self.assertEqual(calls, [self.signal, signals.SIGNAL_NODE_ADDED])
+
+    def test_002_disconnect_while_sending(self):
+        sender = Sender()
+        calls = []
+
+        def receiver1(**_):
+            calls.append(1)
+            self.dispatcher.disconnect(receiver2, self.signal, sender)
+
+        def receiver2(**_):
+            calls.append(2)
+
+        self.dispatcher.connect(receiver1, self.signal, sender)
+        self.dispatcher.connect(receiver2, self.signal, sender)
+
+        self.dispatcher.send(self.signal, sender)
+        self.dispatcher.send(self.signal, sender)
+        self.assertEqual(calls, [1, 2, 1])
+
+    def test_100_benchmark(self):
+        def receiver(**_):
+            pass
+
+        for count in (10, 100, 1000, 10000):
+            senders = list(Sender() for _ in range(count))
+
+            for sender in senders:
+                self.dispatcher.connect(receiver, self.signal, sender)
+
+            sender = senders[count // 2]
+
+            self.bench(
+                'send with {0} registrations'.format(count),
+                lambda: self.dispatcher.send(self.signal, sender),
+                number=10000
+            )
+
+            for s in senders:
+                self.dispatcher.disconnect(receiver, self.signal, s)
+
+        sys.stderr.write('\n')
+
+
+
+class TestAsyncReceiver(BenchmarkCase):
+
+    def setUp(self):
+        self.signal = signals.SIGNAL_VALUE_CHANGED
+        self.event = threading.Event()
+        self.calls = []
+
+    def receiver(self, sender, value_data, **_):
+        self.event.wait(5.0)
+        self.calls.append((sender, value_data))
+
+    def send(self, receiver, sender, value_data):
+        receiver(sender=sender, signal=self.signal, value_data=value_data)
+
+    def test_000_drop_oldest(self):
+        receiver = signals.AsyncReceiver(self.receiver, max_size=2)
+        sender = Sender()
+
+        # the first one is picked up by the worker right away
+        self.send(receiver, sender, 0)
+        time.sleep(0.1)
+
+        for i in range(1, 5):
+            self.send(receiver, sender, i)
+
+        self.assertEqual(receiver.queue_depth, 2)
+        self.assertEqual(receiver.dropped, 2)
+
+        self.event.set()
+        receiver.stop(5.0)
+
+        self.assertEqual(self.calls, [(sender, 0), (sender, 3), (sender, 4)])
+        self.assertEqual(receiver.delivered, 3)
+        self.assertEqual(receiver.max_queue_depth, 2)
+
+    def test_001_coalesce(self):
+        receiver = signals.AsyncReceiver(
+            self.receiver,
+            max_size=10,
+            overflow=signals.OVERFLOW_COALESCE
+        )
+        sender1 = Sender()
+        sender2 = Sender()
+
+        self.send(receiver, sender1, 0)
+        time.sleep(0.1)
+
+        for i in range(1, 5):
+            self.send(receiver, sender1, i)
+            self.send(receiver, sender2, i)
+
+        self.assertEqual(receiver.queue_depth, 2)
+        self.assertEqual(receiver.coalesced, 6)
+
+        self.event.set()
+        receiver.stop(5.0)
+
+        self.assertEqual(
+            self.calls,
+            [(sender1, 0), (sender1, 4), (sender2, 4)]
+        )
+
+    def test_002_block(self):
+        receiver = signals.AsyncReceiver(
+            self.receiver,
+            max_size=1,
+            overflow=signals.OVERFLOW_BLOCK,
+            block_timeout=0.1
+        )
+        sender = Sender()
+
+        self.send(receiver, sender, 0)
+        time.sleep(0.1)
+        self.send(receiver, sender, 1)
+
+        start = time.time()
+        self.send(receiver, sender, 2)
+        self.assertGreaterEqual(time.time() - start, 0.09)
+        self.assertEqual(receiver.dropped, 1)
+
+        self.event.set()
+        receiver.stop(5.0)
+        self.assertEqual(self.calls, [(sender, 0), (sender, 1)])
+
+    def test_003_unregister_with_wrapped_receiver(self):
+        receiver = signals.AsyncReceiver(self.receiver)
+        self.signal.register(receiver)
+
+        self.assertIn(
+            (receiver, None),
+            signals.dispatcher.receivers(self.signal)
+        )
+
+        self.signal.unregister(self.receiver)
+        self.assertNotIn(
+            (receiver, None),
+            signals.dispatcher.receivers(self.signal)
+        )
+        receiver.stop()
+
+    def test_100_benchmark(self):
+        def slow_receiver(**_):
+            time.sleep(0.001)
+
+        receiver = signals.AsyncReceiver(
+            slow_receiver,
+            max_size=1000,
+            overflow=signals.OVERFLOW_COALESCE
+        )
+        dispatcher = signals.Dispatcher()
+        sender = Sender()
+
+        dispatcher.connect(slow_receiver, self.signal, sender)
+        self.bench(
+            'send to a slow receiver',
+            lambda: dispatcher.send(self.signal, sender),
+            number=100
+        )
+        dispatcher.disconnect(slow_receiver, self.signal, sender)
+
+        dispatcher.connect(receiver, self.signal, sender)
+        self.bench(
+            'send to a slow AsyncReceiver',
+            lambda: dispatcher.send(self.signal, sender),
+            number=100
+        )
+        receiver.stop(5.0)
+        sys.stderr.write('\n')
+
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
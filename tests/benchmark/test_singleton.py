@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for building the node classes.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import tracemalloc
+import unittest
+
+from libopenzwave import singleton
+from libopenzwave import command_classes
+from libopenzwave import notification_handler
+from libopenzwave.node import ZWaveNode
+from libopenzwave.controller import ZWaveController
+from .common import BenchmarkCase
+
+# basic, switch binary, configuration, manufacturer specific, version
+SWITCH = [0x20, 0x25, 0x70, 0x72, 0x86]
+# basic, switch multilevel, configuration, manufacturer specific, version
+DIMMER = [0x20, 0x26, 0x70, 0x72, 0x86]
+
+NODE_COUNT = 40
+
+
+class Manager(object):
+    # stands in for the part of PyManager the node constructor uses
+
+    @staticmethod
+    def getNodeClassIds(_, __):
+        return SWITCH
+
+
+class Network(object):
+    home_id = 0xE1A2B3C4
+    controller = None
+
+    def __init__(self):
+        self.manager = Manager()
+
+
+class TestNodeClass(BenchmarkCase):
+
+    def setUp(self):
+        singleton._NODE_CLASSES.clear()
+
+    def tearDown(self):
+        singleton._NODE_CLASSES.clear()
+
+        handlers = notification_handler.NotificationHandler.node_handlers
+        for handler in handlers[:]:
+            handler.stop()
+
+    def test_000_shared(self):
+        cls1 = singleton._node_class(ZWaveNode, SWITCH)
+        cls2 = singleton._node_class(ZWaveNode, list(SWITCH) + [0x25])
+        cls3 = singleton._node_class(ZWaveNode, DIMMER)
+        cls4 = singleton._node_class(ZWaveController, SWITCH)
+
+        self.assertIs(cls1, cls2)
+        self.assertIsNot(cls1, cls3)
+        self.assertIsNot(cls1, cls4)
+
+        self.assertTrue(issubclass(cls1, ZWaveNode))
+        self.assertTrue(issubclass(cls4, ZWaveController))
+
+    def test_001_order(self):
+        # the bases are in the order the command classes are in
+        cls1 = singleton._node_class(ZWaveNode, SWITCH)
+        cls2 = singleton._node_class(ZWaveNode, list(reversed(SWITCH)))
+
+        self.assertIsNot(cls1, cls2)
+        self.assertEqual(
+            list(base.class_id for base in cls1.__bases__[1:]),
+            SWITCH
+        )
+        self.assertEqual(
+            list(base.class_id for base in cls2.__bases__[1:]),
+            list(reversed(SWITCH))
+        )
+
+    def test_002_replaced(self):
+        original = command_classes.COMMAND_CLASS_SWITCH_BINARY
+        module = sys.modules[original.__openzwave_module__]
+        names = [
+            name for name, value in vars(command_classes).items()
+            if value is original
+        ]
+        cls1 = singleton._node_class(ZWaveNode, SWITCH)
+
+        try:
+            # a plugin replaces the command class
+            class SwitchBinary(original):
+                pass
+
+            self.assertIs(command_classes.COMMAND_CLASSES[0x25], SwitchBinary)
+
+            cls2 = singleton._node_class(ZWaveNode, SWITCH)
+
+            self.assertIsNot(cls1, cls2)
+            self.assertIn(SwitchBinary, cls2.__bases__)
+            self.assertNotIn(original, cls2.__bases__)
+            self.assertIs(singleton._node_class(ZWaveNode, SWITCH), cls2)
+        finally:
+            replaced = singleton._REPLACED_ZWAVE_CLASSES
+            replaced[replaced.index(SwitchBinary)] = original
+            setattr(module, original.__openzwave_name__, original)
+
+            for name in names:
+                setattr(command_classes, name, original)
+
+        self.assertIs(command_classes.COMMAND_CLASSES[0x25], original)
+
+    def build(self, cached):
+        for _ in range(NODE_COUNT):
+            if not cached:
+                singleton._NODE_CLASSES.clear()
+
+            singleton._node_class(ZWaveNode, SWITCH)
+
+    def start(self, cached):
+        # the nodes of a network loaded at start up
+        network = Network()
+
+        for node_id in range(1, NODE_COUNT + 1):
+            if not cached:
+                singleton._NODE_CLASSES.clear()
+
+            ZWaveNode('{0}.1'.format(node_id), network, None)
+
+        handlers = notification_handler.NotificationHandler.node_handlers
+        for handler in handlers[:]:
+            handler.stop()
+
+    def test_100_benchmark(self):
+        self.bench(
+            'build {0} switch classes'.format(NODE_COUNT),
+            lambda: self.build(False),
+            number=5
+        )
+        self.bench(
+            'share 1 class for {0} switches'.format(NODE_COUNT),
+            lambda: self.build(True),
+            number=5
+        )
+
+        uncached_time = self.bench(
+            'start {0} switches, a class each'.format(NODE_COUNT),
+            lambda: self.start(False)
+        )
+        cached_time = self.bench(
+            'start {0} switches, 1 shared class'.format(NODE_COUNT),
+            lambda: self.start(True)
+        )
+
+        sys.stderr.write(
+            '\n    {0:<50} {1:>12.1f} x'.format(
+                'start up, shared class speed up',
+                uncached_time / cached_time
+            )
+        )
+
+        sizes = []
+
+        for cached in (False, True):
+            singleton._NODE_CLASSES.clear()
+            # the classes that are no longer used are not freed right away
+            classes = []
+
+            tracemalloc.start()
+
+            for _ in range(NODE_COUNT):
+                if not cached:
+                    singleton._NODE_CLASSES.clear()
+
+                classes.append(singleton._node_class(ZWaveNode, SWITCH))
+
+            sizes.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+
+        sys.stderr.write(
+            '\n    {0:<50} {1:>12.1f} KB'
+            '\n    {2:<50} {3:>12.1f} KB\n'.format(
+                'memory, {0} switch classes'.format(NODE_COUNT),
+                sizes[0] / 1024.0,
+                'memory, 1 shared class',
+                sizes[1] / 1024.0
+            )
+        )
+
+        self.assertLess(sizes[1], sizes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
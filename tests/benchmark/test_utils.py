@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for the data path logging decorator.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import logging
+import unittest
+
+from libopenzwave import utils
+from .common import BenchmarkCase
+
+logger = logging.getLogger(__name__)
+
+
+class Value(object):
+
+    def __init__(self):
+        self._data = 0
+
+    @property
+    @utils.logit
+    def data(self):
+        return self._data
+
+    @data.setter
+    @utils.logit
+    def data(self, value):
+        self._data = value
+
+    @utils.logit
+    def get_data(self):
+        return self._data
+
+
+class PlainValue(object):
+
+    def __init__(self):
+        self._data = 0
+
+    @property
+    def data(self):
+        return self._data
+
+    def get_data(self):
+        return self._data
+
+
+class TestLogit(BenchmarkCase):
+
+    def tearDown(self):
+        logger.setLevel(logging.NOTSET)
+        utils.update_logit()
+
+    def test_000_swap(self):
+        # setting the level of a logger swaps the functions
+        logger.setLevel(logging.INFO)
+        self.assertFalse(hasattr(Value.get_data, '__wrapped__'))
+        self.assertFalse(hasattr(Value.data.fget, '__wrapped__'))
+        self.assertFalse(hasattr(Value.data.fset, '__wrapped__'))
+
+        logger.setLevel(utils.LOGGING_DATA_PATH)
+        self.assertTrue(hasattr(Value.get_data, '__wrapped__'))
+        self.assertTrue(hasattr(Value.data.fget, '__wrapped__'))
+        self.assertTrue(hasattr(Value.data.fset, '__wrapped__'))
+
+        value = Value()
+        with self.assertLogs(__name__, utils.LOGGING_DATA_PATH) as logs:
+            value.data = 5
+            self.assertEqual(value.get_data(), 5)
+
+        self.assertEqual(len(logs.output), 2)
+
+        logger.setLevel(logging.INFO)
+        self.assertFalse(hasattr(Value.get_data, '__wrapped__'))
+        self.assertEqual(value.data, 5)
+
+    def test_100_benchmark(self):
+        value = Value()
+        plain_value = PlainValue()
+
+        logger.setLevel(logging.INFO)
+
+        self.bench(
+            'plain property access',
+            lambda: plain_value.data,
+            number=100000
+        )
+        self.bench(
+            'plain method call',
+            plain_value.get_data,
+            number=100000
+        )
+        self.bench(
+            'logit property access',
+            lambda: value.data,
+            number=100000
+        )
+        self.bench(
+            'logit method call',
+            value.get_data,
+            number=100000
+        )
+
+        logger.setLevel(utils.LOGGING_DATA_PATH)
+        wrapped_data = Value.data
+        wrapped_get_data = Value.get_data
+        logger.setLevel(logging.INFO)
+
+        # put the wrappers back in place to see what they cost when the data
+        # path logging is turned off
+        Value.data = wrapped_data
+        Value.get_data = wrapped_get_data
+
+        self.bench(
+            'logit property access, wrapper',
+            lambda: value.data,
+            number=100000
+        )
+        self.bench(
+            'logit method call, wrapper',
+            value.get_data,
+            number=100000
+        )
+        sys.stderr.write('\n')
+
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for finding the value a notification is for.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import sys
+import unittest
+
+from libopenzwave import value as _value
+from libopenzwave import xml_handler
+from .common import BenchmarkCase
+
+VALUE_COUNT = 200
+
+VALUE_XML = (
+    '<Value id="0x{0:04X}" type="Decimal" genre="User" index="{1}" '
+    'endpoint="{2}" label="Value {1}">'
+    '<CommandClass id="{3}" symbol="COMMAND_CLASS_METER"/>'
+    '</Value>'
+)
+
+
+class MeterIndexes(object):
+    pass
+
+
+for _index in range(VALUE_COUNT):
+    setattr(MeterIndexes, 'value_{0}'.format(_index), _index)
+
+
+class Meter(object):
+    class_id = 0x32
+    class_desc = 'COMMAND_CLASS_METER'
+    ValueIndexes = MeterIndexes
+
+
+class Network(object):
+    controller = None
+    manager = None
+
+
+class Node(object):
+    _bases = [Meter]
+
+    def __init__(self):
+        self.network = Network()
+        self.xml_handler = xml_handler.XMLElement('Node')
+        self.xml_handler.Values = xml_handler.XMLElement('Values')
+
+
+class NotificationValue(object):
+
+    def __init__(self, id_, command_class, instance, index):
+        self.id = id_
+        self.command_class = command_class
+        self.instance = instance
+        self.index = index
+
+
+def make_value(node, value_id, index, instance=1, saved_id=None):
+    # a value loaded from the saved dataset has a temporary id, the id
+    # OpenZWave gave it the last time is stored in the xml data.
+    if saved_id is None:
+        saved_id = value_id
+
+    xml_data = xml_handler.XMLElement.from_string(
+        VALUE_XML.format(saved_id, index, instance - 1, Meter.class_id)
+    )
+    node.xml_handler.Values.append(xml_data)
+
+    return _value.ZWaveValue(value_id, node.network, node, xml_data)
+
+
+def legacy_resolve(values, n):
+    # the loop ZWaveNode._handle_value used before ZWaveValues.resolve.
+    # it is kept here only to compare the two.
+    for value_id, value in list(values.items())[:]:
+        if value_id == n.id:
+            break
+
+        if value_id > -1:
+            continue
+
+        cc_id = value.command_class.class_id
+
+        if (
+            cc_id == n.command_class and
+            value.index == n.index and
+            value.instance == n.instance
+        ):
+            value._set_id(n.id)
+            values[n.id] = values.pop(value_id)
+            value._update_dataset()  # NOQA
+            break
+    else:
+        value = None
+
+    return value
+
+
+def build_values(cached):
+    node = Node()
+    values = _value.ZWaveValues(node)
+
+    for index in range(VALUE_COUNT):
+        if cached:
+            value = make_value(
+                node,
+                _value.new_value_id(),
+                index,
+                saved_id=0x2000 + index
+            )
+        else:
+            value = make_value(node, 1000 + index, index)
+
+        values[value.object_id] = value
+
+    return values
+
+
+class TestValues(BenchmarkCase):
+
+    def test_000_live_value(self):
+        values = build_values(cached=False)
+
+        value = values.resolve(1005, Meter.class_id, 1, 5)
+        self.assertIs(value, values[1005])
+        self.assertEqual(value.id, 1005)
+        self.assertEqual(value.xml_handler['id'], '0x03ED')
+
+        self.assertIsNone(values.resolve(5000, Meter.class_id, 1, 5))
+
+    def test_001_cached_value(self):
+        values = build_values(cached=True)
+        value = next(v for v in values.values() if v.index == 5)
+        temp_id = value.object_id
+        value_hash = hash(value)
+
+        self.assertLess(temp_id, 0)
+        self.assertEqual(value.id, 0x2005)
+
+        self.assertIs(values.resolve(1005, Meter.class_id, 1, 5), value)
+        self.assertEqual(value.id, 1005)
+        self.assertEqual(value.object_id, 1005)
+        self.assertEqual(value.xml_handler['id'], '0x03ED')
+        self.assertNotEqual(hash(value), value_hash)
+        self.assertEqual(hash(value), hash(1005))
+        self.assertNotIn(temp_id, values)
+        self.assertIs(values[1005], value)
+
+        # the value has been moved so it is found using the id from now on
+        self.assertIs(values.resolve(1005, Meter.class_id, 1, 5), value)
+        self.assertIs(values.resolve(1005, 0x25, 2, 7), value)
+
+        self.assertIsNone(values.resolve(2000, Meter.class_id, 2, 5))
+        self.assertIsNone(values.resolve(2000, 0x25, 1, 5))
+
+    def test_002_compare_resolved(self):
+        values = build_values(cached=True)
+        value = next(v for v in values.values() if v.index == 5)
+        before = {value}
+
+        self.assertIs(values.resolve(1005, Meter.class_id, 1, 5), value)
+
+        # a value made using the id OpenZWave gave it
+        live = make_value(Node(), 1005, 5)
+
+        self.assertIsNot(live, value)
+        self.assertEqual(value, live)
+        self.assertEqual(live, value)
+        self.assertEqual(hash(value), hash(live))
+        self.assertNotEqual(value, make_value(Node(), 0x2005, 5))
+
+        self.assertIn(live, {value})
+        self.assertIn(value, {live: None})
+        self.assertIn(value, set(values.values()))
+
+        # a set made before the id changed has to add the value again
+        self.assertIn(value, {v for v in before})
+
+    def test_003_remove(self):
+        values = build_values(cached=True)
+        keys = dict((v.index, k) for k, v in values.items())
+
+        del values[keys[0]]
+        values.pop(keys[1])
+
+        self.assertIsNone(values.resolve(1000, Meter.class_id, 1, 0))
+        self.assertIsNone(values.resolve(1001, Meter.class_id, 1, 1))
+        self.assertEqual(values.resolve(1002, Meter.class_id, 1, 2).id, 1002)
+
+    def test_100_benchmark_resolve(self):
+        values = build_values(cached=False)
+        legacy = dict(values.items())
+        n = NotificationValue(1000 + VALUE_COUNT - 1, Meter.class_id, 1, 0)
+
+        self.bench(
+            'legacy ({0} values)'.format(VALUE_COUNT),
+            lambda: legacy_resolve(legacy, n),
+            number=2000
+        )
+        self.bench(
+            'ZWaveValues.resolve ({0} values)'.format(VALUE_COUNT),
+            lambda: values.resolve(
+                n.id,
+                n.command_class,
+                n.instance,
+                n.index
+            ),
+            number=2000
+        )
+        sys.stderr.write('\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+
+# **libopenzwave** is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# **libopenzwave** is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with libopenzwave. If not, see http://www.gnu.org/licenses.
+
+"""
+This file is part of the **libopenzwave** project
+
+:platform: Unix, Windows, OSX
+:license: GPL(v3)
+:synopsis: Benchmarks for the "zwave database" xml handler.
+
+.. moduleauthor:: Kevin G Schlosser
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+
+from libopenzwave import xml_handler
+from .common import BenchmarkCase, build_network_xml
+
+
+def legacy_from_string(cls, str_element):
+    # the split and join parser that XMLElement.from_string replaced.
+    # it is kept here only to compare the two.
+    str_element = str_element.split('?>', 1)[-1].strip()
+
+    while '<!--' in str_element:
+        front = str_element.split('<!--', 1)[0]
+        back = str_element.split('-->', 1)[-1]
+
+        str_element = front + back.lstrip()
+
+    elements = list(
+        item.strip() for item in str_element.strip().split('<')
+        if item.strip()
+    )
+
+    attr_line = elements.pop(0)
+    attr_line = attr_line.split('>')
+
+    if len(attr_line) == 2:
+        attr_line, text = attr_line
+    else:
+        attr_line = attr_line[0]
+        text = ''
+
+    attr_line = attr_line.split(' ', 1)
+
+    if len(attr_line) == 2:
+        tag, attr_line = attr_line
+    else:
+        tag = attr_line[0]
+        attr_line = ''
+
+    if tag.endswith('/') or attr_line.endswith('/'):
+        sub_nodes = []
+    else:
+        sub_nodes = elements[:-1]
+
+    tag = tag.rstrip('/').strip()
+    attr_line = attr_line.rstrip('/').strip()
+    text = text.strip()
+
+    self = cls(tag)
+
+    quote_count = None
+    key = ''
+    value = ''
+
+    for char in list(attr_line):
+        if quote_count is None and char in (' ', '\n', '\t'):
+            continue
+
+        if quote_count is None and char == '=':
+            quote_count = 0
+            continue
+
+        if char in ('"', "'"):
+            if quote_count == 0:
+                quote_count = 1
+                continue
+            else:
+                quote_count = None
+
+                for item in xml_handler.UNESCAPE_CHARS:
+                    value = value.replace(*item)
+
+                self[key.strip()] = value
+                key = ''
+                value = ''
+                continue
+
+        if quote_count == 1:
+            value += char
+        else:
+            key += char
+
+    if key and value:
+        self[key.strip()] = value
+
+    if text:
+        for item in xml_handler.UNESCAPE_CHARS:
+            text = text.replace(*item)
+
+        num_indents = 0
+
+        for line in text.splitlines():
+            indent_count = line.count('    ')
+
+            for i in range(indent_count, -1, -1):
+                if line.startswith('    ' * indent_count):
+                    num_indents = i
+                    break
+
+        self.text = text.replace('    ' * num_indents, '').strip('\n')
+
+    while sub_nodes:
+        sub_element = sub_nodes.pop(0)
+        if sub_element.endswith('/>'):
+            self.append(
+                legacy_from_string(xml_handler.XMLElement, '<' + sub_element)
+            )
+            continue
+
+        sub_tag = sub_element.split(' ', 1)[0]
+        sub_tag = sub_tag.split('>')[0].strip()
+
+        while (
+            not '/' + sub_tag + '>' in sub_element and
+            not '/' + sub_tag + ' >' in sub_element
+        ):
+            sub_element += '<' + sub_nodes.pop(0)
+
+        self.append(
+            legacy_from_string(xml_handler.XMLElement, '<' + sub_element)
+        )
+
+    return self
+
+
+class TestXMLParser(BenchmarkCase):
+
+    def test_000_same_tree_as_legacy_parser(self):
+        data = build_network_xml(5)
+
+        new_root = xml_handler.XMLRootElement.from_string(data)
+        old_root = legacy_from_string(xml_handler.XMLRootElement, data)
+
+        self.assertIsInstance(new_root, xml_handler.XMLRootElement)
+        self.assertEqual(str(new_root), str(old_root))
+        self.assertEqual(new_root['home_id'], '0xE1A2B3C4')
+
+        node = new_root.Nodes[0]
+        self.assertEqual(node['name'], 'Node & 2')
+        self.assertEqual(node.Values[0]['units'], '<C>')
+        self.assertEqual(
+            node.Values[0].Help.text,
+            'Line one of the help text <1>\nLine two of the help text'
+        )
+
+    def test_001_round_trip(self):
+        root = xml_handler.XMLRootElement.from_string(build_network_xml(5))
+        data = str(root)
+
+        self.assertEqual(
+            str(xml_handler.XMLRootElement.from_string(data)),
+            data
+        )
+
+    def test_002_malformed(self):
+        for data in ('', '<Network>', '<Network></Nodes>'):
+            self.assertRaises(
+                ValueError,
+                xml_handler.XMLRootElement.from_string,
+                data
+            )
+
+    def test_100_benchmark(self):
+        for node_count in (50, 200, 1000):
+            data = build_network_xml(node_count)
+
+            self.bench(
+                'from_string {0} nodes'.format(node_count),
+                lambda: xml_handler.XMLRootElement.from_string(data)
+            )
+
+            # the legacy parser takes minutes on the large dataset
+            if node_count > 200:
+                continue
+
+            self.bench(
+                'legacy from_string {0} nodes'.format(node_count),
+                lambda: legacy_from_string(xml_handler.XMLRootElement, data),
+                repeat=1
+            )
+
+
+class TestXMLWriter(BenchmarkCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.xml_file = os.path.join(self.path, 'PyOZW_NetworkData.xml')
+
+        with open(self.xml_file, 'w') as f:
+            f.write(build_network_xml(50))
+
+        self.root = xml_handler.XMLRootElement.handle_file(self.xml_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_000_load_is_clean(self):
+        self.assertFalse(self.root.is_dirty)
+        self.assertFalse(self.root.write_file(force=True))
+
+    def test_001_cache_invalidation(self):
+        str(self.root)
+        data = self.root.Nodes[10].Values[3].Data
+        data.text = 'changed'
+        data['value'] = 'changed'
+        self.root.Nodes[20]['name'] = 'renamed'
+
+        self.assertTrue(self.root.is_dirty)
+
+        cached = str(self.root)
+        fresh = str(xml_handler.XMLRootElement.from_string(cached))
+        self.assertEqual(cached, fresh)
+        self.assertIn('<Data index="None" value="changed">changed</Data>', cached)
+        self.assertIn('name="renamed"', cached)
+
+    def test_002_write_delay(self):
+        self.root.Nodes[0]['name'] = 'renamed'
+        self.assertFalse(self.root.write_file())
+        self.assertTrue(self.root.is_dirty)
+
+        self.assertTrue(self.root.write_file(force=True))
+        self.assertFalse(self.root.is_dirty)
+        self.assertEqual(
+            sorted(os.listdir(self.path)),
+            ['PyOZW_NetworkData.xml', 'PyOZW_NetworkData.xml.backup']
+        )
+
+        with open(self.xml_file, 'r') as f:
+            self.assertEqual(f.read(), str(self.root))
+
+    def test_003_from_string_is_clean(self):
+        root = xml_handler.XMLRootElement.from_string(str(self.root))
+        root.xml_file = self.xml_file
+
+        self.assertFalse(root.is_dirty)
+        self.assertFalse(root.write_file(force=True))
+
+    def test_004_concurrent_writers(self):
+        os.chmod(self.xml_file, 0o644)
+        roots = list(
+            xml_handler.XMLRootElement.handle_file(self.xml_file)
+            for _ in range(4)
+        )
+        results = []
+
+        def write(root, name):
+            for i in range(20):
+                root.Nodes[0]['name'] = '{0}{1}'.format(name, i)
+                results.append(root.write_file(force=True))
+
+        threads = list(
+            threading.Thread(target=write, args=(root, 'writer' + str(i)))
+            for i, root in enumerate(roots)
+        )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [True] * 80)
+        self.assertEqual(
+            sorted(os.listdir(self.path)),
+            ['PyOZW_NetworkData.xml', 'PyOZW_NetworkData.xml.backup']
+        )
+        self.assertEqual(os.stat(self.xml_file).st_mode & 0o777, 0o644)
+
+        with open(self.xml_file, 'r') as f:
+            data = f.read()
+
+        self.assertIn(data, list(str(root) for root in roots))
+
+    def test_100_benchmark(self):
+        data = build_network_xml(200)
+        roots = list(
+            xml_handler.XMLRootElement.from_string(data) for _ in range(3)
+        )
+
+        self.bench(
+            'serialize 200 nodes',
+            lambda: str(roots.pop())
+        )
+
+        root = xml_handler.XMLRootElement.from_string(data)
+        str(root)
+        element = root.Nodes[100].Values[5].Data
+
+        def change():
+            element['value'] = element['value'] + 1
+            str(root)
+
+        self.bench(
+            'serialize 200 nodes, one value changed',
+            change,
+            number=10
+        )
+        sys.stderr.write('\n')
+
+
+if __name__ == '__main__':
+    sys.argv.append('-v')
+    unittest.main()